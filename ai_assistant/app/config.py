@@ -26,10 +26,22 @@ class Settings(BaseSettings):
     
     # Database configuration (for session storage)
     DATABASE_URL: str = Field(default="")
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_MAX_OVERFLOW: int = Field(default=20)
+    DB_POOL_TIMEOUT: int = Field(default=30)
+    # Server-side limit per SQL statement in milliseconds, 0 to disable
+    DB_STATEMENT_TIMEOUT_MS: int = Field(default=0)
+    # Connecting through PgBouncer in transaction pooling mode
+    DB_PGBOUNCER: bool = Field(default=False)
+    # Worker threads for blocking database calls made from async code
+    DB_THREAD_POOL_SIZE: int = Field(default=8)
     
     # Redis configuration (for session management)
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
     
+    # Machine context cache (seconds an assembled context may be reused)
+    MACHINE_CONTEXT_CACHE_TTL: int = Field(default=300)
+    
     # CORS configuration
     CORS_ALLOWED_ORIGINS: str = Field(
         default="http://localhost:3000,http://localhost:3001,http://127.0.0.1:3000,http://127.0.0.1:3001"
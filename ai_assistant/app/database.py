@@ -3,10 +3,18 @@ Database configuration for the AI Assistant service.
 """
 
 import os
-from sqlalchemy import create_engine, text
+import asyncio
+import functools
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, event, exc, text
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Dict, Generator, AsyncGenerator, Callable, Optional, TypeVar
 import logging
 
 from .config import settings
@@ -16,17 +24,150 @@ logger = logging.getLogger(__name__)
 # Database URL - use ABParts database
 DATABASE_URL = settings.DATABASE_URL or "postgresql://abparts_user:abparts_password@db:5432/abparts_dev"
 
+T = TypeVar("T")
+
+
+class PoolWaitStats:
+    """Checkout wait times and timeouts of one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+            }
+
+
+pool_wait_stats = {"sync": PoolWaitStats(), "async": PoolWaitStats()}
+
+
+def instrumented_pool_class(base, stats: PoolWaitStats):
+    """Pool subclass recording how long each checkout waits for a connection."""
+
+    class InstrumentedPool(base):
+        def connect(self):
+            started = time.perf_counter()
+            timed_out = False
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                timed_out = True
+                logger.warning(f"Timed out waiting for a database connection (pool_size={self.size()})")
+                raise
+            finally:
+                stats.record(time.perf_counter() - started, timed_out)
+
+    return InstrumentedPool
+
+
+def sync_connect_args() -> Dict[str, Any]:
+    """psycopg2 connection arguments; it never uses server-side prepared statements."""
+    if settings.DB_STATEMENT_TIMEOUT_MS and not settings.DB_PGBOUNCER:
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def async_connect_args() -> Dict[str, Any]:
+    """asyncpg connection arguments."""
+    if settings.DB_PGBOUNCER:
+        # Prepared statements live on a server connection that PgBouncer hands
+        # to other clients after each transaction: don't cache them, and give
+        # the ones asyncpg still prepares names that cannot collide
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return {}
+
+
+@event.listens_for(Session, "after_begin")
+def _set_local_statement_timeout(session, transaction, connection):
+    """Through PgBouncer, apply the statement timeout per transaction."""
+    if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT_MS and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {settings.DB_STATEMENT_TIMEOUT_MS}")
+
+
 # Create SQLAlchemy engine
+# Blocking sessions are only opened from the DB thread pool (or sync code),
+# so the pool is sized to the number of worker threads.
 engine = create_engine(
     DATABASE_URL,
+    poolclass=instrumented_pool_class(QueuePool, pool_wait_stats["sync"]),
+    pool_size=settings.DB_THREAD_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_pre_ping=True,
     pool_recycle=300,
+    connect_args=sync_connect_args(),
     echo=settings.DEBUG
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Bounded executor for blocking database work invoked from async code
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_THREAD_POOL_SIZE,
+    thread_name_prefix="ai-db"
+)
+
+# Async engine is created lazily so importing this module does not require
+# the asyncpg driver (e.g. for offline scripts and unit tests).
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_database_url(url: str = DATABASE_URL) -> str:
+    """Translate the configured database URL to its asyncpg equivalent."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the shared async engine, creating it on first use."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, pool_wait_stats["async"]),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            pool_recycle=300,
+            connect_args=async_connect_args(),
+            echo=settings.DEBUG
+        )
+        _async_session_factory = async_sessionmaker(
+            _async_engine, expire_on_commit=False, autoflush=False
+        )
+    return _async_engine
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -55,6 +196,69 @@ def get_db_session():
         db.close()
 
 
+@asynccontextmanager
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async context manager for database sessions.
+    
+    Queries are awaited on the async engine so they never block the
+    event loop. Commits on success and rolls back on error, like
+    ``get_db_session``.
+    """
+    get_async_engine()
+    db = _async_session_factory()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
+async def run_in_db_thread(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking database callable on the bounded DB thread pool.
+    
+    Used for the remaining synchronous SQLAlchemy code paths so they do not
+    stall the event loop while waiting on Postgres.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, functools.partial(func, *args, **kwargs))
+
+
+def _pool_numbers(pool) -> Dict[str, Any]:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def pool_status() -> Dict[str, Any]:
+    """Usage and checkout waits of the sync and async connection pools."""
+    status = {
+        "pool_timeout_seconds": settings.DB_POOL_TIMEOUT,
+        "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+        "pgbouncer": settings.DB_PGBOUNCER,
+        "sync": {
+            **_pool_numbers(engine.pool),
+            "capacity": settings.DB_THREAD_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+            **pool_wait_stats["sync"].snapshot(),
+        },
+        "async": None,
+    }
+    if _async_engine is not None:
+        status["async"] = {
+            **_pool_numbers(_async_engine.sync_engine.pool),
+            "capacity": settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+            **pool_wait_stats["async"].snapshot(),
+        }
+    return status
+
+
 async def init_database():
     """
     Initialize database connection.
@@ -62,8 +266,8 @@ async def init_database():
     """
     try:
         # Test database connection
-        with get_db_session() as db:
-            db.execute(text("SELECT 1"))
+        async with get_async_db_session() as db:
+            await db.execute(text("SELECT 1"))
         logger.info("Database connection established")
     except Exception as e:
         logger.error(f"Failed to connect to database: {e}")
@@ -75,7 +279,10 @@ async def close_database():
     Close database connections.
     """
     try:
+        if _async_engine is not None:
+            await _async_engine.dispose()
         engine.dispose()
+        db_executor.shutdown(wait=False)
         logger.info("Database connections closed")
     except Exception as e:
         logger.error(f"Error closing database connections: {e}")
\ No newline at end of file
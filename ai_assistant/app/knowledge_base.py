@@ -9,6 +9,7 @@ and expert knowledge.
 import logging
 import hashlib
 import asyncio
+import time
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import uuid
@@ -24,6 +25,11 @@ from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Key of an embedding partition: (language, version, document_type).
+# ``None`` for version or document_type means "any", mirroring the
+# optional filters of ``KnowledgeBaseManager.search_documents``.
+PartitionKey = Tuple[str, Optional[str], Optional[str]]
+
 
 class DocumentProcessor:
     """Processes documents for knowledge base storage."""
@@ -217,12 +223,252 @@ class EmbeddingService:
         return dot_product / (norm1 * norm2)
 
 
+def normalize_embeddings(embeddings: Any) -> np.ndarray:
+    """
+    Convert embeddings to a row-normalized float32 matrix.
+    
+    Zero vectors are kept as zero rows so they score 0.0 against any query,
+    matching ``EmbeddingService.cosine_similarity``.
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class EmbeddingMatrix:
+    """Preloaded, normalized embedding matrix for a single partition."""
+    
+    def __init__(self):
+        self.matrix: Optional[np.ndarray] = None
+        self.chunk_ids: List[str] = []
+        self.document_ids: List[str] = []
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at = time.monotonic()
+        self._known_chunks: set = set()
+    
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+    
+    def append(
+        self,
+        chunk_ids: List[str],
+        document_ids: List[str],
+        embeddings: List[List[float]],
+        created_at: List[Optional[datetime]]
+    ) -> int:
+        """
+        Append chunk embeddings, skipping chunks already in the matrix.
+        
+        Returns:
+            Number of rows added
+        """
+        rows = [
+            i for i, chunk_id in enumerate(chunk_ids)
+            if chunk_id not in self._known_chunks and embeddings[i]
+        ]
+        if not rows:
+            return 0
+        
+        vectors = normalize_embeddings([embeddings[i] for i in rows])
+        if self.matrix is None or len(self.chunk_ids) == 0:
+            self.matrix = vectors
+        else:
+            self.matrix = np.vstack([self.matrix, vectors])
+        
+        for i in rows:
+            self.chunk_ids.append(chunk_ids[i])
+            self.document_ids.append(document_ids[i])
+            self._known_chunks.add(chunk_ids[i])
+            if created_at[i] and (self.watermark is None or created_at[i] > self.watermark):
+                self.watermark = created_at[i]
+        
+        return len(rows)
+    
+    def remove_document(self, document_id: str) -> int:
+        """
+        Drop all rows belonging to a document.
+        
+        Returns:
+            Number of rows removed
+        """
+        keep = [i for i, doc_id in enumerate(self.document_ids) if doc_id != document_id]
+        removed = len(self.document_ids) - len(keep)
+        if removed == 0:
+            return 0
+        
+        for i, doc_id in enumerate(self.document_ids):
+            if doc_id == document_id:
+                self._known_chunks.discard(self.chunk_ids[i])
+        
+        self.matrix = self.matrix[keep] if keep else None
+        self.chunk_ids = [self.chunk_ids[i] for i in keep]
+        self.document_ids = [self.document_ids[i] for i in keep]
+        return removed
+    
+    def top_k(
+        self,
+        query_vector: np.ndarray,
+        limit: int,
+        similarity_threshold: float = 0.0
+    ) -> List[Tuple[int, float]]:
+        """
+        Score all rows with one matrix-vector product and select the top k.
+        
+        Args:
+            query_vector: Normalized float32 query vector
+            limit: Maximum number of results
+            similarity_threshold: Minimum similarity score
+            
+        Returns:
+            List of (row, similarity) tuples ordered by descending similarity
+        """
+        if self.matrix is None or len(self.chunk_ids) == 0 or limit <= 0:
+            return []
+        
+        scores = self.matrix @ query_vector
+        candidates = np.flatnonzero(scores >= similarity_threshold)
+        if candidates.size > limit:
+            top = np.argpartition(scores[candidates], -limit)[-limit:]
+            candidates = candidates[top]
+        
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(row), float(scores[row])) for row in ordered]
+
+
+class EmbeddingIndex:
+    """
+    In-memory embedding matrices partitioned by (language, version, type).
+    
+    Partitions are loaded lazily on first search with a single projected
+    query, kept up to date from ``KnowledgeBaseManager`` writes, and topped
+    up with chunks created by other writers once ``refresh_interval``
+    seconds have passed.
+    """
+    
+    def __init__(self, refresh_interval: float = 60.0):
+        self.refresh_interval = refresh_interval
+        self._partitions: Dict[PartitionKey, EmbeddingMatrix] = {}
+    
+    @staticmethod
+    def partition_keys(
+        language: str,
+        version: Optional[str],
+        document_type: Optional[str]
+    ) -> List[PartitionKey]:
+        """All partition keys a document with these attributes belongs to."""
+        return [
+            (language, None, None),
+            (language, version, None),
+            (language, None, document_type),
+            (language, version, document_type)
+        ]
+    
+    def get_partition(
+        self,
+        db: Session,
+        language: str,
+        version: Optional[str] = None,
+        document_type: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """Return the partition for the given filters, loading or refreshing it."""
+        key = (language, version, document_type)
+        partition = self._partitions.get(key)
+        
+        if partition is None:
+            partition = EmbeddingMatrix()
+            self._load(db, key, partition)
+            self._partitions[key] = partition
+            logger.info(f"Loaded embedding partition {key} with {len(partition)} chunks")
+        elif time.monotonic() - partition.refreshed_at >= self.refresh_interval:
+            added = self._load(db, key, partition, since=partition.watermark)
+            if added:
+                logger.info(f"Refreshed embedding partition {key} with {added} new chunks")
+        
+        return partition
+    
+    def _load(
+        self,
+        db: Session,
+        key: PartitionKey,
+        partition: EmbeddingMatrix,
+        since: Optional[datetime] = None
+    ) -> int:
+        """Load (or top up) a partition from the database."""
+        language, version, document_type = key
+        filters = [KnowledgeDocument.language == language]
+        if version:
+            filters.append(KnowledgeDocument.version == version)
+        if document_type:
+            filters.append(KnowledgeDocument.document_type == document_type)
+        if since is not None:
+            filters.append(DocumentChunk.created_at >= since)
+        
+        rows = db.query(
+            DocumentChunk.id,
+            DocumentChunk.document_id,
+            DocumentChunk.embedding,
+            DocumentChunk.created_at
+        ).join(
+            KnowledgeDocument,
+            DocumentChunk.document_id == KnowledgeDocument.id
+        ).filter(and_(*filters)).all()
+        
+        partition.refreshed_at = time.monotonic()
+        if not rows:
+            return 0
+        
+        return partition.append(
+            [row.id for row in rows],
+            [row.document_id for row in rows],
+            [row.embedding for row in rows],
+            [row.created_at for row in rows]
+        )
+    
+    def add_chunks(
+        self,
+        language: str,
+        version: Optional[str],
+        document_type: Optional[str],
+        document_id: str,
+        chunk_ids: List[str],
+        embeddings: List[List[float]],
+        created_at: datetime
+    ):
+        """Append new chunks to every loaded partition the document belongs to."""
+        for key in set(self.partition_keys(language, version, document_type)):
+            partition = self._partitions.get(key)
+            if partition is not None:
+                partition.append(
+                    chunk_ids,
+                    [document_id] * len(chunk_ids),
+                    embeddings,
+                    [created_at] * len(chunk_ids)
+                )
+    
+    def remove_document(self, document_id: str):
+        """Remove a document's chunks from every loaded partition."""
+        for partition in self._partitions.values():
+            partition.remove_document(document_id)
+    
+    def invalidate(self, language: Optional[str] = None):
+        """Drop loaded partitions so they are reloaded on next search."""
+        if language is None:
+            self._partitions.clear()
+        else:
+            for key in [k for k in self._partitions if k[0] == language]:
+                del self._partitions[key]
+
+
 class KnowledgeBaseManager:
     """Main knowledge base management class."""
     
     def __init__(self):
         self.processor = DocumentProcessor()
         self.embedding_service = EmbeddingService()
+        self.index = EmbeddingIndex()
         
     async def add_document(
         self,
@@ -292,7 +538,7 @@ class KnowledgeBaseManager:
                 file_path=str(path),
                 file_hash=file_hash,
                 chunk_count=len(text_chunks),
-                metadata=metadata or {},
+                document_metadata=metadata or {},
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow()
             )
@@ -301,6 +547,8 @@ class KnowledgeBaseManager:
             db.flush()  # Get the document ID
             
             # Create chunk records
+            created_at = datetime.utcnow()
+            chunk_ids = []
             for i, (chunk_text, embedding) in enumerate(zip(text_chunks, embeddings)):
                 chunk = DocumentChunk(
                     id=str(uuid.uuid4()),
@@ -308,12 +556,18 @@ class KnowledgeBaseManager:
                     chunk_index=i,
                     content=chunk_text,
                     embedding=embedding,
-                    created_at=datetime.utcnow()
+                    created_at=created_at
                 )
                 db.add(chunk)
+                chunk_ids.append(chunk.id)
             
             db.commit()
             
+            self.index.add_chunks(
+                language, version, document_type, document_id,
+                chunk_ids, embeddings, created_at
+            )
+            
             logger.info(f"Successfully added document: {title} ({len(text_chunks)} chunks)")
             return document_id
             
@@ -357,46 +611,41 @@ class KnowledgeBaseManager:
             # Get database session
             db = next(get_db())
             
-            # Build query filters
-            filters = [KnowledgeDocument.language == language]
-            
-            if version:
-                filters.append(KnowledgeDocument.version == version)
+            # Score the preloaded partition with a single matrix-vector product
+            partition = self.index.get_partition(db, language, version, document_type)
+            query_vector = normalize_embeddings(query_embedding)[0]
+            hits = partition.top_k(query_vector, limit, similarity_threshold)
             
-            if document_type:
-                filters.append(KnowledgeDocument.document_type == document_type)
+            if not hits:
+                logger.info(f"Found 0 relevant chunks for query: {query[:50]}...")
+                return []
             
-            # Get all chunks from matching documents
-            chunks_query = db.query(DocumentChunk, KnowledgeDocument).join(
+            # Materialize only the top-k chunks
+            hit_ids = [partition.chunk_ids[row] for row, _ in hits]
+            rows = db.query(DocumentChunk, KnowledgeDocument).join(
                 KnowledgeDocument,
                 DocumentChunk.document_id == KnowledgeDocument.id
-            ).filter(and_(*filters))
-            
-            chunks = chunks_query.all()
+            ).filter(DocumentChunk.id.in_(hit_ids)).all()
+            chunks_by_id = {chunk.id: (chunk, document) for chunk, document in rows}
             
-            # Calculate similarities and rank results
             results = []
-            for chunk, document in chunks:
-                similarity = self.embedding_service.cosine_similarity(
-                    query_embedding, chunk.embedding
-                )
-                
-                if similarity >= similarity_threshold:
-                    results.append({
-                        'chunk_id': chunk.id,
-                        'document_id': document.id,
-                        'document_title': document.title,
-                        'document_type': document.document_type,
-                        'version': document.version,
-                        'content': chunk.content,
-                        'chunk_index': chunk.chunk_index,
-                        'similarity': similarity,
-                        'metadata': document.metadata
-                    })
-            
-            # Sort by similarity and limit results
-            results.sort(key=lambda x: x['similarity'], reverse=True)
-            results = results[:limit]
+            for row, similarity in hits:
+                match = chunks_by_id.get(partition.chunk_ids[row])
+                if match is None:
+                    # Deleted by another writer since the partition was loaded
+                    continue
+                chunk, document = match
+                results.append({
+                    'chunk_id': chunk.id,
+                    'document_id': document.id,
+                    'document_title': document.title,
+                    'document_type': document.document_type,
+                    'version': document.version,
+                    'content': chunk.content,
+                    'chunk_index': chunk.chunk_index,
+                    'similarity': similarity,
+                    'metadata': document.document_metadata
+                })
             
             logger.info(f"Found {len(results)} relevant chunks for query: {query[:50]}...")
             return results
@@ -498,6 +747,7 @@ class KnowledgeBaseManager:
             ).delete()
             
             db.commit()
+            self.index.remove_document(document_id)
             
             if result > 0:
                 logger.info(f"Successfully deleted document: {document_id}")
@@ -7,7 +7,7 @@ including error handling, retries, and fallback mechanisms.
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import time
@@ -37,6 +37,11 @@ class LLMResponse:
     response_time: float
     success: bool
     error_message: Optional[str] = None
+    time_to_first_token: Optional[float] = None
+
+
+# Async callback receiving each content delta of a streamed completion
+TokenCallback = Callable[[str], Awaitable[None]]
 
 
 @dataclass
@@ -157,7 +162,8 @@ class LLMClient:
         language: str = "en",
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        on_token: Optional[TokenCallback] = None
     ) -> LLMResponse:
         """
         Generate a response using the LLM with knowledge base integration.
@@ -168,11 +174,21 @@ class LLMClient:
             model: Specific model to use (optional)
             max_tokens: Maximum tokens for response
             temperature: Response creativity (0.0-1.0)
+            on_token: Optional async callback; when given the completion is
+                streamed and each raw content delta is passed to it as it
+                arrives. The returned content is still the full cleaned text.
             
         Returns:
             LLMResponse with generated content and metadata
         """
         start_time = time.time()
+        first_token_at: Optional[float] = None
+        
+        async def forward_token(delta: str) -> None:
+            nonlocal first_token_at
+            if first_token_at is None:
+                first_token_at = time.time() - start_time
+            await on_token(delta)
         
         # If client is not initialized, return a mock response
         if not self.client:
@@ -382,29 +398,42 @@ Respond in {language}."""
         # Attempt generation with retries and fallback
         for attempt in range(self.max_retries):
             try:
-                response = await self._make_api_call(
-                    messages=openai_messages,
-                    model=model_to_use,
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
+                if on_token:
+                    raw_content, model_used, tokens_used = await self._make_streaming_api_call(
+                        messages=openai_messages,
+                        model=model_to_use,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        on_token=forward_token
+                    )
+                else:
+                    response = await self._make_api_call(
+                        messages=openai_messages,
+                        model=model_to_use,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                    raw_content = response.choices[0].message.content
+                    model_used = response.model
+                    tokens_used = response.usage.total_tokens
                 
                 response_time = time.time() - start_time
                 
                 # Clean the response content to remove markdown formatting
-                cleaned_content = self._clean_response_formatting(response.choices[0].message.content)
+                cleaned_content = self._clean_response_formatting(raw_content)
                 
                 return LLMResponse(
                     content=cleaned_content,
-                    model_used=response.model,
-                    tokens_used=response.usage.total_tokens,
+                    model_used=model_used,
+                    tokens_used=tokens_used,
                     response_time=response_time,
-                    success=True
+                    success=True,
+                    time_to_first_token=first_token_at
                 )
                 
             except openai.RateLimitError as e:
                 logger.warning(f"Rate limit hit on attempt {attempt + 1}: {e}")
-                if attempt < self.max_retries - 1:
+                if attempt < self.max_retries - 1 and first_token_at is None:
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
                     continue
                 else:
@@ -417,12 +446,12 @@ Respond in {language}."""
                 logger.error(f"OpenAI API error on attempt {attempt + 1}: {e}")
                 
                 # Try fallback model if using primary model
-                if model_to_use == self.primary_model and attempt == 0:
+                if model_to_use == self.primary_model and attempt == 0 and first_token_at is None:
                     logger.info("Falling back to secondary model")
                     model_to_use = self.fallback_model
                     continue
                     
-                if attempt < self.max_retries - 1:
+                if attempt < self.max_retries - 1 and first_token_at is None:
                     await asyncio.sleep(2 ** attempt)
                     continue
                 else:
@@ -433,7 +462,7 @@ Respond in {language}."""
                     
             except Exception as e:
                 logger.error(f"Unexpected error on attempt {attempt + 1}: {e}")
-                if attempt < self.max_retries - 1:
+                if attempt < self.max_retries - 1 and first_token_at is None:
                     await asyncio.sleep(2 ** attempt)
                     continue
                 else:
@@ -464,6 +493,44 @@ Respond in {language}."""
             timeout=self.timeout
         )
     
+    async def _make_streaming_api_call(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        on_token: TokenCallback
+    ) -> Tuple[str, str, int]:
+        """
+        Make a streaming API call, forwarding content deltas as they arrive.
+        
+        Returns:
+            Tuple of (full content, model used, number of streamed chunks).
+            Streamed completions do not report usage, so the chunk count is
+            used as the token count.
+        """
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            timeout=self.timeout,
+            stream=True
+        )
+        
+        parts: List[str] = []
+        model_used = model
+        async for chunk in stream:
+            model_used = chunk.model or model_used
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                await on_token(delta)
+        
+        return "".join(parts), model_used, len(parts)
+    
     def _get_language_instruction(self, language: str) -> str:
         """Get language-specific instruction for the LLM."""
         language_instructions = {
@@ -139,6 +139,7 @@ async def track_response_metrics(
     knowledge_sources_used: int = 0,
     contains_safety_warning: bool = False,
     requires_expert_review: bool = False,
+    time_to_first_token_ms: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """Track AI response quality metrics."""
@@ -152,7 +153,8 @@ async def track_response_metrics(
             relevance_score=relevance_score,
             knowledge_sources_used=knowledge_sources_used,
             contains_safety_warning=contains_safety_warning,
-            requires_expert_review=requires_expert_review
+            requires_expert_review=requires_expert_review,
+            time_to_first_token_ms=time_to_first_token_ms
         )
         
         success = await analytics_service.track_ai_response_metrics(db, metrics)
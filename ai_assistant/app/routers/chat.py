@@ -3,22 +3,26 @@ Chat endpoints for the AI Assistant service.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Header
-from typing import Dict, Any, List, Optional
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, List, Optional, Callable, Awaitable, AsyncIterator
 from pydantic import BaseModel, Field
 from sqlalchemy import text
+import asyncio
+import json
 import logging
 import uuid
 import time
 from datetime import datetime, timedelta
 
-from ..llm_client import LLMClient, ConversationMessage
+from ..llm_client import LLMClient, ConversationMessage, TokenCallback
 from ..services.user_service import UserService
 from ..services.security_service import get_security_service, SecurityService
 from ..services.audit_service import get_audit_service, AuditService, AuditEventType, AuditSeverity
 from ..services.troubleshooting_service import TroubleshootingService
 from ..services.learning_service import learning_service
+from ..services.analytics_service import analytics_service, AIResponseMetrics
 from ..session_manager import SessionManager
-from ..database import get_db_session
+from ..database import get_async_db_session
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -101,6 +105,7 @@ class ChatResponse(BaseModel):
     """Chat response model."""
     response: str = Field(..., description="AI assistant response")
     session_id: str = Field(..., description="Session ID")
+    message_id: Optional[str] = Field(default=None, description="ID of the stored assistant message")
     model_used: str = Field(..., description="LLM model used for response")
     tokens_used: int = Field(..., description="Number of tokens consumed")
     response_time: float = Field(..., description="Response generation time in seconds")
@@ -136,6 +141,93 @@ class ProblemAnalysisRequest(BaseModel):
     machine_context: Optional[Dict[str, Any]] = Field(default=None, description="Machine-specific context")
 
 
+def _sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_events(
+    process: Callable[[TokenCallback], Awaitable[BaseModel]],
+    chat_response_of: Callable[[BaseModel], Optional[ChatResponse]]
+) -> AsyncIterator[str]:
+    """
+    Run ``process`` and yield its output as server-sent events.
+    
+    Tokens are forwarded as ``token`` events while the response is generated;
+    the final model is sent as ``done`` after latency metrics are recorded.
+    Processing runs as its own task so a client disconnect does not abort
+    persisting the assistant message.
+    
+    Args:
+        process: Coroutine factory taking the token callback
+        chat_response_of: Picks the ChatResponse out of the final result
+    """
+    start_time = time.time()
+    first_token_at: Optional[float] = None
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+
+    async def on_token(delta: str):
+        await queue.put(delta)
+
+    task = asyncio.create_task(process(on_token))
+    try:
+        while not task.done() or not queue.empty():
+            if queue.empty():
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    continue
+                delta = getter.result()
+            else:
+                delta = queue.get_nowait()
+
+            if first_token_at is None:
+                first_token_at = time.time()
+            yield _sse_event("token", {"delta": delta})
+
+        result = task.result()
+    except HTTPException as e:
+        yield _sse_event("error", {"detail": e.detail})
+        return
+    except Exception as e:
+        logger.error(f"Streaming chat error: {e}")
+        yield _sse_event("error", {"detail": str(e)})
+        return
+
+    chat_response = chat_response_of(result)
+    if chat_response is not None:
+        await analytics_service.record_response_latency(AIResponseMetrics(
+            session_id=chat_response.session_id,
+            message_id=chat_response.message_id or str(uuid.uuid4()),
+            response_time_ms=int((time.time() - start_time) * 1000),
+            token_count=chat_response.tokens_used or None,
+            confidence_score=None,
+            relevance_score=None,
+            knowledge_sources_used=0,
+            contains_safety_warning=False,
+            requires_expert_review=False,
+            time_to_first_token_ms=(
+                int((first_token_at - start_time) * 1000) if first_token_at is not None else None
+            ),
+            streamed=True
+        ))
+
+    yield _sse_event("done", result.model_dump())
+
+
+def _sse_response(
+    process: Callable[[TokenCallback], Awaitable[BaseModel]],
+    chat_response_of: Callable[[BaseModel], Optional[ChatResponse]]
+) -> StreamingResponse:
+    """Wrap _stream_events in an unbuffered text/event-stream response."""
+    return StreamingResponse(
+        _stream_events(process, chat_response_of),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
@@ -156,6 +248,45 @@ async def chat(
     Automatically detects troubleshooting scenarios and initiates interactive
     step-by-step workflows when appropriate.
     """
+    return await _process_chat(request, llm_client, user_service, security_service)
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    authorization: Optional[str] = Header(None),
+    llm_client: LLMClient = Depends(get_llm_client),
+    user_service: UserService = Depends(get_user_service),
+    security_service: SecurityService = Depends(get_security_service)
+) -> StreamingResponse:
+    """
+    Streaming variant of /chat using server-sent events.
+    
+    Emits ``token`` events with content deltas while the completion is
+    generated (including troubleshooting steps produced from clarifications),
+    then a single ``done`` event carrying the full ChatResponse. Clients
+    should replace the streamed text with ``done.response``, which has
+    formatting cleaned up. Failures are reported as an ``error`` event.
+    """
+    return _sse_response(
+        lambda on_token: _process_chat(request, llm_client, user_service, security_service, on_token),
+        lambda result: result
+    )
+
+
+async def _process_chat(
+    request: ChatRequest,
+    llm_client: LLMClient,
+    user_service: UserService,
+    security_service: SecurityService,
+    on_token: Optional[TokenCallback] = None
+) -> ChatResponse:
+    """
+    Shared implementation of /chat and /chat/stream.
+    
+    When ``on_token`` is given, LLM-generated text is forwarded to it as it
+    is produced; the assistant message is persisted once complete either way.
+    """
     # CRITICAL: Log at entry point
     print(f"[ENTRY] Chat endpoint called - message: {request.message[:50]}, machine_id: {request.machine_id}, user_id: {request.user_id}")
     logger.info(f"[ENTRY] Chat endpoint - message: {request.message[:50]}, machine_id: {request.machine_id}")
@@ -178,9 +309,9 @@ async def chat(
             logger.warning(f"Sensitive data detected in message for session {session_id}: {len(detections)} pattern(s)")
             # Store detection in database for audit
             try:
-                with get_db_session() as db:
+                async with get_async_db_session() as db:
                     from sqlalchemy import text
-                    db.execute(text("""
+                    await db.execute(text("""
                         INSERT INTO sensitive_data_detections 
                         (id, session_id, detection_type, detected_at, action_taken, details)
                         VALUES (:id, :session_id, :detection_type, NOW(), :action_taken, :details)
@@ -200,19 +331,19 @@ async def chat(
         # Create or update session record if user_id is provided
         if request.user_id:
             try:
-                from ..database import get_db_session
+                from ..database import get_async_db_session
                 from sqlalchemy import text
                 
-                with get_db_session() as db:
+                async with get_async_db_session() as db:
                     # Check if session exists
-                    existing_session = db.execute(
+                    existing_session = (await db.execute(
                         text("SELECT id FROM ai_sessions WHERE id = :session_id"),
                         {'session_id': session_id}
-                    ).fetchone()
+                    )).fetchone()
                     
                     if not existing_session:
                         # Create new session
-                        db.execute(text("""
+                        await db.execute(text("""
                             INSERT INTO ai_sessions (id, user_id, machine_id, status, language, created_at, updated_at)
                             VALUES (:session_id, :user_id, :machine_id, :status, :language, NOW(), NOW())
                         """), {
@@ -225,7 +356,7 @@ async def chat(
                         logger.info(f"Created new AI session {session_id} for user {request.user_id}")
                     else:
                         # Update existing session
-                        db.execute(text("""
+                        await db.execute(text("""
                             UPDATE ai_sessions 
                             SET updated_at = NOW(), machine_id = :machine_id, language = :language
                             WHERE id = :session_id
@@ -236,7 +367,7 @@ async def chat(
                         })
                     
                     # Store user message
-                    db.execute(text("""
+                    await db.execute(text("""
                         INSERT INTO ai_messages (id, session_id, sender, content, message_type, language, timestamp)
                         VALUES (:id, :session_id, :sender, :content, :message_type, :language, NOW())
                     """), {
@@ -270,7 +401,7 @@ async def chat(
         # Only reuse session if it was updated in the last 5 minutes (active conversation)
         if not request.session_id and request.user_id and request.machine_id:
             try:
-                with get_db_session() as db:
+                async with get_async_db_session() as db:
                     # Look for ANY active session, not just ones with uncompleted steps
                     # This allows clarifications to work even after steps are marked complete
                     query = text("""
@@ -283,10 +414,10 @@ async def chat(
                         ORDER BY s.updated_at DESC
                         LIMIT 1
                     """)
-                    result = db.execute(query, {
+                    result = (await db.execute(query, {
                         'user_id': request.user_id,
                         'machine_id': request.machine_id
-                    }).fetchone()
+                    })).fetchone()
                     
                     if result:
                         request.session_id = str(result[0])
@@ -326,15 +457,17 @@ async def chat(
                     next_step = await troubleshooting_service.process_clarification(
                         session_id=request.session_id,
                         clarification=message_to_process,
-                        language=language
+                        language=language,
+                        on_token=on_token
                     )
                     
                     if next_step:
+                        assistant_message_id = str(uuid.uuid4())
                         # Store user message
                         if request.user_id:
                             try:
-                                with get_db_session() as db:
-                                    db.execute(text("""
+                                async with get_async_db_session() as db:
+                                    await db.execute(text("""
                                         INSERT INTO ai_messages (id, session_id, sender, content, message_type, language, timestamp)
                                         VALUES (:id, :session_id, :sender, :content, :message_type, :language, NOW())
                                     """), {
@@ -347,11 +480,11 @@ async def chat(
                                     })
                                     
                                     # Store assistant response
-                                    db.execute(text("""
+                                    await db.execute(text("""
                                         INSERT INTO ai_messages (id, session_id, sender, content, message_type, language, timestamp)
                                         VALUES (:id, :session_id, :sender, :content, :message_type, :language, NOW())
                                     """), {
-                                        'id': str(uuid.uuid4()),
+                                        'id': assistant_message_id,
                                         'session_id': request.session_id,
                                         'sender': 'assistant',
                                         'content': next_step.instruction,
@@ -364,6 +497,7 @@ async def chat(
                         return ChatResponse(
                             response=next_step.instruction,
                             session_id=request.session_id,
+                            message_id=assistant_message_id,
                             model_used="troubleshooting-engine",
                             tokens_used=0,
                             response_time=time.time() - start_time,
@@ -409,7 +543,7 @@ async def chat(
             # This prevents old sessions from interfering with new troubleshooting
             if request.user_id and request.machine_id:
                 try:
-                    with get_db_session() as db:
+                    async with get_async_db_session() as db:
                         # Find and complete old active sessions
                         old_sessions_query = text("""
                             UPDATE ai_sessions 
@@ -422,11 +556,11 @@ async def chat(
                               AND id != :current_session_id
                             RETURNING id
                         """)
-                        old_sessions = db.execute(old_sessions_query, {
+                        old_sessions = (await db.execute(old_sessions_query, {
                             'user_id': request.user_id,
                             'machine_id': request.machine_id,
                             'current_session_id': session_id
-                        }).fetchall()
+                        })).fetchall()
                         
                         if old_sessions:
                             old_session_ids = [str(row[0]) for row in old_sessions]
@@ -458,16 +592,17 @@ async def chat(
                     print(f"[DEBUG] Returning troubleshooting step")
                     # Return first step with special formatting
                     step = workflow_state.current_step
+                    assistant_message_id = str(uuid.uuid4())
                     
                     # Store encrypted AI response if user_id provided
                     if request.user_id:
                         try:
-                            with get_db_session() as db:
-                                db.execute(text("""
+                            async with get_async_db_session() as db:
+                                await db.execute(text("""
                                     INSERT INTO ai_messages (id, session_id, sender, content, message_type, language, timestamp)
                                     VALUES (:id, :session_id, :sender, :content, :message_type, :language, NOW())
                                 """), {
-                                    'id': str(uuid.uuid4()),
+                                    'id': assistant_message_id,
                                     'session_id': session_id,
                                     'sender': 'assistant',
                                     'content': step.instruction,
@@ -480,6 +615,7 @@ async def chat(
                     return ChatResponse(
                         response=step.instruction,
                         session_id=session_id,
+                        message_id=assistant_message_id,
                         model_used="troubleshooting-engine",
                         tokens_used=0,
                         response_time=time.time() - start_time,
@@ -532,18 +668,20 @@ async def chat(
         # Generate response
         llm_response = await llm_client.generate_response(
             messages=messages,
-            language=language
+            language=language,
+            on_token=on_token
         )
+        assistant_message_id = str(uuid.uuid4())
         
         # Store encrypted AI response if user_id provided
         if request.user_id:
             try:
-                with get_db_session() as db:
-                    db.execute(text("""
+                async with get_async_db_session() as db:
+                    await db.execute(text("""
                         INSERT INTO ai_messages (id, session_id, sender, content, message_type, language, timestamp)
                         VALUES (:id, :session_id, :sender, :content, :message_type, :language, NOW())
                     """), {
-                        'id': str(uuid.uuid4()),
+                        'id': assistant_message_id,
                         'session_id': session_id,
                         'sender': 'assistant',
                         'content': llm_response.content,
@@ -556,6 +694,7 @@ async def chat(
         return ChatResponse(
             response=llm_response.content,
             session_id=session_id,
+            message_id=assistant_message_id,
             model_used=llm_response.model_used,
             tokens_used=llm_response.tokens_used,
             response_time=llm_response.response_time,
@@ -642,13 +781,42 @@ async def submit_step_feedback(
     - Marks the workflow as completed if problem is resolved
     - Escalates to expert support if needed
     """
+    return await _process_step_feedback(request, troubleshooting_service)
+
+
+@router.post("/chat/step-feedback/stream")
+async def submit_step_feedback_stream(
+    request: StepFeedbackRequest,
+    authorization: Optional[str] = Header(None),
+    troubleshooting_service: TroubleshootingService = Depends(get_troubleshooting_service)
+) -> StreamingResponse:
+    """
+    Streaming variant of /chat/step-feedback using server-sent events.
+    
+    The next step's instruction is streamed as ``token`` events while it is
+    generated, followed by a ``done`` event carrying the StepFeedbackResponse.
+    """
+    return _sse_response(
+        lambda on_token: _process_step_feedback(request, troubleshooting_service, on_token),
+        lambda result: result.next_step
+    )
+
+
+async def _process_step_feedback(
+    request: StepFeedbackRequest,
+    troubleshooting_service: TroubleshootingService,
+    on_token: Optional[TokenCallback] = None
+) -> StepFeedbackResponse:
+    """Shared implementation of /chat/step-feedback and its streaming variant."""
+    start_time = time.time()
     try:
         # Process the feedback and get next step
         next_step = await troubleshooting_service.process_user_feedback(
             session_id=request.session_id,
             step_id=request.step_id,
             user_feedback=request.feedback,
-            language=request.language
+            language=request.language,
+            on_token=on_token
         )
         
         if next_step is None:
@@ -684,7 +852,7 @@ async def submit_step_feedback(
             session_id=request.session_id,
             model_used="troubleshooting-engine",
             tokens_used=0,
-            response_time=0.0,
+            response_time=time.time() - start_time,
             success=True,
             message_type="diagnostic_step",
             step_data={
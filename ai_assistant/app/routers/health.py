@@ -8,6 +8,7 @@ import time
 import logging
 
 from ..config import settings
+from ..database import pool_status
 from ..llm_client import LLMClient, ConversationMessage
 
 logger = logging.getLogger(__name__)
@@ -88,6 +89,15 @@ async def readiness_check(llm_client: LLMClient = Depends(get_llm_client)) -> Di
     }
 
 
+@router.get("/database-pool")
+async def database_pool_status() -> Dict[str, Any]:
+    """Connection pool usage and checkout wait times."""
+    return {
+        "pools": pool_status(),
+        "timestamp": time.time()
+    }
+
+
 @router.get("/live")
 async def liveness_check() -> Dict[str, Any]:
     """Liveness check for Kubernetes/Docker health monitoring."""
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..services.abparts_integration import abparts_integration
+from ..services.machine_context import machine_context_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -145,4 +146,21 @@ async def get_machine_maintenance_suggestions(machine_id: str) -> List[Dict[str,
         return suggestions
     except Exception as e:
         logger.error(f"Error retrieving maintenance suggestions for {machine_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve maintenance suggestions")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to retrieve maintenance suggestions")
+
+@router.delete("/{machine_id}/context-cache")
+async def invalidate_machine_context(machine_id: str) -> Dict[str, Any]:
+    """
+    Drop the cached troubleshooting context for a machine.
+    
+    Cached context is refreshed automatically when new hours or maintenance
+    records are detected; this forces a refresh on the next request.
+    
+    Args:
+        machine_id: UUID of the machine
+        
+    Returns:
+        Invalidation confirmation
+    """
+    machine_context_aggregator.invalidate(machine_id)
+    return {"machine_id": machine_id, "invalidated": True}
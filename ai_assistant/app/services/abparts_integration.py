@@ -5,10 +5,11 @@ This service provides integration with the ABParts database to retrieve
 machine context, maintenance history, and user preferences for the AI Assistant.
 """
 
+import asyncio
 import logging
 import sys
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, and_, or_
@@ -18,7 +19,7 @@ backend_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'backen
 if backend_path not in sys.path:
     sys.path.insert(0, backend_path)
 
-from ..database import get_db_session
+from ..database import get_db_session, get_async_db_session, run_in_db_thread
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -42,16 +43,16 @@ class ABPartsIntegration:
         """
         try:
             from sqlalchemy import text
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Use raw SQL instead of ORM to avoid import issues
-                result = db.execute(text("""
+                result = (await db.execute(text("""
                     SELECT m.id, m.name, m.serial_number, m.model_type, m.installation_date,
                            m.total_operating_hours, m.status, m.customer_organization_id,
                            o.name as org_name, o.organization_type
                     FROM machines m
                     LEFT JOIN organizations o ON m.customer_organization_id = o.id
                     WHERE m.id = :machine_id
-                """), {'machine_id': machine_id}).fetchone()
+                """), {'machine_id': machine_id})).fetchone()
                 
                 if not result:
                     self.logger.warning(f"Machine not found: {machine_id}")
@@ -91,61 +92,64 @@ class ABPartsIntegration:
             List of maintenance records
         """
         try:
-            with get_db_session() as db:
-                from app.models import MachineMaintenance, User, MaintenancePartUsage, Part
+            return await run_in_db_thread(self._get_maintenance_history_sync, machine_id, limit)
+        except Exception as e:
+            self.logger.error(f"Error retrieving maintenance history for {machine_id}: {e}")
+            return []
+    
+    def _get_maintenance_history_sync(self, machine_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Blocking part of get_maintenance_history, run on the DB thread pool."""
+        with get_db_session() as db:
+            from app.models import MachineMaintenance, User, MaintenancePartUsage, Part
+            
+            maintenance_records = db.query(MachineMaintenance)\
+                .filter(MachineMaintenance.machine_id == machine_id)\
+                .order_by(desc(MachineMaintenance.maintenance_date))\
+                .limit(limit)\
+                .all()
+            
+            history = []
+            for record in maintenance_records:
+                # Get user who performed maintenance
+                user = db.query(User).filter(User.id == record.performed_by_user_id).first()
                 
-                maintenance_records = db.query(MachineMaintenance)\
-                    .filter(MachineMaintenance.machine_id == machine_id)\
-                    .order_by(desc(MachineMaintenance.maintenance_date))\
-                    .limit(limit)\
+                # Get parts used in this maintenance
+                parts_used = db.query(MaintenancePartUsage, Part)\
+                    .join(Part, MaintenancePartUsage.part_id == Part.id)\
+                    .filter(MaintenancePartUsage.maintenance_id == record.id)\
                     .all()
                 
-                history = []
-                for record in maintenance_records:
-                    # Get user who performed maintenance
-                    user = db.query(User).filter(User.id == record.performed_by_user_id).first()
-                    
-                    # Get parts used in this maintenance
-                    parts_used = db.query(MaintenancePartUsage, Part)\
-                        .join(Part, MaintenancePartUsage.part_id == Part.id)\
-                        .filter(MaintenancePartUsage.maintenance_id == record.id)\
-                        .all()
-                    
-                    parts_list = []
-                    for part_usage, part in parts_used:
-                        parts_list.append({
-                            "part_id": str(part.id),
-                            "part_name": part.name,
-                            "part_number": part.part_number,
-                            "quantity": float(part_usage.quantity),
-                            "notes": part_usage.notes
-                        })
-                    
-                    maintenance_data = {
-                        "id": str(record.id),
-                        "maintenance_date": record.maintenance_date.isoformat(),
-                        "maintenance_type": record.maintenance_type.value,
-                        "description": record.description,
-                        "hours_spent": float(record.hours_spent) if record.hours_spent else None,
-                        "cost": float(record.cost) if record.cost else None,
-                        "next_maintenance_date": record.next_maintenance_date.isoformat() if record.next_maintenance_date else None,
-                        "notes": record.notes,
-                        "performed_by": {
-                            "id": str(user.id) if user else None,
-                            "name": user.name if user else None,
-                            "username": user.username if user else None
-                        },
-                        "parts_used": parts_list,
-                        "created_at": record.created_at.isoformat() if record.created_at else None
-                    }
-                    history.append(maintenance_data)
-                
-                self.logger.info(f"Retrieved {len(history)} maintenance records for machine {machine_id}")
-                return history
+                parts_list = []
+                for part_usage, part in parts_used:
+                    parts_list.append({
+                        "part_id": str(part.id),
+                        "part_name": part.name,
+                        "part_number": part.part_number,
+                        "quantity": float(part_usage.quantity),
+                        "notes": part_usage.notes
+                    })
                 
-        except Exception as e:
-            self.logger.error(f"Error retrieving maintenance history for {machine_id}: {e}")
-            return []
+                maintenance_data = {
+                    "id": str(record.id),
+                    "maintenance_date": record.maintenance_date.isoformat(),
+                    "maintenance_type": record.maintenance_type.value,
+                    "description": record.description,
+                    "hours_spent": float(record.hours_spent) if record.hours_spent else None,
+                    "cost": float(record.cost) if record.cost else None,
+                    "next_maintenance_date": record.next_maintenance_date.isoformat() if record.next_maintenance_date else None,
+                    "notes": record.notes,
+                    "performed_by": {
+                        "id": str(user.id) if user else None,
+                        "name": user.name if user else None,
+                        "username": user.username if user else None
+                    },
+                    "parts_used": parts_list,
+                    "created_at": record.created_at.isoformat() if record.created_at else None
+                }
+                history.append(maintenance_data)
+            
+            self.logger.info(f"Retrieved {len(history)} maintenance records for machine {machine_id}")
+            return history
     
     async def get_parts_usage_data(self, machine_id: str, days: int = 90) -> List[Dict[str, Any]]:
         """
@@ -159,57 +163,60 @@ class ABPartsIntegration:
             List of parts usage records
         """
         try:
-            with get_db_session() as db:
-                from app.models import PartUsage, Part, User, Warehouse
-                
-                cutoff_date = datetime.now() - timedelta(days=days)
-                
-                usage_records = db.query(PartUsage, Part, User, Warehouse)\
-                    .join(Part, PartUsage.part_id == Part.id)\
-                    .join(User, PartUsage.recorded_by_user_id == User.id)\
-                    .join(Warehouse, PartUsage.warehouse_id == Warehouse.id)\
-                    .filter(
-                        PartUsage.machine_id == machine_id,
-                        PartUsage.usage_date >= cutoff_date
-                    )\
-                    .order_by(desc(PartUsage.usage_date))\
-                    .all()
-                
-                usage_data = []
-                for usage, part, user, warehouse in usage_records:
-                    usage_record = {
-                        "id": str(usage.id),
-                        "usage_date": usage.usage_date.isoformat(),
-                        "quantity": float(usage.quantity),
-                        "notes": usage.notes,
-                        "part": {
-                            "id": str(part.id),
-                            "name": part.name,
-                            "part_number": part.part_number,
-                            "part_type": part.part_type.value,
-                            "is_proprietary": part.is_proprietary
-                        },
-                        "recorded_by": {
-                            "id": str(user.id),
-                            "name": user.name,
-                            "username": user.username
-                        },
-                        "warehouse": {
-                            "id": str(warehouse.id),
-                            "name": warehouse.name,
-                            "location": warehouse.location
-                        },
-                        "created_at": usage.created_at.isoformat() if usage.created_at else None
-                    }
-                    usage_data.append(usage_record)
-                
-                self.logger.info(f"Retrieved {len(usage_data)} parts usage records for machine {machine_id}")
-                return usage_data
-                
+            return await run_in_db_thread(self._get_parts_usage_data_sync, machine_id, days)
         except Exception as e:
             self.logger.error(f"Error retrieving parts usage data for {machine_id}: {e}")
             return []
     
+    def _get_parts_usage_data_sync(self, machine_id: str, days: int) -> List[Dict[str, Any]]:
+        """Blocking part of get_parts_usage_data, run on the DB thread pool."""
+        with get_db_session() as db:
+            from app.models import PartUsage, Part, User, Warehouse
+            
+            cutoff_date = datetime.now() - timedelta(days=days)
+            
+            usage_records = db.query(PartUsage, Part, User, Warehouse)\
+                .join(Part, PartUsage.part_id == Part.id)\
+                .join(User, PartUsage.recorded_by_user_id == User.id)\
+                .join(Warehouse, PartUsage.warehouse_id == Warehouse.id)\
+                .filter(
+                    PartUsage.machine_id == machine_id,
+                    PartUsage.usage_date >= cutoff_date
+                )\
+                .order_by(desc(PartUsage.usage_date))\
+                .all()
+            
+            usage_data = []
+            for usage, part, user, warehouse in usage_records:
+                usage_record = {
+                    "id": str(usage.id),
+                    "usage_date": usage.usage_date.isoformat(),
+                    "quantity": float(usage.quantity),
+                    "notes": usage.notes,
+                    "part": {
+                        "id": str(part.id),
+                        "name": part.name,
+                        "part_number": part.part_number,
+                        "part_type": part.part_type.value,
+                        "is_proprietary": part.is_proprietary
+                    },
+                    "recorded_by": {
+                        "id": str(user.id),
+                        "name": user.name,
+                        "username": user.username
+                    },
+                    "warehouse": {
+                        "id": str(warehouse.id),
+                        "name": warehouse.name,
+                        "location": warehouse.location
+                    },
+                    "created_at": usage.created_at.isoformat() if usage.created_at else None
+                }
+                usage_data.append(usage_record)
+            
+            self.logger.info(f"Retrieved {len(usage_data)} parts usage records for machine {machine_id}")
+            return usage_data
+    
     async def get_user_preferences(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve user preferences including language settings.
@@ -222,16 +229,16 @@ class ABPartsIntegration:
         """
         try:
             from sqlalchemy import text
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Use raw SQL instead of ORM
-                result = db.execute(text("""
+                result = (await db.execute(text("""
                     SELECT u.id, u.username, u.name, u.email, u.preferred_language, u.role,
                            u.is_active, u.created_at, u.organization_id,
                            o.name as org_name, o.organization_type
                     FROM users u
                     LEFT JOIN organizations o ON u.organization_id = o.id
                     WHERE u.id = :user_id
-                """), {'user_id': user_id}).fetchone()
+                """), {'user_id': user_id})).fetchone()
                 
                 if not result:
                     self.logger.warning(f"User not found: {user_id}")
@@ -271,54 +278,57 @@ class ABPartsIntegration:
             List of machines accessible to the user
         """
         try:
-            with get_db_session() as db:
-                from app.models import User, Machine, Organization
-                
-                user = db.query(User).filter(User.id == user_id).first()
-                if not user:
-                    self.logger.warning(f"User not found: {user_id}")
-                    return []
-                
-                # Get machines based on user's organization
-                # Super admins can see all machines, others only their organization's machines
-                if user.role.value == "super_admin":
-                    machines = db.query(Machine).all()
-                else:
-                    machines = db.query(Machine)\
-                        .filter(Machine.customer_organization_id == user.organization_id)\
-                        .all()
-                
-                machines_data = []
-                for machine in machines:
-                    # Get organization details
-                    organization = db.query(Organization).filter(
-                        Organization.id == machine.customer_organization_id
-                    ).first()
-                    
-                    # Get latest hours
-                    latest_hours = machine.get_latest_hours(db)
-                    
-                    machine_data = {
-                        "id": str(machine.id),
-                        "name": machine.name,
-                        "model_type": machine.model_type,
-                        "serial_number": machine.serial_number,
-                        "latest_hours": float(latest_hours) if latest_hours else 0,
-                        "organization": {
-                            "id": str(organization.id) if organization else None,
-                            "name": organization.name if organization else None
-                        },
-                        "created_at": machine.created_at.isoformat() if machine.created_at else None
-                    }
-                    machines_data.append(machine_data)
-                
-                self.logger.info(f"Retrieved {len(machines_data)} machines for user {user_id}")
-                return machines_data
-                
+            return await run_in_db_thread(self._get_user_machines_sync, user_id)
         except Exception as e:
             self.logger.error(f"Error retrieving machines for user {user_id}: {e}")
             return []
     
+    def _get_user_machines_sync(self, user_id: str) -> List[Dict[str, Any]]:
+        """Blocking part of get_user_machines, run on the DB thread pool."""
+        with get_db_session() as db:
+            from app.models import User, Machine, Organization
+            
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                self.logger.warning(f"User not found: {user_id}")
+                return []
+            
+            # Get machines based on user's organization
+            # Super admins can see all machines, others only their organization's machines
+            if user.role.value == "super_admin":
+                machines = db.query(Machine).all()
+            else:
+                machines = db.query(Machine)\
+                    .filter(Machine.customer_organization_id == user.organization_id)\
+                    .all()
+            
+            machines_data = []
+            for machine in machines:
+                # Get organization details
+                organization = db.query(Organization).filter(
+                    Organization.id == machine.customer_organization_id
+                ).first()
+                
+                # Get latest hours
+                latest_hours = machine.get_latest_hours(db)
+                
+                machine_data = {
+                    "id": str(machine.id),
+                    "name": machine.name,
+                    "model_type": machine.model_type,
+                    "serial_number": machine.serial_number,
+                    "latest_hours": float(latest_hours) if latest_hours else 0,
+                    "organization": {
+                        "id": str(organization.id) if organization else None,
+                        "name": organization.name if organization else None
+                    },
+                    "created_at": machine.created_at.isoformat() if machine.created_at else None
+                }
+                machines_data.append(machine_data)
+            
+            self.logger.info(f"Retrieved {len(machines_data)} machines for user {user_id}")
+            return machines_data
+    
     async def get_machine_hours_history(self, machine_id: str, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Retrieve machine hours history for trend analysis.
@@ -331,41 +341,44 @@ class ABPartsIntegration:
             List of machine hours records
         """
         try:
-            with get_db_session() as db:
-                from app.models import MachineHours, User
-                
-                hours_records = db.query(MachineHours)\
-                    .filter(MachineHours.machine_id == machine_id)\
-                    .order_by(desc(MachineHours.recorded_date))\
-                    .limit(limit)\
-                    .all()
-                
-                hours_data = []
-                for record in hours_records:
-                    # Get user who recorded the hours
-                    user = db.query(User).filter(User.id == record.recorded_by_user_id).first()
-                    
-                    hours_record = {
-                        "id": str(record.id),
-                        "hours_value": float(record.hours_value),
-                        "recorded_date": record.recorded_date.isoformat(),
-                        "notes": record.notes,
-                        "recorded_by": {
-                            "id": str(user.id) if user else None,
-                            "name": user.name if user else None,
-                            "username": user.username if user else None
-                        },
-                        "created_at": record.created_at.isoformat() if record.created_at else None
-                    }
-                    hours_data.append(hours_record)
-                
-                self.logger.info(f"Retrieved {len(hours_data)} hours records for machine {machine_id}")
-                return hours_data
-                
+            return await run_in_db_thread(self._get_machine_hours_history_sync, machine_id, limit)
         except Exception as e:
             self.logger.error(f"Error retrieving machine hours history for {machine_id}: {e}")
             return []
     
+    def _get_machine_hours_history_sync(self, machine_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Blocking part of get_machine_hours_history, run on the DB thread pool."""
+        with get_db_session() as db:
+            from app.models import MachineHours, User
+            
+            hours_records = db.query(MachineHours)\
+                .filter(MachineHours.machine_id == machine_id)\
+                .order_by(desc(MachineHours.recorded_date))\
+                .limit(limit)\
+                .all()
+            
+            hours_data = []
+            for record in hours_records:
+                # Get user who recorded the hours
+                user = db.query(User).filter(User.id == record.recorded_by_user_id).first()
+                
+                hours_record = {
+                    "id": str(record.id),
+                    "hours_value": float(record.hours_value),
+                    "recorded_date": record.recorded_date.isoformat(),
+                    "notes": record.notes,
+                    "recorded_by": {
+                        "id": str(user.id) if user else None,
+                        "name": user.name if user else None,
+                        "username": user.username if user else None
+                    },
+                    "created_at": record.created_at.isoformat() if record.created_at else None
+                }
+                hours_data.append(hours_record)
+            
+            self.logger.info(f"Retrieved {len(hours_data)} hours records for machine {machine_id}")
+            return hours_data
+    
     async def get_preventive_maintenance_suggestions(self, machine_id: str) -> List[Dict[str, Any]]:
         """
         Generate preventive maintenance suggestions based on machine usage patterns.
@@ -377,63 +390,110 @@ class ABPartsIntegration:
             List of maintenance suggestions
         """
         try:
-            machine_details = await self.get_machine_details(machine_id)
+            machine_details, maintenance_history = await asyncio.gather(
+                self.get_machine_details(machine_id),
+                self.get_maintenance_history(machine_id, limit=5)
+            )
             if not machine_details:
                 return []
             
-            maintenance_history = await self.get_maintenance_history(machine_id, limit=5)
-            hours_history = await self.get_machine_hours_history(machine_id, limit=10)
-            
-            suggestions = []
-            current_hours = machine_details.get("latest_hours", 0)
-            
-            # Basic maintenance interval suggestions based on AutoBoss standards
-            maintenance_intervals = {
-                "50h": {"hours": 50, "description": "Basic cleaning and inspection"},
-                "250h": {"hours": 250, "description": "Comprehensive service and part replacement"},
-                "500h": {"hours": 500, "description": "Major service and system check"},
-                "1000h": {"hours": 1000, "description": "Complete overhaul and inspection"}
-            }
-            
-            # Find the last maintenance for each type
-            last_maintenance_hours = {}
-            for record in maintenance_history:
-                maintenance_type = record.get("maintenance_type", "")
-                if maintenance_type not in last_maintenance_hours:
-                    # Estimate hours at maintenance time (simplified)
-                    last_maintenance_hours[maintenance_type] = current_hours - 100  # Rough estimate
-            
-            # Generate suggestions based on intervals
-            for interval_name, interval_data in maintenance_intervals.items():
-                interval_hours = interval_data["hours"]
-                description = interval_data["description"]
-                
-                # Calculate hours since last maintenance of this type
-                last_hours = last_maintenance_hours.get(interval_name, 0)
-                hours_since_last = current_hours - last_hours
-                
-                if hours_since_last >= interval_hours:
-                    priority = "high" if hours_since_last > interval_hours * 1.2 else "medium"
-                    suggestions.append({
-                        "type": interval_name,
-                        "description": description,
-                        "priority": priority,
-                        "current_hours": current_hours,
-                        "hours_since_last": hours_since_last,
-                        "recommended_hours": interval_hours,
-                        "overdue_hours": max(0, hours_since_last - interval_hours)
-                    })
-            
-            # Sort by priority and overdue hours
-            priority_order = {"high": 3, "medium": 2, "low": 1}
-            suggestions.sort(key=lambda x: (priority_order.get(x["priority"], 0), x["overdue_hours"]), reverse=True)
-            
+            suggestions = self.build_maintenance_suggestions(machine_details, maintenance_history)
             self.logger.info(f"Generated {len(suggestions)} maintenance suggestions for machine {machine_id}")
             return suggestions
             
         except Exception as e:
             self.logger.error(f"Error generating maintenance suggestions for {machine_id}: {e}")
             return []
+    
+    def build_maintenance_suggestions(
+        self,
+        machine_details: Dict[str, Any],
+        maintenance_history: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Build preventive maintenance suggestions from already-fetched data.
+        
+        Args:
+            machine_details: Result of get_machine_details
+            maintenance_history: Result of get_maintenance_history
+            
+        Returns:
+            List of maintenance suggestions, most urgent first
+        """
+        suggestions = []
+        current_hours = machine_details.get("latest_hours", 0)
+        
+        # Basic maintenance interval suggestions based on AutoBoss standards
+        maintenance_intervals = {
+            "50h": {"hours": 50, "description": "Basic cleaning and inspection"},
+            "250h": {"hours": 250, "description": "Comprehensive service and part replacement"},
+            "500h": {"hours": 500, "description": "Major service and system check"},
+            "1000h": {"hours": 1000, "description": "Complete overhaul and inspection"}
+        }
+        
+        # Find the last maintenance for each type
+        last_maintenance_hours = {}
+        for record in maintenance_history:
+            maintenance_type = record.get("maintenance_type", "")
+            if maintenance_type not in last_maintenance_hours:
+                # Estimate hours at maintenance time (simplified)
+                last_maintenance_hours[maintenance_type] = current_hours - 100  # Rough estimate
+        
+        # Generate suggestions based on intervals
+        for interval_name, interval_data in maintenance_intervals.items():
+            interval_hours = interval_data["hours"]
+            description = interval_data["description"]
+            
+            # Calculate hours since last maintenance of this type
+            last_hours = last_maintenance_hours.get(interval_name, 0)
+            hours_since_last = current_hours - last_hours
+            
+            if hours_since_last >= interval_hours:
+                priority = "high" if hours_since_last > interval_hours * 1.2 else "medium"
+                suggestions.append({
+                    "type": interval_name,
+                    "description": description,
+                    "priority": priority,
+                    "current_hours": current_hours,
+                    "hours_since_last": hours_since_last,
+                    "recommended_hours": interval_hours,
+                    "overdue_hours": max(0, hours_since_last - interval_hours)
+                })
+        
+        # Sort by priority and overdue hours
+        priority_order = {"high": 3, "medium": 2, "low": 1}
+        suggestions.sort(key=lambda x: (priority_order.get(x["priority"], 0), x["overdue_hours"]), reverse=True)
+        
+        return suggestions
+    
+    async def get_machine_activity_watermark(self, machine_id: str) -> Optional[Tuple[Any, ...]]:
+        """
+        Cheap change marker for a machine's hours and maintenance records.
+        
+        The marker changes whenever hours or maintenance rows are added,
+        updated or deleted, so cached machine context can be revalidated
+        with a single indexed query.
+        
+        Args:
+            machine_id: UUID of the machine
+            
+        Returns:
+            Tuple of counts and latest update times, or None on error
+        """
+        try:
+            from sqlalchemy import text
+            async with get_async_db_session() as db:
+                result = (await db.execute(text("""
+                    SELECT
+                        (SELECT COUNT(*) FROM machine_hours WHERE machine_id = :machine_id) AS hours_count,
+                        (SELECT MAX(updated_at) FROM machine_hours WHERE machine_id = :machine_id) AS hours_updated,
+                        (SELECT COUNT(*) FROM machine_maintenance WHERE machine_id = :machine_id) AS maintenance_count,
+                        (SELECT MAX(updated_at) FROM machine_maintenance WHERE machine_id = :machine_id) AS maintenance_updated
+                """), {'machine_id': machine_id})).fetchone()
+                return tuple(result) if result else None
+        except Exception as e:
+            self.logger.warning(f"Error retrieving activity watermark for {machine_id}: {e}")
+            return None
 
 
 # Global instance
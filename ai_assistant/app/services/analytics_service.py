@@ -12,7 +12,7 @@ import json
 import asyncio
 from dataclasses import dataclass
 
-from ..database import get_db
+from ..database import get_db, get_async_db_session
 from ..models import (
     AISession, AIMessage, SessionStatus, MessageSender,
     KnowledgeDocument, DocumentChunk
@@ -58,6 +58,8 @@ class AIResponseMetrics:
     knowledge_sources_used: int
     contains_safety_warning: bool
     requires_expert_review: bool
+    time_to_first_token_ms: Optional[int] = None
+    streamed: bool = False
 
 
 @dataclass
@@ -74,6 +76,21 @@ class UserSatisfactionFeedback:
     improvement_suggestions: Optional[str]
 
 
+AI_RESPONSE_METRICS_INSERT = text("""
+    INSERT INTO ai_response_metrics (
+        session_id, message_id, response_time_ms, token_count,
+        confidence_score, relevance_score, knowledge_sources_used,
+        contains_safety_warning, requires_expert_review,
+        time_to_first_token_ms, streamed
+    ) VALUES (
+        :session_id, :message_id, :response_time_ms, :token_count,
+        :confidence_score, :relevance_score, :knowledge_sources_used,
+        :contains_safety_warning, :requires_expert_review,
+        :time_to_first_token_ms, :streamed
+    )
+""")
+
+
 class AnalyticsService:
     """Service for tracking AI Assistant analytics and performance metrics."""
     
@@ -210,29 +227,7 @@ class AnalyticsService:
     ) -> bool:
         """Track AI response quality metrics."""
         try:
-            query = text("""
-                INSERT INTO ai_response_metrics (
-                    session_id, message_id, response_time_ms, token_count,
-                    confidence_score, relevance_score, knowledge_sources_used,
-                    contains_safety_warning, requires_expert_review
-                ) VALUES (
-                    :session_id, :message_id, :response_time_ms, :token_count,
-                    :confidence_score, :relevance_score, :knowledge_sources_used,
-                    :contains_safety_warning, :requires_expert_review
-                )
-            """)
-            
-            db.execute(query, {
-                "session_id": metrics.session_id,
-                "message_id": metrics.message_id,
-                "response_time_ms": metrics.response_time_ms,
-                "token_count": metrics.token_count,
-                "confidence_score": metrics.confidence_score,
-                "relevance_score": metrics.relevance_score,
-                "knowledge_sources_used": metrics.knowledge_sources_used,
-                "contains_safety_warning": metrics.contains_safety_warning,
-                "requires_expert_review": metrics.requires_expert_review
-            })
+            db.execute(AI_RESPONSE_METRICS_INSERT, self._response_metrics_params(metrics))
             
             db.commit()
             self.logger.info(f"Tracked AI response metrics for message {metrics.message_id}")
@@ -243,6 +238,44 @@ class AnalyticsService:
             db.rollback()
             return False
     
+    async def record_response_latency(self, metrics: AIResponseMetrics) -> bool:
+        """
+        Record latency metrics for a generated response from async code.
+        
+        Used by the streaming endpoints once the final message has been
+        persisted, so time-to-first-token and total latency land in
+        ai_response_metrics next to the non-streamed responses.
+        """
+        try:
+            async with get_async_db_session() as db:
+                await db.execute(AI_RESPONSE_METRICS_INSERT, self._response_metrics_params(metrics))
+            
+            self.logger.info(
+                f"Recorded response latency for message {metrics.message_id}: "
+                f"ttft={metrics.time_to_first_token_ms}ms total={metrics.response_time_ms}ms"
+            )
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error recording response latency: {e}")
+            return False
+    
+    def _response_metrics_params(self, metrics: AIResponseMetrics) -> Dict[str, Any]:
+        """Bind parameters for AI_RESPONSE_METRICS_INSERT."""
+        return {
+            "session_id": metrics.session_id,
+            "message_id": metrics.message_id,
+            "response_time_ms": metrics.response_time_ms,
+            "token_count": metrics.token_count,
+            "confidence_score": metrics.confidence_score,
+            "relevance_score": metrics.relevance_score,
+            "knowledge_sources_used": metrics.knowledge_sources_used,
+            "contains_safety_warning": metrics.contains_safety_warning,
+            "requires_expert_review": metrics.requires_expert_review,
+            "time_to_first_token_ms": metrics.time_to_first_token_ms,
+            "streamed": metrics.streamed
+        }
+    
     async def collect_user_satisfaction_feedback(
         self,
         db: Session,
@@ -449,6 +482,24 @@ class AnalyticsService:
                     "daily", yesterday, today
                 )
             
+            # Average time to first token for streamed responses
+            ttft_query = text("""
+                SELECT AVG(time_to_first_token_ms) as avg_ttft
+                FROM ai_response_metrics 
+                WHERE DATE(created_at) = :date AND time_to_first_token_ms IS NOT NULL
+            """)
+            
+            result = db.execute(ttft_query, {"date": yesterday}).fetchone()
+            if result and result.avg_ttft:
+                avg_ttft = float(result.avg_ttft)
+                metrics["daily_avg_time_to_first_token_ms"] = avg_ttft
+                
+                # Store metric
+                await self._store_performance_metric(
+                    db, "avg_time_to_first_token", avg_ttft, "ms",
+                    "daily", yesterday, today
+                )
+            
             # User satisfaction
             satisfaction_query = text("""
                 SELECT AVG(overall_satisfaction) as avg_satisfaction
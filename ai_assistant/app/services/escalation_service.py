@@ -12,7 +12,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy import text, desc
 
-from ..database import get_db_session
+from ..database import get_async_db_session
 from ..models import (
     SupportTicket, EscalationTrigger, ExpertKnowledge, ExpertFeedback,
     AISession, AIMessage
@@ -157,12 +157,12 @@ class EscalationService:
     async def _check_expert_required_indicators(self, session_id: str) -> List[str]:
         """Check session metadata for expert-required indicators."""
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 query = text("""
                     SELECT session_metadata FROM ai_sessions 
                     WHERE id = :session_id
                 """)
-                result = db.execute(query, {'session_id': session_id}).fetchone()
+                result = (await db.execute(query, {'session_id': session_id})).fetchone()
                 
                 if not result or not result.session_metadata:
                     return []
@@ -205,14 +205,14 @@ class EscalationService:
     ) -> None:
         """Record escalation trigger in database."""
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 trigger_id = str(uuid.uuid4())
                 query = text("""
                     INSERT INTO escalation_triggers 
                     (id, session_id, trigger_type, trigger_value, escalation_decision, decision_reason, triggered_at)
                     VALUES (:id, :session_id, :trigger_type, :trigger_value, :decision, :reason, :triggered_at)
                 """)
-                db.execute(query, {
+                await db.execute(query, {
                     'id': trigger_id,
                     'session_id': session_id,
                     'trigger_type': trigger_type,
@@ -256,7 +256,7 @@ class EscalationService:
             # Create support ticket
             ticket_id = str(uuid.uuid4())
             
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 query = text("""
                     INSERT INTO support_tickets 
                     (id, session_id, ticket_number, priority, status, escalation_reason,
@@ -264,7 +264,7 @@ class EscalationService:
                     VALUES (:id, :session_id, :ticket_number, :priority, :status, :escalation_reason,
                             :session_summary, :machine_context, :expert_contact_info, :created_at, :updated_at)
                 """)
-                db.execute(query, {
+                await db.execute(query, {
                     'id': ticket_id,
                     'session_id': session_id,
                     'ticket_number': ticket_number,
@@ -341,13 +341,13 @@ class EscalationService:
         date_str = datetime.now().strftime("%Y%m%d")
         
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Get count of tickets created today
                 query = text("""
                     SELECT COUNT(*) as count FROM support_tickets 
                     WHERE ticket_number LIKE :pattern
                 """)
-                result = db.execute(query, {'pattern': f'AB-{date_str}-%'}).fetchone()
+                result = (await db.execute(query, {'pattern': f'AB-{date_str}-%'})).fetchone()
                 count = result.count if result else 0
                 
                 return f"AB-{date_str}-{count + 1:04d}"
@@ -362,13 +362,13 @@ class EscalationService:
         """Compile comprehensive session summary for support ticket."""
         try:
             # Get session data
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Get session info
                 session_query = text("""
                     SELECT user_id, machine_id, status, language, session_metadata, created_at
                     FROM ai_sessions WHERE id = :session_id
                 """)
-                session_result = db.execute(session_query, {'session_id': session_id}).fetchone()
+                session_result = (await db.execute(session_query, {'session_id': session_id})).fetchone()
                 
                 if not session_result:
                     return "Session data not found"
@@ -380,7 +380,7 @@ class EscalationService:
                     WHERE session_id = :session_id 
                     ORDER BY timestamp ASC
                 """)
-                messages = db.execute(messages_query, {'session_id': session_id}).fetchall()
+                messages = (await db.execute(messages_query, {'session_id': session_id})).fetchall()
                 
                 # Get troubleshooting steps
                 steps_query = text("""
@@ -389,7 +389,7 @@ class EscalationService:
                     WHERE session_id = :session_id 
                     ORDER BY step_number ASC
                 """)
-                steps = db.execute(steps_query, {'session_id': session_id}).fetchall()
+                steps = (await db.execute(steps_query, {'session_id': session_id})).fetchall()
             
             # Build summary
             summary_parts = []
@@ -443,12 +443,12 @@ class EscalationService:
     async def _get_machine_context_for_ticket(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get machine context for support ticket."""
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 query = text("""
                     SELECT machine_id, session_metadata FROM ai_sessions 
                     WHERE id = :session_id
                 """)
-                result = db.execute(query, {'session_id': session_id}).fetchone()
+                result = (await db.execute(query, {'session_id': session_id})).fetchone()
                 
                 if not result or not result.machine_id:
                     return None
@@ -544,14 +544,14 @@ class EscalationService:
     async def _update_session_status_escalated(self, session_id: str, ticket_number: str) -> None:
         """Update session status to escalated."""
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 query = text("""
                     UPDATE ai_sessions 
                     SET status = 'escalated', 
                         updated_at = NOW()
                     WHERE id = :session_id
                 """)
-                db.execute(query, {
+                await db.execute(query, {
                     'session_id': session_id
                 })
                 
@@ -561,12 +561,12 @@ class EscalationService:
     async def _get_user_info_for_email(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get user information for email notification."""
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Get user_id from session first
                 session_query = text("""
                     SELECT user_id FROM ai_sessions WHERE id = :session_id
                 """)
-                session_result = db.execute(session_query, {'session_id': session_id}).fetchone()
+                session_result = (await db.execute(session_query, {'session_id': session_id})).fetchone()
                 
                 if not session_result or not session_result.user_id:
                     return None
@@ -578,7 +578,7 @@ class EscalationService:
                     LEFT JOIN organizations o ON u.organization_id = o.id
                     WHERE u.id = CAST(:user_id AS UUID)
                 """)
-                user_result = db.execute(user_query, {'user_id': session_result.user_id}).fetchone()
+                user_result = (await db.execute(user_query, {'user_id': session_result.user_id})).fetchone()
                 
                 if user_result:
                     return {
@@ -597,13 +597,13 @@ class EscalationService:
     async def _get_machine_info_for_email(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get machine information for email notification."""
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Get machine_id from session first
                 session_query = text("""
                     SELECT machine_id FROM ai_sessions 
                     WHERE id = :session_id AND machine_id IS NOT NULL
                 """)
-                session_result = db.execute(session_query, {'session_id': session_id}).fetchone()
+                session_result = (await db.execute(session_query, {'session_id': session_id})).fetchone()
                 
                 if not session_result or not session_result.machine_id:
                     return None
@@ -614,7 +614,7 @@ class EscalationService:
                     FROM machines 
                     WHERE id = CAST(:machine_id AS UUID)
                 """)
-                machine_result = db.execute(machine_query, {'machine_id': session_result.machine_id}).fetchone()
+                machine_result = (await db.execute(machine_query, {'machine_id': session_result.machine_id})).fetchone()
                 
                 if machine_result:
                     # Get latest hours from machine_hours table
@@ -625,7 +625,7 @@ class EscalationService:
                         ORDER BY recorded_date DESC 
                         LIMIT 1
                     """)
-                    hours_result = db.execute(hours_query, {'machine_id': session_result.machine_id}).fetchone()
+                    hours_result = (await db.execute(hours_query, {'machine_id': session_result.machine_id})).fetchone()
                     latest_hours = hours_result.hours_value if hours_result else 0
                     
                     return {
@@ -668,7 +668,7 @@ class EscalationService:
         try:
             knowledge_id = str(uuid.uuid4())
             
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 query = text("""
                     INSERT INTO expert_knowledge 
                     (id, expert_user_id, problem_description, solution, machine_version, 
@@ -676,7 +676,7 @@ class EscalationService:
                     VALUES (:id, :expert_user_id, :problem_description, :solution, :machine_version,
                             :tags, :verified, :metadata, :created_at, :updated_at)
                 """)
-                db.execute(query, {
+                await db.execute(query, {
                     'id': knowledge_id,
                     'expert_user_id': expert_user_id,
                     'problem_description': problem_description,
@@ -734,7 +734,7 @@ class EscalationService:
         try:
             feedback_id = str(uuid.uuid4())
             
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 query = text("""
                     INSERT INTO expert_feedback 
                     (id, session_id, message_id, expert_user_id, feedback_type, rating,
@@ -742,7 +742,7 @@ class EscalationService:
                     VALUES (:id, :session_id, :message_id, :expert_user_id, :feedback_type, :rating,
                             :feedback_text, :suggested_improvement, :created_at)
                 """)
-                db.execute(query, {
+                await db.execute(query, {
                     'id': feedback_id,
                     'session_id': session_id,
                     'message_id': message_id,
@@ -790,7 +790,7 @@ class EscalationService:
             List of relevant expert knowledge entries
         """
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Build search query
                 search_conditions = []
                 params = {'limit': limit}
@@ -823,7 +823,7 @@ class EscalationService:
                     LIMIT :limit
                 """)
                 
-                results = db.execute(query, params).fetchall()
+                results = (await db.execute(query, params)).fetchall()
                 
                 knowledge_entries = []
                 for row in results:
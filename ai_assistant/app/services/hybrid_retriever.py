@@ -0,0 +1,246 @@
+"""
+Hybrid keyword + vector retrieval for the knowledge base.
+
+Combines a BM25 inverted index over chunk text with FAISS vector search.
+Metadata filters are resolved to candidate IDs before either scorer runs,
+and the two rankings are merged with reciprocal-rank fusion.
+"""
+
+import math
+import re
+import logging
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Set
+
+logger = logging.getLogger(__name__)
+
+# Words joined by '-', '_', '.' or '/' are kept together so error codes
+# ("E-102") and part numbers ("AB-4411.2") remain single searchable terms.
+_TOKEN_PATTERN = re.compile(r"\w+(?:[-_./]\w+)*", re.UNICODE)
+_SPLIT_PATTERN = re.compile(r"[-_./]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Compound tokens are emitted both whole and as their parts, plus a
+    separator-free form, so "E-102" matches "E-102", "E102" and "102".
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(match)
+        parts = [p for p in _SPLIT_PATTERN.split(match) if p]
+        if len(parts) > 1:
+            tokens.extend(parts)
+            tokens.append("".join(parts))
+    return tokens
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 scoring.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.doc_lengths: Dict[int, int] = {}
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: int, text: str):
+        """Index a chunk's text under the given ID."""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+
+        terms = tokenize(text)
+        frequencies = Counter(terms)
+        for term, frequency in frequencies.items():
+            self.postings[term][doc_id] = frequency
+
+        self._doc_terms[doc_id] = list(frequencies)
+        self.doc_lengths[doc_id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, doc_id: int):
+        """Remove a chunk from the index."""
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+
+        self._total_length -= length
+        for term in self._doc_terms.pop(doc_id, []):
+            self.postings[term].pop(doc_id, None)
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def search(self, query: str, k: int = 10,
+               candidate_ids: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Score chunks against the query.
+
+        Args:
+            query: Free-text query
+            k: Number of results to return
+            candidate_ids: Optional set of IDs to restrict scoring to
+
+        Returns:
+            List of (doc_id, score) tuples ordered by descending score
+        """
+        if not self.doc_lengths or k <= 0:
+            return []
+
+        n_docs = len(self.doc_lengths)
+        avg_length = self._total_length / n_docs if n_docs else 0.0
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, frequency in docs.items():
+                if candidate_ids is not None and doc_id not in candidate_ids:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / (avg_length or 1.0))
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[int]], k: int = 60,
+                           weights: Optional[List[float]] = None) -> List[Tuple[int, float]]:
+    """
+    Merge ranked ID lists with reciprocal-rank fusion.
+
+    Args:
+        rankings: Ranked lists of IDs, best first
+        k: RRF damping constant
+        weights: Optional per-ranking weights
+
+    Returns:
+        List of (id, fused_score) tuples ordered by descending score
+    """
+    fused: Dict[int, float] = defaultdict(float)
+    for i, ranking in enumerate(rankings):
+        weight = weights[i] if weights else 1.0
+        for rank, doc_id in enumerate(ranking):
+            fused[doc_id] += weight / (k + rank + 1)
+
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever:
+    """
+    Hybrid BM25 + vector retriever over a ``VectorDatabase``.
+    """
+
+    def __init__(self, vector_db, rrf_k: int = 60, candidate_multiplier: int = 4,
+                 keyword_weight: float = 1.0, vector_weight: float = 1.0):
+        """
+        Initialize hybrid retriever.
+
+        Args:
+            vector_db: VectorDatabase holding embeddings, chunk text and partitions
+            rrf_k: Reciprocal-rank fusion constant
+            candidate_multiplier: How many candidates each scorer contributes per result
+            keyword_weight: RRF weight of the BM25 ranking
+            vector_weight: RRF weight of the vector ranking
+        """
+        self.vector_db = vector_db
+        self.rrf_k = rrf_k
+        self.candidate_multiplier = candidate_multiplier
+        self.keyword_weight = keyword_weight
+        self.vector_weight = vector_weight
+
+    def search(self, query: str, query_embedding: List[float], k: int = 10,
+               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Search with both scorers and fuse the rankings.
+
+        Results have the same shape as ``VectorDatabase.search``;
+        ``relevance_score`` stays the cosine similarity so existing
+        thresholds keep working, and ``fusion_score`` carries the RRF rank.
+
+        Args:
+            query: Query text for keyword scoring
+            query_embedding: Query vector for similarity scoring
+            k: Number of results to return
+            filters: Optional metadata filters applied before scoring
+
+        Returns:
+            List of search results ordered by fused rank
+        """
+        candidate_ids = self.vector_db.candidate_ids(filters)
+        if candidate_ids is not None and not candidate_ids:
+            return []
+
+        depth = k * self.candidate_multiplier
+        vector_hits = self.vector_db.search_ids(query_embedding, depth, candidate_ids)
+        keyword_hits = self.vector_db.keyword_index.search(query, depth, candidate_ids)
+
+        fused = reciprocal_rank_fusion(
+            [[doc_id for doc_id, _ in vector_hits], [doc_id for doc_id, _ in keyword_hits]],
+            k=self.rrf_k,
+            weights=[self.vector_weight, self.keyword_weight]
+        )[:k]
+        if not fused:
+            return []
+
+        vector_scores = dict(vector_hits)
+        keyword_scores = dict(keyword_hits)
+        missing = [doc_id for doc_id, _ in fused if doc_id not in vector_scores]
+        if missing:
+            vector_scores.update(self.vector_db.similarity(query_embedding, missing))
+
+        results = []
+        for vector_id, fusion_score in fused:
+            result = self.vector_db.result_for(vector_id, vector_scores.get(vector_id, 0.0))
+            result['keyword_score'] = float(keyword_scores.get(vector_id, 0.0))
+            result['fusion_score'] = float(fusion_score)
+            results.append(result)
+
+        return results
+
+
+def evaluate_retrieval(search_fn, cases: List[Dict[str, Any]], k: int = 5) -> Dict[str, Any]:
+    """
+    Offline evaluation of a retriever against labelled queries.
+
+    Args:
+        search_fn: Callable ``(query, filters, k) -> results`` returning
+            dicts with ``content_chunk``
+        cases: Dicts with ``query``, ``expected`` (substring that a relevant
+            chunk contains) and optional ``filters``
+        k: Cut-off for recall and MRR
+
+    Returns:
+        Aggregate recall@k, MRR@k and per-query ranks
+    """
+    ranks = []
+    for case in cases:
+        results = search_fn(case['query'], case.get('filters'), k)
+        expected = case['expected'].lower()
+        rank = next(
+            (i + 1 for i, r in enumerate(results[:k])
+             if expected in r.get('content_chunk', '').lower()),
+            None
+        )
+        ranks.append({'query': case['query'], 'rank': rank, 'returned': len(results)})
+
+    hits = [r['rank'] for r in ranks if r['rank'] is not None]
+    total = len(cases) or 1
+    return {
+        'k': k,
+        'queries': len(cases),
+        'recall_at_k': len(hits) / total,
+        'mrr_at_k': sum(1.0 / rank for rank in hits) / total,
+        'ranks': ranks
+    }
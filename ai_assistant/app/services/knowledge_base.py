@@ -14,9 +14,10 @@ import io
 from sqlalchemy.orm import Session
 from sqlalchemy import text, and_, or_
 
-from ..database import get_db_session
+from ..database import get_async_db_session
 from ..llm_client import LLMClient
 from .vector_database import VectorDatabase
+from .hybrid_retriever import HybridRetriever
 from ..models import DocumentType
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,7 @@ class KnowledgeBaseService:
         """
         self.llm_client = llm_client
         self.vector_db = vector_db
+        self.retriever = HybridRetriever(vector_db)
         self.chunk_size = 500  # Smaller chunks for more precise retrieval
         self.chunk_overlap = 250  # Higher overlap to preserve context across boundaries
     
@@ -66,8 +68,8 @@ class KnowledgeBaseService:
         
         try:
             # Store document in database
-            with get_db_session() as db:
-                db.execute(text("""
+            async with get_async_db_session() as db:
+                await db.execute(text("""
                     INSERT INTO knowledge_documents 
                     (id, title, document_type, language, version, file_path, document_metadata, chunk_count, machine_models, tags)
                     VALUES (:document_id, :title, :document_type, :language, :version, :file_path, :metadata, :chunk_count, :machine_models, :tags)
@@ -96,10 +98,10 @@ class KnowledgeBaseService:
             
             # Store content chunks in document_chunks table
             chunks = self._chunk_text(content)
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 for i, chunk in enumerate(chunks):
                     chunk_id = f"{document_id}_chunk_{i}"
-                    db.execute(text("""
+                    await db.execute(text("""
                         INSERT INTO document_chunks (id, document_id, chunk_index, content)
                         VALUES (:chunk_id, :document_id, :chunk_index, :content)
                     """), {
@@ -110,7 +112,7 @@ class KnowledgeBaseService:
                     })
                 
                 # Update chunk count
-                db.execute(text("""
+                await db.execute(text("""
                     UPDATE knowledge_documents SET chunk_count = :chunk_count WHERE id = :document_id
                 """), {
                     'chunk_count': len(chunks),
@@ -125,8 +127,8 @@ class KnowledgeBaseService:
             # Cleanup on failure
             try:
                 self.vector_db.delete_document(document_id)
-                with get_db_session() as db:
-                    db.execute(text("DELETE FROM knowledge_documents WHERE document_id = :id"), 
+                async with get_async_db_session() as db:
+                    await db.execute(text("DELETE FROM knowledge_documents WHERE document_id = :id"), 
                              {'id': document_id})
             except:
                 pass
@@ -165,8 +167,8 @@ class KnowledgeBaseService:
             set_clauses.append("updated_at = NOW()")
             query = f"UPDATE knowledge_documents SET {', '.join(set_clauses)} WHERE id = :document_id"
             
-            with get_db_session() as db:
-                result = db.execute(text(query), params)
+            async with get_async_db_session() as db:
+                result = await db.execute(text(query), params)
                 if result.rowcount == 0:
                     return False
             
@@ -204,8 +206,8 @@ class KnowledgeBaseService:
             self.vector_db.delete_document(document_id)
             
             # Delete from SQL database (document_chunks will be deleted by CASCADE)
-            with get_db_session() as db:
-                result = db.execute(text("""
+            async with get_async_db_session() as db:
+                result = await db.execute(text("""
                     DELETE FROM knowledge_documents WHERE id = :document_id
                 """), {'document_id': document_id})
                 
@@ -223,7 +225,7 @@ class KnowledgeBaseService:
                              document_type: Optional[str] = None, language: str = "en",
                              limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Search knowledge base documents using vector similarity.
+        Search knowledge base documents using hybrid keyword + vector retrieval.
         
         Args:
             query: Search query
@@ -246,9 +248,10 @@ class KnowledgeBaseService:
             if document_type:
                 filters['document_type'] = document_type
             
-            # Search vector database
-            vector_results = self.vector_db.search(
-                query_embedding, k=limit * 2, filters=filters
+            # Filters are applied before scoring, then BM25 and vector
+            # rankings are fused so exact codes and part numbers rank well
+            vector_results = self.retriever.search(
+                query, query_embedding, k=limit * 2, filters=filters
             )
             
             # Group results by document and get document details
@@ -259,18 +262,23 @@ class KnowledgeBaseService:
                     document_results[doc_id] = {
                         'document_id': doc_id,
                         'chunks': [],
-                        'max_score': result['relevance_score']
+                        'max_score': result['relevance_score'],
+                        'fusion_score': result['fusion_score']
                     }
                 else:
                     document_results[doc_id]['max_score'] = max(
                         document_results[doc_id]['max_score'],
                         result['relevance_score']
                     )
+                    document_results[doc_id]['fusion_score'] = max(
+                        document_results[doc_id]['fusion_score'],
+                        result['fusion_score']
+                    )
                 
                 document_results[doc_id]['chunks'].append({
                     'content': result['content_chunk'],
                     'chunk_index': result['chunk_index'],
-                    'score': result['relevance_score']
+                    'score': result['fusion_score']
                 })
             
             # Get document details from database
@@ -284,11 +292,12 @@ class KnowledgeBaseService:
                     final_results.append({
                         'document': doc_details,
                         'relevance_score': doc_data['max_score'],
+                        'fusion_score': doc_data['fusion_score'],
                         'matched_content': best_chunk['content'][:500] + "..." if len(best_chunk['content']) > 500 else best_chunk['content']
                     })
             
-            # Sort by relevance score and limit results
-            final_results.sort(key=lambda x: x['relevance_score'], reverse=True)
+            # Sort by fused rank and limit results
+            final_results.sort(key=lambda x: x['fusion_score'], reverse=True)
             return final_results[:limit]
             
         except Exception as e:
@@ -356,8 +365,8 @@ class KnowledgeBaseService:
                 LIMIT :limit OFFSET :offset
             """
             
-            with get_db_session() as db:
-                result = db.execute(text(query), params)
+            async with get_async_db_session() as db:
+                result = await db.execute(text(query), params)
                 documents = []
                 
                 for row in result:
@@ -479,8 +488,8 @@ class KnowledgeBaseService:
     async def _get_document_details(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get full document details from database."""
         try:
-            with get_db_session() as db:
-                result = db.execute(text("""
+            async with get_async_db_session() as db:
+                result = await db.execute(text("""
                     SELECT id, title, document_type, language, version, file_path, document_metadata, created_at, updated_at, machine_models, tags
                     FROM knowledge_documents
                     WHERE id = :document_id
@@ -498,7 +507,7 @@ class KnowledgeBaseService:
                         pass
                 
                 # Get content from document_chunks
-                content_result = db.execute(text("""
+                content_result = await db.execute(text("""
                     SELECT content FROM document_chunks 
                     WHERE document_id = :document_id 
                     ORDER BY chunk_index
@@ -529,8 +538,8 @@ class KnowledgeBaseService:
     async def _get_document_metadata(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get document metadata for embedding generation."""
         try:
-            with get_db_session() as db:
-                result = db.execute(text("""
+            async with get_async_db_session() as db:
+                result = await db.execute(text("""
                     SELECT title, document_type, language, version, machine_models, tags
                     FROM knowledge_documents
                     WHERE id = :document_id
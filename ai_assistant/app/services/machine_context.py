@@ -0,0 +1,192 @@
+"""
+Machine context aggregation for the AI Assistant.
+
+Assembles the machine details, maintenance history, parts usage, hours
+history and preventive maintenance suggestions used by chat and
+troubleshooting in one concurrent fetch, and caches the result per machine
+for a few minutes. Cached entries are revalidated against a cheap
+hours/maintenance watermark so new records show up on the next turn.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from ..config import settings
+from .abparts_integration import abparts_integration
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_HISTORY_LIMIT = 5
+PARTS_USAGE_DAYS = 30
+HOURS_HISTORY_LIMIT = 10
+
+
+@dataclass
+class CachedMachineContext:
+    """Assembled machine context with its validity markers."""
+    context: Dict[str, Any]
+    watermark: Optional[Tuple[Any, ...]]
+    expires_at: float
+
+
+class MachineContextAggregator:
+    """Concurrent, cached assembly of per-machine troubleshooting context."""
+
+    def __init__(self, integration=abparts_integration,
+                 ttl_seconds: Optional[int] = None, max_entries: int = 1024):
+        """
+        Initialize the aggregator.
+
+        Args:
+            integration: ABPartsIntegration used for the underlying fetches
+            ttl_seconds: Maximum age of a cached context (defaults to settings)
+            max_entries: Maximum number of machines kept in the cache
+        """
+        self.integration = integration
+        self.ttl_seconds = settings.MACHINE_CONTEXT_CACHE_TTL if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, CachedMachineContext]" = OrderedDict()
+        # Per-machine fetch lock and the number of requests holding or awaiting it
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_context(self, machine_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the assembled context for a machine.
+
+        Returns a cached context when it is younger than the TTL and the
+        machine has no new hours or maintenance records; otherwise fetches
+        all parts concurrently. Concurrent misses for the same machine share
+        one fetch.
+
+        Args:
+            machine_id: UUID of the machine
+
+        Returns:
+            Dict with machine_details, maintenance_history, parts_usage,
+            hours_history and maintenance_suggestions, or None if the
+            machine does not exist
+        """
+        cached = await self._get_valid(machine_id)
+        if cached is not None:
+            self.hits += 1
+            return copy.deepcopy(cached.context)
+
+        async with self._machine_lock(machine_id):
+            # Another request may have filled the cache while we waited
+            cached = self._cache.get(machine_id)
+            if cached is not None and cached.expires_at > time.monotonic():
+                self.hits += 1
+                return copy.deepcopy(cached.context)
+
+            self.misses += 1
+            entry = await self._fetch(machine_id)
+            if entry is None:
+                return None
+
+            self._store(machine_id, entry)
+            return copy.deepcopy(entry.context)
+
+    def invalidate(self, machine_id: Optional[str] = None):
+        """
+        Drop cached context for one machine, or for all machines.
+
+        Args:
+            machine_id: Machine to invalidate; None clears the whole cache
+        """
+        if machine_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(machine_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters."""
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    async def _get_valid(self, machine_id: str) -> Optional[CachedMachineContext]:
+        """Return the cached entry if it is unexpired and still current."""
+        cached = self._cache.get(machine_id)
+        if cached is None:
+            return None
+
+        if cached.expires_at <= time.monotonic():
+            self.invalidate(machine_id)
+            return None
+
+        watermark = await self.integration.get_machine_activity_watermark(machine_id)
+        if watermark is not None and watermark != cached.watermark:
+            logger.info(f"New hours or maintenance for machine {machine_id}, refreshing context")
+            self.invalidate(machine_id)
+            return None
+
+        return cached
+
+    async def _fetch(self, machine_id: str) -> Optional[CachedMachineContext]:
+        """Fetch every part of the context concurrently."""
+        # Read the watermark first so records written during the fetch
+        # invalidate the entry on the next request instead of being missed.
+        watermark = await self.integration.get_machine_activity_watermark(machine_id)
+
+        machine_details, maintenance_history, parts_usage, hours_history = await asyncio.gather(
+            self.integration.get_machine_details(machine_id),
+            self.integration.get_maintenance_history(machine_id, limit=MAINTENANCE_HISTORY_LIMIT),
+            self.integration.get_parts_usage_data(machine_id, days=PARTS_USAGE_DAYS),
+            self.integration.get_machine_hours_history(machine_id, limit=HOURS_HISTORY_LIMIT)
+        )
+        if not machine_details:
+            logger.warning(f"Machine details not found for machine {machine_id}")
+            return None
+
+        context = {
+            "machine_details": machine_details,
+            "maintenance_history": maintenance_history,
+            "parts_usage": parts_usage,
+            "hours_history": hours_history,
+            "maintenance_suggestions": self.integration.build_maintenance_suggestions(
+                machine_details, maintenance_history
+            )
+        }
+        return CachedMachineContext(
+            context=context,
+            watermark=watermark,
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+
+    @asynccontextmanager
+    async def _machine_lock(self, machine_id: str) -> AsyncIterator[None]:
+        """Hold the fetch lock for a machine; it is dropped once no request uses it."""
+        lock, users = self._locks.get(machine_id, (None, 0))
+        lock = lock or asyncio.Lock()
+        self._locks[machine_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[machine_id]
+            if users == 1:
+                del self._locks[machine_id]
+            else:
+                self._locks[machine_id] = (lock, users - 1)
+
+    def _store(self, machine_id: str, entry: CachedMachineContext):
+        """Insert an entry, evicting the least recently stored machines."""
+        self._cache[machine_id] = entry
+        self._cache.move_to_end(machine_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+# Global instance
+machine_context_aggregator = MachineContextAggregator()
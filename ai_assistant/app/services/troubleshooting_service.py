@@ -14,11 +14,12 @@ from dataclasses import dataclass
 from enum import Enum
 
 from ..models import TroubleshootingStep
-from ..llm_client import LLMClient, ConversationMessage
+from ..llm_client import LLMClient, ConversationMessage, TokenCallback
 from ..session_manager import SessionManager
-from ..database import get_db_session
+from ..database import get_db_session, run_in_db_thread
 from .problem_analyzer import ProblemAnalyzer
 from .abparts_integration import abparts_integration
+from .machine_context import machine_context_aggregator
 from .troubleshooting_types import (
     DiagnosticAssessment, TroubleshootingStepData, WorkflowState,
     ConfidenceLevel, StepStatus
@@ -72,20 +73,15 @@ class TroubleshootingService:
         # Get machine context if machine_id is provided
         machine_context = None
         if machine_id:
-            machine_details = await abparts_integration.get_machine_details(machine_id)
-            if machine_details:
-                # Get additional context
-                maintenance_history = await abparts_integration.get_maintenance_history(machine_id, limit=5)
-                parts_usage = await abparts_integration.get_parts_usage_data(machine_id, days=30)
-                hours_history = await abparts_integration.get_machine_hours_history(machine_id, limit=5)
-                maintenance_suggestions = await abparts_integration.get_preventive_maintenance_suggestions(machine_id)
-                
+            raw_context = await machine_context_aggregator.get_context(machine_id)
+            if raw_context:
+                machine_details = raw_context["machine_details"]
                 machine_context = {
                     "machine_details": machine_details,
-                    "recent_maintenance": maintenance_history,
-                    "recent_parts_usage": parts_usage,
-                    "hours_history": hours_history,
-                    "maintenance_suggestions": maintenance_suggestions
+                    "recent_maintenance": raw_context["maintenance_history"],
+                    "recent_parts_usage": raw_context["parts_usage"],
+                    "hours_history": raw_context["hours_history"][:5],
+                    "maintenance_suggestions": raw_context["maintenance_suggestions"]
                 }
                 
                 logger.info(f"Retrieved machine context for {machine_id}: {machine_details['name']} ({machine_details['model_type']})")
@@ -586,42 +582,54 @@ Gi din analyse i det nøyaktige JSON-formatet spesifisert i systemprompten. Foku
     ) -> None:
         """Store diagnostic assessment in database."""
         try:
-            with get_db_session() as db:
-                # Store as JSON in session metadata
-                metadata = {
-                    "diagnostic_assessment": {
-                        "problem_category": assessment.problem_category,
-                        "likely_causes": assessment.likely_causes,
-                        "confidence_level": assessment.confidence_level.value,
-                        "recommended_steps": assessment.recommended_steps,
-                        "safety_warnings": assessment.safety_warnings,
-                        "estimated_duration": assessment.estimated_duration,
-                        "requires_expert": assessment.requires_expert,
-                        "created_at": datetime.utcnow().isoformat()
-                    }
-                }
-                
-                # Add machine context to metadata
-                if machine_context:
-                    metadata["machine_context"] = machine_context
-                
-                # Add user context to metadata
-                if user_context:
-                    metadata["user_context"] = user_context
-                
-                query = text("""
-                    UPDATE ai_sessions 
-                    SET session_metadata = :metadata, updated_at = NOW()
-                    WHERE id = :session_id
-                """)
-                db.execute(query, {
-                    'session_id': session_id,
-                    'metadata': json.dumps(metadata)
-                })
-                
+            await run_in_db_thread(
+                self._store_diagnostic_assessment_sync,
+                session_id, assessment, machine_context, user_context
+            )
         except Exception as e:
             logger.error(f"Failed to store diagnostic assessment: {e}")
     
+    def _store_diagnostic_assessment_sync(
+        self,
+        session_id: str,
+        assessment: DiagnosticAssessment,
+        machine_context: Optional[Dict[str, Any]],
+        user_context: Optional[Dict[str, Any]]
+    ) -> None:
+        """Blocking part of _store_diagnostic_assessment, run on the DB thread pool."""
+        with get_db_session() as db:
+            # Store as JSON in session metadata
+            metadata = {
+                "diagnostic_assessment": {
+                    "problem_category": assessment.problem_category,
+                    "likely_causes": assessment.likely_causes,
+                    "confidence_level": assessment.confidence_level.value,
+                    "recommended_steps": assessment.recommended_steps,
+                    "safety_warnings": assessment.safety_warnings,
+                    "estimated_duration": assessment.estimated_duration,
+                    "requires_expert": assessment.requires_expert,
+                    "created_at": datetime.utcnow().isoformat()
+                }
+            }
+            
+            # Add machine context to metadata
+            if machine_context:
+                metadata["machine_context"] = machine_context
+            
+            # Add user context to metadata
+            if user_context:
+                metadata["user_context"] = user_context
+            
+            query = text("""
+                UPDATE ai_sessions 
+                SET session_metadata = :metadata, updated_at = NOW()
+                WHERE id = :session_id
+            """)
+            db.execute(query, {
+                'session_id': session_id,
+                'metadata': json.dumps(metadata)
+            })
+    
     async def _store_troubleshooting_step(
         self, 
         session_id: str, 
@@ -629,35 +637,39 @@ Gi din analyse i det nøyaktige JSON-formatet spesifisert i systemprompten. Foku
     ) -> str:
         """Store troubleshooting step in database and return the generated ID."""
         try:
-            with get_db_session() as db:
-                query = text("""
-                    INSERT INTO troubleshooting_steps 
-                    (session_id, step_number, instruction, user_feedback, completed, success, created_at)
-                    VALUES (:session_id, :step_number, :instruction, :user_feedback, :completed, :success, :created_at)
-                    RETURNING id
-                """)
-                result = db.execute(query, {
-                    'session_id': session_id,
-                    'step_number': step.step_number,
-                    'instruction': step.instruction,
-                    'user_feedback': step.user_feedback,
-                    'completed': step.status == StepStatus.completed,
-                    'success': step.status == StepStatus.completed,
-                    'created_at': step.created_at
-                })
-                row = result.fetchone()
-                return str(row[0]) if row else None
-                
+            return await run_in_db_thread(self._store_troubleshooting_step_sync, session_id, step)
         except Exception as e:
             logger.error(f"Failed to store troubleshooting step: {e}")
             return None
     
+    def _store_troubleshooting_step_sync(self, session_id: str, step: TroubleshootingStepData) -> Optional[str]:
+        """Blocking part of _store_troubleshooting_step, run on the DB thread pool."""
+        with get_db_session() as db:
+            query = text("""
+                INSERT INTO troubleshooting_steps 
+                (session_id, step_number, instruction, user_feedback, completed, success, created_at)
+                VALUES (:session_id, :step_number, :instruction, :user_feedback, :completed, :success, :created_at)
+                RETURNING id
+            """)
+            result = db.execute(query, {
+                'session_id': session_id,
+                'step_number': step.step_number,
+                'instruction': step.instruction,
+                'user_feedback': step.user_feedback,
+                'completed': step.status == StepStatus.completed,
+                'success': step.status == StepStatus.completed,
+                'created_at': step.created_at
+            })
+            row = result.fetchone()
+            return str(row[0]) if row else None
+    
     async def process_user_feedback(
         self,
         session_id: str,
         step_id: str,
         user_feedback: str,
-        language: str = "en"
+        language: str = "en",
+        on_token: Optional[TokenCallback] = None
     ) -> Optional[TroubleshootingStepData]:
         """
         Process user feedback for a troubleshooting step and generate next step.
@@ -667,6 +679,8 @@ Gi din analyse i det nøyaktige JSON-formatet spesifisert i systemprompten. Foku
             step_id: ID of the current step
             user_feedback: User's feedback on the step outcome
             language: Language for responses
+            on_token: Optional callback receiving the next step's instruction
+                tokens as they are generated
             
         Returns:
             Next troubleshooting step or None if workflow is complete
@@ -713,25 +727,28 @@ Gi din analyse i det nøyaktige JSON-formatet spesifisert i systemprompten. Foku
             return None
         else:
             # Generate next troubleshooting step
-            return await self._generate_next_step(session_id, step_id, user_feedback, language)
+            return await self._generate_next_step(session_id, step_id, user_feedback, language, on_token)
     
     async def _update_step_feedback(self, step_id: str, user_feedback: str) -> None:
         """Update troubleshooting step with user feedback."""
         try:
-            with get_db_session() as db:
-                query = text("""
-                    UPDATE troubleshooting_steps 
-                    SET user_feedback = :feedback, completed = true, updated_at = NOW()
-                    WHERE id = :step_id
-                """)
-                db.execute(query, {
-                    'step_id': step_id,
-                    'feedback': user_feedback
-                })
-                
+            await run_in_db_thread(self._update_step_feedback_sync, step_id, user_feedback)
         except Exception as e:
             logger.error(f"Failed to update step feedback: {e}")
     
+    def _update_step_feedback_sync(self, step_id: str, user_feedback: str) -> None:
+        """Blocking part of _update_step_feedback, run on the DB thread pool."""
+        with get_db_session() as db:
+            query = text("""
+                UPDATE troubleshooting_steps 
+                SET user_feedback = :feedback, completed = true, updated_at = NOW()
+                WHERE id = :step_id
+            """)
+            db.execute(query, {
+                'step_id': step_id,
+                'feedback': user_feedback
+            })
+    
     async def _analyze_feedback(
         self, 
         session_id: str, 
@@ -795,7 +812,8 @@ Gi din analyse i det nøyaktige JSON-formatet spesifisert i systemprompten. Foku
         session_id: str,
         current_step_id: str,
         user_feedback: str,
-        language: str
+        language: str,
+        on_token: Optional[TokenCallback] = None
     ) -> TroubleshootingStepData:
         """Generate the next troubleshooting step based on current progress."""
         
@@ -815,7 +833,7 @@ Gi din analyse i det nøyaktige JSON-formatet spesifisert i systemprompten. Foku
         }
         
         # Generate next step using LLM
-        next_step_content = await self._generate_step_with_llm(context, language)
+        next_step_content = await self._generate_step_with_llm(context, language, on_token)
         
         # Create next step data
         step_id = str(uuid.uuid4())
@@ -844,7 +862,12 @@ Gi din analyse i det nøyaktige JSON-formatet spesifisert i systemprompten. Foku
         
         return next_step
     
-    async def _generate_step_with_llm(self, context: Dict[str, Any], language: str) -> str:
+    async def _generate_step_with_llm(
+        self,
+        context: Dict[str, Any],
+        language: str,
+        on_token: Optional[TokenCallback] = None
+    ) -> str:
         """Generate next troubleshooting step using LLM."""
         
         system_prompts = {
@@ -919,7 +942,7 @@ Generer neste feilsøkingstrinn basert på denne informasjonen."""
             ConversationMessage(role="user", content=user_prompt)
         ]
         
-        response = await self.llm_client.generate_response(messages, language=language)
+        response = await self.llm_client.generate_response(messages, language=language, on_token=on_token)
         
         if response.success:
             return response.content.strip()
@@ -938,43 +961,47 @@ Generer neste feilsøkingstrinn basert på denne informasjonen."""
     async def _get_troubleshooting_step(self, step_id: str) -> Optional[TroubleshootingStepData]:
         """Retrieve troubleshooting step from database."""
         try:
-            with get_db_session() as db:
-                query = text("""
-                    SELECT id as step_id, session_id, step_number, instruction,
-                           user_feedback, completed, success, created_at, updated_at
-                    FROM troubleshooting_steps 
-                    WHERE id = :step_id
-                """)
-                result = db.execute(query, {'step_id': step_id}).fetchone()
-                
-                if not result:
-                    return None
-                
-                return TroubleshootingStepData(
-                    step_id=str(result.step_id),
-                    step_number=result.step_number,
-                    instruction=result.instruction,
-                    expected_outcomes=[],  # Not stored in DB
-                    user_feedback=result.user_feedback,
-                    status=StepStatus.completed if result.completed else StepStatus.pending,
-                    confidence_score=0.7,  # Default value
-                    next_steps={},
-                    requires_feedback=True,
-                    estimated_duration=15,
-                    safety_warnings=[],
-                    created_at=result.created_at,
-                    completed_at=result.updated_at  # Use updated_at instead of completed_at
-                )
-                
+            return await run_in_db_thread(self._get_troubleshooting_step_sync, step_id)
         except Exception as e:
             logger.error(f"Failed to retrieve troubleshooting step: {e}")
             return None
     
+    def _get_troubleshooting_step_sync(self, step_id: str) -> Optional[TroubleshootingStepData]:
+        """Blocking part of _get_troubleshooting_step, run on the DB thread pool."""
+        with get_db_session() as db:
+            query = text("""
+                SELECT id as step_id, session_id, step_number, instruction,
+                       user_feedback, completed, success, created_at, updated_at
+                FROM troubleshooting_steps 
+                WHERE id = :step_id
+            """)
+            result = db.execute(query, {'step_id': step_id}).fetchone()
+            
+            if not result:
+                return None
+            
+            return TroubleshootingStepData(
+                step_id=str(result.step_id),
+                step_number=result.step_number,
+                instruction=result.instruction,
+                expected_outcomes=[],  # Not stored in DB
+                user_feedback=result.user_feedback,
+                status=StepStatus.completed if result.completed else StepStatus.pending,
+                confidence_score=0.7,  # Default value
+                next_steps={},
+                requires_feedback=True,
+                estimated_duration=15,
+                safety_warnings=[],
+                created_at=result.created_at,
+                completed_at=result.updated_at  # Use updated_at instead of completed_at
+            )
+    
     async def process_clarification(
         self,
         session_id: str,
         clarification: str,
-        language: str = "en"
+        language: str = "en",
+        on_token: Optional[TokenCallback] = None
     ) -> Optional[TroubleshootingStepData]:
         """
         Process user clarification during active troubleshooting.
@@ -987,6 +1014,8 @@ Generer neste feilsøkingstrinn basert på denne informasjonen."""
             session_id: ID of the troubleshooting session
             clarification: User's clarification message
             language: Language for responses
+            on_token: Optional callback receiving the next step's instruction
+                tokens as they are generated
             
         Returns:
             Next troubleshooting step incorporating the clarification
@@ -1016,7 +1045,7 @@ Generer neste feilsøkingstrinn basert på denne informasjonen."""
         }
         
         # Generate next step incorporating the clarification
-        instruction = await self._generate_step_with_clarification(context, language)
+        instruction = await self._generate_step_with_clarification(context, language, on_token)
         
         # Create next step
         step_id = str(uuid.uuid4())
@@ -1046,7 +1075,12 @@ Generer neste feilsøkingstrinn basert på denne informasjonen."""
         logger.info(f"Generated next step {next_step.step_number} after clarification")
         return next_step
     
-    async def _generate_step_with_clarification(self, context: Dict[str, Any], language: str) -> str:
+    async def _generate_step_with_clarification(
+        self,
+        context: Dict[str, Any],
+        language: str,
+        on_token: Optional[TokenCallback] = None
+    ) -> str:
         """Generate next troubleshooting step incorporating user clarification."""
         
         system_prompts = {
@@ -1180,7 +1214,7 @@ Basert på avklaringen, generer neste feilsøkingstrinn (trinn #{context['step_n
             ConversationMessage(role="user", content=user_prompt)
         ]
         
-        response = await self.llm_client.generate_response(messages, language=language)
+        response = await self.llm_client.generate_response(messages, language=language, on_token=on_token)
         
         if response.success:
             return response.content.strip()
@@ -1204,28 +1238,9 @@ Basert på avklaringen, generer neste feilsøkingstrinn (trinn #{context['step_n
             
             # If not in Redis, query database
             if not session_data:
-                with get_db_session() as db:
-                    query = text("""
-                        SELECT id, user_id, machine_id, status, problem_description, 
-                               resolution_summary, language, session_metadata
-                        FROM ai_sessions 
-                        WHERE id = :session_id
-                    """)
-                    result = db.execute(query, {'session_id': session_id}).fetchone()
-                    
-                    if not result:
-                        return None
-                    
-                    session_data = {
-                        "session_id": str(result.id),
-                        "user_id": str(result.user_id),
-                        "machine_id": str(result.machine_id) if result.machine_id else None,
-                        "status": result.status,
-                        "problem_description": result.problem_description,
-                        "resolution_summary": result.resolution_summary,
-                        "language": result.language,
-                        "metadata": result.session_metadata if isinstance(result.session_metadata, dict) else {}
-                    }
+                session_data = await run_in_db_thread(self._load_session_data_sync, session_id)
+                if not session_data:
+                    return None
             
             # Get diagnostic assessment from metadata
             metadata = session_data.get("metadata", {})
@@ -1244,39 +1259,9 @@ Basert på avklaringen, generer neste feilsøkingstrinn (trinn #{context['step_n
                 )
             
             # Get troubleshooting steps
-            with get_db_session() as db:
-                query = text("""
-                    SELECT id, step_number, instruction, user_feedback, completed, success, created_at, updated_at
-                    FROM troubleshooting_steps 
-                    WHERE session_id = :session_id
-                    ORDER BY step_number ASC
-                """)
-                results = db.execute(query, {'session_id': session_id}).fetchall()
-                
-                completed_steps = []
-                current_step = None
-                
-                for row in results:
-                    step = TroubleshootingStepData(
-                        step_id=str(row.id),
-                        step_number=row.step_number,
-                        instruction=row.instruction,
-                        expected_outcomes=[],  # Not stored in DB, generate on demand
-                        user_feedback=row.user_feedback,
-                        status=StepStatus.completed if row.completed else StepStatus.pending,
-                        confidence_score=0.7,
-                        next_steps={},
-                        requires_feedback=not row.completed,
-                        estimated_duration=15,
-                        safety_warnings=[],
-                        created_at=row.created_at,
-                        completed_at=row.updated_at if row.completed else None
-                    )
-                    
-                    if row.completed:
-                        completed_steps.append(step)
-                    else:
-                        current_step = step
+            current_step, completed_steps = await run_in_db_thread(
+                self._load_workflow_steps_sync, session_id
+            )
             
             return WorkflowState(
                 session_id=session_id,
@@ -1292,4 +1277,69 @@ Basert på avklaringen, generer neste feilsøkingstrinn (trinn #{context['step_n
             import traceback
             logger.error(f"Failed to get workflow state: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return None
\ No newline at end of file
+            return None
+    
+    def _load_session_data_sync(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load session data from the database, run on the DB thread pool."""
+        with get_db_session() as db:
+            query = text("""
+                SELECT id, user_id, machine_id, status, problem_description, 
+                       resolution_summary, language, session_metadata
+                FROM ai_sessions 
+                WHERE id = :session_id
+            """)
+            result = db.execute(query, {'session_id': session_id}).fetchone()
+            
+            if not result:
+                return None
+            
+            return {
+                "session_id": str(result.id),
+                "user_id": str(result.user_id),
+                "machine_id": str(result.machine_id) if result.machine_id else None,
+                "status": result.status,
+                "problem_description": result.problem_description,
+                "resolution_summary": result.resolution_summary,
+                "language": result.language,
+                "metadata": result.session_metadata if isinstance(result.session_metadata, dict) else {}
+            }
+    
+    def _load_workflow_steps_sync(
+        self, session_id: str
+    ) -> Tuple[Optional[TroubleshootingStepData], List[TroubleshootingStepData]]:
+        """Load current and completed steps for a session, run on the DB thread pool."""
+        with get_db_session() as db:
+            query = text("""
+                SELECT id, step_number, instruction, user_feedback, completed, success, created_at, updated_at
+                FROM troubleshooting_steps 
+                WHERE session_id = :session_id
+                ORDER BY step_number ASC
+            """)
+            results = db.execute(query, {'session_id': session_id}).fetchall()
+            
+            completed_steps = []
+            current_step = None
+            
+            for row in results:
+                step = TroubleshootingStepData(
+                    step_id=str(row.id),
+                    step_number=row.step_number,
+                    instruction=row.instruction,
+                    expected_outcomes=[],  # Not stored in DB, generate on demand
+                    user_feedback=row.user_feedback,
+                    status=StepStatus.completed if row.completed else StepStatus.pending,
+                    confidence_score=0.7,
+                    next_steps={},
+                    requires_feedback=not row.completed,
+                    estimated_duration=15,
+                    safety_warnings=[],
+                    created_at=row.created_at,
+                    completed_at=row.updated_at if row.completed else None
+                )
+                
+                if row.completed:
+                    completed_steps.append(step)
+                else:
+                    current_step = step
+            
+            return current_step, completed_steps
@@ -8,6 +8,7 @@ from the ABParts system, including language preferences.
 import logging
 from typing import Optional, Dict, Any, List
 from .abparts_integration import abparts_integration
+from .machine_context import machine_context_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,7 @@ class UserService:
     
     def __init__(self):
         self.abparts_integration = abparts_integration
+        self.machine_context = machine_context_aggregator
         
     async def get_user_language(self, user_id: str, auth_token: str = None) -> str:
         """
@@ -88,23 +90,18 @@ class UserService:
             Machine context data including details, maintenance history, and usage patterns
         """
         try:
-            # Get machine details
-            machine_details = await self.abparts_integration.get_machine_details(machine_id)
-            if not machine_details:
+            # Details, history, usage and suggestions are fetched concurrently
+            # and cached per machine across conversation turns
+            raw_context = await self.machine_context.get_context(machine_id)
+            if not raw_context:
                 logger.warning(f"Machine details not found for machine {machine_id}")
                 return None
             
-            # Get maintenance history
-            maintenance_history = await self.abparts_integration.get_maintenance_history(machine_id, limit=5)
-            
-            # Get parts usage data
-            parts_usage = await self.abparts_integration.get_parts_usage_data(machine_id, days=30)
-            
-            # Get machine hours history
-            hours_history = await self.abparts_integration.get_machine_hours_history(machine_id, limit=10)
-            
-            # Get preventive maintenance suggestions
-            maintenance_suggestions = await self.abparts_integration.get_preventive_maintenance_suggestions(machine_id)
+            machine_details = raw_context["machine_details"]
+            maintenance_history = raw_context["maintenance_history"]
+            parts_usage = raw_context["parts_usage"]
+            hours_history = raw_context["hours_history"]
+            maintenance_suggestions = raw_context["maintenance_suggestions"]
             
             # Build comprehensive context for AI
             context = {
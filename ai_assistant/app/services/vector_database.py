@@ -7,18 +7,32 @@ import json
 import pickle
 import numpy as np
 import faiss
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Set
 from pathlib import Path
 import logging
 
+from .hybrid_retriever import BM25Index
+
 logger = logging.getLogger(__name__)
 
 
 class VectorDatabase:
     """
     Local vector database using FAISS for document embeddings.
+    
+    Alongside the FAISS index it keeps a BM25 keyword index over chunk text
+    and per-filter partitions (vector ID sets) so filtered searches are
+    restricted before scoring instead of post-filtered.
     """
     
+    # Metadata keys with a maintained partition; list-valued keys are
+    # partitioned per element.
+    PARTITION_KEYS = {
+        'language': 'language',
+        'document_type': 'document_type',
+        'machine_model': 'machine_models',
+    }
+    
     def __init__(self, dimension: int = 1536, index_path: str = "data/vector_index"):
         """
         Initialize vector database.
@@ -36,8 +50,14 @@ class VectorDatabase:
         self.document_metadata: Dict[int, Dict[str, Any]] = {}
         self.next_id = 0
         
+        # Keyword index and filter partitions, derived from metadata
+        self.keyword_index = BM25Index()
+        self.partitions: Dict[Tuple[str, Any], Set[int]] = {}
+        self.active_ids: Set[int] = set()
+        
         # Load existing index if available
         self._load_index()
+        self._rebuild_derived_indexes()
     
     def _load_index(self):
         """Load existing FAISS index and metadata from disk."""
@@ -59,6 +79,37 @@ class VectorDatabase:
             self.document_metadata = {}
             self.next_id = 0
     
+    def _rebuild_derived_indexes(self):
+        """Rebuild keyword index and filter partitions from metadata."""
+        self.keyword_index = BM25Index()
+        self.partitions = {}
+        self.active_ids = set()
+        for vector_id, metadata in self.document_metadata.items():
+            self._index_vector(vector_id, metadata)
+    
+    def _index_vector(self, vector_id: int, metadata: Dict[str, Any]):
+        """Add one active vector to the keyword index and partitions."""
+        if metadata.get('deleted', False):
+            return
+        
+        self.active_ids.add(vector_id)
+        self.keyword_index.add(vector_id, metadata.get('content_chunk', ''))
+        for filter_key, metadata_key in self.PARTITION_KEYS.items():
+            values = metadata.get(metadata_key)
+            if values is None:
+                continue
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            for value in values:
+                self.partitions.setdefault((filter_key, value), set()).add(vector_id)
+    
+    def _unindex_vector(self, vector_id: int):
+        """Remove one vector from the keyword index and partitions."""
+        self.active_ids.discard(vector_id)
+        self.keyword_index.remove(vector_id)
+        for ids in self.partitions.values():
+            ids.discard(vector_id)
+    
     def _save_index(self):
         """Save FAISS index and metadata to disk."""
         try:
@@ -107,6 +158,7 @@ class VectorDatabase:
                 'chunk_index': i,
                 **metadata
             }
+            self._index_vector(vector_id, self.document_metadata[vector_id])
             vector_ids.append(vector_id)
             self.next_id += 1
         
@@ -132,41 +184,101 @@ class VectorDatabase:
         Returns:
             List of search results with metadata and scores
         """
-        if self.index.ntotal == 0:
+        candidate_ids = self.candidate_ids(filters)
+        return [
+            self.result_for(vector_id, score)
+            for vector_id, score in self.search_ids(query_embedding, k, candidate_ids)
+        ]
+    
+    def candidate_ids(self, filters: Optional[Dict[str, Any]] = None) -> Optional[Set[int]]:
+        """
+        Resolve filters to the set of vector IDs that may be scored.
+        
+        Args:
+            filters: Optional metadata filters
+            
+        Returns:
+            Set of matching active vector IDs, or None when every vector
+            in the index is a candidate
+        """
+        if not filters and len(self.active_ids) == self.index.ntotal:
+            return None
+        
+        candidates = set(self.active_ids)
+        for key, value in (filters or {}).items():
+            if key in self.PARTITION_KEYS:
+                candidates &= self.partitions.get((key, value), set())
+            else:
+                candidates = {
+                    vector_id for vector_id in candidates
+                    if self._matches_filters(self.document_metadata.get(vector_id, {}), {key: value})
+                }
+            if not candidates:
+                break
+        
+        return candidates
+    
+    def search_ids(self, query_embedding: List[float], k: int = 10,
+                   candidate_ids: Optional[Set[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Vector search restricted to candidate IDs.
+        
+        Args:
+            query_embedding: Query vector
+            k: Number of results to return
+            candidate_ids: IDs to search within; None searches the whole index
+            
+        Returns:
+            List of (vector_id, score) tuples ordered by descending score
+        """
+        if self.index.ntotal == 0 or k <= 0:
             return []
         
         # Normalize query vector
         query_vector = np.array([query_embedding], dtype=np.float32)
         faiss.normalize_L2(query_vector)
         
-        # Search in FAISS index
-        scores, indices = self.index.search(query_vector, min(k * 2, self.index.ntotal))
+        if candidate_ids is None:
+            scores, indices = self.index.search(query_vector, min(k, self.index.ntotal))
+        else:
+            if not candidate_ids:
+                return []
+            selector = faiss.IDSelectorBatch(np.fromiter(candidate_ids, dtype=np.int64))
+            scores, indices = self.index.search(
+                query_vector, min(k, len(candidate_ids)),
+                params=faiss.SearchParameters(sel=selector)
+            )
+        
+        return [
+            (int(idx), float(score))
+            for score, idx in zip(scores[0], indices[0])
+            if idx != -1  # FAISS returns -1 for empty slots
+        ]
+    
+    def similarity(self, query_embedding: List[float], vector_ids: List[int]) -> Dict[int, float]:
+        """Cosine similarity between the query and specific stored vectors."""
+        if not vector_ids:
+            return {}
         
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx == -1:  # FAISS returns -1 for empty slots
-                continue
-                
-            metadata = self.document_metadata.get(idx, {})
-            
-            # Apply filters if provided
-            if filters:
-                if not self._matches_filters(metadata, filters):
-                    continue
-            
-            results.append({
-                'vector_id': int(idx),
-                'document_id': metadata.get('document_id'),
-                'content_chunk': metadata.get('content_chunk', ''),
-                'chunk_index': metadata.get('chunk_index', 0),
-                'relevance_score': float(score),
-                'metadata': metadata
-            })
-            
-            if len(results) >= k:
-                break
+        query_vector = np.array(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm > 0:
+            query_vector = query_vector / norm
         
-        return results
+        vectors = np.vstack([self.index.reconstruct(int(vector_id)) for vector_id in vector_ids])
+        return dict(zip(vector_ids, (vectors @ query_vector).tolist()))
+    
+    def result_for(self, vector_id: int, score: float) -> Dict[str, Any]:
+        """Build a search result entry for a stored vector."""
+        metadata = self.document_metadata.get(vector_id, {})
+        return {
+            'vector_id': int(vector_id),
+            'document_id': metadata.get('document_id'),
+            'content_chunk': metadata.get('content_chunk', ''),
+            'chunk_index': metadata.get('chunk_index', 0),
+            'relevance_score': float(score),
+            'metadata': metadata
+        }
     
     def _matches_filters(self, metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
         """Check if metadata matches the provided filters."""
@@ -199,8 +311,9 @@ class VectorDatabase:
         """
         deleted_count = 0
         for vector_id, metadata in self.document_metadata.items():
-            if metadata.get('document_id') == document_id:
+            if metadata.get('document_id') == document_id and not metadata.get('deleted', False):
                 metadata['deleted'] = True
+                self._unindex_vector(vector_id)
                 deleted_count += 1
         
         if deleted_count > 0:
@@ -256,5 +369,6 @@ class VectorDatabase:
             self.document_metadata = active_metadata
             self.next_id = new_id
         
+        self._rebuild_derived_indexes()
         self._save_index()
         logger.info(f"Index rebuilt with {len(active_vectors)} active vectors")
\ No newline at end of file
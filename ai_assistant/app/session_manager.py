@@ -14,7 +14,7 @@ import logging
 
 from .config import settings
 from .models import MessageData, MessageSender, MessageType
-from .database import get_db_session
+from .database import get_async_db_session
 
 logger = logging.getLogger(__name__)
 
@@ -68,12 +68,12 @@ class SessionManager:
         session_id = str(uuid.uuid4())
         
         # Create session in database
-        with get_db_session() as db:
+        async with get_async_db_session() as db:
             query = text("""
                 INSERT INTO ai_sessions (id, user_id, machine_id, status, problem_description, language, session_metadata)
                 VALUES (:session_id, :user_id, :machine_id, 'active', :problem_description, :language, '{}')
             """)
-            db.execute(query, {
+            await db.execute(query, {
                 'session_id': session_id,
                 'user_id': user_id,
                 'machine_id': machine_id,
@@ -125,14 +125,14 @@ class SessionManager:
                 logger.warning(f"Failed to retrieve session from Redis: {e}")
         
         # Fallback to database
-        with get_db_session() as db:
+        async with get_async_db_session() as db:
             query = text("""
                 SELECT id, user_id, machine_id, status, problem_description, 
                        resolution_summary, language, session_metadata, created_at, updated_at
                 FROM ai_sessions 
                 WHERE id = :session_id
             """)
-            result = db.execute(query, {'session_id': session_id}).fetchone()
+            result = (await db.execute(query, {'session_id': session_id})).fetchone()
             
             if not result:
                 return None
@@ -182,14 +182,14 @@ class SessionManager:
         """
         try:
             # Update database
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 if resolution_summary:
                     query = text("""
                         UPDATE ai_sessions 
                         SET status = :status, resolution_summary = :resolution_summary, updated_at = NOW()
                         WHERE id = :session_id
                     """)
-                    result = db.execute(query, {
+                    result = await db.execute(query, {
                         'session_id': session_id,
                         'status': status,
                         'resolution_summary': resolution_summary
@@ -200,7 +200,7 @@ class SessionManager:
                         SET status = :status, updated_at = NOW()
                         WHERE id = :session_id
                     """)
-                    result = db.execute(query, {
+                    result = await db.execute(query, {
                         'session_id': session_id,
                         'status': status
                     })
@@ -259,12 +259,12 @@ class SessionManager:
         message_id = str(uuid.uuid4())
         
         # Add to database
-        with get_db_session() as db:
+        async with get_async_db_session() as db:
             query = text("""
                 INSERT INTO ai_messages (message_id, session_id, sender, content, message_type, language, message_metadata)
                 VALUES (:message_id, :session_id, :sender, :content, :message_type, :language, :metadata)
             """)
-            db.execute(query, {
+            await db.execute(query, {
                 'message_id': message_id,
                 'session_id': session_id,
                 'sender': sender,
@@ -291,14 +291,14 @@ class SessionManager:
             User's preferred language code (defaults to 'en' if not found)
         """
         try:
-            with get_db_session() as db:
+            async with get_async_db_session() as db:
                 # Query user's preferred language from ABParts users table
                 query = text("""
                     SELECT preferred_language 
                     FROM users 
                     WHERE id = :user_id
                 """)
-                result = db.execute(query, {'user_id': user_id}).fetchone()
+                result = (await db.execute(query, {'user_id': user_id})).fetchone()
                 
                 if result and result.preferred_language:
                     # Map ABParts language codes to supported AI languages
@@ -335,7 +335,7 @@ class SessionManager:
         """
         messages = []
         
-        with get_db_session() as db:
+        async with get_async_db_session() as db:
             query = text("""
                 SELECT message_id, session_id, sender, content, message_type, language, message_metadata, created_at
                 FROM ai_messages 
@@ -343,7 +343,7 @@ class SessionManager:
                 ORDER BY created_at ASC 
                 LIMIT :limit
             """)
-            results = db.execute(query, {'session_id': session_id, 'limit': limit}).fetchall()
+            results = (await db.execute(query, {'session_id': session_id, 'limit': limit})).fetchall()
             
             for row in results:
                 message = MessageData(
@@ -377,7 +377,7 @@ class SessionManager:
         """
         sessions = []
         
-        with get_db_session() as db:
+        async with get_async_db_session() as db:
             query = text("""
                 SELECT id, user_id, machine_id, status, problem_description, 
                        resolution_summary, language, session_metadata, created_at, updated_at
@@ -386,7 +386,7 @@ class SessionManager:
                 ORDER BY updated_at DESC 
                 LIMIT :limit
             """)
-            results = db.execute(query, {'user_id': user_id, 'limit': limit}).fetchall()
+            results = (await db.execute(query, {'user_id': user_id, 'limit': limit})).fetchall()
             
             for row in results:
                 session_data = {
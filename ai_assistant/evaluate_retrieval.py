@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Offline Retrieval Evaluation
+
+Indexes the knowledge-base test fixtures into a throwaway vector database
+and compares vector-only search with hybrid BM25 + vector retrieval on a
+set of labelled queries (recall@k and MRR@k).
+
+By default embeddings come from a deterministic hashing embedder so the
+evaluation runs without network access; pass --openai to use the
+configured OpenAI embedding model instead.
+
+Usage:
+    python evaluate_retrieval.py --k 5
+    python evaluate_retrieval.py --k 3 --openai --json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Awaitable
+
+import numpy as np
+
+# Add the app directory to the path
+sys.path.append(str(Path(__file__).parent / "app"))
+
+from app.services.hybrid_retriever import HybridRetriever, evaluate_retrieval, tokenize
+from app.services.vector_database import VectorDatabase
+
+FIXTURES = [
+    {
+        'path': Path(__file__).parent / "sample_autoboss_manual.txt",
+        'metadata': {
+            'title': "AutoBoss V3.1B Operator Manual - Troubleshooting Section",
+            'document_type': "manual",
+            'machine_models': ["V3.1B"],
+            'language': "en",
+        },
+    },
+    {
+        'path': Path(__file__).parent.parent / "test_knowledge_document.txt",
+        'metadata': {
+            'title': "AutoBoss Machine Troubleshooting Guide",
+            'document_type': "troubleshooting_guide",
+            'machine_models': ["V4.0"],
+            'language': "en",
+        },
+    },
+]
+
+EVALUATION_CASES = [
+    {'query': "HP gauge in the red zone", 'expected': "red zone"},
+    {'query': "what is the dilution ratio 1:10", 'expected': "1:10"},
+    {'query': "filter replacement every 100 operating hours", 'expected': "100 operating hours"},
+    {'query': "machine won't start emergency stop engaged", 'expected': "emergency stop"},
+    {'query': "optimal water temperature 140-160°F", 'expected': "140-160"},
+    {'query': "excessive noise drive belts", 'expected': "drive belts"},
+    {'query': "chemical tank capacity gallons", 'expected': "50 gallons"},
+    {'query': "operating pressure PSI", 'expected': "1000-3000 PSI"},
+    {'query': "support@autoboss.com", 'expected': "support@autoboss.com"},
+    {'query': "low pressure hydraulic fluid", 'expected': "hydraulic fluid",
+     'filters': {'machine_model': "V4.0"}},
+    {'query': "weekly maintenance", 'expected': "Inspect connections and hoses",
+     'filters': {'machine_model': "V4.0"}},
+    {'query': "weekly maintenance", 'expected': "Check pump oil level",
+     'filters': {'machine_model': "V3.1B", 'language': "en"}},
+    {'query': "pump seals", 'expected': "pump seals",
+     'filters': {'document_type': "manual"}},
+]
+
+
+def hashing_embedding(text: str, dimension: int = 256) -> List[float]:
+    """Deterministic bag-of-terms embedding used for offline evaluation."""
+    vector = np.zeros(dimension, dtype=np.float32)
+    for term in tokenize(text):
+        digest = hashlib.md5(term.encode("utf-8")).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dimension
+        vector[bucket] += 1.0 if digest[4] % 2 == 0 else -1.0
+    return vector.tolist()
+
+
+def chunk_text(text: str, chunk_size: int = 500) -> List[str]:
+    """Split fixture text into paragraph-aligned chunks."""
+    chunks, current = [], ""
+    for paragraph in [p.strip() for p in text.split("\n\n") if p.strip()]:
+        if current and len(current) + len(paragraph) > chunk_size:
+            chunks.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def build_index(index_path: str, embed: Callable[[str], Awaitable[List[float]]],
+                      dimension: int) -> VectorDatabase:
+    """Index the fixtures into a fresh vector database."""
+    vector_db = VectorDatabase(dimension=dimension, index_path=index_path)
+    for i, fixture in enumerate(FIXTURES):
+        chunks = chunk_text(fixture['path'].read_text(encoding="utf-8"))
+        embeddings = [await embed(chunk) for chunk in chunks]
+        vector_db.add_document(f"fixture-{i}", chunks, embeddings, fixture['metadata'])
+    return vector_db
+
+
+async def run_evaluation(k: int = 5, use_openai: bool = False) -> Dict[str, Any]:
+    """Evaluate vector-only and hybrid retrieval on the fixtures."""
+    if use_openai:
+        from app.llm_client import LLMClient
+        llm_client = LLMClient()
+        await llm_client.initialize()
+        embed, dimension = llm_client.generate_embedding, 1536
+    else:
+        async def embed(text: str) -> List[float]:
+            return hashing_embedding(text)
+        dimension = 256
+
+    with tempfile.TemporaryDirectory() as index_path:
+        vector_db = await build_index(index_path, embed, dimension)
+        retriever = HybridRetriever(vector_db)
+
+        embeddings = {}
+        for case in EVALUATION_CASES:
+            embeddings[case['query']] = await embed(case['query'])
+
+        vector_only = evaluate_retrieval(
+            lambda query, filters, limit: vector_db.search(embeddings[query], k=limit, filters=filters),
+            EVALUATION_CASES, k
+        )
+        hybrid = evaluate_retrieval(
+            lambda query, filters, limit: retriever.search(query, embeddings[query], k=limit, filters=filters),
+            EVALUATION_CASES, k
+        )
+
+    return {'vector': vector_only, 'hybrid': hybrid}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate knowledge base retrieval offline")
+    parser.add_argument("--k", type=int, default=5, help="Cut-off for recall and MRR")
+    parser.add_argument("--openai", action="store_true", help="Use OpenAI embeddings")
+    parser.add_argument("--json", action="store_true", help="Print full JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_evaluation(k=args.k, use_openai=args.openai))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for name, metrics in report.items():
+        print(f"{name:>7}: recall@{metrics['k']}={metrics['recall_at_k']:.3f} "
+              f"mrr@{metrics['k']}={metrics['mrr_at_k']:.3f}")
+        for rank in metrics['ranks']:
+            if rank['rank'] is None:
+                print(f"         miss: {rank['query']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Concurrent Chat Load Test
+
+Measures how many chat turns the assistant completes per second when many
+users talk to it at once, and how long the event loop stalls meanwhile.
+
+Two modes are available:
+
+* ``--url``: fire concurrent POST /api/ai/chat requests at a running
+  service and report throughput and latency percentiles. Run it against
+  the service before and after a change to compare.
+* default: an in-process comparison of the database access patterns used
+  by the chat path. Each simulated chat turn issues a few queries; the
+  "blocking" variant runs them with the synchronous session inside the
+  coroutine (the old behaviour), the "async" variant awaits them on the
+  async engine and the "offload" variant runs them on the bounded DB
+  thread pool. Without a reachable database pass ``--simulate`` to model
+  each query as a fixed delay instead of ``pg_sleep``.
+
+Usage:
+    python load_test_chat.py --simulate --concurrency 50
+    python load_test_chat.py --query-ms 20 --turns 200
+    python load_test_chat.py --url http://localhost:8001 --token $TOKEN
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+
+# Add the app directory to the path
+sys.path.append(str(Path(__file__).parent / "app"))
+
+QUERIES_PER_TURN = 4
+
+
+def summarize(name: str, latencies: List[float], elapsed: float,
+              max_loop_lag: float, errors: int = 0) -> Dict[str, Any]:
+    """Aggregate per-turn latencies into a report row."""
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        'mode': name,
+        'turns': len(latencies),
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_per_s': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(0.50) * 1000, 1),
+        'p95_ms': round(percentile(0.95) * 1000, 1),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 1) if ordered else 0.0,
+        'max_loop_lag_ms': round(max_loop_lag * 1000, 1),
+    }
+
+
+async def measure(name: str, turn: Callable[[], Awaitable[None]],
+                  turns: int, concurrency: int) -> Dict[str, Any]:
+    """Run ``turns`` chat turns with bounded concurrency while probing loop lag."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def probe():
+        nonlocal max_lag
+        interval = 0.005
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - started - interval)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await turn()
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(turns)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+
+    return summarize(name, latencies, elapsed, max_lag, errors)
+
+
+def build_db_turns(query_seconds: float, simulate: bool) -> Dict[str, Callable[[], Awaitable[None]]]:
+    """Chat-turn coroutines for each database access pattern."""
+    from app.database import get_db_session, get_async_db_session, run_in_db_thread
+
+    if simulate:
+        async def async_query():
+            await asyncio.sleep(query_seconds)
+
+        def blocking_query():
+            time.sleep(query_seconds)
+    else:
+        from sqlalchemy import text
+        statement = text("SELECT pg_sleep(:seconds)")
+
+        async def async_query():
+            async with get_async_db_session() as db:
+                await db.execute(statement, {'seconds': query_seconds})
+
+        def blocking_query():
+            with get_db_session() as db:
+                db.execute(statement, {'seconds': query_seconds})
+
+    async def blocking_turn():
+        for _ in range(QUERIES_PER_TURN):
+            blocking_query()
+
+    async def async_turn():
+        for _ in range(QUERIES_PER_TURN):
+            await async_query()
+
+    async def offload_turn():
+        for _ in range(QUERIES_PER_TURN):
+            await run_in_db_thread(blocking_query)
+
+    return {'blocking': blocking_turn, 'async': async_turn, 'offload': offload_turn}
+
+
+def build_http_turn(url: str, token: Optional[str], message: str):
+    """Chat-turn coroutine that posts to a running assistant service."""
+    import httpx
+
+    headers = {'Authorization': f"Bearer {token}"} if token else {}
+    client = httpx.AsyncClient(base_url=url, headers=headers, timeout=120.0)
+
+    async def http_turn():
+        response = await client.post("/api/ai/chat", json={'message': message})
+        response.raise_for_status()
+
+    return client, http_turn
+
+
+async def run_load_test(args) -> List[Dict[str, Any]]:
+    if args.url:
+        client, turn = build_http_turn(args.url, args.token, args.message)
+        try:
+            return [await measure("http", turn, args.turns, args.concurrency)]
+        finally:
+            await client.aclose()
+
+    turns = build_db_turns(args.query_ms / 1000.0, args.simulate)
+    return [
+        await measure(name, turns[name], args.turns, args.concurrency)
+        for name in args.modes
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent chat throughput load test")
+    parser.add_argument("--url", help="Base URL of a running AI assistant service")
+    parser.add_argument("--token", help="Bearer token for --url mode")
+    parser.add_argument("--message", default="The machine is losing pressure, what should I check?",
+                        help="Chat message for --url mode")
+    parser.add_argument("--turns", type=int, default=100, help="Total chat turns")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent chats")
+    parser.add_argument("--query-ms", type=float, default=10.0,
+                        help="Duration of each simulated database query")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Model queries as delays instead of pg_sleep")
+    parser.add_argument("--modes", nargs="+", default=["blocking", "async", "offload"],
+                        choices=["blocking", "async", "offload"])
+    parser.add_argument("--json", action="store_true", help="Print full JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for row in report:
+        print(f"{row['mode']:>8}: {row['throughput_per_s']:>8.2f} turns/s  "
+              f"p50={row['p50_ms']}ms p95={row['p95_ms']}ms  "
+              f"max loop lag={row['max_loop_lag_ms']}ms  errors={row['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Tests for the non-blocking database access layer.
+
+Covers async URL translation, offloading blocking calls to the bounded DB
+thread pool, and the in-process chat load test used to compare the
+blocking and non-blocking access patterns.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from app.database import (
+    PoolWaitStats, async_connect_args, db_executor, get_async_database_url, instrumented_pool_class,
+    run_in_db_thread, sync_connect_args
+)
+from load_test_chat import build_db_turns, measure
+
+
+class TestAsyncDatabaseUrl:
+    @pytest.mark.parametrize("url, expected", [
+        ("postgresql://u:p@db:5432/abparts", "postgresql+asyncpg://u:p@db:5432/abparts"),
+        ("postgresql+psycopg2://u:p@db/abparts", "postgresql+asyncpg://u:p@db/abparts"),
+        ("postgres://u:p@db/abparts", "postgresql+asyncpg://u:p@db/abparts"),
+        ("postgresql+asyncpg://u:p@db/abparts", "postgresql+asyncpg://u:p@db/abparts"),
+    ])
+    def test_driver_is_swapped(self, url, expected):
+        assert get_async_database_url(url) == expected
+
+
+class TestPoolConfiguration:
+    def test_statement_timeout_as_startup_setting(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 15000)
+        monkeypatch.setattr(settings, "DB_PGBOUNCER", False)
+
+        assert sync_connect_args() == {"options": "-c statement_timeout=15000"}
+        assert async_connect_args() == {"server_settings": {"statement_timeout": "15000"}}
+
+    def test_pgbouncer_mode_disables_prepared_statement_caches(self, monkeypatch):
+        monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 15000)
+        monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+
+        args = async_connect_args()
+        assert args["statement_cache_size"] == args["prepared_statement_cache_size"] == 0
+        assert args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+        assert sync_connect_args() == {}
+
+    def test_checkout_waits_and_timeouts_recorded(self):
+        stats = PoolWaitStats()
+        engine = create_engine("sqlite:///:memory:", poolclass=instrumented_pool_class(QueuePool, stats),
+                               pool_size=1, max_overflow=0, pool_timeout=0.05)
+
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        engine.dispose()
+
+        snapshot = stats.snapshot()
+        assert snapshot["checkouts"] == 2
+        assert snapshot["timeouts"] == 1
+        assert snapshot["max_wait_ms"] >= 50
+
+
+class TestRunInDbThread:
+    @pytest.mark.asyncio
+    async def test_runs_on_db_pool_with_arguments(self):
+        def work(a, b=0):
+            return threading.current_thread().name, a + b
+
+        thread_name, value = await run_in_db_thread(work, 2, b=3)
+
+        assert thread_name.startswith("ai-db")
+        assert value == 5
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await run_in_db_thread(fail)
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Blocking calls on the pool do not delay other coroutines."""
+        async def ticker():
+            started = time.perf_counter()
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+            return time.perf_counter() - started
+
+        _, ticker_elapsed = await asyncio.gather(run_in_db_thread(time.sleep, 0.3), ticker())
+
+        assert ticker_elapsed < 0.25
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        await asyncio.gather(*(run_in_db_thread(work) for _ in range(db_executor._max_workers * 3)))
+
+        assert peak <= db_executor._max_workers
+
+
+class TestChatLoadTest:
+    @pytest.mark.asyncio
+    async def test_non_blocking_patterns_outperform_blocking(self):
+        turns = build_db_turns(query_seconds=0.005, simulate=True)
+
+        blocking = await measure("blocking", turns['blocking'], turns=20, concurrency=10)
+        non_blocking = await measure("async", turns['async'], turns=20, concurrency=10)
+
+        assert blocking['errors'] == non_blocking['errors'] == 0
+        assert non_blocking['throughput_per_s'] > blocking['throughput_per_s']
+        assert non_blocking['max_loop_lag_ms'] < blocking['max_loop_lag_ms']
@@ -0,0 +1,159 @@
+"""
+Tests for hybrid BM25 + vector retrieval with prefiltered partitions.
+
+Covers the keyword index, reciprocal-rank fusion, filter partitions in
+VectorDatabase and the offline evaluation harness over the knowledge-base
+fixtures.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.hybrid_retriever import (
+    BM25Index,
+    HybridRetriever,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from app.services.vector_database import VectorDatabase
+from evaluate_retrieval import run_evaluation
+
+
+DIMENSION = 16
+
+
+def unit_vector(index: int) -> list:
+    vector = [0.0] * DIMENSION
+    vector[index % DIMENSION] = 1.0
+    return vector
+
+
+@pytest.fixture
+def vector_db(tmp_path):
+    return VectorDatabase(dimension=DIMENSION, index_path=str(tmp_path / "index"))
+
+
+class TestTokenize:
+    def test_compound_tokens_are_kept_and_split(self):
+        tokens = tokenize("Error E-102 on part AB-4411.2")
+        assert "e-102" in tokens
+        assert "e102" in tokens
+        assert "ab-4411.2" in tokens
+        assert "4411" in tokens
+
+
+class TestBM25Index:
+    def test_exact_code_ranks_first(self):
+        index = BM25Index()
+        index.add(0, "Pump pressure is low, check the unloader valve")
+        index.add(1, "Error E-102 means the pump pressure sensor failed")
+        index.add(2, "Clean the nozzles daily")
+
+        results = index.search("E-102", k=3)
+
+        assert results[0][0] == 1
+        assert all(doc_id != 2 for doc_id, _ in results)
+
+    def test_candidate_ids_restrict_scoring(self):
+        index = BM25Index()
+        index.add(0, "pump seals")
+        index.add(1, "pump seals")
+
+        assert [doc_id for doc_id, _ in index.search("pump", candidate_ids={1})] == [1]
+
+    def test_remove(self):
+        index = BM25Index()
+        index.add(0, "pump seals")
+        index.remove(0)
+
+        assert len(index) == 0
+        assert index.search("pump") == []
+        assert "pump" not in index.postings
+
+
+class TestReciprocalRankFusion:
+    def test_items_in_both_rankings_win(self):
+        fused = reciprocal_rank_fusion([[1, 2, 3], [3, 4, 1]])
+        assert [doc_id for doc_id, _ in fused][:2] == [1, 3]
+
+    def test_weights(self):
+        fused = reciprocal_rank_fusion([[1], [2]], weights=[1.0, 2.0])
+        assert fused[0][0] == 2
+
+
+class TestPrefilteredSearch:
+    def test_filtered_search_returns_k_results(self, vector_db):
+        """A rare filter value still fills k slots instead of being post-filtered away."""
+        # 50 chunks for V3.1B that are closer to the query than any V4.0 chunk
+        vector_db.add_document(
+            "common", [f"common chunk {i}" for i in range(50)],
+            [unit_vector(0)] * 50,
+            {'machine_models': ["V3.1B"], 'language': "en", 'document_type': "manual"}
+        )
+        vector_db.add_document(
+            "rare", [f"rare chunk {i}" for i in range(5)],
+            [unit_vector(1)] * 5,
+            {'machine_models': ["V4.0"], 'language': "en", 'document_type': "manual"}
+        )
+
+        results = vector_db.search(unit_vector(0), k=3, filters={'machine_model': "V4.0"})
+
+        assert len(results) == 3
+        assert {r['document_id'] for r in results} == {"rare"}
+
+    def test_deleted_documents_are_excluded(self, vector_db):
+        vector_db.add_document("a", ["alpha"], [unit_vector(0)], {'language': "en"})
+        vector_db.add_document("b", ["beta"], [unit_vector(0)], {'language': "en"})
+        vector_db.delete_document("a")
+
+        results = vector_db.search(unit_vector(0), k=5)
+
+        assert [r['document_id'] for r in results] == ["b"]
+        assert vector_db.candidate_ids({'language': "en"}) == {1}
+
+    def test_unknown_filter_values_return_nothing(self, vector_db):
+        vector_db.add_document("a", ["alpha"], [unit_vector(0)], {'language': "en"})
+
+        assert vector_db.search(unit_vector(0), k=5, filters={'language': "el"}) == []
+
+    def test_partitions_survive_reload_and_rebuild(self, vector_db, tmp_path):
+        vector_db.add_document("a", ["alpha"], [unit_vector(0)], {'language': "el"})
+        vector_db.add_document("b", ["beta"], [unit_vector(1)], {'language': "en"})
+        vector_db.delete_document("a")
+        vector_db.rebuild_index()
+
+        reloaded = VectorDatabase(dimension=DIMENSION, index_path=str(tmp_path / "index"))
+
+        assert reloaded.candidate_ids({'language': "en"}) == {0}
+        assert reloaded.keyword_index.search("beta")[0][0] == 0
+
+
+class TestHybridRetriever:
+    def test_keyword_match_is_surfaced(self, vector_db):
+        """A chunk with an exact error code is returned even if embeddings miss it."""
+        vector_db.add_document(
+            "manual",
+            ["General pump pressure advice", "Fault code E-417: replace the remote battery"],
+            [unit_vector(0), unit_vector(5)],
+            {'language': "en"}
+        )
+        retriever = HybridRetriever(vector_db)
+
+        results = retriever.search("E-417", unit_vector(0), k=2)
+
+        assert results[0]['content_chunk'].startswith("Fault code E-417")
+        assert results[0]['keyword_score'] > 0
+        # relevance_score remains the cosine similarity of the chunk
+        assert results[0]['relevance_score'] == pytest.approx(0.0, abs=1e-6)
+        assert results[1]['relevance_score'] == pytest.approx(1.0, abs=1e-6)
+
+
+class TestOfflineEvaluation:
+    def test_hybrid_not_worse_than_vector_on_fixtures(self):
+        report = asyncio.run(run_evaluation(k=3))
+
+        assert report['hybrid']['queries'] > 0
+        assert report['hybrid']['recall_at_k'] >= report['vector']['recall_at_k']
+        assert report['hybrid']['recall_at_k'] >= 0.9
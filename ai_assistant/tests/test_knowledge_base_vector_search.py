@@ -0,0 +1,141 @@
+"""
+Property-based tests for the preloaded embedding matrix used by
+KnowledgeBaseManager.search_documents.
+
+The vectorized top-k path must return the same chunks, in the same order,
+as the original per-row cosine similarity loop.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from hypothesis import given, strategies as st, settings, assume
+
+from app.knowledge_base import (
+    EmbeddingIndex,
+    EmbeddingMatrix,
+    EmbeddingService,
+    normalize_embeddings,
+)
+
+
+DIMENSION = 8
+
+vector_strategy = st.lists(
+    st.floats(min_value=-1.0, max_value=1.0, allow_nan=False, allow_infinity=False),
+    min_size=DIMENSION,
+    max_size=DIMENSION,
+)
+
+
+def build_matrix(embeddings, document_id="doc-1"):
+    matrix = EmbeddingMatrix()
+    matrix.append(
+        [str(uuid.uuid4()) for _ in embeddings],
+        [document_id] * len(embeddings),
+        embeddings,
+        [datetime.utcnow()] * len(embeddings),
+    )
+    return matrix
+
+
+class TestEmbeddingMatrix:
+    """Tests for the per-partition embedding matrix."""
+
+    @given(
+        embeddings=st.lists(vector_strategy, min_size=1, max_size=40),
+        query=vector_strategy,
+        limit=st.integers(min_value=1, max_value=10),
+        threshold=st.floats(min_value=-1.0, max_value=1.0),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_top_k_matches_cosine_loop(self, embeddings, query, limit, threshold):
+        """Top-k selection agrees with the per-pair cosine similarity loop."""
+        service = EmbeddingService()
+        similarities = [service.cosine_similarity(query, e) for e in embeddings]
+        # float32 scoring may flip rows sitting exactly on the threshold
+        assume(all(abs(s - threshold) > 1e-4 for s in similarities))
+
+        expected = sorted(
+            (s for s in similarities if s >= threshold), reverse=True
+        )[:limit]
+
+        matrix = build_matrix(embeddings)
+        hits = matrix.top_k(normalize_embeddings(query)[0], limit, threshold)
+
+        assert len(hits) == len(expected)
+        for (row, score), expected_score in zip(hits, expected):
+            assert score == pytest.approx(expected_score, abs=1e-4)
+            assert score == pytest.approx(similarities[row], abs=1e-4)
+
+    def test_zero_vectors_score_zero(self):
+        """Zero embeddings never produce NaN scores."""
+        matrix = build_matrix([[0.0] * DIMENSION, [1.0] + [0.0] * (DIMENSION - 1)])
+        query = normalize_embeddings([1.0] + [0.0] * (DIMENSION - 1))[0]
+
+        hits = matrix.top_k(query, 5, similarity_threshold=-1.0)
+
+        assert [round(s, 6) for _, s in hits] == [1.0, 0.0]
+
+    def test_append_skips_known_and_empty_chunks(self):
+        """Re-appending a chunk or a chunk without embedding is a no-op."""
+        matrix = EmbeddingMatrix()
+        now = datetime.utcnow()
+        added = matrix.append(["c1", "c2"], ["d1", "d1"], [[1.0] * DIMENSION, None], [now, now])
+        assert added == 1
+
+        added = matrix.append(["c1"], ["d1"], [[1.0] * DIMENSION], [now + timedelta(seconds=1)])
+        assert added == 0
+        assert len(matrix) == 1
+        assert matrix.watermark == now
+
+    def test_remove_document(self):
+        """Removing a document drops only its rows."""
+        matrix = build_matrix([[1.0] * DIMENSION] * 3, document_id="keep")
+        matrix.append(["x1", "x2"], ["drop", "drop"], [[0.5] * DIMENSION] * 2,
+                      [datetime.utcnow()] * 2)
+
+        assert matrix.remove_document("drop") == 2
+        assert len(matrix) == 3
+        assert matrix.matrix.shape == (3, DIMENSION)
+        assert set(matrix.document_ids) == {"keep"}
+
+        assert matrix.remove_document("keep") == 3
+        assert matrix.top_k(normalize_embeddings([1.0] * DIMENSION)[0], 5) == []
+
+
+class TestEmbeddingIndex:
+    """Tests for incremental maintenance of loaded partitions."""
+
+    def test_add_chunks_updates_matching_partitions_only(self):
+        index = EmbeddingIndex()
+        for key in [("en", None, None), ("en", "V4.0", None),
+                    ("en", "V3.1B", None), ("el", None, None)]:
+            index._partitions[key] = EmbeddingMatrix()
+
+        index.add_chunks("en", "V4.0", "manual", "doc-1", ["c1", "c2"],
+                         [[1.0] * DIMENSION] * 2, datetime.utcnow())
+
+        assert len(index._partitions[("en", None, None)]) == 2
+        assert len(index._partitions[("en", "V4.0", None)]) == 2
+        assert len(index._partitions[("en", "V3.1B", None)]) == 0
+        assert len(index._partitions[("el", None, None)]) == 0
+        # Unloaded partitions are not created eagerly
+        assert ("en", "V4.0", "manual") not in index._partitions
+
+        index.remove_document("doc-1")
+        assert all(len(p) == 0 for p in index._partitions.values())
+
+    def test_invalidate_by_language(self):
+        index = EmbeddingIndex()
+        index._partitions[("en", None, None)] = EmbeddingMatrix()
+        index._partitions[("el", None, None)] = EmbeddingMatrix()
+
+        index.invalidate("en")
+
+        assert list(index._partitions) == [("el", None, None)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
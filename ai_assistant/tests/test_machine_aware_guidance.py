@@ -17,6 +17,7 @@ from datetime import datetime, timedelta
 import uuid
 
 from app.services.abparts_integration import ABPartsIntegration
+from app.services.machine_context import MachineContextAggregator
 from app.services.troubleshooting_service import TroubleshootingService
 from app.services.troubleshooting_types import DiagnosticAssessment, ConfidenceLevel
 from app.llm_client import LLMClient
@@ -192,11 +193,14 @@ class TestMachineAwareGuidance:
                 mock_integration.get_maintenance_history = AsyncMock(return_value=maintenance_history)
                 mock_integration.get_parts_usage_data = AsyncMock(return_value=[])
                 mock_integration.get_machine_hours_history = AsyncMock(return_value=[])
-                mock_integration.get_preventive_maintenance_suggestions = AsyncMock(return_value=maintenance_suggestions)
+                mock_integration.build_maintenance_suggestions = MagicMock(return_value=maintenance_suggestions)
+                mock_integration.get_machine_activity_watermark = AsyncMock(return_value=None)
                 mock_integration.get_user_preferences = AsyncMock(return_value=user_context)
                 
                 # Mock the database session context manager
-                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session:
+                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session, \
+                     patch('app.services.troubleshooting_service.machine_context_aggregator',
+                           MachineContextAggregator(integration=mock_integration, ttl_seconds=0)):
                     mock_db = MagicMock()
                     mock_db_session.return_value.__enter__.return_value = mock_db
                     mock_db_session.return_value.__exit__.return_value = None
@@ -231,7 +235,7 @@ class TestMachineAwareGuidance:
                     # Verify that machine context was retrieved
                     mock_integration.get_machine_details.assert_called_once_with(machine_details["id"])
                     mock_integration.get_maintenance_history.assert_called_once_with(machine_details["id"], limit=5)
-                    mock_integration.get_preventive_maintenance_suggestions.assert_called_once_with(machine_details["id"])
+                    mock_integration.build_maintenance_suggestions.assert_called_once()
                     mock_integration.get_user_preferences.assert_called_once_with(user_context["user_id"])
                     
                     # Verify that LLM was called with enhanced context
@@ -278,11 +282,14 @@ class TestMachineAwareGuidance:
                 mock_integration.get_maintenance_history = AsyncMock(return_value=maintenance_history)
                 mock_integration.get_parts_usage_data = AsyncMock(return_value=[])
                 mock_integration.get_machine_hours_history = AsyncMock(return_value=[])
-                mock_integration.get_preventive_maintenance_suggestions = AsyncMock(return_value=[])
+                mock_integration.build_maintenance_suggestions = MagicMock(return_value=[])
+                mock_integration.get_machine_activity_watermark = AsyncMock(return_value=None)
                 mock_integration.get_user_preferences = AsyncMock(return_value={"preferred_language": "en"})
                 
                 # Mock the database session context manager
-                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session:
+                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session, \
+                     patch('app.services.troubleshooting_service.machine_context_aggregator',
+                           MachineContextAggregator(integration=mock_integration, ttl_seconds=0)):
                     mock_db = MagicMock()
                     mock_db_session.return_value.__enter__.return_value = mock_db
                     mock_db_session.return_value.__exit__.return_value = None
@@ -350,11 +357,14 @@ class TestMachineAwareGuidance:
                 mock_integration.get_maintenance_history = AsyncMock(return_value=[])
                 mock_integration.get_parts_usage_data = AsyncMock(return_value=[])
                 mock_integration.get_machine_hours_history = AsyncMock(return_value=[])
-                mock_integration.get_preventive_maintenance_suggestions = AsyncMock(return_value=maintenance_suggestions)
+                mock_integration.build_maintenance_suggestions = MagicMock(return_value=maintenance_suggestions)
+                mock_integration.get_machine_activity_watermark = AsyncMock(return_value=None)
                 mock_integration.get_user_preferences = AsyncMock(return_value={"preferred_language": "en"})
                 
                 # Mock the database session context manager
-                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session:
+                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session, \
+                     patch('app.services.troubleshooting_service.machine_context_aggregator',
+                           MachineContextAggregator(integration=mock_integration, ttl_seconds=0)):
                     mock_db = MagicMock()
                     mock_db_session.return_value.__enter__.return_value = mock_db
                     mock_db_session.return_value.__exit__.return_value = None
@@ -376,7 +386,7 @@ class TestMachineAwareGuidance:
                     )
                     
                     # Verify maintenance suggestions were retrieved
-                    mock_integration.get_preventive_maintenance_suggestions.assert_called_once_with(machine_details["id"])
+                    mock_integration.build_maintenance_suggestions.assert_called_once()
                     
                     # If there are high-priority maintenance suggestions, they should influence guidance
                     high_priority_suggestions = [s for s in maintenance_suggestions if s.get("priority") == "high"]
@@ -388,7 +398,7 @@ class TestMachineAwareGuidance:
                         # High priority maintenance should potentially increase estimated duration
                         if len(high_priority_suggestions) > 0:
                             # The system should have access to maintenance suggestions
-                            assert mock_integration.get_preventive_maintenance_suggestions.called
+                            assert mock_integration.build_maintenance_suggestions.called
         
         asyncio.run(run_test())
     
@@ -429,11 +439,14 @@ class TestMachineAwareGuidance:
                 mock_integration.get_maintenance_history = AsyncMock(return_value=[])
                 mock_integration.get_parts_usage_data = AsyncMock(return_value=[])
                 mock_integration.get_machine_hours_history = AsyncMock(return_value=[])
-                mock_integration.get_preventive_maintenance_suggestions = AsyncMock(return_value=[])
+                mock_integration.build_maintenance_suggestions = MagicMock(return_value=[])
+                mock_integration.get_machine_activity_watermark = AsyncMock(return_value=None)
                 mock_integration.get_user_preferences = AsyncMock(return_value={"preferred_language": "en"})
                 
                 # Mock the database session context manager
-                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session:
+                with patch('app.services.troubleshooting_service.get_db_session') as mock_db_session, \
+                     patch('app.services.troubleshooting_service.machine_context_aggregator',
+                           MachineContextAggregator(integration=mock_integration, ttl_seconds=0)):
                     mock_db = MagicMock()
                     mock_db_session.return_value.__enter__.return_value = mock_db
                     mock_db_session.return_value.__exit__.return_value = None
@@ -0,0 +1,131 @@
+"""
+Tests for concurrent machine-context assembly and its per-machine cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.machine_context import MachineContextAggregator
+
+
+MACHINE_ID = "5723d538-23ce-451a-85e6-b3430268e96b"
+MACHINE_DETAILS = {"id": MACHINE_ID, "name": "AB-1", "model_type": "V4.0", "latest_hours": 120.0}
+
+
+def create_integration(delay: float = 0.0, watermark=(1, "t1", 1, "t1")):
+    """Mock ABPartsIntegration whose fetches each take ``delay`` seconds."""
+    def returning(value):
+        async def fetch(*args, **kwargs):
+            await asyncio.sleep(delay)
+            return value() if callable(value) else value
+        return fetch
+
+    integration = MagicMock()
+    integration.get_machine_details = AsyncMock(side_effect=returning(lambda: dict(MACHINE_DETAILS)))
+    integration.get_maintenance_history = AsyncMock(side_effect=returning([{"maintenance_type": "50h"}]))
+    integration.get_parts_usage_data = AsyncMock(side_effect=returning([]))
+    integration.get_machine_hours_history = AsyncMock(side_effect=returning([{"hours_value": 120.0}]))
+    integration.get_machine_activity_watermark = AsyncMock(return_value=watermark)
+    integration.build_maintenance_suggestions = MagicMock(return_value=[{"type": "250h"}])
+    return integration
+
+
+class TestMachineContextAggregator:
+    @pytest.mark.asyncio
+    async def test_fetches_run_concurrently(self):
+        integration = create_integration(delay=0.1)
+        aggregator = MachineContextAggregator(integration=integration, ttl_seconds=60)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        context = await aggregator.get_context(MACHINE_ID)
+        elapsed = loop.time() - started
+
+        assert elapsed < 0.3
+        assert context["machine_details"]["name"] == "AB-1"
+        assert context["maintenance_suggestions"] == [{"type": "250h"}]
+        integration.build_maintenance_suggestions.assert_called_once()
+        integration.get_preventive_maintenance_suggestions.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_repeat_turns_use_cache(self):
+        integration = create_integration()
+        aggregator = MachineContextAggregator(integration=integration, ttl_seconds=60)
+
+        first = await aggregator.get_context(MACHINE_ID)
+        first["machine_details"]["name"] = "mutated by caller"
+        second = await aggregator.get_context(MACHINE_ID)
+
+        assert integration.get_maintenance_history.call_count == 1
+        assert second["machine_details"]["name"] == "AB-1"
+        assert aggregator.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_hours_or_maintenance_invalidate(self):
+        integration = create_integration()
+        aggregator = MachineContextAggregator(integration=integration, ttl_seconds=60)
+
+        await aggregator.get_context(MACHINE_ID)
+        integration.get_machine_activity_watermark.return_value = (2, "t2", 1, "t1")
+        await aggregator.get_context(MACHINE_ID)
+
+        assert integration.get_machine_hours_history.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry_and_explicit_invalidation(self):
+        integration = create_integration()
+        expired = MachineContextAggregator(integration=integration, ttl_seconds=0)
+        await expired.get_context(MACHINE_ID)
+        await expired.get_context(MACHINE_ID)
+        assert integration.get_machine_details.call_count == 2
+
+        cached = MachineContextAggregator(integration=integration, ttl_seconds=60)
+        await cached.get_context(MACHINE_ID)
+        cached.invalidate(MACHINE_ID)
+        await cached.get_context(MACHINE_ID)
+        assert integration.get_machine_details.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        integration = create_integration(delay=0.05)
+        aggregator = MachineContextAggregator(integration=integration, ttl_seconds=60)
+
+        results = await asyncio.gather(*(aggregator.get_context(MACHINE_ID) for _ in range(5)))
+
+        assert all(r["machine_details"]["id"] == MACHINE_ID for r in results)
+        assert integration.get_machine_details.call_count == 1
+        assert aggregator._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_unknown_machine_is_not_cached(self):
+        integration = create_integration()
+        integration.get_machine_details = AsyncMock(return_value=None)
+        aggregator = MachineContextAggregator(integration=integration, ttl_seconds=60)
+
+        assert await aggregator.get_context(MACHINE_ID) is None
+        assert aggregator.get_stats()["entries"] == 0
+        assert aggregator._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_releases_its_lock(self):
+        integration = create_integration()
+        integration.get_machine_details = AsyncMock(side_effect=ConnectionError("ABParts unavailable"))
+        aggregator = MachineContextAggregator(integration=integration, ttl_seconds=60)
+
+        for machine_id in ["m1", "m2", "m3"]:
+            with pytest.raises(ConnectionError):
+                await aggregator.get_context(machine_id)
+
+        assert aggregator._locks == {}
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self):
+        integration = create_integration()
+        aggregator = MachineContextAggregator(integration=integration, ttl_seconds=60, max_entries=2)
+
+        for machine_id in ["m1", "m2", "m3"]:
+            await aggregator.get_context(machine_id)
+
+        assert list(aggregator._cache) == ["m2", "m3"]
@@ -0,0 +1,141 @@
+"""
+Tests for streamed chat responses.
+
+Covers forwarding completion deltas from the LLM client and the
+server-sent event sequence produced by the streaming chat endpoints.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.llm_client import LLMClient, ConversationMessage
+from app.routers.chat import ChatResponse, _stream_events
+
+
+def make_chunk(content):
+    return SimpleNamespace(
+        model="gpt-test",
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=content))]
+    )
+
+
+class FakeStream:
+    """Async iterator over completion chunks, optionally failing midway."""
+
+    def __init__(self, contents, fail_after=None):
+        self.contents = list(contents)
+        self.fail_after = fail_after
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for index, content in enumerate(self.contents):
+            if self.fail_after is not None and index == self.fail_after:
+                raise RuntimeError("connection dropped")
+            yield make_chunk(content)
+
+
+def create_client(stream):
+    client = LLMClient()
+    client.max_retries = 3
+    client.client = MagicMock()
+    client.client.chat.completions.create = AsyncMock(return_value=stream)
+    return client
+
+
+def parse_events(raw_events):
+    events = []
+    for raw in raw_events:
+        event_line, data_line = raw.strip().split("\n")
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+class TestStreamingGeneration:
+    @pytest.mark.asyncio
+    async def test_deltas_are_forwarded(self):
+        client = create_client(FakeStream(["Check ", "the ", "**pump**", None]))
+        received = []
+
+        async def on_token(delta):
+            received.append(delta)
+
+        response = await client.generate_response(
+            messages=[ConversationMessage(role="user", content="No pressure")],
+            on_token=on_token
+        )
+
+        assert received == ["Check ", "the ", "**pump**"]
+        assert response.success
+        assert response.content == "Check the pump"
+        assert response.tokens_used == 3
+        assert response.time_to_first_token is not None
+        assert client.client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_no_retry_after_first_token(self):
+        client = create_client(FakeStream(["Check ", "the pump"], fail_after=1))
+
+        async def on_token(delta):
+            pass
+
+        response = await client.generate_response(
+            messages=[ConversationMessage(role="user", content="No pressure")],
+            on_token=on_token
+        )
+
+        assert not response.success
+        assert client.client.chat.completions.create.call_count == 1
+
+
+class TestServerSentEvents:
+    @pytest.mark.asyncio
+    async def test_tokens_then_done_after_metrics(self):
+        order = []
+
+        async def process(on_token):
+            for delta in ["Open ", "the valve"]:
+                await on_token(delta)
+                await asyncio.sleep(0)
+            return ChatResponse(
+                response="Open the valve", session_id="s1", message_id="m1",
+                model_used="gpt-test", tokens_used=2, response_time=0.1, success=True
+            )
+
+        async def record(metrics):
+            order.append("metrics")
+            assert metrics.streamed
+            assert metrics.message_id == "m1"
+            assert metrics.time_to_first_token_ms is not None
+            return True
+
+        with patch("app.routers.chat.analytics_service") as analytics:
+            analytics.record_response_latency = AsyncMock(side_effect=record)
+            raw = []
+            async for event in _stream_events(process, lambda result: result):
+                order.append("event")
+                raw.append(event)
+
+        events = parse_events(raw)
+        assert [name for name, _ in events] == ["token", "token", "done"]
+        assert "".join(data["delta"] for name, data in events if name == "token") == "Open the valve"
+        assert events[-1][1]["message_id"] == "m1"
+        assert order == ["event", "event", "metrics", "event"]
+
+    @pytest.mark.asyncio
+    async def test_failure_yields_error_event(self):
+        async def process(on_token):
+            await on_token("partial")
+            raise RuntimeError("boom")
+
+        with patch("app.routers.chat.analytics_service") as analytics:
+            analytics.record_response_latency = AsyncMock()
+            events = parse_events([event async for event in _stream_events(process, lambda result: result)])
+
+        assert events == [("token", {"delta": "partial"}), ("error", {"detail": "boom"})]
+        analytics.record_response_latency.assert_not_called()
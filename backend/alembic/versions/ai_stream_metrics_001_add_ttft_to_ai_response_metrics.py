@@ -0,0 +1,51 @@
+"""add time-to-first-token columns to ai_response_metrics
+
+Revision ID: ai_stream_metrics_001
+Revises: warehouse_loc_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'ai_stream_metrics_001'
+down_revision = 'warehouse_loc_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Record time-to-first-token and whether a response was streamed."""
+
+    # ai_response_metrics is owned by the AI assistant's analytics setup,
+    # so only alter it where it already exists.
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'ai_response_metrics' not in inspector.get_table_names():
+        return
+
+    existing_columns = [col['name'] for col in inspector.get_columns('ai_response_metrics')]
+
+    if 'time_to_first_token_ms' not in existing_columns:
+        op.add_column('ai_response_metrics', sa.Column('time_to_first_token_ms', sa.Integer(), nullable=True))
+
+    if 'streamed' not in existing_columns:
+        op.add_column('ai_response_metrics', sa.Column('streamed', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade():
+    """Remove streaming latency columns from ai_response_metrics."""
+
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if 'ai_response_metrics' not in inspector.get_table_names():
+        return
+
+    existing_columns = [col['name'] for col in inspector.get_columns('ai_response_metrics')]
+
+    if 'streamed' in existing_columns:
+        op.drop_column('ai_response_metrics', 'streamed')
+
+    if 'time_to_first_token_ms' in existing_columns:
+        op.drop_column('ai_response_metrics', 'time_to_first_token_ms')
@@ -0,0 +1,39 @@
+"""add content-hash version columns for organization logos and profile photos
+
+Revision ID: image_version_001
+Revises: org_hierarchy_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'image_version_001'
+down_revision = 'org_hierarchy_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add logo_version / profile_photo_version and backfill them from stored bytes."""
+    op.add_column('organizations', sa.Column('logo_version', sa.String(length=16), nullable=True))
+    op.add_column('users', sa.Column('profile_photo_version', sa.String(length=16), nullable=True))
+
+    # Same value as models.image_version: first 16 hex chars of the SHA-256
+    op.execute("""
+        UPDATE organizations
+        SET logo_version = substr(encode(sha256(logo_data), 'hex'), 1, 16)
+        WHERE logo_data IS NOT NULL AND length(logo_data) > 0
+    """)
+    op.execute("""
+        UPDATE users
+        SET profile_photo_version = substr(encode(sha256(profile_photo_data), 'hex'), 1, 16)
+        WHERE profile_photo_data IS NOT NULL AND length(profile_photo_data) > 0
+    """)
+
+
+def downgrade():
+    """Drop the image version columns."""
+    op.drop_column('users', 'profile_photo_version')
+    op.drop_column('organizations', 'logo_version')
@@ -0,0 +1,29 @@
+"""index organizations.parent_organization_id for hierarchy queries
+
+Revision ID: org_hierarchy_001
+Revises: txn_keyset_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'org_hierarchy_001'
+down_revision = 'txn_keyset_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index the parent link walked by the recursive hierarchy CTEs."""
+    op.create_index(
+        'ix_organizations_parent_organization_id',
+        'organizations',
+        ['parent_organization_id'],
+        unique=False
+    )
+
+
+def downgrade():
+    """Drop the parent link index."""
+    op.drop_index('ix_organizations_parent_organization_id', table_name='organizations')
@@ -0,0 +1,66 @@
+"""add part_price_index with latest and average unit cost per part
+
+Revision ID: part_price_index_001
+Revises: translation_memory_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'part_price_index_001'
+down_revision = 'translation_memory_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the part price index and backfill it from existing supplier orders."""
+    op.create_table(
+        'part_price_index',
+        sa.Column('part_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('parts.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('latest_unit_price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('latest_order_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('average_unit_cost', sa.DECIMAL(precision=12, scale=4), nullable=True),
+        sa.Column('received_quantity', sa.DECIMAL(precision=12, scale=3), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    # Supports the per-part lookups that keep the index current
+    op.create_index('ix_supplier_order_items_part_id', 'supplier_order_items', ['part_id'])
+
+    # Backfill: same rules as crud/part_price_index.PRICE_INDEX_REFRESH
+    op.execute("""
+        INSERT INTO part_price_index
+            (part_id, latest_unit_price, latest_order_date, average_unit_cost, received_quantity, updated_at)
+        SELECT p.part_id, latest.unit_price, latest.order_date,
+               received.total_cost / NULLIF(received.quantity, 0),
+               COALESCE(received.quantity, 0),
+               now()
+        FROM (SELECT DISTINCT part_id FROM supplier_order_items WHERE unit_price IS NOT NULL) p
+        CROSS JOIN LATERAL (
+            SELECT soi.unit_price, so.order_date
+            FROM supplier_order_items soi
+            JOIN supplier_orders so ON so.id = soi.supplier_order_id
+            WHERE soi.part_id = p.part_id
+              AND soi.unit_price IS NOT NULL
+            ORDER BY so.order_date DESC, soi.created_at DESC
+            LIMIT 1
+        ) latest
+        LEFT JOIN LATERAL (
+            SELECT SUM(soi.quantity * soi.unit_price) AS total_cost, SUM(soi.quantity) AS quantity
+            FROM supplier_order_items soi
+            JOIN supplier_orders so ON so.id = soi.supplier_order_id
+            WHERE soi.part_id = p.part_id
+              AND soi.unit_price IS NOT NULL
+              AND so.status IN ('Delivered', 'Received')
+        ) received ON true
+    """)
+
+
+def downgrade():
+    """Drop the part price index."""
+    op.drop_index('ix_supplier_order_items_part_id', table_name='supplier_order_items')
+    op.drop_table('part_price_index')
@@ -0,0 +1,60 @@
+"""add trigram indexes and a search vector for parts search
+
+Revision ID: parts_search_001
+Revises: part_price_index_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'parts_search_001'
+down_revision = 'part_price_index_001'
+branch_labels = None
+depends_on = None
+
+# Same expression as models.PART_SEARCH_VECTOR_SQL
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, replace(name, '|', ' ')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, part_number), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'C')"
+)
+
+# Parts search filters with ILIKE '%term%' on each of these columns; a trigram
+# index per column turns the OR into a bitmap OR of index scans
+TRIGRAM_INDEXES = [
+    ('idx_parts_name_trgm', 'name'),
+    ('idx_parts_part_number_trgm', 'part_number'),
+    ('idx_parts_description_trgm', 'description'),
+]
+
+
+def upgrade():
+    """Create the pg_trgm indexes and the generated search vector."""
+    # pg_trgm is a trusted extension: the database owner may create it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for name, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            'parts',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+    op.add_column(
+        'parts',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True))
+    )
+    op.create_index('idx_parts_search_vector', 'parts', ['search_vector'], postgresql_using='gin')
+
+
+def downgrade():
+    """Drop the parts search indexes and the search vector (pg_trgm is kept)."""
+    op.drop_index('idx_parts_search_vector', table_name='parts')
+    op.drop_column('parts', 'search_vector')
+    for name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name='parts')
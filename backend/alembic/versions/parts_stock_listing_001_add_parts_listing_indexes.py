@@ -0,0 +1,36 @@
+"""add indexes for the inventory-joined parts listing
+
+Revision ID: parts_stock_listing_001
+Revises: parts_search_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'parts_stock_listing_001'
+down_revision = 'parts_search_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index inventory by part and parts by creation time."""
+    # The parts listing sums each part's inventory rows; the unique
+    # (warehouse_id, part_id) constraint cannot serve lookups by part alone.
+    # The included columns let the sum and low stock check run index-only.
+    op.create_index(
+        'idx_inventory_part_stock',
+        'inventory',
+        ['part_id'],
+        postgresql_include=['warehouse_id', 'current_stock', 'minimum_stock_recommendation']
+    )
+    # Newest-first pages scan parts backwards in index order and stop after the page
+    op.create_index('idx_parts_created_at', 'parts', ['created_at'])
+
+
+def downgrade():
+    """Drop the parts listing indexes."""
+    op.drop_index('idx_parts_created_at', table_name='parts')
+    op.drop_index('idx_inventory_part_stock', table_name='inventory')
@@ -0,0 +1,111 @@
+"""add warehouse_part_stock and organization_part_stock rollup tables
+
+Revision ID: stock_rollup_001
+Revises: ai_stream_metrics_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'stock_rollup_001'
+down_revision = 'ai_stream_metrics_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the stock rollup tables and backfill them from existing stock history."""
+
+    op.create_table(
+        'warehouse_part_stock',
+        sa.Column('warehouse_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('warehouses.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('part_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('parts.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('organizations.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('stock', sa.DECIMAL(precision=10, scale=3), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_warehouse_part_stock_org_part', 'warehouse_part_stock', ['organization_id', 'part_id'])
+
+    # Primary key (organization_id, part_id) serves the per-organization read
+    op.create_table(
+        'organization_part_stock',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('organizations.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('part_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('parts.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_stock', sa.DECIMAL(precision=12, scale=3), nullable=False, server_default='0'),
+        sa.Column('warehouse_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_minimum_stock', sa.DECIMAL(precision=10, scale=3), nullable=False, server_default='0'),
+        sa.Column('is_low_stock', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    # Backfill: same rules as calculate_current_stock (latest adjustment as
+    # baseline plus later transactions), for every warehouse/part with history
+    op.execute("""
+        INSERT INTO warehouse_part_stock (warehouse_id, part_id, organization_id, stock, updated_at)
+        SELECT k.warehouse_id, k.part_id, w.organization_id,
+               COALESCE(adj.quantity_after, 0) + COALESCE(mov.delta, 0),
+               now()
+        FROM (
+            SELECT to_warehouse_id AS warehouse_id, part_id FROM transactions WHERE to_warehouse_id IS NOT NULL
+            UNION
+            SELECT from_warehouse_id, part_id FROM transactions WHERE from_warehouse_id IS NOT NULL
+            UNION
+            SELECT sa.warehouse_id, sai.part_id
+            FROM stock_adjustment_items sai
+            JOIN stock_adjustments sa ON sa.id = sai.stock_adjustment_id
+            UNION
+            SELECT warehouse_id, part_id FROM inventory
+        ) k
+        JOIN warehouses w ON w.id = k.warehouse_id
+        LEFT JOIN LATERAL (
+            SELECT sai.quantity_after, sa.adjustment_date
+            FROM stock_adjustment_items sai
+            JOIN stock_adjustments sa ON sa.id = sai.stock_adjustment_id
+            WHERE sa.warehouse_id = k.warehouse_id
+              AND sai.part_id = k.part_id
+              AND sa.adjustment_date <= now()
+            ORDER BY sa.adjustment_date DESC
+            LIMIT 1
+        ) adj ON true
+        LEFT JOIN LATERAL (
+            SELECT SUM(CASE WHEN t.to_warehouse_id = k.warehouse_id THEN t.quantity ELSE -t.quantity END) AS delta
+            FROM transactions t
+            WHERE t.part_id = k.part_id
+              AND (t.to_warehouse_id = k.warehouse_id OR t.from_warehouse_id = k.warehouse_id)
+              AND t.transaction_date <= now()
+              AND (adj.adjustment_date IS NULL OR t.transaction_date > adj.adjustment_date)
+        ) mov ON true
+    """)
+
+    op.execute("""
+        INSERT INTO organization_part_stock
+            (organization_id, part_id, total_stock, warehouse_count, max_minimum_stock, is_low_stock, updated_at)
+        SELECT m.organization_id, m.part_id,
+               COALESCE(s.total_stock, 0),
+               COALESCE(s.warehouse_count, 0),
+               m.max_minimum_stock,
+               COALESCE(s.total_stock, 0) <= m.max_minimum_stock,
+               now()
+        FROM (
+            SELECT w.organization_id, i.part_id, MAX(i.minimum_stock_recommendation) AS max_minimum_stock
+            FROM inventory i
+            JOIN warehouses w ON w.id = i.warehouse_id
+            GROUP BY w.organization_id, i.part_id
+        ) m
+        LEFT JOIN (
+            SELECT organization_id, part_id, SUM(stock) AS total_stock, COUNT(*) AS warehouse_count
+            FROM warehouse_part_stock
+            WHERE stock > 0
+            GROUP BY organization_id, part_id
+        ) s ON s.organization_id = m.organization_id AND s.part_id = m.part_id
+    """)
+
+
+def downgrade():
+    """Drop the stock rollup tables."""
+    op.drop_table('organization_part_stock')
+    op.drop_index('ix_warehouse_part_stock_org_part', table_name='warehouse_part_stock')
+    op.drop_table('warehouse_part_stock')
@@ -0,0 +1,52 @@
+"""add sync_version columns and sync_tombstones for delta sync
+
+Revision ID: sync_001
+Revises: image_version_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'sync_001'
+down_revision = 'image_version_001'
+branch_labels = None
+depends_on = None
+
+SYNC_TABLES = ['maintenance_protocols', 'protocol_checklist_items', 'machines', 'farm_sites', 'nets']
+
+
+def upgrade():
+    """Create the change sequence, version the syncable tables and add tombstones."""
+    op.execute("CREATE SEQUENCE sync_change_seq")
+
+    # The volatile default gives every existing row its own version
+    for table in SYNC_TABLES:
+        op.add_column(table, sa.Column(
+            'sync_version', sa.BigInteger(),
+            server_default=sa.text("nextval('sync_change_seq')"), nullable=False
+        ))
+        op.create_index(f'ix_{table}_sync_version', table, ['sync_version'])
+
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('resource', sa.String(length=50), nullable=False),
+        sa.Column('resource_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('sync_version', sa.BigInteger(), server_default=sa.text("nextval('sync_change_seq')"), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_sync_tombstones_resource_version', 'sync_tombstones', ['resource', 'sync_version'])
+
+
+def downgrade():
+    """Drop delta sync tables, columns and sequence."""
+    op.drop_index('ix_sync_tombstones_resource_version', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    for table in reversed(SYNC_TABLES):
+        op.drop_index(f'ix_{table}_sync_version', table_name=table)
+        op.drop_column(table, 'sync_version')
+    op.execute("DROP SEQUENCE sync_change_seq")
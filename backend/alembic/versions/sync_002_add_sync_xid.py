@@ -0,0 +1,46 @@
+"""record the writing transaction of delta-sync rows and tombstones
+
+Revision ID: sync_002
+Revises: parts_stock_listing_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'sync_002'
+down_revision = 'parts_stock_listing_001'
+branch_labels = None
+depends_on = None
+
+SYNC_TABLES = ['maintenance_protocols', 'protocol_checklist_items', 'machines', 'farm_sites', 'nets']
+
+# Same expression as models.CURRENT_XID_SQL
+CURRENT_XID_SQL = "(pg_current_xact_id()::text::bigint)"
+
+
+def upgrade():
+    """Add sync_xid to the syncable tables and to sync_tombstones."""
+    # Existing rows get this migration's transaction; their versions still
+    # order them, so a full download pages through them as before
+    for table in SYNC_TABLES:
+        op.add_column(table, sa.Column(
+            'sync_xid', sa.BigInteger(), server_default=sa.text(CURRENT_XID_SQL), nullable=False
+        ))
+        op.create_index(f'ix_{table}_sync_xid', table, ['sync_xid'])
+
+    op.add_column('sync_tombstones', sa.Column(
+        'sync_xid', sa.BigInteger(), server_default=sa.text(CURRENT_XID_SQL), nullable=False
+    ))
+    op.create_index('ix_sync_tombstones_resource_xid', 'sync_tombstones', ['resource', 'sync_xid'])
+
+
+def downgrade():
+    """Drop the sync_xid columns."""
+    op.drop_index('ix_sync_tombstones_resource_xid', table_name='sync_tombstones')
+    op.drop_column('sync_tombstones', 'sync_xid')
+    for table in reversed(SYNC_TABLES):
+        op.drop_index(f'ix_{table}_sync_xid', table_name=table)
+        op.drop_column(table, 'sync_xid')
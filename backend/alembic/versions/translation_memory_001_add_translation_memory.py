@@ -0,0 +1,34 @@
+"""add translation_memory for machine translations
+
+Revision ID: translation_memory_001
+Revises: sync_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'translation_memory_001'
+down_revision = 'sync_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the translation memory table."""
+    op.create_table(
+        'translation_memory',
+        sa.Column('source_hash', sa.String(length=64), nullable=False),
+        sa.Column('source_language', sa.String(length=5), nullable=False),
+        sa.Column('target_language', sa.String(length=5), nullable=False),
+        sa.Column('source_text', sa.Text(), nullable=False),
+        sa.Column('translated_text', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('source_hash', 'source_language', 'target_language')
+    )
+
+
+def downgrade():
+    """Drop the translation memory table."""
+    op.drop_table('translation_memory')
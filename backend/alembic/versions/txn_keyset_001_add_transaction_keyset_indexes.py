@@ -0,0 +1,55 @@
+"""add composite indexes for keyset-paginated transaction search
+
+Revision ID: txn_keyset_001
+Revises: stock_rollup_001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'txn_keyset_001'
+down_revision = 'stock_rollup_001'
+branch_labels = None
+depends_on = None
+
+# Transaction search orders by (transaction_date DESC, id DESC) and pages with
+# a row comparison on the same pair. Each supported equality filter gets an
+# index with that pair as suffix so a page is a short index range scan.
+KEYSET_INDEXES = [
+    ('ix_transactions_date_id', []),
+    ('ix_transactions_part_date_id', ['part_id']),
+    ('ix_transactions_type_date_id', ['transaction_type']),
+    ('ix_transactions_from_wh_date_id', ['from_warehouse_id']),
+    ('ix_transactions_to_wh_date_id', ['to_warehouse_id']),
+    ('ix_transactions_user_date_id', ['performed_by_user_id']),
+    ('ix_transactions_type_part_date_id', ['transaction_type', 'part_id']),
+]
+
+
+def upgrade():
+    """Create keyset indexes for transaction search."""
+    for name, prefix in KEYSET_INDEXES:
+        op.create_index(
+            name,
+            'transactions',
+            prefix + [sa.text('transaction_date DESC'), sa.text('id DESC')],
+            unique=False
+        )
+
+    # Most transactions have no machine; keep the machine index small
+    op.create_index(
+        'ix_transactions_machine_date_id',
+        'transactions',
+        ['machine_id', sa.text('transaction_date DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('machine_id IS NOT NULL')
+    )
+
+
+def downgrade():
+    """Drop keyset indexes for transaction search."""
+    op.drop_index('ix_transactions_machine_date_id', table_name='transactions')
+    for name, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(name, table_name='transactions')
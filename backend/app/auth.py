@@ -313,7 +313,7 @@ async def read_users_me(current_user: TokenData = Depends(get_current_user), db:
     from .image_utils import image_to_data_url
     
     profile_photo_url = None
-    if user_db.profile_photo_data:
+    if user_db.profile_photo_version:
         profile_photo_url = image_to_data_url(user_db.profile_photo_data)
     elif user_db.profile_photo_url:
         # Fallback to legacy URL if exists
@@ -326,6 +326,7 @@ async def read_users_me(current_user: TokenData = Depends(get_current_user), db:
         "name": user_db.name,
         "profile_photo_url": profile_photo_url,
         "profile_photo_data_url": profile_photo_url,  # Same as profile_photo_url for consistency
+        "profile_photo_version": user_db.profile_photo_version,
         "role": user_db.role.value if hasattr(user_db.role, 'value') else user_db.role,
         "organization_id": user_db.organization_id,
         "user_status": user_db.user_status.value if hasattr(user_db.user_status, 'value') else user_db.user_status,
@@ -344,7 +345,7 @@ async def read_users_me(current_user: TokenData = Depends(get_current_user), db:
         # Convert organization logo binary data to data URL
         logo_url = None
         logo_data_url = None
-        if user_db.organization.logo_data:
+        if user_db.organization.logo_version:
             logo_data_url = image_to_data_url(user_db.organization.logo_data)
             logo_url = logo_data_url  # Keep legacy field for compatibility
         elif user_db.organization.logo_url:
@@ -357,6 +358,7 @@ async def read_users_me(current_user: TokenData = Depends(get_current_user), db:
             "organization_type": user_db.organization.organization_type.value if hasattr(user_db.organization.organization_type, 'value') else user_db.organization.organization_type,
             "logo_url": logo_url,
             "logo_data_url": logo_data_url,
+            "logo_version": user_db.organization.logo_version,
             "is_active": user_db.organization.is_active,
             "created_at": user_db.organization.created_at,
             "updated_at": user_db.organization.updated_at,
@@ -207,6 +207,19 @@ def invalidate_warehouse_analytics_cache(warehouse_id: str):
     return cache_manager.invalidate_warehouse_cache(warehouse_id)
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match request header against a strong ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
 def get_analytics_cache_stats() -> Dict[str, Any]:
     """Get analytics cache statistics."""
     return cache_manager.get_cache_stats()
\ No newline at end of file
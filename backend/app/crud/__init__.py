@@ -18,4 +18,7 @@ from . import stocktake
 from . import transaction
 from . import maintenance_protocols
 from . import warehouse_locations
+from . import stock_rollup
+from . import part_price_index
+from . import sync
 # Add other CRUD modules here as you create them:
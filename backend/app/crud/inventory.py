@@ -191,65 +191,17 @@ def get_inventory_by_organization(db: Session, organization_id: uuid.UUID, skip:
 
 
 def get_inventory_aggregation_by_organization(db: Session, organization_id: uuid.UUID) -> List[dict]:
-    """Get inventory aggregated by part across all warehouses for an organization with CALCULATED stock."""
-    from sqlalchemy import func
-    from .inventory_calculator import calculate_current_stock
-    
-    # Get all warehouses for this organization
-    warehouses = db.query(models.Warehouse).filter(
-        models.Warehouse.organization_id == organization_id
-    ).all()
-    
-    # Get all unique parts across these warehouses
-    parts_query = db.query(
-        models.Part.id,
-        models.Part.part_number,
-        models.Part.name,
-        models.Part.unit_of_measure
-    ).join(
-        models.Inventory, models.Part.id == models.Inventory.part_id
-    ).join(
-        models.Warehouse, models.Inventory.warehouse_id == models.Warehouse.id
-    ).filter(
-        models.Warehouse.organization_id == organization_id
-    ).distinct().order_by(models.Part.part_number).all()
+    """
+    Get inventory aggregated by part across all warehouses for an organization with CALCULATED stock.
     
-    # Calculate total stock for each part across all warehouses
-    results = []
-    for part in parts_query:
-        total_stock = Decimal('0')
-        warehouse_count = 0
-        
-        for warehouse in warehouses:
-            stock = calculate_current_stock(db, warehouse.id, part.id)
-            if stock > 0:
-                total_stock += stock
-                warehouse_count += 1
-        
-        # Get maximum minimum stock recommendation across warehouses
-        # Using MAX rather than SUM: we want the highest single-warehouse requirement,
-        # not the sum of all warehouses (which inflates the number by warehouse count)
-        min_stock_max = db.query(
-            func.max(models.Inventory.minimum_stock_recommendation)
-        ).join(
-            models.Warehouse
-        ).filter(
-            models.Inventory.part_id == part.id,
-            models.Warehouse.organization_id == organization_id
-        ).scalar() or Decimal('0')
-        
-        results.append({
-            'part_id': str(part.id),
-            'part_number': part.part_number,
-            'part_name': part.name,
-            'unit_of_measure': part.unit_of_measure,
-            'total_stock': float(total_stock),
-            'warehouse_count': warehouse_count,
-            'total_minimum_stock': float(min_stock_max),
-            'is_low_stock': total_stock <= min_stock_max
-        })
+    Served from the organization_part_stock rollup, which is kept current from
+    transactions and stock adjustments (see crud/stock_rollup.py). Total stock
+    counts warehouses with positive stock only, and the minimum stock is the
+    highest single-warehouse recommendation rather than the sum across warehouses.
+    """
+    from .stock_rollup import get_organization_stock_rollup
     
-    return results
+    return get_organization_stock_rollup(db, organization_id)
 
 
 def transfer_inventory_between_warehouses(db: Session, from_warehouse_id: uuid.UUID, 
@@ -550,19 +502,16 @@ def get_warehouse_analytics(db: Session, warehouse_id: uuid.UUID, start_date: Op
                 detail="Database error occurred while calculating inventory summary"
             )
         
-        # Calculate total value using recent order prices with error handling
+        # Calculate total value at the latest supplier order price per part with error handling
         try:
             total_value_query = db.query(
                 func.coalesce(
-                    func.sum(models.Inventory.current_stock * models.SupplierOrderItem.unit_price), 0
+                    func.sum(models.Inventory.current_stock * models.PartPriceIndex.latest_unit_price), 0
                 ).label('total_value')
             ).join(
-                models.SupplierOrderItem, models.Inventory.part_id == models.SupplierOrderItem.part_id
-            ).join(
-                models.SupplierOrder, models.SupplierOrderItem.supplier_order_id == models.SupplierOrder.id
+                models.PartPriceIndex, models.Inventory.part_id == models.PartPriceIndex.part_id
             ).filter(
-                models.Inventory.warehouse_id == warehouse_id,
-                models.SupplierOrderItem.unit_price.isnot(None)
+                models.Inventory.warehouse_id == warehouse_id
             ).first()
         except SQLAlchemyError as e:
             logger.error(f"Database error calculating total value for warehouse {warehouse_id}: {e}")
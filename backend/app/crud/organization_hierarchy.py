@@ -0,0 +1,175 @@
+# backend/app/crud/organization_hierarchy.py
+
+"""
+Organization hierarchy queries backed by recursive CTEs.
+
+Organizations form a tree through parent_organization_id (Oraseas EE ->
+customers -> suppliers). Each question asked of that tree is answered with a
+single statement:
+
+- get_subtree: an organization and all of its descendants, with depth
+- get_ancestor_path: the chain of organizations from the root down to one
+- would_create_cycle: whether re-parenting an organization would create a loop
+- get_accessible_organization_ids: an organization plus its active direct
+  suppliers, which is what the isolation layers let non-super-admins reach
+- get_organization_and_children_ids: an organization plus all of its direct
+  children, which is what non-super-admins see of the organization tree
+
+The hierarchy tree endpoint, organization CRUD and the isolation/permission
+layers all use these functions so the rules live in one place. Recursion is
+capped at MAX_HIERARCHY_DEPTH so corrupt data containing a loop cannot make a
+query run forever.
+"""
+
+import uuid
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Integer, exists, func, literal_column, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from .. import models
+from ..models import OrganizationType
+
+MAX_HIERARCHY_DEPTH = 32
+
+
+def _descendants_cte(root_id: uuid.UUID, include_inactive: bool = True):
+    """Recursive CTE of (id, depth) for root_id and the organizations below it."""
+    org = models.Organization
+    tree = select(
+        org.id.label("id"),
+        literal_column("0", Integer).label("depth")
+    ).where(org.id == root_id).cte("org_subtree", recursive=True)
+
+    child = aliased(org)
+    step = select(child.id, tree.c.depth + 1)\
+        .join(tree, child.parent_organization_id == tree.c.id)\
+        .where(tree.c.depth < MAX_HIERARCHY_DEPTH)
+    if not include_inactive:
+        step = step.where(child.is_active == True)
+
+    return tree.union_all(step)
+
+
+def _ancestors_cte(org_id: uuid.UUID):
+    """Recursive CTE of (id, parent_id, depth) for org_id and its parents, depth counting upwards."""
+    org = models.Organization
+    chain = select(
+        org.id.label("id"),
+        org.parent_organization_id.label("parent_id"),
+        literal_column("0", Integer).label("depth")
+    ).where(org.id == org_id).cte("org_ancestors", recursive=True)
+
+    parent = aliased(org)
+    step = select(parent.id, parent.parent_organization_id, chain.c.depth + 1)\
+        .join(chain, parent.id == chain.c.parent_id)\
+        .where(chain.c.depth < MAX_HIERARCHY_DEPTH)
+
+    return chain.union_all(step)
+
+
+def get_subtree(
+    db: Session,
+    root_id: uuid.UUID,
+    include_inactive: bool = True
+) -> List[Tuple[models.Organization, int]]:
+    """
+    Return (organization, depth) for root_id and every organization below it,
+    ordered by depth then name. The root is returned even if it is inactive;
+    with include_inactive=False inactive descendants and their subtrees are skipped.
+    """
+    tree = _descendants_cte(root_id, include_inactive=include_inactive)
+    depths = select(tree.c.id, func.min(tree.c.depth).label("depth"))\
+        .group_by(tree.c.id)\
+        .subquery()
+
+    return db.query(models.Organization, depths.c.depth)\
+        .join(depths, models.Organization.id == depths.c.id)\
+        .order_by(depths.c.depth, models.Organization.name)\
+        .all()
+
+
+def get_subtree_ids(db: Session, root_id: uuid.UUID, include_inactive: bool = True) -> List[uuid.UUID]:
+    """Return the IDs of root_id and every organization below it."""
+    tree = _descendants_cte(root_id, include_inactive=include_inactive)
+    return list(db.execute(select(tree.c.id).distinct()).scalars())
+
+
+def get_ancestor_path(db: Session, org_id: uuid.UUID) -> List[uuid.UUID]:
+    """Return organization IDs from the top-level root down to org_id (inclusive)."""
+    chain = _ancestors_cte(org_id)
+    rows = db.execute(select(chain.c.id).order_by(chain.c.depth.desc())).scalars()
+
+    # A loop in the data would repeat IDs up to the depth cap; keep the first
+    path: List[uuid.UUID] = []
+    for ancestor_id in rows:
+        if ancestor_id not in path:
+            path.append(ancestor_id)
+    return path
+
+
+def would_create_cycle(db: Session, org_id: uuid.UUID, new_parent_id: uuid.UUID) -> bool:
+    """Check if setting new_parent_id as parent of org_id would create a cycle."""
+    if org_id == new_parent_id:
+        return True
+
+    chain = _ancestors_cte(new_parent_id)
+    return bool(db.execute(select(exists().where(chain.c.id == org_id))).scalar())
+
+
+def get_accessible_organization_ids(db: Session, organization_id: uuid.UUID) -> List[uuid.UUID]:
+    """
+    Organizations a non-super-admin member of organization_id may access:
+    the organization itself plus its active direct suppliers. BossAqua is
+    only visible to super admins and is always excluded.
+    """
+    org = models.Organization
+    query = select(org.id).where(
+        or_(
+            org.id == organization_id,
+            (org.parent_organization_id == organization_id) &
+            (org.organization_type == OrganizationType.supplier) &
+            (org.is_active == True)
+        ),
+        org.organization_type != OrganizationType.bossaqua
+    )
+    return list(db.execute(query).scalars())
+
+
+def get_organization_and_children_ids(
+    db: Session,
+    organization_id: uuid.UUID,
+    include_inactive: bool = True
+) -> List[uuid.UUID]:
+    """
+    Return organization_id and the IDs of all its direct children, of any type.
+    With include_inactive=False inactive organizations, including organization_id
+    itself, are left out.
+    """
+    org = models.Organization
+    query = select(org.id).where(
+        or_(org.id == organization_id, org.parent_organization_id == organization_id)
+    )
+    if not include_inactive:
+        query = query.where(org.is_active == True)
+    return list(db.execute(query).scalars())
+
+
+def build_hierarchy(
+    organizations: List[models.Organization]
+) -> Tuple[List[models.Organization], Dict[uuid.UUID, List[models.Organization]]]:
+    """
+    Group a flat list of organizations into (roots, children_by_parent_id).
+    An organization whose parent is not in the list is treated as a root, so a
+    scoped subset still forms a tree.
+    """
+    by_id = {org.id: org for org in organizations}
+    children: Dict[uuid.UUID, List[models.Organization]] = {org.id: [] for org in organizations}
+    roots = []
+    for org in organizations:
+        parent_id = org.parent_organization_id
+        if parent_id is not None and parent_id in by_id and parent_id != org.id:
+            children[parent_id].append(org)
+        else:
+            roots.append(org)
+    return roots, children
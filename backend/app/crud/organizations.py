@@ -6,6 +6,7 @@ from sqlalchemy import and_, or_
 from .. import models
 from ..models import OrganizationType
 from ..schemas import OrganizationHierarchyNode
+from . import organization_hierarchy
 
 def get_organization(db: Session, organization_id: uuid.UUID):
     """Retrieves a single organization by its ID with parent and children."""
@@ -46,33 +47,26 @@ def get_organizations_by_type(db: Session, organization_type: OrganizationType,
 
 def get_organization_hierarchy(db: Session, root_organization_id: uuid.UUID):
     """Retrieves the complete hierarchy starting from a root organization."""
-    def build_hierarchy(org_id: uuid.UUID, visited: set = None):
-        if visited is None:
-            visited = set()
-        
-        if org_id in visited:
-            return None  # Prevent infinite loops
-        
-        visited.add(org_id)
-        
-        org = get_organization(db, org_id)
-        if not org:
-            return None
-        
-        children = []
-        for child in org.child_organizations:
-            if child.is_active:
-                child_hierarchy = build_hierarchy(child.id, visited.copy())
-                if child_hierarchy:
-                    children.append(child_hierarchy)
-        
+    subtree = organization_hierarchy.get_subtree(db, root_organization_id, include_inactive=False)
+    if not subtree:
+        return None
+
+    # Rows come ordered by depth; attaching each child one level below its
+    # parent keeps the result a tree even if the stored data has a loop
+    depths = {org.id: depth for org, depth in subtree}
+    children = {org.id: [] for org, _ in subtree}
+    for org, depth in subtree[1:]:
+        if depths.get(org.parent_organization_id) == depth - 1:
+            children[org.parent_organization_id].append(org)
+
+    def build_node(org: models.Organization):
         return {
             "organization": org,
-            "children": children,
-            "depth": 0  # Will be calculated by caller if needed
+            "children": [build_node(child) for child in children[org.id]],
+            "depth": depths[org.id]
         }
-    
-    return build_hierarchy(root_organization_id)
+
+    return build_node(subtree[0][0])
 
 def get_child_organizations(db: Session, parent_id: uuid.UUID, include_inactive: bool = False):
     """Retrieves direct children of an organization."""
@@ -254,24 +248,7 @@ def delete_organization(db: Session, organization_id: uuid.UUID):
 
 def _would_create_cycle(db: Session, org_id: uuid.UUID, new_parent_id: uuid.UUID) -> bool:
     """Check if setting new_parent_id as parent of org_id would create a cycle."""
-    visited = set()
-    current_id = new_parent_id
-    
-    while current_id and current_id not in visited:
-        if current_id == org_id:
-            return True
-        
-        visited.add(current_id)
-        parent_org = db.query(models.Organization)\
-            .filter(models.Organization.id == current_id)\
-            .first()
-        
-        if not parent_org:
-            break
-        
-        current_id = parent_org.parent_organization_id
-    
-    return False
+    return organization_hierarchy.would_create_cycle(db, org_id, new_parent_id)
 
 def get_potential_parent_organizations(db: Session, organization_type: OrganizationType):
     """
@@ -516,23 +493,8 @@ def get_organization_hierarchy_tree(
     # Fetch all organizations in a single query
     all_orgs = query.order_by(models.Organization.name).all()
     
-    # Build parent-child mapping
-    org_dict = {org.id: org for org in all_orgs}
-    children_map = {}
-    
-    # Initialize children map
-    for org in all_orgs:
-        children_map[org.id] = []
-    
-    # Populate children map and identify roots
-    root_orgs = []
-    for org in all_orgs:
-        if org.parent_organization_id is None:
-            # This is a root organization
-            root_orgs.append(org)
-        elif org.parent_organization_id in org_dict:
-            # Add to parent's children list
-            children_map[org.parent_organization_id].append(org)
+    # Build parent-child mapping; organizations whose parent is out of scope become roots
+    root_orgs, children_map = organization_hierarchy.build_hierarchy(all_orgs)
     
     def build_hierarchy_node(org: models.Organization) -> OrganizationHierarchyNode:
         """Recursively build hierarchy node with children."""
@@ -554,7 +516,8 @@ def get_organization_hierarchy_tree(
             parent_organization_id=org.parent_organization_id,
             created_at=org.created_at,
             updated_at=org.updated_at,
-            children=children
+            children=children,
+            logo_version=org.logo_version
         )
     
     # Build hierarchy tree starting from root organizations
@@ -0,0 +1,209 @@
+# backend/app/crud/part_price_index.py
+
+"""
+Per-part unit cost index used for inventory valuation.
+
+Valuing inventory needs a unit cost per part, taken from supplier order items.
+Looking it up per inventory row, or joining every past order item, gets slower
+with every order placed, so part_price_index keeps one row per priced part:
+
+- latest_unit_price / latest_order_date: unit price of the most recent supplier
+  order item with a price (by order date), the basis of estimated stock value
+- average_unit_cost / received_quantity: quantity-weighted average unit price
+  of priced items on received (Delivered/Received) orders
+
+Like the stock rollup (crud/stock_rollup.py), the index is maintained by
+session event listeners registered in this module: a flush that creates,
+changes or deletes supplier order items, or changes the date or status of a
+supplier order, recalculates only the parts involved. Valuation queries then
+need a single join on part_id. rebuild_part_price_index, exposed as
+scripts/rebuild_part_price_index.py, repairs the index after raw SQL writes.
+"""
+
+import logging
+import uuid
+from itertools import chain
+from typing import Iterable, Set
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+REFRESH_BATCH_SIZE = 5000
+
+# Columns whose changes move a part's price, per mapped class
+_ITEM_PRICE_ATTRS = ('part_id', 'supplier_order_id', 'quantity', 'unit_price')
+_ORDER_PRICE_ATTRS = ('order_date', 'status')
+
+PRICE_INDEX_REFRESH = text("""
+    WITH keys AS (
+        SELECT DISTINCT k.part_id
+        FROM unnest(CAST(:part_ids AS uuid[])) AS k(part_id)
+    ),
+    prices AS (
+        SELECT k.part_id, latest.unit_price, latest.order_date,
+               received.total_cost, received.quantity
+        FROM keys k
+        LEFT JOIN LATERAL (
+            SELECT soi.unit_price, so.order_date
+            FROM supplier_order_items soi
+            JOIN supplier_orders so ON so.id = soi.supplier_order_id
+            WHERE soi.part_id = k.part_id
+              AND soi.unit_price IS NOT NULL
+            ORDER BY so.order_date DESC, soi.created_at DESC
+            LIMIT 1
+        ) latest ON true
+        LEFT JOIN LATERAL (
+            SELECT SUM(soi.quantity * soi.unit_price) AS total_cost, SUM(soi.quantity) AS quantity
+            FROM supplier_order_items soi
+            JOIN supplier_orders so ON so.id = soi.supplier_order_id
+            WHERE soi.part_id = k.part_id
+              AND soi.unit_price IS NOT NULL
+              AND so.status IN ('Delivered', 'Received')
+        ) received ON true
+    ),
+    removed AS (
+        DELETE FROM part_price_index i
+        USING prices p
+        WHERE i.part_id = p.part_id
+          AND p.unit_price IS NULL
+    )
+    INSERT INTO part_price_index
+        (part_id, latest_unit_price, latest_order_date, average_unit_cost, received_quantity, updated_at)
+    SELECT part_id, unit_price, order_date,
+           total_cost / NULLIF(quantity, 0),
+           COALESCE(quantity, 0),
+           now()
+    FROM prices
+    WHERE unit_price IS NOT NULL
+    ON CONFLICT (part_id) DO UPDATE
+    SET latest_unit_price = EXCLUDED.latest_unit_price,
+        latest_order_date = EXCLUDED.latest_order_date,
+        average_unit_cost = EXCLUDED.average_unit_cost,
+        received_quantity = EXCLUDED.received_quantity,
+        updated_at = EXCLUDED.updated_at
+""")
+
+
+def refresh_part_prices(connection, part_ids: Iterable[uuid.UUID]) -> int:
+    """
+    Recalculate the price index rows of the given parts.
+
+    Runs in the caller's transaction, so the index commits or rolls back
+    together with the change that triggered it.
+
+    Args:
+        connection: SQLAlchemy Connection or Session
+        part_ids: Parts whose supplier order items may have changed
+
+    Returns:
+        Number of parts recalculated
+    """
+    # Sorted so concurrent writers lock index rows in the same order
+    ordered = sorted({str(p) for p in part_ids if p is not None})
+    for start in range(0, len(ordered), REFRESH_BATCH_SIZE):
+        connection.execute(PRICE_INDEX_REFRESH, {'part_ids': ordered[start:start + REFRESH_BATCH_SIZE]})
+    return len(ordered)
+
+
+def rebuild_part_price_index(db: Session) -> int:
+    """
+    Rebuild the part price index from scratch, for recovery.
+
+    Returns:
+        Number of parts recalculated
+    """
+    db.query(models.PartPriceIndex).delete(synchronize_session=False)
+    part_ids = db.execute(
+        select(models.SupplierOrderItem.part_id).where(
+            models.SupplierOrderItem.unit_price.isnot(None)
+        ).distinct()
+    ).scalars().all()
+    refreshed = refresh_part_prices(db, part_ids)
+    db.commit()
+
+    logger.info(f"Rebuilt part price index for {refreshed} parts")
+    return refreshed
+
+
+# --- Incremental maintenance ---
+
+def _attribute_values(obj, attr: str) -> Set:
+    """Current and pre-flush values of an attribute."""
+    history = inspect(obj).attrs[attr].history
+    values = set(history.sum())
+    if not values:
+        values.add(getattr(obj, attr))
+    return values
+
+
+def _price_changed(obj, attrs) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def _collect_flush_parts(session: Session, connection) -> Set[uuid.UUID]:
+    """Parts whose price may have changed in this flush."""
+    part_ids: Set[uuid.UUID] = set()
+    changed_orders = []
+
+    for obj, is_dirty in chain(
+        ((o, False) for o in session.new),
+        ((o, True) for o in session.dirty),
+        ((o, False) for o in session.deleted)
+    ):
+        if isinstance(obj, models.SupplierOrderItem):
+            if is_dirty and not _price_changed(obj, _ITEM_PRICE_ATTRS):
+                continue
+            part_ids.update(_attribute_values(obj, 'part_id'))
+
+        elif isinstance(obj, models.SupplierOrder):
+            if is_dirty and _price_changed(obj, _ORDER_PRICE_ATTRS):
+                changed_orders.append(obj.id)
+
+    if changed_orders:
+        part_ids.update(connection.execute(
+            select(models.SupplierOrderItem.part_id).where(
+                models.SupplierOrderItem.supplier_order_id.in_(changed_orders)
+            )
+        ).scalars().all())
+
+    return part_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_prices_after_flush(session, flush_context):
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+
+    part_ids = _collect_flush_parts(session, connection)
+    if part_ids:
+        refresh_part_prices(connection, part_ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _refresh_prices_after_bulk_delete(orm_execute_state):
+    if not orm_execute_state.is_delete:
+        return None
+
+    statement = orm_execute_state.statement
+    if statement.table.name != models.SupplierOrderItem.__tablename__:
+        return None
+
+    session = orm_execute_state.session
+    if session.connection().dialect.name != "postgresql":
+        return None
+
+    parts_query = select(models.SupplierOrderItem.part_id)
+    if statement.whereclause is not None:
+        parts_query = parts_query.where(statement.whereclause)
+
+    part_ids = session.connection().execute(parts_query).scalars().all()
+    result = orm_execute_state.invoke_statement()
+    if part_ids:
+        refresh_part_prices(session.connection(), part_ids)
+    return result
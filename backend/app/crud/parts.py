@@ -1,5 +1,6 @@
 # backend/app/crud/parts.py
 
+import re
 import uuid
 import logging
 import time
@@ -8,7 +9,8 @@ from decimal import Decimal
 from datetime import datetime, timedelta
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc, text
+from sqlalchemy import Text, and_, case, cast, false, func, desc, or_, select, text, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from fastapi import HTTPException, status
 
 from .. import models, schemas # Import models and schemas
@@ -217,6 +219,88 @@ def get_filtered_parts_with_count(db: Session, part_type: Optional[str] = None,
         "has_more": has_more
     }
 
+# --- Parts search ---
+# Matching stays a substring ILIKE on name, part number and description (served
+# by the pg_trgm indexes), so a term finds exactly what it always has. Matches
+# are ordered by relevance: exact and prefix part number matches first, then
+# matches at the start of a word in any language variant of the name, then by
+# full-text rank over search_vector.
+
+_SEARCH_WORD = re.compile(r"[^\W_]+")
+
+
+def _prefix_tsquery(search_term: str) -> Optional[str]:
+    """to_tsquery() text matching words that start with each word of the term."""
+    words = _SEARCH_WORD.findall(search_term.lower())
+    return " & ".join(f"{word}:*" for word in words) if words else None
+
+
+def _part_search_conditions(search_term: str) -> list:
+    return [
+        models.Part.name.ilike(f"%{search_term}%"),
+        models.Part.part_number.ilike(f"%{search_term}%"),
+        models.Part.description.ilike(f"%{search_term}%")
+    ]
+
+
+def _part_search_order(search_term: str) -> list:
+    """ORDER BY clauses ranking parts by relevance to the search term."""
+    tsquery = _prefix_tsquery(search_term)
+    tiers = [
+        (func.lower(models.Part.part_number) == search_term.lower(), 3),
+        (models.Part.part_number.ilike(f"{search_term}%"), 2),
+    ]
+    order = []
+    if tsquery:
+        query = func.to_tsquery("simple", tsquery)
+        tiers.append((models.Part.search_vector.op("@@")(query), 1))
+        order.append(func.ts_rank(models.Part.search_vector, query).desc())
+    return [case(*tiers, else_=0).desc(), *order, models.Part.part_number]
+
+
+def _matching_name_variant(name: str, search_term: str) -> str:
+    """The language variant of a pipe-separated name the term matched, else the first one."""
+    variants = [variant.strip() for variant in name.split("|") if variant.strip()] or [name]
+    words = _SEARCH_WORD.findall(search_term.lower())
+    for variant in variants:
+        variant_words = _SEARCH_WORD.findall(variant.lower())
+        if words and all(any(vw.startswith(word) for vw in variant_words) for word in words):
+            return variant
+    return variants[0]
+
+
+@monitor_performance("parts_crud.autocomplete_parts", param_keys=["limit"])
+def autocomplete_parts(db: Session, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Suggest parts for a search box as the user types.
+    
+    A part matches when its part number, or a word in any language variant of
+    its name, starts with the prefix (each word of it, for several words).
+    
+    Args:
+        db: Database session
+        prefix: What the user has typed so far
+        limit: Maximum number of suggestions
+        
+    Returns:
+        Suggestions with the part's full name and the name variant that matched
+    """
+    conditions = [models.Part.part_number.ilike(f"{prefix}%")]
+    tsquery = _prefix_tsquery(prefix)
+    if tsquery:
+        conditions.append(models.Part.search_vector.op("@@")(func.to_tsquery("simple", tsquery)))
+    
+    rows = db.query(models.Part.id, models.Part.part_number, models.Part.name).filter(
+        or_(*conditions)
+    ).order_by(*_part_search_order(prefix)).limit(limit).all()
+    
+    return [{
+        "id": row.id,
+        "part_number": row.part_number,
+        "name": row.name,
+        "matched_name": _matching_name_variant(row.name, prefix)
+    } for row in rows]
+
 @monitor_performance("parts_crud.search_parts", param_keys=["part_type", "is_proprietary", "skip", "limit"])
 def search_parts(db: Session, search_term: str, part_type: Optional[str] = None, is_proprietary: Optional[bool] = None, skip: int = 0, limit: int = 100):
     """
@@ -231,18 +315,10 @@ def search_parts(db: Session, search_term: str, part_type: Optional[str] = None,
         limit: Maximum number of records to return
         
     Returns:
-        List of parts matching the search criteria
+        List of parts matching the search criteria, most relevant first
     """
-    from sqlalchemy import or_
-    
     # Start with base query
-    query = db.query(models.Part).filter(
-        or_(
-            models.Part.name.ilike(f"%{search_term}%"),
-            models.Part.part_number.ilike(f"%{search_term}%"),
-            models.Part.description.ilike(f"%{search_term}%")
-        )
-    )
+    query = db.query(models.Part).filter(or_(*_part_search_conditions(search_term)))
     
     # Apply additional filters if provided
     if part_type:
@@ -258,7 +334,7 @@ def search_parts(db: Session, search_term: str, part_type: Optional[str] = None,
         query = query.filter(models.Part.is_proprietary == is_proprietary)
     
     # Apply pagination
-    return query.offset(skip).limit(limit).all()
+    return query.order_by(*_part_search_order(search_term)).offset(skip).limit(limit).all()
 
 def validate_multilingual_name(name: str) -> bool:
     """
@@ -318,15 +394,9 @@ def search_parts_multilingual(db: Session, search_term: str, part_type: Optional
     Returns:
         List of parts matching the search criteria
     """
-    from sqlalchemy import or_, func
-    
     # Create search conditions for multilingual names
     # This will search in the full name field which may contain pipe-separated values
-    search_conditions = [
-        models.Part.name.ilike(f"%{search_term}%"),
-        models.Part.part_number.ilike(f"%{search_term}%"),
-        models.Part.description.ilike(f"%{search_term}%")
-    ]
+    search_conditions = _part_search_conditions(search_term)
     
     # Add search in new fields
     if hasattr(models.Part, 'manufacturer') and models.Part.manufacturer is not None:
@@ -352,8 +422,8 @@ def search_parts_multilingual(db: Session, search_term: str, part_type: Optional
     if is_proprietary is not None:
         query = query.filter(models.Part.is_proprietary == is_proprietary)
     
-    # Apply pagination and return results
-    parts = query.offset(skip).limit(limit).all()
+    # Apply pagination and return results, most relevant first
+    parts = query.order_by(*_part_search_order(search_term)).offset(skip).limit(limit).all()
     return [_add_image_urls_to_part(part) for part in parts]
 
 @monitor_performance("parts_crud.search_parts_multilingual_with_count", param_keys=["part_type", "is_proprietary", "skip", "limit", "include_count"])
@@ -375,14 +445,8 @@ def search_parts_multilingual_with_count(db: Session, search_term: str, part_typ
     Returns:
         Dictionary with items, total_count (if requested), and has_more flag
     """
-    from sqlalchemy import or_, func
-    
     # Create search conditions for multilingual names
-    search_conditions = [
-        models.Part.name.ilike(f"%{search_term}%"),
-        models.Part.part_number.ilike(f"%{search_term}%"),
-        models.Part.description.ilike(f"%{search_term}%")
-    ]
+    search_conditions = _part_search_conditions(search_term)
     
     # Add search in new fields
     if hasattr(models.Part, 'manufacturer') and models.Part.manufacturer is not None:
@@ -413,8 +477,8 @@ def search_parts_multilingual_with_count(db: Session, search_term: str, part_typ
     if include_count:
         total_count = query.count()
     
-    # Get paginated results
-    items = query.offset(skip).limit(limit + 1).all()  # Get one extra to check if there are more
+    # Get paginated results, most relevant first
+    items = query.order_by(*_part_search_order(search_term)).offset(skip).limit(limit + 1).all()  # Get one extra to check if there are more
     
     # Check if there are more items
     has_more = len(items) > limit
@@ -646,26 +710,154 @@ def get_part_with_inventory(db: Session, part_id: uuid.UUID, organization_id: Op
         logger.info(f"Returning part {part_id} with empty inventory data - tables not implemented")
     
     # Create response
-    result = {
+    return {
         **part.__dict__,
         "total_stock": total_stock,
         "warehouse_inventory": warehouse_inventory,
-        "is_low_stock": is_low_stock
+        "is_low_stock": is_low_stock,
+        "image_urls": _inventory_image_urls(part)
     }
-    
-    # Handle image data - preserve existing image_urls if no image_data
+
+def _inventory_image_urls(part) -> List[str]:
+    """Image URLs for a part with inventory, preserving existing image_urls if no image_data."""
     if part.image_data and len(part.image_data) > 0:
         # Convert binary image data to URLs for frontend compatibility
         base_url = "http://localhost:8000"
-        result["image_urls"] = [f"{base_url}/images/parts/{part.id}?index={i}" for i in range(len(part.image_data))]
-    elif part.image_urls and len(part.image_urls) > 0:
+        return [f"{base_url}/images/parts/{part.id}?index={i}" for i in range(len(part.image_data))]
+    if part.image_urls and len(part.image_urls) > 0:
         # Keep existing image_urls (base64 data URLs or regular URLs)
-        result["image_urls"] = part.image_urls
+        return part.image_urls
+    # No images at all
+    return []
+
+# Stock statuses and sort fields the inventory listing evaluates in the database
+PART_STOCK_STATUSES = ("in_stock", "low", "out")
+PART_INVENTORY_SORT_FIELDS = ("created_at", "name", "part_number", "total_stock")
+
+def _part_stock_lateral(organization_id: Optional[uuid.UUID] = None):
+    """
+    Stock of each part as a LATERAL subquery correlated to the parts row.
+
+    Yields exactly one row per part: total stock, whether any warehouse is
+    below its minimum recommendation, and the warehouse rows as JSON (NULL
+    without inventory). Quantities are serialized as text so they come back
+    as exact Decimals.
+    """
+    inventory = models.Inventory
+    item_is_low = and_(
+        inventory.minimum_stock_recommendation != 0,
+        inventory.current_stock < inventory.minimum_stock_recommendation
+    )
+    warehouse_row = func.json_build_object(
+        "warehouse_id", inventory.warehouse_id,
+        "warehouse_name", models.Warehouse.name,
+        "current_stock", cast(inventory.current_stock, Text),
+        "minimum_stock_recommendation", cast(inventory.minimum_stock_recommendation, Text),
+        "is_low_stock", item_is_low,
+        "unit_of_measure", inventory.unit_of_measure
+    )
+    stock = select(
+        func.coalesce(func.sum(inventory.current_stock), 0).label("total_stock"),
+        func.coalesce(func.bool_or(item_is_low), false()).label("is_low_stock"),
+        func.json_agg(aggregate_order_by(warehouse_row, models.Warehouse.name)).label("warehouse_inventory")
+    ).join_from(
+        inventory, models.Warehouse, inventory.warehouse_id == models.Warehouse.id
+    ).where(inventory.part_id == models.Part.id)
+
+    if organization_id:
+        stock = stock.where(models.Warehouse.organization_id == organization_id)
+
+    return stock.lateral("part_stock")
+
+def _part_with_stock(part, total_stock, is_low_stock, warehouse_rows) -> Dict[str, Any]:
+    """Build the get_part_with_inventory response from a row of the listing query."""
+    warehouse_inventory = [
+        {
+            "warehouse_id": uuid.UUID(row["warehouse_id"]),
+            "warehouse_name": row["warehouse_name"],
+            "current_stock": Decimal(row["current_stock"]),
+            "minimum_stock_recommendation": Decimal(row["minimum_stock_recommendation"]),
+            "is_low_stock": row["is_low_stock"],
+            "unit_of_measure": row["unit_of_measure"]
+        }
+        for row in warehouse_rows or []
+    ]
+    return {
+        **part.__dict__,
+        "total_stock": total_stock,
+        "warehouse_inventory": warehouse_inventory,
+        "is_low_stock": is_low_stock,
+        "image_urls": _inventory_image_urls(part)
+    }
+
+def _parts_with_stock_page(db: Session, organization_id: Optional[uuid.UUID] = None,
+                           part_type: Optional[str] = None, is_proprietary: Optional[bool] = None,
+                           search_term: Optional[str] = None, stock_status: Optional[str] = None,
+                           sort_by: Optional[str] = None, sort_order: str = "asc",
+                           skip: int = 0, limit: int = 100, include_count: bool = False) -> Dict[str, Any]:
+    """
+    One page of parts with their inventory, from a single query.
+
+    Stock comes from _part_stock_lateral, so filtering by stock status and
+    sorting by total stock happen in the database. Without sort_by, parts are
+    ordered newest first, or by relevance when searching.
+    """
+    part_filters = []
+    if search_term:
+        part_filters.append(or_(*_part_search_conditions(search_term)))
+
+    if part_type:
+        try:
+            enum_part_type = models.PartType(part_type)
+            part_filters.append(models.Part.part_type == enum_part_type)
+        except ValueError:
+            logger.warning(f"Invalid part_type filter: {part_type}")
+
+    if is_proprietary is not None:
+        part_filters.append(models.Part.is_proprietary == is_proprietary)
+
+    stock = _part_stock_lateral(organization_id)
+    stock_filters = []
+    # "low" includes parts that ran out in a warehouse with a minimum set
+    if stock_status == "low":
+        stock_filters.append(stock.c.is_low_stock)
+    elif stock_status == "out":
+        stock_filters.append(stock.c.total_stock <= 0)
+    elif stock_status == "in_stock":
+        stock_filters.extend([stock.c.total_stock > 0, ~stock.c.is_low_stock])
+    elif stock_status:
+        logger.warning(f"Invalid stock_status filter: {stock_status}")
+
+    query = db.query(
+        models.Part, stock.c.total_stock, stock.c.is_low_stock, stock.c.warehouse_inventory
+    ).join(stock, true()).filter(*part_filters, *stock_filters)
+
+    # Get total count if requested (expensive operation); stock is only
+    # computed for the count when filtering on it
+    total_count = None
+    if include_count:
+        if stock_filters:
+            total_count = query.count()
+        else:
+            total_count = db.query(models.Part).filter(*part_filters).count()
+
+    if sort_by in PART_INVENTORY_SORT_FIELDS:
+        column = stock.c.total_stock if sort_by == "total_stock" else getattr(models.Part, sort_by)
+        ordering = [column.desc() if sort_order == "desc" else column.asc()]
+    elif search_term:
+        ordering = _part_search_order(search_term)
     else:
-        # No images at all
-        result["image_urls"] = []
-    
-    return result
+        ordering = [models.Part.created_at.desc()]
+
+    rows = query.order_by(*ordering, models.Part.id).offset(skip).limit(limit + 1).all()  # Get one extra to check if there are more
+
+    # Check if there are more items
+    has_more = len(rows) > limit
+    return {
+        "items": [_part_with_stock(*row) for row in rows[:limit]],
+        "total_count": total_count,
+        "has_more": has_more
+    }
 
 @monitor_performance("parts_crud.get_parts_with_inventory", param_keys=["part_type", "is_proprietary", "skip", "limit"])
 def get_parts_with_inventory(db: Session, organization_id: Optional[uuid.UUID] = None, 
@@ -685,41 +877,21 @@ def get_parts_with_inventory(db: Session, organization_id: Optional[uuid.UUID] =
     Returns:
         List of parts with inventory information
     """
-    # Start with base query for parts
-    parts_query = db.query(models.Part)
-    
-    # Apply filters if provided
-    if part_type:
-        try:
-            enum_part_type = models.PartType(part_type)
-            parts_query = parts_query.filter(models.Part.part_type == enum_part_type)
-        except ValueError:
-            logger.warning(f"Invalid part_type filter: {part_type}")
-    
-    if is_proprietary is not None:
-        parts_query = parts_query.filter(models.Part.is_proprietary == is_proprietary)
-    
-    # Apply pagination
     try:
-        parts = parts_query.offset(skip).limit(limit).all()
-        
-        # Get inventory information for these parts
-        result = []
-        for part in parts:
-            part_with_inventory = get_part_with_inventory(db, part.id, organization_id)
-            result.append(part_with_inventory)
-        
-        return result
-        
+        return _parts_with_stock_page(
+            db, organization_id, part_type, is_proprietary, skip=skip, limit=limit
+        )["items"]
     except Exception as e:
         logger.error(f"Error querying parts: {e}")
         logger.info("Returning empty result due to database schema issues")
         return []
 
-@monitor_performance("parts_crud.get_parts_with_inventory_with_count", param_keys=["part_type", "is_proprietary", "skip", "limit", "include_count"])
+@monitor_performance("parts_crud.get_parts_with_inventory_with_count", param_keys=["part_type", "is_proprietary", "stock_status", "sort_by", "skip", "limit", "include_count"])
 def get_parts_with_inventory_with_count(db: Session, organization_id: Optional[uuid.UUID] = None, 
                                        part_type: Optional[str] = None, is_proprietary: Optional[bool] = None, 
-                                       skip: int = 0, limit: int = 100, include_count: bool = False) -> Dict[str, Any]:
+                                       skip: int = 0, limit: int = 100, include_count: bool = False,
+                                       stock_status: Optional[str] = None, sort_by: Optional[str] = None,
+                                       sort_order: str = "asc") -> Dict[str, Any]:
     """
     Retrieve a list of parts with inventory information and optional count.
     
@@ -731,54 +903,19 @@ def get_parts_with_inventory_with_count(db: Session, organization_id: Optional[u
         skip: Number of records to skip
         limit: Maximum number of records to return
         include_count: Whether to include total count (impacts performance)
+        stock_status: Filter by stock status (in_stock, low or out)
+        sort_by: Sort field (created_at, name, part_number or total_stock); newest first if omitted
+        sort_order: Sort direction for sort_by (asc or desc)
         
     Returns:
         Dictionary with items, total_count (if requested), and has_more flag
     """
-    # Start with base query for parts - ORDER BY created_at DESC to show newest first
-    parts_query = db.query(models.Part).order_by(models.Part.created_at.desc())
-    
-    # Apply filters if provided
-    if part_type:
-        try:
-            enum_part_type = models.PartType(part_type)
-            parts_query = parts_query.filter(models.Part.part_type == enum_part_type)
-        except ValueError:
-            logger.warning(f"Invalid part_type filter: {part_type}")
-    
-    if is_proprietary is not None:
-        parts_query = parts_query.filter(models.Part.is_proprietary == is_proprietary)
-    
-    # Get total count if requested (expensive operation)
-    total_count = None
-    if include_count:
-        try:
-            total_count = parts_query.count()
-        except Exception as e:
-            logger.warning(f"Error getting parts count: {e}")
-            logger.info("Returning count as None due to database schema issues")
-            total_count = None
-    
-    # Get paginated results
     try:
-        parts = parts_query.offset(skip).limit(limit + 1).all()  # Get one extra to check if there are more
-        
-        # Check if there are more items
-        has_more = len(parts) > limit
-        if has_more:
-            parts = parts[:limit]  # Remove the extra item
-        
-        # Get inventory information for these parts
-        result_items = []
-        for part in parts:
-            part_with_inventory = get_part_with_inventory(db, part.id, organization_id)
-            result_items.append(part_with_inventory)
-        
-        return {
-            "items": result_items,
-            "total_count": total_count,
-            "has_more": has_more
-        }
+        return _parts_with_stock_page(
+            db, organization_id, part_type, is_proprietary,
+            stock_status=stock_status, sort_by=sort_by, sort_order=sort_order,
+            skip=skip, limit=limit, include_count=include_count
+        )
         
     except Exception as e:
         logger.error(f"Error querying parts with inventory: {e}")
@@ -969,43 +1106,16 @@ def search_parts_with_inventory(db: Session, search_term: str, organization_id:
     Returns:
         List of parts matching the search criteria with inventory information
     """
-    from sqlalchemy import or_
-    
-    # Start with base query
-    query = db.query(models.Part).filter(
-        or_(
-            models.Part.name.ilike(f"%{search_term}%"),
-            models.Part.part_number.ilike(f"%{search_term}%"),
-            models.Part.description.ilike(f"%{search_term}%")
-        )
-    )
-    
-    # Apply additional filters if provided
-    if part_type:
-        try:
-            enum_part_type = models.PartType(part_type)
-            query = query.filter(models.Part.part_type == enum_part_type)
-        except ValueError:
-            logger.warning(f"Invalid part_type filter: {part_type}")
-    
-    if is_proprietary is not None:
-        query = query.filter(models.Part.is_proprietary == is_proprietary)
-    
-    # Apply pagination
-    parts = query.offset(skip).limit(limit).all()
-    
-    # Get inventory information for these parts
-    result = []
-    for part in parts:
-        part_with_inventory = get_part_with_inventory(db, part.id, organization_id)
-        result.append(part_with_inventory)
-    
-    return result
+    return _parts_with_stock_page(
+        db, organization_id, part_type, is_proprietary, search_term=search_term, skip=skip, limit=limit
+    )["items"]
 
-@monitor_performance("parts_crud.search_parts_with_inventory_with_count", param_keys=["part_type", "is_proprietary", "skip", "limit", "include_count"])
+@monitor_performance("parts_crud.search_parts_with_inventory_with_count", param_keys=["part_type", "is_proprietary", "stock_status", "sort_by", "skip", "limit", "include_count"])
 def search_parts_with_inventory_with_count(db: Session, search_term: str, organization_id: Optional[uuid.UUID] = None,
                                           part_type: Optional[str] = None, is_proprietary: Optional[bool] = None,
-                                          skip: int = 0, limit: int = 100, include_count: bool = False) -> Dict[str, Any]:
+                                          skip: int = 0, limit: int = 100, include_count: bool = False,
+                                          stock_status: Optional[str] = None, sort_by: Optional[str] = None,
+                                          sort_order: str = "asc") -> Dict[str, Any]:
     """
     Search parts by name or part number with inventory context and optional count.
     
@@ -1018,56 +1128,18 @@ def search_parts_with_inventory_with_count(db: Session, search_term: str, organi
         skip: Number of records to skip
         limit: Maximum number of records to return
         include_count: Whether to include total count (impacts performance)
+        stock_status: Filter by stock status (in_stock, low or out)
+        sort_by: Sort field (created_at, name, part_number or total_stock); most relevant first if omitted
+        sort_order: Sort direction for sort_by (asc or desc)
         
     Returns:
         Dictionary with items, total_count (if requested), and has_more flag
     """
-    from sqlalchemy import or_
-    
-    # Start with base query
-    query = db.query(models.Part).filter(
-        or_(
-            models.Part.name.ilike(f"%{search_term}%"),
-            models.Part.part_number.ilike(f"%{search_term}%"),
-            models.Part.description.ilike(f"%{search_term}%")
-        )
+    return _parts_with_stock_page(
+        db, organization_id, part_type, is_proprietary, search_term=search_term,
+        stock_status=stock_status, sort_by=sort_by, sort_order=sort_order,
+        skip=skip, limit=limit, include_count=include_count
     )
-    
-    # Apply additional filters if provided
-    if part_type:
-        try:
-            enum_part_type = models.PartType(part_type)
-            query = query.filter(models.Part.part_type == enum_part_type)
-        except ValueError:
-            logger.warning(f"Invalid part_type filter: {part_type}")
-    
-    if is_proprietary is not None:
-        query = query.filter(models.Part.is_proprietary == is_proprietary)
-    
-    # Get total count if requested (expensive operation)
-    total_count = None
-    if include_count:
-        total_count = query.count()
-    
-    # Get paginated results
-    parts = query.offset(skip).limit(limit + 1).all()  # Get one extra to check if there are more
-    
-    # Check if there are more items
-    has_more = len(parts) > limit
-    if has_more:
-        parts = parts[:limit]  # Remove the extra item
-    
-    # Get inventory information for these parts
-    result_items = []
-    for part in parts:
-        part_with_inventory = get_part_with_inventory(db, part.id, organization_id)
-        result_items.append(part_with_inventory)
-    
-    return {
-        "items": result_items,
-        "total_count": total_count,
-        "has_more": has_more
-    }
 
 
 
@@ -0,0 +1,395 @@
+# backend/app/crud/stock_rollup.py
+
+"""
+Organization-wide part stock rollup.
+
+Stock is calculated from transactions and stock adjustments (see
+inventory_calculator.calculate_current_stock). Doing that per warehouse and part
+on every read is too slow for organizations with many warehouses, so two tables
+keep the result:
+
+- warehouse_part_stock: calculated stock per (warehouse, part)
+- organization_part_stock: per (organization, part) total stock, number of
+  warehouses holding stock, highest minimum stock recommendation and low-stock flag
+
+Both are maintained incrementally by session event listeners registered in this
+module: whenever a flush touches transactions, stock adjustments or inventory
+minimums, only the affected (warehouse, part) keys are recalculated. The
+rollup counts every recorded movement, including ones dated in the future:
+it is only recalculated when a key is written, so a date cut-off taken at
+write time would hold such movements back until the key next changed. Use
+calculate_current_stock with as_of_date for point-in-time stock. Bulk
+query().delete() calls on those tables are covered as well. Anything written
+outside the ORM (manual SQL, restores) can be repaired with rebuild_stock_rollup,
+exposed as scripts/rebuild_stock_rollup.py.
+"""
+
+import logging
+import uuid
+from itertools import chain
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.orm import Session
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+StockKey = Tuple[uuid.UUID, uuid.UUID]
+
+REFRESH_BATCH_SIZE = 5000
+
+# Columns whose changes move stock, per mapped class
+_TRANSACTION_STOCK_ATTRS = ('part_id', 'from_warehouse_id', 'to_warehouse_id', 'quantity', 'transaction_date')
+_ADJUSTMENT_ITEM_STOCK_ATTRS = ('part_id', 'stock_adjustment_id', 'quantity_after')
+_ADJUSTMENT_STOCK_ATTRS = ('warehouse_id', 'adjustment_date')
+_INVENTORY_ROLLUP_ATTRS = ('warehouse_id', 'part_id', 'minimum_stock_recommendation')
+
+# Same rules as calculate_current_stock: last adjustment as baseline, plus
+# transactions after it, without a date cut-off (see the module docstring).
+WAREHOUSE_STOCK_REFRESH = text("""
+    WITH keys AS (
+        SELECT DISTINCT k.warehouse_id, k.part_id
+        FROM unnest(CAST(:warehouse_ids AS uuid[]), CAST(:part_ids AS uuid[])) AS k(warehouse_id, part_id)
+    )
+    INSERT INTO warehouse_part_stock (warehouse_id, part_id, organization_id, stock, updated_at)
+    SELECT k.warehouse_id, k.part_id, w.organization_id,
+           COALESCE(adj.quantity_after, 0) + COALESCE(mov.delta, 0),
+           now()
+    FROM keys k
+    JOIN warehouses w ON w.id = k.warehouse_id
+    LEFT JOIN LATERAL (
+        SELECT sai.quantity_after, sa.adjustment_date
+        FROM stock_adjustment_items sai
+        JOIN stock_adjustments sa ON sa.id = sai.stock_adjustment_id
+        WHERE sa.warehouse_id = k.warehouse_id
+          AND sai.part_id = k.part_id
+        ORDER BY sa.adjustment_date DESC
+        LIMIT 1
+    ) adj ON true
+    LEFT JOIN LATERAL (
+        SELECT SUM(CASE WHEN t.to_warehouse_id = k.warehouse_id THEN t.quantity ELSE -t.quantity END) AS delta
+        FROM transactions t
+        WHERE t.part_id = k.part_id
+          AND (t.to_warehouse_id = k.warehouse_id OR t.from_warehouse_id = k.warehouse_id)
+          AND (adj.adjustment_date IS NULL OR t.transaction_date > adj.adjustment_date)
+    ) mov ON true
+    ON CONFLICT (warehouse_id, part_id) DO UPDATE
+    SET organization_id = EXCLUDED.organization_id,
+        stock = EXCLUDED.stock,
+        updated_at = EXCLUDED.updated_at
+    RETURNING organization_id, part_id
+""")
+
+# Parts appear in the rollup while any warehouse of the organization has an
+# inventory record for them, matching the original aggregation.
+ORGANIZATION_STOCK_REFRESH = text("""
+    WITH keys AS (
+        SELECT DISTINCT k.organization_id, k.part_id
+        FROM unnest(CAST(:organization_ids AS uuid[]), CAST(:part_ids AS uuid[])) AS k(organization_id, part_id)
+    ),
+    rollup AS (
+        SELECT k.organization_id, k.part_id,
+               COALESCE(s.total_stock, 0) AS total_stock,
+               s.warehouse_count,
+               COALESCE(m.max_minimum_stock, 0) AS max_minimum_stock,
+               m.inventory_rows
+        FROM keys k
+        LEFT JOIN LATERAL (
+            SELECT SUM(ws.stock) AS total_stock, COUNT(*) AS warehouse_count
+            FROM warehouse_part_stock ws
+            WHERE ws.organization_id = k.organization_id
+              AND ws.part_id = k.part_id
+              AND ws.stock > 0
+        ) s ON true
+        LEFT JOIN LATERAL (
+            SELECT MAX(i.minimum_stock_recommendation) AS max_minimum_stock, COUNT(*) AS inventory_rows
+            FROM inventory i
+            JOIN warehouses w ON w.id = i.warehouse_id
+            WHERE w.organization_id = k.organization_id
+              AND i.part_id = k.part_id
+        ) m ON true
+    ),
+    removed AS (
+        DELETE FROM organization_part_stock o
+        USING rollup r
+        WHERE o.organization_id = r.organization_id
+          AND o.part_id = r.part_id
+          AND r.inventory_rows = 0
+    )
+    INSERT INTO organization_part_stock
+        (organization_id, part_id, total_stock, warehouse_count, max_minimum_stock, is_low_stock, updated_at)
+    SELECT organization_id, part_id, total_stock, warehouse_count, max_minimum_stock,
+           total_stock <= max_minimum_stock, now()
+    FROM rollup
+    WHERE inventory_rows > 0
+    ON CONFLICT (organization_id, part_id) DO UPDATE
+    SET total_stock = EXCLUDED.total_stock,
+        warehouse_count = EXCLUDED.warehouse_count,
+        max_minimum_stock = EXCLUDED.max_minimum_stock,
+        is_low_stock = EXCLUDED.is_low_stock,
+        updated_at = EXCLUDED.updated_at
+""")
+
+ALL_STOCK_KEYS = text("""
+    SELECT k.warehouse_id, k.part_id
+    FROM (
+        SELECT to_warehouse_id AS warehouse_id, part_id FROM transactions WHERE to_warehouse_id IS NOT NULL
+        UNION
+        SELECT from_warehouse_id, part_id FROM transactions WHERE from_warehouse_id IS NOT NULL
+        UNION
+        SELECT sa.warehouse_id, sai.part_id
+        FROM stock_adjustment_items sai
+        JOIN stock_adjustments sa ON sa.id = sai.stock_adjustment_id
+        UNION
+        SELECT warehouse_id, part_id FROM inventory
+    ) k
+    JOIN warehouses w ON w.id = k.warehouse_id
+    WHERE CAST(:organization_id AS uuid) IS NULL OR w.organization_id = CAST(:organization_id AS uuid)
+    ORDER BY k.warehouse_id, k.part_id
+""")
+
+
+def refresh_stock_rollup(connection, keys: Iterable[StockKey],
+                         organization_keys: Iterable[StockKey] = ()) -> int:
+    """
+    Recalculate warehouse stock for the given (warehouse_id, part_id) keys and
+    refresh the organization rollup rows they feed into.
+
+    Runs in the caller's transaction, so the rollup commits or rolls back
+    together with the change that triggered it.
+
+    Args:
+        connection: SQLAlchemy Connection or Session
+        keys: (warehouse_id, part_id) pairs whose stock may have changed
+        organization_keys: Extra (organization_id, part_id) rollup rows to
+            refresh, for warehouses that no longer exist
+
+    Returns:
+        Number of (warehouse, part) keys recalculated
+    """
+    # Sorted so concurrent writers lock rollup rows in the same order
+    ordered = sorted({(str(w), str(p)) for w, p in keys if w is not None and p is not None})
+    extra_organization_keys = {(str(o), str(p)) for o, p in organization_keys if o is not None and p is not None}
+
+    for start in range(0, max(len(ordered), 1), REFRESH_BATCH_SIZE):
+        batch = ordered[start:start + REFRESH_BATCH_SIZE]
+        refreshed_organization_keys = set(extra_organization_keys) if start == 0 else set()
+        if batch:
+            refreshed_organization_keys.update(
+                (str(o), str(p)) for o, p in connection.execute(WAREHOUSE_STOCK_REFRESH, {
+                    'warehouse_ids': [w for w, _ in batch],
+                    'part_ids': [p for _, p in batch]
+                }).fetchall()
+            )
+
+        if refreshed_organization_keys:
+            refreshed_organization_keys = sorted(refreshed_organization_keys)
+            connection.execute(ORGANIZATION_STOCK_REFRESH, {
+                'organization_ids': [o for o, _ in refreshed_organization_keys],
+                'part_ids': [p for _, p in refreshed_organization_keys]
+            })
+
+    return len(ordered)
+
+
+def rebuild_stock_rollup(db: Session, organization_id: Optional[uuid.UUID] = None) -> int:
+    """
+    Rebuild the stock rollup from scratch, for recovery.
+
+    Clears warehouse_part_stock and organization_part_stock (for one
+    organization, or entirely) and recalculates every warehouse/part pair that
+    has transactions, adjustments or inventory records.
+
+    Args:
+        db: Database session
+        organization_id: Only rebuild this organization (optional)
+
+    Returns:
+        Number of (warehouse, part) keys recalculated
+    """
+    org_param = str(organization_id) if organization_id else None
+    if organization_id:
+        db.query(models.WarehousePartStock).filter(
+            models.WarehousePartStock.organization_id == organization_id
+        ).delete(synchronize_session=False)
+        db.query(models.OrganizationPartStock).filter(
+            models.OrganizationPartStock.organization_id == organization_id
+        ).delete(synchronize_session=False)
+    else:
+        db.query(models.WarehousePartStock).delete(synchronize_session=False)
+        db.query(models.OrganizationPartStock).delete(synchronize_session=False)
+
+    keys = db.execute(ALL_STOCK_KEYS, {'organization_id': org_param}).fetchall()
+    refreshed = refresh_stock_rollup(db, [(row.warehouse_id, row.part_id) for row in keys])
+    db.commit()
+
+    logger.info(f"Rebuilt stock rollup for {refreshed} warehouse/part keys"
+                + (f" in organization {organization_id}" if organization_id else ""))
+    return refreshed
+
+
+def get_organization_stock_rollup(db: Session, organization_id: uuid.UUID) -> List[dict]:
+    """Read the organization-wide stock rollup, one row per part, ordered by part number."""
+    rows = db.query(
+        models.OrganizationPartStock,
+        models.Part.part_number,
+        models.Part.name,
+        models.Part.unit_of_measure
+    ).join(
+        models.Part, models.OrganizationPartStock.part_id == models.Part.id
+    ).filter(
+        models.OrganizationPartStock.organization_id == organization_id
+    ).order_by(models.Part.part_number).all()
+
+    return [
+        {
+            'part_id': str(rollup.part_id),
+            'part_number': part_number,
+            'part_name': name,
+            'unit_of_measure': unit_of_measure,
+            'total_stock': float(rollup.total_stock),
+            'warehouse_count': rollup.warehouse_count,
+            'total_minimum_stock': float(rollup.max_minimum_stock),
+            'is_low_stock': rollup.is_low_stock
+        }
+        for rollup, part_number, name, unit_of_measure in rows
+    ]
+
+
+# --- Incremental maintenance ---
+
+def _attribute_values(obj, attr: str) -> Set:
+    """Current and pre-flush values of an attribute."""
+    history = inspect(obj).attrs[attr].history
+    values = set(history.sum())
+    if not values:
+        values.add(getattr(obj, attr))
+    return values
+
+
+def _stock_changed(obj, attrs: Tuple[str, ...]) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+def _collect_flush_keys(session: Session, connection) -> Tuple[Set[StockKey], Set[StockKey]]:
+    """
+    Keys touched by the objects in this flush.
+
+    Returns (warehouse_id, part_id) keys to recalculate, and
+    (organization_id, part_id) rollup keys of warehouses deleted in the flush.
+    """
+    keys: Set[StockKey] = set()
+    organization_keys: Set[StockKey] = set()
+    adjustment_warehouses = {}
+    item_adjustments = []
+    deleted_warehouses = {
+        w.id: w.organization_id for w in session.deleted if isinstance(w, models.Warehouse)
+    }
+
+    for obj, is_dirty in chain(
+        ((o, False) for o in session.new),
+        ((o, True) for o in session.dirty),
+        ((o, False) for o in session.deleted)
+    ):
+        if isinstance(obj, models.Transaction):
+            if is_dirty and not _stock_changed(obj, _TRANSACTION_STOCK_ATTRS):
+                continue
+            warehouses = _attribute_values(obj, 'from_warehouse_id') | _attribute_values(obj, 'to_warehouse_id')
+            keys.update((w, p) for w in warehouses for p in _attribute_values(obj, 'part_id'))
+
+        elif isinstance(obj, models.Inventory):
+            if is_dirty and not _stock_changed(obj, _INVENTORY_ROLLUP_ATTRS):
+                continue
+            keys.update(
+                (w, p) for w in _attribute_values(obj, 'warehouse_id') for p in _attribute_values(obj, 'part_id')
+            )
+            if obj.warehouse_id in deleted_warehouses:
+                organization_keys.add((deleted_warehouses[obj.warehouse_id], obj.part_id))
+
+        elif isinstance(obj, models.StockAdjustmentItem):
+            if is_dirty and not _stock_changed(obj, _ADJUSTMENT_ITEM_STOCK_ATTRS):
+                continue
+            item_adjustments.append((_attribute_values(obj, 'stock_adjustment_id'), _attribute_values(obj, 'part_id')))
+
+        elif isinstance(obj, models.StockAdjustment):
+            adjustment_warehouses[obj.id] = obj.warehouse_id
+            if is_dirty and _stock_changed(obj, _ADJUSTMENT_STOCK_ATTRS):
+                part_ids = connection.execute(
+                    select(models.StockAdjustmentItem.part_id).where(
+                        models.StockAdjustmentItem.stock_adjustment_id == obj.id
+                    )
+                ).scalars().all()
+                keys.update(
+                    (w, p) for w in _attribute_values(obj, 'warehouse_id') for p in part_ids
+                )
+
+    missing = {a for adjustment_ids, _ in item_adjustments for a in adjustment_ids} - adjustment_warehouses.keys()
+    if missing:
+        adjustment_warehouses.update(connection.execute(
+            select(models.StockAdjustment.id, models.StockAdjustment.warehouse_id).where(
+                models.StockAdjustment.id.in_(missing)
+            )
+        ).fetchall())
+
+    for adjustment_ids, part_ids in item_adjustments:
+        keys.update(
+            (adjustment_warehouses.get(a), p) for a in adjustment_ids for p in part_ids
+        )
+
+    return keys, organization_keys
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_rollup_after_flush(session, flush_context):
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+
+    keys, organization_keys = _collect_flush_keys(session, connection)
+    if keys or organization_keys:
+        refresh_stock_rollup(connection, keys, organization_keys)
+
+
+def _bulk_delete_keys_query(statement):
+    """Select the (warehouse_id, part_id) keys a bulk DELETE will remove."""
+    table = statement.table.name
+    if table == models.Transaction.__tablename__:
+        where = statement.whereclause
+        to_keys = select(models.Transaction.to_warehouse_id, models.Transaction.part_id)
+        from_keys = select(models.Transaction.from_warehouse_id, models.Transaction.part_id)
+        if where is not None:
+            to_keys = to_keys.where(where)
+            from_keys = from_keys.where(where)
+        return to_keys.union(from_keys)
+    if table == models.StockAdjustmentItem.__tablename__:
+        query = select(models.StockAdjustment.warehouse_id, models.StockAdjustmentItem.part_id).join(
+            models.StockAdjustment, models.StockAdjustmentItem.stock_adjustment_id == models.StockAdjustment.id
+        )
+        return query.where(statement.whereclause) if statement.whereclause is not None else query
+    if table == models.Inventory.__tablename__:
+        query = select(models.Inventory.warehouse_id, models.Inventory.part_id)
+        return query.where(statement.whereclause) if statement.whereclause is not None else query
+    return None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _refresh_rollup_after_bulk_delete(orm_execute_state):
+    if not orm_execute_state.is_delete:
+        return None
+
+    session = orm_execute_state.session
+    if session.connection().dialect.name != "postgresql":
+        return None
+
+    keys_query = _bulk_delete_keys_query(orm_execute_state.statement)
+    if keys_query is None:
+        return None
+
+    keys = session.connection().execute(keys_query).fetchall()
+    result = orm_execute_state.invoke_statement()
+    if keys:
+        refresh_stock_rollup(session.connection(), [(w, p) for w, p in keys])
+    return result
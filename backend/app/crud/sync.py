@@ -0,0 +1,331 @@
+# backend/app/crud/sync.py
+
+"""
+Delta sync for offline clients.
+
+The field app caches protocols, checklist items, machines, farm sites and nets
+in IndexedDB. Instead of re-downloading whole lists it keeps one cursor per
+resource and asks for what changed since then.
+
+Every syncable row has a sync_version column drawn from the sync_change_seq
+sequence on insert and on every update (see models.sync_version_column), and a
+sync_xid column holding the transaction that wrote it. Deleted rows, and rows
+that move to another organization, leave a SyncTombstone versioned the same way.
+
+Versions are handed out when a row is written, not when its transaction
+commits, so a slow transaction can commit a lower version after a client has
+synced past it. Changes are therefore served in (sync_xid, sync_version) order,
+and only from transactions below the xmin of the current snapshot: every one of
+those has finished, so nothing can appear behind the cursor later. A cursor is
+the "<xid>.<version>" of the last change served; "0" starts a full download.
+
+Tombstones are written by the session listeners in this module for ORM
+deletes, delete cascades and bulk query().delete() calls. Rows removed with raw
+SQL are not seen; clients recover from that with a full sync (cursor 0).
+"""
+
+import uuid
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy import event, inspect, insert, select, text, tuple_, update
+from sqlalchemy.orm import Session, noload
+
+from .. import models, schemas
+from ..schemas.net_cleaning import FarmSiteResponse, NetResponse
+
+
+class SyncResource(NamedTuple):
+    model: Any
+    schema: Any
+    # Organization that owns a row, as a SQL expression; None for global resources
+    organization_column: Any = None
+    # Join needed to reach organization_column
+    join: Any = None
+    # Super admins receive every organization's rows
+    super_admin_unscoped: bool = False
+    exclude: frozenset = frozenset()
+    options: Tuple = ()
+
+
+SYNC_RESOURCES: Dict[str, SyncResource] = {
+    "maintenance_protocols": SyncResource(
+        model=models.MaintenanceProtocol,
+        schema=schemas.MaintenanceProtocolResponse,
+        # Checklist items are their own resource
+        exclude=frozenset({"checklist_items"}),
+        options=(noload(models.MaintenanceProtocol.checklist_items),)
+    ),
+    "protocol_checklist_items": SyncResource(
+        model=models.ProtocolChecklistItem,
+        schema=schemas.ProtocolChecklistItemResponse,
+        exclude=frozenset({"part"}),
+        options=(noload(models.ProtocolChecklistItem.part),)
+    ),
+    "machines": SyncResource(
+        model=models.Machine,
+        schema=schemas.MachineResponse,
+        organization_column=models.Machine.customer_organization_id,
+        super_admin_unscoped=True
+    ),
+    "farm_sites": SyncResource(
+        model=models.FarmSite,
+        schema=FarmSiteResponse,
+        organization_column=models.FarmSite.organization_id
+    ),
+    "nets": SyncResource(
+        model=models.Net,
+        schema=NetResponse,
+        organization_column=models.FarmSite.organization_id,
+        join=models.FarmSite
+    ),
+}
+
+DEFAULT_SYNC_LIMIT = 500
+
+Cursor = Tuple[int, int]
+
+
+def parse_cursor(value) -> Cursor:
+    """(xid, version) of a client cursor; 0, "0" or "" start from the beginning."""
+    if value in (0, "0", "", None):
+        return 0, 0
+    xid, separator, version = str(value).partition(".")
+    if not separator or not xid.isdigit() or not version.isdigit():
+        raise ValueError(f"Invalid sync cursor: {value}")
+    return int(xid), int(version)
+
+
+def format_cursor(cursor: Cursor) -> str:
+    return f"{cursor[0]}.{cursor[1]}"
+
+
+def _settled_xid(db: Session) -> int:
+    """Transactions below this id have all committed or rolled back."""
+    return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+
+
+def _load_changes(
+    db: Session,
+    resource: str,
+    since: Cursor,
+    settled_xid: int,
+    limit: int,
+    organization_id: Optional[uuid.UUID]
+) -> List[Tuple[Cursor, uuid.UUID, Optional[Any]]]:
+    """The `limit + 1` first changes after `since`, as ((xid, version), id, row or None for a delete)."""
+    spec = SYNC_RESOURCES[resource]
+    model = spec.model
+    scoped = organization_id is not None and spec.organization_column is not None
+
+    # The plain sync_xid bounds let the sync_xid index serve the range
+    rows_query = db.query(model).filter(
+        tuple_(model.sync_xid, model.sync_version) > tuple_(*since),
+        model.sync_xid >= since[0],
+        model.sync_xid < settled_xid
+    )
+    if spec.join is not None:
+        rows_query = rows_query.join(spec.join)
+    if scoped:
+        rows_query = rows_query.filter(spec.organization_column == organization_id)
+    rows = rows_query.options(*spec.options)\
+        .order_by(model.sync_xid, model.sync_version)\
+        .limit(limit + 1)\
+        .all()
+
+    tombstone = models.SyncTombstone
+    tombstones_query = db.query(tombstone.resource_id, tombstone.sync_xid, tombstone.sync_version)\
+        .filter(
+            tombstone.resource == resource,
+            tuple_(tombstone.sync_xid, tombstone.sync_version) > tuple_(*since),
+            tombstone.sync_xid >= since[0],
+            tombstone.sync_xid < settled_xid
+        )
+    if scoped:
+        tombstones_query = tombstones_query.filter(tombstone.organization_id == organization_id)
+    tombstones = tombstones_query.order_by(tombstone.sync_xid, tombstone.sync_version).limit(limit + 1).all()
+
+    return sorted(
+        [((row.sync_xid, row.sync_version), row.id, row) for row in rows] +
+        [((t.sync_xid, t.sync_version), t.resource_id, None) for t in tombstones],
+        key=lambda change: change[0]
+    )
+
+
+def get_changes(
+    db: Session,
+    resource: str,
+    since: Union[str, int] = "0",
+    limit: int = DEFAULT_SYNC_LIMIT,
+    organization_id: Optional[uuid.UUID] = None
+) -> Dict[str, Any]:
+    """
+    Rows created, updated or deleted after cursor `since`, oldest first.
+    organization_id=None returns every organization's changes.
+
+    Returns {"resource", "upserts", "deletes", "cursor", "has_more"}; call
+    again with the returned cursor while has_more is true. Raises ValueError
+    for a malformed cursor.
+    """
+    spec = SYNC_RESOURCES[resource]
+    since = parse_cursor(since)
+    settled_xid = _settled_xid(db)
+
+    # Both inputs hold their `limit + 1` lowest changes, so the `limit` lowest
+    # of the merge are complete and the cursor can stop at the last of them
+    changes = _load_changes(db, resource, since, settled_xid, limit, organization_id)
+    page = changes[:limit]
+    has_more = len(changes) > limit
+    if has_more:
+        cursor = page[-1][0]
+    else:
+        # Caught up with every finished transaction, including those that
+        # changed nothing visible to this client
+        cursor = max(since, (settled_xid, 0))
+
+    # Only the latest change per row matters (e.g. moved out and back in)
+    latest: Dict[uuid.UUID, Optional[Any]] = {}
+    for _, row_id, row in page:
+        latest[row_id] = row
+
+    return {
+        "resource": resource,
+        "upserts": [
+            spec.schema.model_validate(row).model_dump(mode="json", exclude=set(spec.exclude))
+            for row in latest.values() if row is not None
+        ],
+        "deletes": [row_id for row_id, row in latest.items() if row is None],
+        "cursor": format_cursor(cursor),
+        "has_more": has_more,
+    }
+
+
+# --- Tombstones ---
+
+def _resource_name(model) -> Optional[str]:
+    for name, spec in SYNC_RESOURCES.items():
+        if spec.model is model:
+            return name
+    return None
+
+
+# Column holding the owning organization, for resources that have one directly;
+# nets follow their farm site (see _move_farm_site_nets)
+_ORGANIZATION_ATTRS = {
+    models.Machine: "customer_organization_id",
+    models.FarmSite: "organization_id",
+}
+
+
+def _deleted_row_organization(connection, obj) -> Optional[uuid.UUID]:
+    """Organization a deleted row belonged to, using pre-flush values."""
+    if isinstance(obj, models.Net):
+        farm_site = inspect(obj).attrs.farm_site.loaded_value
+        if isinstance(farm_site, models.FarmSite):
+            return farm_site.organization_id
+        return connection.execute(
+            select(models.FarmSite.organization_id).where(models.FarmSite.id == obj.farm_site_id)
+        ).scalar()
+
+    attr = _ORGANIZATION_ATTRS.get(type(obj))
+    if attr is None:
+        return None
+    history = inspect(obj).attrs[attr].history
+    values = history.deleted or history.unchanged or history.added
+    return values[0] if values else None
+
+
+def _moved_out_organizations(obj) -> List[uuid.UUID]:
+    """Organizations an updated row no longer belongs to (e.g. a transferred machine)."""
+    attr = _ORGANIZATION_ATTRS.get(type(obj))
+    if attr is None:
+        return []
+    return [org_id for org_id in inspect(obj).attrs[attr].history.deleted if org_id is not None]
+
+
+def _move_farm_site_nets(connection, farm_site, moved_out: List[uuid.UUID]) -> List[Dict[str, Any]]:
+    """
+    Nets follow their farm site to its new organization: re-version them so
+    the new organization receives them, and tombstone them for the old ones.
+    """
+    net_ids = connection.execute(
+        update(models.Net)
+        .where(models.Net.farm_site_id == farm_site.id)
+        .values(sync_version=models.SYNC_CHANGE_SEQ.next_value())
+        .returning(models.Net.id)
+    ).scalars().all()
+    return [_tombstone("nets", net_id, org_id) for net_id in net_ids for org_id in moved_out]
+
+
+def _write_tombstones(connection, tombstones: List[Dict[str, Any]]) -> None:
+    if tombstones:
+        connection.execute(insert(models.SyncTombstone), tombstones)
+
+
+def _tombstone(resource: str, resource_id: uuid.UUID, organization_id: Optional[uuid.UUID]) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "resource": resource,
+        "resource_id": resource_id,
+        "organization_id": organization_id,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones_after_flush(session, flush_context):
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+
+    tombstones = []
+    for obj in session.deleted:
+        resource = _resource_name(type(obj))
+        if resource:
+            tombstones.append(_tombstone(resource, obj.id, _deleted_row_organization(connection, obj)))
+
+    for obj in session.dirty:
+        resource = _resource_name(type(obj))
+        if resource:
+            moved_out = _moved_out_organizations(obj)
+            tombstones.extend(_tombstone(resource, obj.id, org_id) for org_id in moved_out)
+            if moved_out and isinstance(obj, models.FarmSite):
+                tombstones.extend(_move_farm_site_nets(connection, obj, moved_out))
+
+    _write_tombstones(connection, tombstones)
+
+
+def _bulk_delete_rows_query(statement) -> Tuple[Optional[str], Any]:
+    """Select (id, organization_id) of the rows a bulk DELETE will remove."""
+    for resource, spec in SYNC_RESOURCES.items():
+        if statement.table.name != spec.model.__tablename__:
+            continue
+        columns = [spec.model.id]
+        if spec.organization_column is not None:
+            columns.append(spec.organization_column)
+        query = select(*columns)
+        if spec.join is not None:
+            query = query.join(spec.join)
+        if statement.whereclause is not None:
+            query = query.where(statement.whereclause)
+        return resource, query
+    return None, None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_tombstones_for_bulk_delete(orm_execute_state):
+    if not orm_execute_state.is_delete:
+        return None
+
+    session = orm_execute_state.session
+    if session.connection().dialect.name != "postgresql":
+        return None
+
+    resource, rows_query = _bulk_delete_rows_query(orm_execute_state.statement)
+    if rows_query is None:
+        return None
+
+    rows = session.connection().execute(rows_query).fetchall()
+    result = orm_execute_state.invoke_statement()
+    _write_tombstones(session.connection(), [
+        _tombstone(resource, row[0], row[1] if len(row) > 1 else None) for row in rows
+    ])
+    return result
@@ -0,0 +1,304 @@
+# backend/app/crud/sync_replay.py
+
+"""
+Bulk replay of work recorded offline.
+
+A device that comes back online sends everything it queued (maintenance
+executions, checklist completions, machine hours and net cleaning records) in
+one batch instead of one request and one commit per item. Each item carries a
+UUID generated on the device that becomes the row's primary key, so a batch
+replayed again after a dropped response updates the same rows rather than
+creating duplicates.
+
+Everything the batch refers to is loaded with one query per table up front,
+then the items are checked in memory and written with a single commit. Items
+that fail a check are reported as rejected; the rest of the batch still applies.
+An id repeated within a batch updates the row its first occurrence created, as
+if the later item had been replayed on its own.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .. import models, schemas
+
+KIND_EXECUTION = "execution"
+KIND_CHECKLIST_COMPLETION = "checklist_completion"
+KIND_MACHINE_HOURS = "machine_hours"
+KIND_NET_CLEANING_RECORD = "net_cleaning_record"
+
+
+def _result(kind: str, item_id: uuid.UUID, status: str, server_id: Optional[uuid.UUID] = None) -> Dict[str, Any]:
+    return {"kind": kind, "id": item_id, "status": status, "server_id": server_id or item_id, "detail": None}
+
+
+def _rejected(kind: str, item_id: uuid.UUID, detail: str) -> Dict[str, Any]:
+    return {"kind": kind, "id": item_id, "status": "rejected", "server_id": None, "detail": detail}
+
+
+def _by_id(db: Session, model, ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, Any]:
+    ids = set(ids)
+    if not ids:
+        return {}
+    return {row.id: row for row in db.query(model).filter(model.id.in_(ids)).all()}
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Devices send local times without an offset; treat those as UTC, like create_machine_hours."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _latest_hours(db: Session, machine_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, Any]:
+    """Most recently recorded hours value per machine (see Machine.get_latest_hours)."""
+    machine_ids = set(machine_ids)
+    if not machine_ids:
+        return {}
+    latest_date = db.query(
+        models.MachineHours.machine_id,
+        func.max(models.MachineHours.recorded_date).label("recorded_date")
+    ).filter(models.MachineHours.machine_id.in_(machine_ids))\
+        .group_by(models.MachineHours.machine_id)\
+        .subquery()
+    rows = db.query(models.MachineHours.machine_id, func.max(models.MachineHours.hours_value))\
+        .join(latest_date, (models.MachineHours.machine_id == latest_date.c.machine_id) &
+              (models.MachineHours.recorded_date == latest_date.c.recorded_date))\
+        .group_by(models.MachineHours.machine_id)\
+        .all()
+    return {machine_id: hours for machine_id, hours in rows}
+
+
+def replay_offline_batch(
+    db: Session,
+    batch: schemas.SyncReplayRequest,
+    user_id: uuid.UUID,
+    organization_id: uuid.UUID,
+    is_super_admin: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Apply a batch of offline work in one transaction and return one result per
+    item, in request order: executions, checklist completions, machine hours,
+    net cleaning records. Executions are applied first so completions can refer
+    to executions in the same batch.
+    """
+    def can_write(owner_organization_id: Optional[uuid.UUID]) -> bool:
+        return is_super_admin or owner_organization_id == organization_id
+
+    # --- Load everything the batch refers to ---
+    existing_executions = _by_id(
+        db, models.MaintenanceExecution,
+        [item.id for item in batch.executions] + [item.execution_id for item in batch.checklist_completions]
+    )
+    existing_hours = _by_id(db, models.MachineHours, [item.id for item in batch.machine_hours])
+
+    existing_records: Dict[uuid.UUID, Tuple[models.NetCleaningRecord, uuid.UUID]] = {}
+    record_ids = {item.id for item in batch.net_cleaning_records}
+    if record_ids:
+        rows = db.query(models.NetCleaningRecord, models.FarmSite.organization_id)\
+            .join(models.Net, models.NetCleaningRecord.net_id == models.Net.id)\
+            .join(models.FarmSite, models.Net.farm_site_id == models.FarmSite.id)\
+            .filter(models.NetCleaningRecord.id.in_(record_ids))\
+            .all()
+        existing_records = {record.id: (record, owner) for record, owner in rows}
+
+    net_organizations: Dict[uuid.UUID, uuid.UUID] = {}
+    net_ids = {item.net_id for item in batch.net_cleaning_records}
+    if net_ids:
+        net_organizations = dict(
+            db.query(models.Net.id, models.FarmSite.organization_id)
+            .join(models.FarmSite, models.Net.farm_site_id == models.FarmSite.id)
+            .filter(models.Net.id.in_(net_ids))
+            .all()
+        )
+
+    machine_ids = {item.machine_id for item in batch.executions}
+    machine_ids |= {item.machine_id for item in batch.machine_hours}
+    machine_ids |= {item.machine_id for item in batch.net_cleaning_records if item.machine_id}
+    machine_ids |= {execution.machine_id for execution in existing_executions.values()}
+    machine_organizations: Dict[uuid.UUID, uuid.UUID] = {}
+    if machine_ids:
+        machine_organizations = dict(
+            db.query(models.Machine.id, models.Machine.customer_organization_id)
+            .filter(models.Machine.id.in_(machine_ids))
+            .all()
+        )
+
+    protocol_ids = {item.protocol_id for item in batch.executions if item.protocol_id}
+    known_protocols = {row.id for row in db.query(models.MaintenanceProtocol.id)
+                       .filter(models.MaintenanceProtocol.id.in_(protocol_ids)).all()} if protocol_ids else set()
+
+    item_protocols: Dict[uuid.UUID, uuid.UUID] = {}
+    item_ids = {item.checklist_item_id for item in batch.checklist_completions}
+    if item_ids:
+        item_protocols = dict(
+            db.query(models.ProtocolChecklistItem.id, models.ProtocolChecklistItem.protocol_id)
+            .filter(models.ProtocolChecklistItem.id.in_(item_ids))
+            .all()
+        )
+
+    completions_by_id: Dict[uuid.UUID, models.MaintenanceChecklistCompletion] = {}
+    completions_by_item: Dict[Tuple[uuid.UUID, uuid.UUID], models.MaintenanceChecklistCompletion] = {}
+    completion_execution_ids = {item.execution_id for item in batch.checklist_completions}
+    completion_ids = {item.id for item in batch.checklist_completions}
+    if completion_ids:
+        for completion in db.query(models.MaintenanceChecklistCompletion).filter(
+            models.MaintenanceChecklistCompletion.execution_id.in_(completion_execution_ids) |
+            models.MaintenanceChecklistCompletion.id.in_(completion_ids)
+        ).all():
+            completions_by_id[completion.id] = completion
+            completions_by_item[(completion.execution_id, completion.checklist_item_id)] = completion
+
+    latest_hours = _latest_hours(
+        db, [item.machine_id for item in batch.executions if item.machine_hours_at_service]
+    )
+
+    results: List[Dict[str, Any]] = []
+
+    # --- Executions ---
+    # Executions the completions below may attach to: id -> (owner, protocol_id)
+    executions: Dict[uuid.UUID, Tuple[uuid.UUID, Optional[uuid.UUID]]] = {
+        execution.id: (machine_organizations.get(execution.machine_id), execution.protocol_id)
+        for execution in existing_executions.values()
+    }
+
+    for item in batch.executions:
+        existing = existing_executions.get(item.id)
+        owner = machine_organizations.get(item.machine_id)
+        if item.machine_id not in machine_organizations:
+            results.append(_rejected(KIND_EXECUTION, item.id, "Machine not found"))
+            continue
+        if not can_write(owner) or (existing and not can_write(executions[existing.id][0])):
+            results.append(_rejected(KIND_EXECUTION, item.id, "Not authorized for this machine"))
+            continue
+        if item.protocol_id and item.protocol_id not in known_protocols:
+            results.append(_rejected(KIND_EXECUTION, item.id, "Protocol not found"))
+            continue
+
+        values = item.model_dump(exclude={"id", "status"})
+        values["status"] = models.MaintenanceExecutionStatus(item.status.value)
+        if existing:
+            for key, value in values.items():
+                setattr(existing, key, value)
+        else:
+            execution = models.MaintenanceExecution(id=item.id, performed_by_user_id=user_id, **values)
+            db.add(execution)
+            existing_executions[item.id] = execution
+
+            # Same side effect as create_execution: newer hours update the machine
+            hours = item.machine_hours_at_service
+            if hours and hours > latest_hours.get(item.machine_id, 0):
+                latest_hours[item.machine_id] = hours
+                db.add(models.MachineHours(
+                    machine_id=item.machine_id,
+                    recorded_by_user_id=user_id,
+                    hours_value=hours,
+                    recorded_date=_as_utc(item.performed_date) or datetime.now(timezone.utc),
+                    notes="Recorded during maintenance execution"
+                ))
+
+        executions[item.id] = (owner, item.protocol_id)
+        results.append(_result(KIND_EXECUTION, item.id, "updated" if existing else "created"))
+
+    # Executions rejected above must not accept completions even if a row with that id exists
+    rejected_executions = {result["id"] for result in results if result["status"] == "rejected"}
+
+    # --- Checklist completions ---
+    for item in batch.checklist_completions:
+        execution = executions.get(item.execution_id)
+        if execution is None or item.execution_id in rejected_executions:
+            results.append(_rejected(KIND_CHECKLIST_COMPLETION, item.id, "Execution not found"))
+            continue
+        owner, protocol_id = execution
+        if not can_write(owner):
+            results.append(_rejected(KIND_CHECKLIST_COMPLETION, item.id, "Not authorized for this execution"))
+            continue
+        if item_protocols.get(item.checklist_item_id) is None or item_protocols[item.checklist_item_id] != protocol_id:
+            results.append(_rejected(KIND_CHECKLIST_COMPLETION, item.id, "Checklist item not found"))
+            continue
+
+        existing = completions_by_id.get(item.id)
+        if existing and (existing.execution_id, existing.checklist_item_id) != (item.execution_id, item.checklist_item_id):
+            results.append(_rejected(KIND_CHECKLIST_COMPLETION, item.id, "Completion id belongs to another checklist item"))
+            continue
+        # One completion per item and execution, as in complete_checklist_item
+        existing = existing or completions_by_item.get((item.execution_id, item.checklist_item_id))
+
+        values = {
+            "is_completed": item.status == schemas.ChecklistItemStatusEnum.COMPLETED,
+            "notes": item.notes,
+            "completed_at": _as_utc(item.completed_at) or datetime.now(timezone.utc),
+        }
+        if existing:
+            for key, value in values.items():
+                setattr(existing, key, value)
+            completion = existing
+        else:
+            completion = models.MaintenanceChecklistCompletion(
+                id=item.id, execution_id=item.execution_id, checklist_item_id=item.checklist_item_id, **values
+            )
+            db.add(completion)
+            completions_by_id[item.id] = completion
+            completions_by_item[(item.execution_id, item.checklist_item_id)] = completion
+
+        results.append(_result(
+            KIND_CHECKLIST_COMPLETION, item.id, "updated" if existing else "created", server_id=completion.id
+        ))
+
+    # --- Machine hours ---
+    for item in batch.machine_hours:
+        existing = existing_hours.get(item.id)
+        if item.machine_id not in machine_organizations:
+            results.append(_rejected(KIND_MACHINE_HOURS, item.id, "Machine not found"))
+            continue
+        if not can_write(machine_organizations[item.machine_id]):
+            results.append(_rejected(KIND_MACHINE_HOURS, item.id, "Not authorized for this machine"))
+            continue
+        if existing and existing.machine_id != item.machine_id:
+            results.append(_rejected(KIND_MACHINE_HOURS, item.id, "Hours record belongs to another machine"))
+            continue
+
+        values = {
+            "hours_value": item.hours_value,
+            "recorded_date": _as_utc(item.recorded_date),
+            "notes": item.notes,
+        }
+        if existing:
+            for key, value in values.items():
+                setattr(existing, key, value)
+        else:
+            hours_record = models.MachineHours(
+                id=item.id, machine_id=item.machine_id, recorded_by_user_id=user_id, **values
+            )
+            db.add(hours_record)
+            existing_hours[item.id] = hours_record
+        results.append(_result(KIND_MACHINE_HOURS, item.id, "updated" if existing else "created"))
+
+    # --- Net cleaning records ---
+    for item in batch.net_cleaning_records:
+        existing, existing_owner = existing_records.get(item.id, (None, None))
+        if item.net_id not in net_organizations:
+            results.append(_rejected(KIND_NET_CLEANING_RECORD, item.id, "Net not found"))
+            continue
+        if not can_write(net_organizations[item.net_id]) or (existing and not can_write(existing_owner)):
+            results.append(_rejected(KIND_NET_CLEANING_RECORD, item.id, "Not authorized for this net"))
+            continue
+        if item.machine_id and item.machine_id not in machine_organizations:
+            results.append(_rejected(KIND_NET_CLEANING_RECORD, item.id, "Machine not found"))
+            continue
+
+        record = existing or models.NetCleaningRecord(id=item.id, created_by=user_id)
+        for key, value in item.model_dump(exclude={"id"}, exclude_none=not existing).items():
+            setattr(record, key, value)
+        record.calculate_duration()
+        if not existing:
+            db.add(record)
+            existing_records[item.id] = (record, net_organizations[item.net_id])
+        results.append(_result(KIND_NET_CLEANING_RECORD, item.id, "updated" if existing else "created"))
+
+    db.commit()
+    return results
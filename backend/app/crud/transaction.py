@@ -1,13 +1,16 @@
 # backend/app/crud/transaction.py
 
 import uuid
+import json
+import base64
+import binascii
 import logging
 from typing import List, Optional, Dict, Any
 from decimal import Decimal
 from datetime import datetime, timedelta
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc, text
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, func, desc, text, tuple_
 from fastapi import HTTPException, status
 
 from .. import models, schemas
@@ -293,18 +296,54 @@ def update_inventory(db: Session, warehouse_id: uuid.UUID, part_id: uuid.UUID, q
     # Update the last_updated timestamp
     inventory_item.last_updated = datetime.now()
 
-def search_transactions(db: Session, filters: schemas.TransactionFilter, skip: int = 0, limit: int = 100):
-    """Search transactions with filters."""
-    # Start with base query
+def encode_transaction_cursor(transaction_date: datetime, transaction_id: uuid.UUID) -> str:
+    """Encode a (transaction_date, id) keyset position as an opaque cursor."""
+    payload = json.dumps([transaction_date.isoformat(), str(transaction_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_transaction_cursor(cursor: str):
+    """Decode a cursor from encode_transaction_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        transaction_date, transaction_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(transaction_date), uuid.UUID(transaction_id)
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError("Invalid transaction cursor") from e
+
+
+def _transaction_search_query(db: Session, filters: schemas.TransactionFilter,
+                              warehouse_ids: Optional[List[uuid.UUID]] = None):
+    """
+    Build the transaction search as a single query.
+    
+    Warehouses are joined twice through aliases and the machine is outer-joined,
+    so names come back with each row instead of being looked up per transaction.
+    Results are ordered newest first on (transaction_date, id), matching the
+    composite transaction indexes.
+    """
+    FromWarehouse = aliased(models.Warehouse)
+    ToWarehouse = aliased(models.Warehouse)
+    
     query = db.query(
         models.Transaction,
         models.Part.name.label("part_name"),
         models.Part.part_number.label("part_number"),
-        models.User.username.label("performed_by_username")
+        models.User.username.label("performed_by_username"),
+        FromWarehouse.name.label("from_warehouse_name"),
+        ToWarehouse.name.label("to_warehouse_name"),
+        models.Machine.name.label("machine_name"),
+        models.Machine.serial_number.label("machine_serial_number")
     ).join(
         models.Part, models.Transaction.part_id == models.Part.id
     ).join(
         models.User, models.Transaction.performed_by_user_id == models.User.id
+    ).outerjoin(
+        FromWarehouse, models.Transaction.from_warehouse_id == FromWarehouse.id
+    ).outerjoin(
+        ToWarehouse, models.Transaction.to_warehouse_id == ToWarehouse.id
+    ).outerjoin(
+        models.Machine, models.Transaction.machine_id == models.Machine.id
     )
     
     # Apply filters
@@ -320,6 +359,12 @@ def search_transactions(db: Session, filters: schemas.TransactionFilter, skip: i
     if filters.to_warehouse_id:
         query = query.filter(models.Transaction.to_warehouse_id == filters.to_warehouse_id)
     
+    if filters.warehouse_id:
+        query = query.filter(or_(
+            models.Transaction.from_warehouse_id == filters.warehouse_id,
+            models.Transaction.to_warehouse_id == filters.warehouse_id
+        ))
+    
     if filters.machine_id:
         query = query.filter(models.Transaction.machine_id == filters.machine_id)
     
@@ -335,51 +380,90 @@ def search_transactions(db: Session, filters: schemas.TransactionFilter, skip: i
     if filters.reference_number:
         query = query.filter(models.Transaction.reference_number.ilike(f"%{filters.reference_number}%"))
     
-    # Order by transaction date (most recent first)
-    query = query.order_by(desc(models.Transaction.transaction_date))
+    # Organization scope: transactions touching any of these warehouses
+    if warehouse_ids is not None:
+        query = query.filter(or_(
+            models.Transaction.from_warehouse_id.in_(warehouse_ids),
+            models.Transaction.to_warehouse_id.in_(warehouse_ids)
+        ))
     
-    # Apply pagination
-    transactions = query.offset(skip).limit(limit).all()
+    # Most recent first; id breaks ties so keyset pagination is stable
+    return query.order_by(desc(models.Transaction.transaction_date), desc(models.Transaction.id))
+
+
+def _transaction_search_result(row) -> dict:
+    transaction = row.Transaction
+    return {
+        **transaction.__dict__,
+        "part_name": row.part_name,
+        "part_number": row.part_number,
+        "from_warehouse_name": row.from_warehouse_name,
+        "to_warehouse_name": row.to_warehouse_name,
+        "machine_serial": row.machine_name or row.machine_serial_number,
+        "machine_name": row.machine_name,
+        "performed_by_username": row.performed_by_username
+    }
+
+
+def search_transactions(db: Session, filters: schemas.TransactionFilter, skip: int = 0, limit: int = 100,
+                        warehouse_ids: Optional[List[uuid.UUID]] = None):
+    """
+    Search transactions with filters, paging with skip/limit.
     
-    results = []
-    for transaction, part_name, part_number, performed_by_username in transactions:
-        # Get warehouse names if they exist
-        from_warehouse_name = None
-        if transaction.from_warehouse_id:
-            from_warehouse = db.query(models.Warehouse).filter(models.Warehouse.id == transaction.from_warehouse_id).first()
-            if from_warehouse:
-                from_warehouse_name = from_warehouse.name
-        
-        to_warehouse_name = None
-        if transaction.to_warehouse_id:
-            to_warehouse = db.query(models.Warehouse).filter(models.Warehouse.id == transaction.to_warehouse_id).first()
-            if to_warehouse:
-                to_warehouse_name = to_warehouse.name
-        
-        # Get machine info if it exists
-        machine_serial = None
-        machine_name = None
-        if transaction.machine_id:
-            machine = db.query(models.Machine).filter(models.Machine.id == transaction.machine_id).first()
-            if machine:
-                machine_serial = machine.name or machine.serial_number
-                machine_name = machine.name
-        
-        # Create a dictionary with all the data
-        result = {
-            **transaction.__dict__,
-            "part_name": part_name,
-            "part_number": part_number,
-            "from_warehouse_name": from_warehouse_name,
-            "to_warehouse_name": to_warehouse_name,
-            "machine_serial": machine_serial,
-            "machine_name": machine_name,
-            "performed_by_username": performed_by_username
-        }
-        
-        results.append(result)
+    Prefer search_transactions_page for scrolling through long histories;
+    OFFSET gets slower the deeper the page.
     
-    return results
+    Args:
+        warehouse_ids: Only transactions from or to these warehouses (optional)
+    """
+    rows = _transaction_search_query(db, filters, warehouse_ids).offset(skip).limit(limit).all()
+    return [_transaction_search_result(row) for row in rows]
+
+
+def search_transactions_page(db: Session, filters: schemas.TransactionFilter, limit: int = 100,
+                             cursor: Optional[str] = None,
+                             warehouse_ids: Optional[List[uuid.UUID]] = None) -> Dict[str, Any]:
+    """
+    Search transactions with filters using keyset pagination.
+    
+    Each page continues strictly after the (transaction_date, id) of the
+    previous page's last row, so the cost of a page does not depend on how
+    deep into the history it is.
+    
+    Args:
+        limit: Maximum number of transactions to return
+        cursor: next_cursor from the previous page (omit for the first page)
+        warehouse_ids: Only transactions from or to these warehouses (optional)
+    
+    Returns:
+        Dictionary with items, next_cursor and has_more
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = _transaction_search_query(db, filters, warehouse_ids)
+    
+    if cursor:
+        after_date, after_id = decode_transaction_cursor(cursor)
+        query = query.filter(
+            tuple_(models.Transaction.transaction_date, models.Transaction.id) < tuple_(after_date, after_id)
+        )
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last = rows[-1].Transaction
+        next_cursor = encode_transaction_cursor(last.transaction_date, last.id)
+    
+    return {
+        "items": [_transaction_search_result(row) for row in rows],
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
 
 def reverse_transaction(db: Session, reversal: schemas.TransactionReversal):
     """Reverse a transaction by creating a new transaction with opposite effect."""
@@ -1,12 +1,18 @@
 # backend/app/database.py
 
 import os
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 import logging
 import redis
 
+from .metrics import (
+    DB_POOL_CAPACITY, DB_POOL_CHECKOUT_WAIT, DB_POOL_CHECKOUTS, DB_POOL_CONNECTIONS, DB_POOL_TIMEOUTS
+)
+
 logger = logging.getLogger(__name__)
 
 # --- Database Configuration ---
@@ -15,13 +21,111 @@ if not DATABASE_URL:
     logger.error("DATABASE_URL environment variable is not set.")
     raise ValueError("DATABASE_URL environment variable is not set.")
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=3600,   # Recycle connections every hour
-    echo=False           # Set to True for SQL debugging
-)
+# --- Connection Pool Configuration ---
+# Each uvicorn worker has its own pool, so the database sees up to
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections from the API.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Seconds a request waits for a free connection before failing
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Server-side limit per SQL statement, 0 to disable
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# Connecting through PgBouncer in transaction pooling mode: no session state
+# (startup options, SET, prepared statements) may outlive a transaction
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+
+def instrumented_pool_class(target: str):
+    """QueuePool subclass recording how long checkouts wait, labelled by target."""
+
+    class InstrumentedQueuePool(QueuePool):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                DB_POOL_TIMEOUTS.labels(target).inc()
+                logger.warning(f"Timed out waiting for a {target} database connection "
+                               f"(pool_size={self.size()}, overflow={self.overflow()})")
+                raise
+            finally:
+                DB_POOL_CHECKOUT_WAIT.labels(target).observe(time.perf_counter() - started)
+
+    return InstrumentedQueuePool
+
+
+def engine_options(target: str = "primary") -> dict:
+    """create_engine() arguments shared by the primary and the read replica."""
+    options = dict(
+        poolclass=instrumented_pool_class(target),
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=True,  # Verify connections before use
+        pool_recycle=3600,   # Recycle connections every hour
+        echo=False           # Set to True for SQL debugging
+    )
+    # psycopg2 never uses server-side prepared statements, so PgBouncer mode
+    # only has to move the statement timeout out of the startup packet
+    if DB_STATEMENT_TIMEOUT_MS and not DB_PGBOUNCER:
+        options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def _set_local_statement_timeout(session, transaction, connection):
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+
+
+def apply_statement_timeout(session_factory) -> None:
+    """
+    Apply DB_STATEMENT_TIMEOUT_MS to every transaction of the factory's sessions.
+
+    Through PgBouncer the timeout is set per transaction with SET LOCAL, as the
+    server connection is handed to another client afterwards; directly it is a
+    startup option (see engine_options) and this does nothing.
+    """
+    if DB_STATEMENT_TIMEOUT_MS and DB_PGBOUNCER:
+        event.listen(session_factory, "after_begin", _set_local_statement_timeout)
+
+
+def pool_numbers(target_engine) -> dict:
+    """Current size and usage of an engine's connection pool."""
+    pool = target_engine.pool
+    numbers = {"size": pool.size()} if hasattr(pool, "size") else {}
+    if hasattr(pool, "checkedout"):
+        numbers.update(
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            capacity=pool.size() + max(DB_MAX_OVERFLOW, 0),
+        )
+    return numbers
+
+
+def instrument_pool(target: str, target_engine) -> None:
+    """Export the engine's pool usage as Prometheus gauges on every checkout and checkin."""
+    def update(*args):
+        numbers = pool_numbers(target_engine)
+        for state in ("checked_out", "idle", "overflow"):
+            if state in numbers:
+                DB_POOL_CONNECTIONS.labels(target, state).set(numbers[state])
+
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.labels(target).inc()
+        update()
+
+    capacity = pool_numbers(target_engine).get("capacity")
+    if capacity is not None:
+        DB_POOL_CAPACITY.labels(target).set(capacity)
+    event.listen(target_engine, "checkout", checkout)
+    event.listen(target_engine, "checkin", update)
+
+
+engine = create_engine(DATABASE_URL, **engine_options("primary"))
+instrument_pool("primary", engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+apply_statement_timeout(SessionLocal)
 Base = declarative_base()
 
 # --- Redis Configuration ---
@@ -0,0 +1,174 @@
+# backend/app/db_routing.py
+
+"""
+Read replica routing for read-only endpoints.
+
+When DATABASE_REPLICA_URL is set, endpoints that depend on get_read_db
+(dashboard, inventory reports and analytics) read from a streaming replica
+through their own connection pool, so heavy reads stop competing with
+transactional writes on the primary. Everything else keeps using get_db and
+the primary. Without a replica, get_read_db is the same as get_db.
+
+A replica lags the primary slightly, so a client that has just written would
+not see its own change there. DatabaseRoutingMiddleware identifies the client
+by its bearer token, and every successful POST/PUT/PATCH/DELETE marks it for
+READ_YOUR_WRITES_SECONDS: its reads go to the primary until the window has
+passed. (Marking on requests rather than on session flushes keeps the audit
+log rows written on every request from counting as the client's writes.)
+Marks are kept in Redis, so the window holds whichever worker serves the next
+request, with an in-process fallback when Redis is unavailable.
+
+Pool usage of both targets is exported to Prometheus and returned by
+pool_status() for /monitoring/database-pools.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from .database import (
+    DB_PGBOUNCER, DB_POOL_TIMEOUT, DB_STATEMENT_TIMEOUT_MS, SessionLocal, apply_statement_timeout,
+    engine, engine_options, instrument_pool, pool_numbers, redis_client
+)
+from .metrics import DB_READ_SESSIONS
+
+logger = logging.getLogger(__name__)
+
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+RECENT_WRITE_PREFIX = "db_recent_write:"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+replica_engine = None
+ReplicaSessionLocal = None
+if DATABASE_REPLICA_URL:
+    replica_engine = create_engine(DATABASE_REPLICA_URL, **engine_options("replica"))
+    instrument_pool("replica", replica_engine)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    apply_statement_timeout(ReplicaSessionLocal)
+    logger.info("Read replica configured; read-only endpoints will use it")
+
+# Client making the current request, set by DatabaseRoutingMiddleware
+_client_key: ContextVar[Optional[str]] = ContextVar("db_client_key", default=None)
+
+# Fallback record of recent writes when Redis is unavailable: client -> deadline
+_local_recent_writes: Dict[str, float] = {}
+_local_lock = threading.Lock()
+
+
+def client_key_from_scope(scope) -> Optional[str]:
+    """Stable key for the client behind a request: a hash of its bearer token."""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return hashlib.sha256(token.encode()).hexdigest()[:32]
+    return None
+
+
+def mark_write(client_key: Optional[str]) -> None:
+    """Send the client's reads to the primary for the read-your-writes window."""
+    if not client_key or replica_engine is None:
+        return
+
+    window_ms = int(READ_YOUR_WRITES_SECONDS * 1000)
+    try:
+        redis_client.set(f"{RECENT_WRITE_PREFIX}{client_key}", "1", px=window_ms)
+        return
+    except Exception as e:
+        logger.debug(f"Recording recent write in Redis failed, keeping it in process: {e}")
+
+    with _local_lock:
+        now = time.monotonic()
+        _local_recent_writes[client_key] = now + READ_YOUR_WRITES_SECONDS
+        # Drop expired marks so the fallback does not grow without bound
+        for key in [key for key, deadline in _local_recent_writes.items() if deadline <= now]:
+            del _local_recent_writes[key]
+
+
+def recently_wrote(client_key: Optional[str]) -> bool:
+    """Whether the client wrote within the read-your-writes window."""
+    if not client_key:
+        return False
+
+    with _local_lock:
+        if _local_recent_writes.get(client_key, 0) > time.monotonic():
+            return True
+    try:
+        return bool(redis_client.exists(f"{RECENT_WRITE_PREFIX}{client_key}"))
+    except Exception as e:
+        logger.debug(f"Checking recent writes in Redis failed: {e}")
+        return False
+
+
+class DatabaseRoutingMiddleware:
+    """ASGI middleware identifying the client for read routing and marking its writes."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client_key = client_key_from_scope(scope)
+        is_write = scope["method"] not in SAFE_METHODS
+
+        async def send_wrapper(message):
+            # Marked before the client sees the response, so its next read already goes to the primary
+            if is_write and message["type"] == "http.response.start" and message["status"] < 400:
+                mark_write(client_key)
+            await send(message)
+
+        token = _client_key.set(client_key)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _client_key.reset(token)
+
+
+def get_read_db():
+    """
+    Provides a SQLAlchemy session for a read-only request.
+
+    Uses the replica when one is configured and the client has not written
+    within the read-your-writes window, the primary otherwise. Endpoints using
+    it must not write.
+    """
+    if replica_engine is None:
+        target, reason = "primary", "no_replica"
+    elif recently_wrote(_client_key.get()):
+        target, reason = "primary", "read_your_writes"
+    else:
+        target, reason = "replica", "read_only"
+    DB_READ_SESSIONS.labels(target, reason).inc()
+
+    db = ReplicaSessionLocal() if target == "replica" else SessionLocal()
+    try:
+        yield db
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Database session error ({target}): {e}")
+        raise
+    finally:
+        db.close()
+
+
+def pool_status() -> Dict[str, Any]:
+    """Connection pool usage of the primary and, when configured, the replica."""
+    return {
+        "pool_timeout_seconds": DB_POOL_TIMEOUT,
+        "statement_timeout_ms": DB_STATEMENT_TIMEOUT_MS,
+        "pgbouncer": DB_PGBOUNCER,
+        "read_your_writes_seconds": READ_YOUR_WRITES_SECONDS,
+        "primary": pool_numbers(engine),
+        "replica": pool_numbers(replica_engine) if replica_engine is not None else None,
+    }
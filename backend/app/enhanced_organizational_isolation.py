@@ -14,6 +14,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from .database import get_db
 from .models import User, Organization, Part, Machine, Warehouse, Inventory, Transaction, OrganizationType, UserRole
 from .enhanced_audit_system import EnhancedAuditSystem, AuditContext
+from .crud import organization_hierarchy
 
 # Configure logging for security events
 security_logger = logging.getLogger("security")
@@ -133,12 +134,10 @@ class EnhancedOrganizationalDataFilter:
         
         # Add supplier organizations if user is admin
         if user_role == "admin":
-            suppliers = db.query(Organization.id).filter(
-                Organization.parent_organization_id == current_user.organization_id,
-                Organization.organization_type == OrganizationType.supplier,
-                Organization.is_active == True
-            ).all()
-            supplier_ids = [supplier.id for supplier in suppliers]
+            supplier_ids = [
+                org_id for org_id in organization_hierarchy.get_accessible_organization_ids(db, current_user.organization_id)
+                if org_id != current_user.organization_id
+            ]
             accessible_ids.extend(supplier_ids)
             
             if audit_context:
@@ -1,6 +1,9 @@
 # backend/app/image_utils.py
 
 import io
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
 from PIL import Image
 from fastapi import HTTPException, UploadFile
 
@@ -94,3 +97,50 @@ def image_to_data_url(image_bytes: bytes, format: str = "webp") -> str:
     import base64
     base64_image = base64.b64encode(image_bytes).decode('utf-8')
     return f"data:image/{format};base64,{base64_image}"
+
+
+class ImageByteCache:
+    """
+    Small in-process LRU cache for served image bytes, bounded by total size.
+    Keys include the image content version, so a new upload is simply a new
+    key and stale entries fall out through eviction.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: Hashable, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+# Shared cache for profile photos and organization logos
+image_cache = ImageByteCache()
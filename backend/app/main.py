@@ -5,10 +5,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles # New: Import StaticFiles
 from fastapi.encoders import jsonable_encoder
 import os
+import hmac
 import logging
 import time
 import json
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -58,6 +60,7 @@ from .routers.nets import router as nets_router # New: Import nets router
 from .routers.net_cleaning_records import router as net_cleaning_records_router # New: Import net cleaning records router
 from .routers.reports import router as reports_router # New: Import standalone reports router
 from .routers.warehouse_locations import router as warehouse_locations_router # New: Import warehouse locations router
+from .routers.sync import router as sync_router # Delta sync for offline clients
 from .auth import login_for_access_token, read_users_me, TokenData
 
 
@@ -66,7 +69,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 
 # Custom JSON encoder for datetime and UUID objects
 class CustomJSONEncoder(json.JSONEncoder):
@@ -77,8 +80,16 @@ class CustomJSONEncoder(json.JSONEncoder):
             return str(obj)
         return super().default(obj)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Each uvicorn worker drops its live gauges from the shared metrics directory on exit
+    mark_process_dead()
+
+
 # --- FastAPI App Initialization ---
 app = FastAPI(
+    lifespan=lifespan,
     title="ABParts API",
     description="API for managing AutoBoss parts inventory and customer stock.",
     version="0.1.0",
@@ -155,6 +166,9 @@ from .middleware import (
 )
 from .security_middleware import SecurityAuditMiddleware, OrganizationalIsolationMiddleware
 from .monitoring import get_monitoring_system, track_request_middleware
+from .metrics import PrometheusMiddleware, CONTENT_TYPE_LATEST, mark_process_dead, render_metrics
+from .query_instrumentation import QueryStatsMiddleware
+from .db_routing import DatabaseRoutingMiddleware
 import os
 import redis
 
@@ -180,7 +194,7 @@ app.add_middleware(HTTPSRedirectMiddleware)
 # Add CORS violation handler before permission middleware
 app.add_middleware(
     CORSViolationHandlerMiddleware,
-    exclude_paths=["/health", "/", "/docs", "/redoc", "/openapi.json"],
+    exclude_paths=["/health", "/metrics", "/", "/docs", "/redoc", "/openapi.json"],
     exclude_prefixes=["/static/"]
 )
 app.add_middleware(PermissionEnforcementMiddleware)
@@ -199,7 +213,7 @@ app.add_middleware(
     allow_credentials=cors_settings.get("allow_credentials", True),
     allow_methods=cors_settings.get("allow_methods", ["*"]),
     allow_headers=cors_settings.get("allow_headers", ["*"]),
-    expose_headers=["X-Process-Time", "X-Request-ID"],
+    expose_headers=["X-Process-Time", "X-Request-ID", "X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Repeated-Statements"],
     max_age=cors_settings.get("max_age", 600),
 )
 
@@ -214,6 +228,12 @@ async def add_process_time_header(request: Request, call_next):
     track_request_middleware(request, response)
     return response
 
+# Prometheus request metrics, per-request SQL statistics and read replica
+# routing; added last so they wrap the whole middleware stack
+app.add_middleware(DatabaseRoutingMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(PrometheusMiddleware)
+
 # --- Mount Static Files Directory ---
 # This makes files in the UPLOAD_DIRECTORY accessible via /static/images/your_image.jpg
 # IMPORTANT: In production, consider serving static files via a CDN or dedicated static file server.
@@ -263,6 +283,7 @@ app.include_router(farm_sites_router, prefix="/farm-sites", tags=["Farm Sites"])
 app.include_router(nets_router, prefix="/nets", tags=["Nets"])
 app.include_router(net_cleaning_records_router, prefix="/net-cleaning-records", tags=["Net Cleaning Records"])
 app.include_router(warehouse_locations_router, tags=["Warehouse Locations"])
+app.include_router(sync_router, prefix="/sync", tags=["Sync"])
 
 # --- Authentication Endpoints (kept in main for simplicity of login flow) ---
 app.post("/token", tags=["Authentication"])(login_for_access_token)
@@ -305,6 +326,21 @@ async def health_check(db: Session = Depends(get_db)):
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """
+    Prometheus scrape endpoint; requires a bearer token when METRICS_TOKEN is set.
+    In production it is not served at all until a token is configured.
+    """
+    metrics_token = os.getenv("METRICS_TOKEN")
+    if not metrics_token and os.getenv("ENVIRONMENT", "development") == "production":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    authorization = request.headers.get("Authorization", "")
+    if metrics_token and not hmac.compare_digest(authorization.encode(), f"Bearer {metrics_token}".encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 # --- Database Table Creation on Startup ---
 # Commented out to allow Alembic migrations to handle schema creation
 # @app.on_event("startup")
@@ -0,0 +1,176 @@
+# backend/app/metrics.py
+
+"""
+Prometheus metrics for the API, exposed at /metrics.
+
+Latencies are recorded in fixed-bucket histograms, so memory does not grow with
+traffic and percentiles are computed by Prometheus (histogram_quantile) instead
+of by sorting samples in the API.
+
+The API runs several uvicorn workers. When PROMETHEUS_MULTIPROC_DIR is set,
+prometheus_client keeps every worker's values in memory-mapped files in that
+directory and /metrics aggregates all of them, whichever worker answers the
+scrape. The directory must be emptied before the workers start (see the api
+command in docker-compose.prod.yml), and each worker removes its livesum gauge
+files when it shuts down (mark_process_dead) so in-progress and pool gauges do
+not keep counting workers that have exited. Without the directory, each process
+reports its own values, which is fine for single-process development servers.
+
+Request metrics are recorded by PrometheusMiddleware, a plain ASGI middleware
+labelled by route template (/parts/{part_id}) rather than raw path to keep the
+number of series bounded.
+"""
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+# Seconds; covers cached reads through slow reports
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Route label for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUESTS = Counter(
+    "abparts_http_requests_total",
+    "HTTP requests handled, by method, route and status code",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "abparts_http_request_duration_seconds",
+    "HTTP request latency, by method and route",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "abparts_http_requests_in_progress",
+    "HTTP requests being handled",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "abparts_db_statements_per_request",
+    "SQL statements executed per HTTP request, by route",
+    ["route"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "abparts_db_time_per_request_seconds",
+    "Time spent executing SQL per HTTP request, by route",
+    ["route"],
+    buckets=LATENCY_BUCKETS
+)
+DB_N_PLUS_ONE_REQUESTS = Counter(
+    "abparts_db_n_plus_one_requests_total",
+    "HTTP requests that repeated one SQL statement past the N+1 threshold, by route",
+    ["route"]
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "abparts_db_pool_connections",
+    "Database pool connections, by target (primary/replica) and state (checked_out/idle/overflow)",
+    ["target", "state"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUTS = Counter(
+    "abparts_db_pool_checkouts_total",
+    "Connections checked out of the database pool, by target",
+    ["target"]
+)
+DB_POOL_CAPACITY = Gauge(
+    "abparts_db_pool_capacity",
+    "Connections the database pool may open (pool size plus overflow), by target",
+    ["target"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "abparts_db_pool_checkout_wait_seconds",
+    "Time spent obtaining a connection from the database pool, by target",
+    ["target"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+DB_POOL_TIMEOUTS = Counter(
+    "abparts_db_pool_timeouts_total",
+    "Checkouts that gave up waiting for a free database connection, by target",
+    ["target"]
+)
+DB_READ_SESSIONS = Counter(
+    "abparts_db_read_sessions_total",
+    "Sessions opened for read-only endpoints, by target and reason",
+    ["target", "reason"]
+)
+OPERATION_DURATION = Histogram(
+    "abparts_operation_duration_seconds",
+    "Latency of operations wrapped with the performance monitoring decorators",
+    ["operation", "success"],
+    buckets=LATENCY_BUCKETS
+)
+
+
+def observe_operation(operation_name: str, execution_time: float, success: bool = True) -> None:
+    """Record one execution of a monitored operation."""
+    OPERATION_DURATION.labels(operation_name, "true" if success else "false").observe(execution_time)
+
+
+def render_metrics() -> bytes:
+    """Metrics in the Prometheus text exposition format, across all workers when configured."""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead(pid: int = None) -> None:
+    """Drop the live gauge values of an exiting worker from the multiprocess directory."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid or os.getpid(), MULTIPROC_DIR)
+
+
+def route_label(scope) -> str:
+    """Route template of the matched route, set in the scope by the router."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording count, status and latency of every HTTP request."""
+
+    def __init__(self, app, exclude_paths=("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            in_progress.dec()
+            # Routing has run by now, so the scope holds the matched route
+            route = route_label(scope)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(duration)
+
@@ -93,7 +93,7 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next):
         # Skip rate limiting for health checks and static files
-        if request.url.path in ["/health", "/"] or request.url.path.startswith("/static"):
+        if request.url.path in ["/health", "/", "/metrics"] or request.url.path.startswith("/static"):
             return await call_next(request)
         
         # Skip if Redis is not available
@@ -206,6 +206,7 @@ class PermissionEnforcementMiddleware(BaseHTTPMiddleware):
         self.public_endpoints = {
             "/",
             "/health",
+            "/metrics",
             "/token",
             "/docs",
             "/openapi.json",
@@ -471,7 +472,7 @@ class SessionManagementMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next):
         # Skip session management for public endpoints
-        if request.url.path in ["/", "/health", "/token"] or request.url.path.startswith("/static"):
+        if request.url.path in ["/", "/health", "/metrics", "/token"] or request.url.path.startswith("/static"):
             return await call_next(request)
         
         # Skip if Redis is not available
@@ -2,10 +2,11 @@
 
 import uuid
 import enum
+import hashlib
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, Date, Text, ARRAY, DECIMAL, UniqueConstraint, Enum, LargeBinary
-from sqlalchemy.dialects.postgresql import UUID, ENUM
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, Integer, BigInteger, ForeignKey, DateTime, Date, Text, ARRAY, DECIMAL, UniqueConstraint, Enum, LargeBinary, Index, Sequence, Computed, text
+from sqlalchemy.dialects.postgresql import UUID, ENUM, TSVECTOR
+from sqlalchemy.orm import relationship, deferred, validates
 from sqlalchemy.sql import func
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -15,6 +16,37 @@ from .database import Base
 from .models_config import SystemConfiguration, OrganizationConfiguration
 
 
+# Change counter for delta sync (see crud/sync.py). Every insert or update of a
+# syncable row takes the next value, and so does every tombstone.
+SYNC_CHANGE_SEQ = Sequence("sync_change_seq", metadata=Base.metadata)
+
+
+def sync_version_column(index=True):
+    """sync_version column for resources served by the delta-sync API."""
+    return Column(
+        BigInteger, SYNC_CHANGE_SEQ,
+        server_default=SYNC_CHANGE_SEQ.next_value(),
+        onupdate=SYNC_CHANGE_SEQ.next_value(),
+        nullable=False, index=index
+    )
+
+
+# Transaction that wrote a syncable row or tombstone. Versions are handed out
+# when a row is written, not when it commits, so delta sync pages by writing
+# transaction and only serves transactions that can no longer commit changes.
+CURRENT_XID_SQL = "(pg_current_xact_id()::text::bigint)"
+
+
+def sync_xid_column(index=True):
+    """sync_xid column recording the transaction of the last insert or update."""
+    return Column(
+        BigInteger,
+        server_default=text(CURRENT_XID_SQL),
+        onupdate=text(CURRENT_XID_SQL),
+        nullable=False, index=index
+    )
+
+
 # Enums for the new business model
 class OrganizationType(enum.Enum):
     oraseas_ee = "oraseas_ee"
@@ -73,6 +105,13 @@ class StockAdjustmentReason(enum.Enum):
     CUSTOMER_RETURN_DAMAGED = "Customer Return - Damaged"
     OTHER = "Other"
 
+def image_version(image_bytes):
+    """Short content hash of stored image bytes, or None when there is no image."""
+    if not image_bytes:
+        return None
+    return hashlib.sha256(image_bytes).hexdigest()[:16]
+
+
 class Organization(Base):
     """
     SQLAlchemy model for the 'organizations' table.
@@ -83,12 +122,15 @@ class Organization(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), unique=True, nullable=False, index=True)
     organization_type = Column(Enum(OrganizationType), nullable=False)
-    parent_organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True)
+    parent_organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True, index=True)
     country = Column(Enum(CountryCode), nullable=True)
     address = Column(Text)
     contact_info = Column(Text)
     logo_url = Column(String(500), nullable=True)  # Organization logo (legacy)
-    logo_data = Column(LargeBinary, nullable=True)  # Binary image storage
+    # Image bytes are deferred so listings and auth checks never load them;
+    # logo_version is a content hash clients use to build cache-busting URLs
+    logo_data = deferred(Column(LargeBinary, nullable=True))  # Binary image storage
+    logo_version = Column(String(16), nullable=True)
     is_active = Column(Boolean, nullable=False, server_default='true')
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -117,6 +159,11 @@ class Organization(Base):
     part_usage_records = relationship("PartUsage", back_populates="customer_organization", cascade="all, delete-orphan")
 
 
+    @validates("logo_data")
+    def _set_logo_version(self, key, value):
+        self.logo_version = image_version(value)
+        return value
+
     @hybrid_property
     def is_oraseas_ee(self):
         """Check if this organization is Oraseas EE."""
@@ -199,7 +246,8 @@ class User(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255))
     profile_photo_url = Column(String(500), nullable=True)  # User profile photo (legacy)
-    profile_photo_data = Column(LargeBinary, nullable=True)  # Binary image storage
+    profile_photo_data = deferred(Column(LargeBinary, nullable=True))  # Binary image storage (deferred)
+    profile_photo_version = Column(String(16), nullable=True)  # Content hash of profile_photo_data
     role = Column(ENUM(UserRole, name='userrole'), nullable=False)
     user_status = Column(ENUM(UserStatus, name='userstatus'), nullable=False)
     failed_login_attempts = Column(Integer, nullable=False, server_default='0')
@@ -232,6 +280,11 @@ class User(Base):
     scheduled_stocktakes = relationship("Stocktake", foreign_keys="[Stocktake.scheduled_by_user_id]", back_populates="scheduled_by_user")
     completed_stocktakes = relationship("Stocktake", foreign_keys="[Stocktake.completed_by_user_id]", back_populates="completed_by_user")
 
+    @validates("profile_photo_data")
+    def _set_profile_photo_version(self, key, value):
+        self.profile_photo_version = image_version(value)
+        return value
+
     @hybrid_property
     def is_super_admin(self):
         """Check if this user is a super admin."""
@@ -286,6 +339,8 @@ class Machine(Base):
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    sync_version = sync_version_column()
+    sync_xid = sync_xid_column()
 
     # Relationships
     customer_organization = relationship("Organization", back_populates="machines")
@@ -560,6 +615,16 @@ class MachineHours(Base):
         return f"<MachineHours(id={self.id}, machine_id={self.machine_id}, hours={self.hours_value}, date={self.recorded_date})>"
 
 
+# Expression behind parts.search_vector: every pipe-separated language variant
+# of the name, the part number and the description. The 'simple' configuration
+# does no stemming, which no single language would get right for all variants.
+PART_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, replace(name, '|', ' ')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, part_number), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
 class Part(Base):
     """
     SQLAlchemy model for the 'parts' table.
@@ -568,7 +633,10 @@ class Part(Base):
     - part_number: Unique index (existing)
     - idx_parts_type_proprietary: Composite index on (part_type, is_proprietary) for filtering
     - idx_parts_manufacturer: Index on manufacturer field (partial, where manufacturer IS NOT NULL)
-    - idx_parts_name_fulltext: Full-text search index on name field for multilingual search
+    - idx_parts_name_trgm, idx_parts_part_number_trgm, idx_parts_description_trgm:
+      pg_trgm GIN indexes serving ILIKE '%term%' search
+    - idx_parts_search_vector: GIN index on search_vector for ranking and prefix autocomplete
+    - idx_parts_created_at: Index on created_at for the newest-first parts listing
     """
     __tablename__ = "parts"
 
@@ -590,6 +658,8 @@ class Part(Base):
     image_data = Column(ARRAY(LargeBinary))  # Binary image storage
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    # Maintained by PostgreSQL; only referenced in search queries, never loaded
+    search_vector = deferred(Column(TSVECTOR, Computed(PART_SEARCH_VECTOR_SQL, persisted=True)))
 
     # Relationships
     inventory_items = relationship("Inventory", back_populates="part", cascade="all, delete-orphan")
@@ -641,6 +711,10 @@ class Inventory(Base):
     """
     SQLAlchemy model for the 'inventory' table.
     Tracks part stock levels for each warehouse.
+
+    Performance Indexes:
+    - _warehouse_part_uc: Unique (warehouse_id, part_id), serving lookups within a warehouse
+    - idx_inventory_part_stock: Index on part_id including stock columns, for per-part stock totals
     """
     __tablename__ = "inventory"
 
@@ -705,7 +779,7 @@ class SupplierOrderItem(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     supplier_order_id = Column(UUID(as_uuid=True), ForeignKey("supplier_orders.id"), nullable=False)
-    part_id = Column(UUID(as_uuid=True), ForeignKey("parts.id"), nullable=False)
+    part_id = Column(UUID(as_uuid=True), ForeignKey("parts.id"), nullable=False, index=True)
     quantity = Column(DECIMAL(precision=10, scale=3), nullable=False, server_default='1')
     unit_price = Column(DECIMAL(10, 2))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1281,6 +1355,8 @@ class MaintenanceProtocol(Base):
     base_language = Column(String(5), nullable=False, server_default='en')  # Base language for translations
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    sync_version = sync_version_column()
+    sync_xid = sync_xid_column()
 
     # Relationships
     checklist_items = relationship("ProtocolChecklistItem", back_populates="protocol", cascade="all, delete-orphan", order_by="ProtocolChecklistItem.item_order")
@@ -1312,6 +1388,8 @@ class ProtocolChecklistItem(Base):
     notes = Column(Text, nullable=True)
     base_language = Column(String(5), nullable=False, server_default='en')  # Base language for translations
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sync_version = sync_version_column()
+    sync_xid = sync_xid_column()
 
     # Relationships
     protocol = relationship("MaintenanceProtocol", back_populates="checklist_items")
@@ -1821,6 +1899,25 @@ class ChecklistItemTranslation(Base):
         return f"<ChecklistItemTranslation(item_id={self.checklist_item_id}, language={self.language_code}, description='{self.item_description[:30]}...')>"
 
 
+class TranslationMemory(Base):
+    """
+    Machine translations already obtained, keyed by a hash of the source text
+    and the language pair, so each distinct string is only sent to the
+    translation provider once.
+    """
+    __tablename__ = "translation_memory"
+
+    source_hash = Column(String(64), primary_key=True)  # sha256 hex of source_text
+    source_language = Column(String(5), primary_key=True)
+    target_language = Column(String(5), primary_key=True)
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<TranslationMemory({self.source_language}->{self.target_language}, source='{self.source_text[:30]}...')>"
+
+
 # AI Assistant Models
 class AISessionStatus(enum.Enum):
     """Status of an AI troubleshooting session."""
@@ -1913,6 +2010,8 @@ class FarmSite(Base):
     active = Column(Boolean, nullable=False, server_default='true')
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    sync_version = sync_version_column()
+    sync_xid = sync_xid_column()
 
     # Relationships
     organization = relationship("Organization", backref="farm_sites")
@@ -1941,6 +2040,8 @@ class Net(Base):
     active = Column(Boolean, nullable=False, server_default='true')
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    sync_version = sync_version_column()
+    sync_xid = sync_xid_column()
 
     # Relationships
     farm_site = relationship("FarmSite", back_populates="nets")
@@ -2051,3 +2152,95 @@ class InventoryLocation(Base):
 
     def __repr__(self):
         return f"<InventoryLocation(id={self.id}, inventory_id={self.inventory_id}, location_id={self.location_id})>"
+
+
+class WarehousePartStock(Base):
+    """
+    SQLAlchemy model for the 'warehouse_part_stock' table.
+    Calculated stock per warehouse and part, kept current from transactions and
+    stock adjustments (see crud/stock_rollup.py). Feeds organization_part_stock.
+    """
+    __tablename__ = "warehouse_part_stock"
+
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True)
+    part_id = Column(UUID(as_uuid=True), ForeignKey("parts.id", ondelete="CASCADE"), primary_key=True)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    stock = Column(DECIMAL(precision=10, scale=3), nullable=False, server_default='0')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_warehouse_part_stock_org_part', 'organization_id', 'part_id'),
+    )
+
+    def __repr__(self):
+        return f"<WarehousePartStock(warehouse_id={self.warehouse_id}, part_id={self.part_id}, stock={self.stock})>"
+
+
+class OrganizationPartStock(Base):
+    """
+    SQLAlchemy model for the 'organization_part_stock' table.
+    Organization-wide stock rollup per part: total stock across warehouses, number of
+    warehouses holding stock, and the highest minimum stock recommendation.
+    Maintained incrementally alongside warehouse_part_stock.
+    """
+    __tablename__ = "organization_part_stock"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    part_id = Column(UUID(as_uuid=True), ForeignKey("parts.id", ondelete="CASCADE"), primary_key=True)
+    total_stock = Column(DECIMAL(precision=12, scale=3), nullable=False, server_default='0')
+    warehouse_count = Column(Integer, nullable=False, server_default='0')
+    max_minimum_stock = Column(DECIMAL(precision=10, scale=3), nullable=False, server_default='0')
+    is_low_stock = Column(Boolean, nullable=False, server_default='true')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    part = relationship("Part")
+
+    def __repr__(self):
+        return f"<OrganizationPartStock(organization_id={self.organization_id}, part_id={self.part_id}, total={self.total_stock})>"
+
+
+class PartPriceIndex(Base):
+    """
+    SQLAlchemy model for the 'part_price_index' table.
+    Unit cost per part derived from supplier order items: the most recent unit price
+    and the quantity-weighted average cost of received orders. Maintained on every
+    write to supplier orders and their items (see crud/part_price_index.py).
+    """
+    __tablename__ = "part_price_index"
+
+    part_id = Column(UUID(as_uuid=True), ForeignKey("parts.id", ondelete="CASCADE"), primary_key=True)
+    latest_unit_price = Column(DECIMAL(precision=10, scale=2), nullable=False)
+    latest_order_date = Column(DateTime(timezone=True), nullable=False)
+    average_unit_cost = Column(DECIMAL(precision=12, scale=4))  # NULL until a priced order is received
+    received_quantity = Column(DECIMAL(precision=12, scale=3), nullable=False, server_default='0')
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    part = relationship("Part")
+
+    def __repr__(self):
+        return f"<PartPriceIndex(part_id={self.part_id}, latest={self.latest_unit_price}, average={self.average_unit_cost})>"
+
+
+class SyncTombstone(Base):
+    """
+    Record of a syncable row that was deleted, or moved out of an organization,
+    so offline clients can drop it on their next delta sync.
+    organization_id is NULL for resources visible to every organization.
+    """
+    __tablename__ = "sync_tombstones"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    resource = Column(String(50), nullable=False)
+    resource_id = Column(UUID(as_uuid=True), nullable=False)
+    organization_id = Column(UUID(as_uuid=True), nullable=True)
+    sync_version = sync_version_column(index=False)
+    sync_xid = sync_xid_column(index=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_sync_tombstones_resource_version', 'resource', 'sync_version'),
+        Index('ix_sync_tombstones_resource_xid', 'resource', 'sync_xid'),
+    )
+
+    def __repr__(self):
+        return f"<SyncTombstone(resource='{self.resource}', resource_id={self.resource_id}, version={self.sync_version})>"
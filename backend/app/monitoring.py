@@ -70,7 +70,8 @@ class MetricsCollector:
         }
         self.request_count = 0
         self.error_count = 0
-        self.response_times = []
+        # Running total rather than a list of samples, so memory stays constant
+        self.total_response_time = 0.0
         self.last_reset = datetime.utcnow()
     
     def collect_system_metrics(self) -> Dict[str, float]:
@@ -182,7 +183,7 @@ class MetricsCollector:
     def track_request(self, response_time: float, is_error: bool = False):
         """Track API request metrics."""
         self.request_count += 1
-        self.response_times.append(response_time)
+        self.total_response_time += response_time
         if is_error:
             self.error_count += 1
         
@@ -195,7 +196,7 @@ class MetricsCollector:
     def _calculate_request_metrics(self):
         """Calculate request metrics based on collected data."""
         if self.request_count > 0:
-            avg_response_time = sum(self.response_times) / len(self.response_times) if self.response_times else 0
+            avg_response_time = self.total_response_time / self.request_count
             error_rate = (self.error_count / self.request_count) * 100 if self.request_count > 0 else 0
             
             self.metrics["application"] = {
@@ -207,7 +208,7 @@ class MetricsCollector:
         # Reset counters
         self.request_count = 0
         self.error_count = 0
-        self.response_times = []
+        self.total_response_time = 0.0
     
     def get_all_metrics(self) -> Dict[str, Any]:
         """Get all collected metrics."""
@@ -13,6 +13,7 @@ from sqlalchemy import and_, or_, text
 from .auth import TokenData
 from .models import Organization, OrganizationType, UserRole
 from .database import get_db
+from .crud import organization_hierarchy
 
 logger = logging.getLogger(__name__)
 
@@ -72,27 +73,8 @@ class OrganizationalDataIsolation:
                 orgs = db.query(Organization.id).all()
                 accessible_orgs = [org.id for org in orgs]
             else:
-                # Regular users and admins can access their own organization
-                accessible_orgs.append(user.organization_id)
-                
-                # Get supplier organizations under their organization
-                suppliers = db.query(Organization.id).filter(
-                    and_(
-                        Organization.parent_organization_id == user.organization_id,
-                        Organization.organization_type == OrganizationType.supplier,
-                        Organization.is_active == True
-                    )
-                ).all()
-                
-                accessible_orgs.extend([supplier.id for supplier in suppliers])
-                
-                # Exclude BossAqua data for non-super admins
-                bossaqua_org = db.query(Organization.id).filter(
-                    Organization.organization_type == OrganizationType.bossaqua
-                ).first()
-                
-                if bossaqua_org and bossaqua_org.id in accessible_orgs:
-                    accessible_orgs.remove(bossaqua_org.id)
+                # Own organization plus active suppliers beneath it, without BossAqua
+                accessible_orgs = organization_hierarchy.get_accessible_organization_ids(db, user.organization_id)
             
             # Cache the result
             self._cache_isolation_rules(cache_key, accessible_orgs)
@@ -10,6 +10,8 @@ import threading
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .metrics import observe_operation
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -32,7 +34,13 @@ class PerformanceMetric:
     error_message: Optional[str] = None
 
 class PerformanceMonitor:
-    """Thread-safe performance monitoring system"""
+    """
+    Thread-safe performance monitoring system.
+
+    Keeps the most recent samples of this process for the /performance
+    endpoints. Every sample is also recorded in the operation latency histogram
+    exported at /metrics, which aggregates all workers.
+    """
     
     def __init__(self, max_metrics_per_operation: int = 1000):
         self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_metrics_per_operation))
@@ -48,6 +56,7 @@ class PerformanceMonitor:
         """Record a performance metric"""
         with self.lock:
             self.metrics[metric.operation_name].append(metric)
+        observe_operation(metric.operation_name, metric.execution_time, metric.success)
             
         # Log based on performance level
         level = self._get_performance_level(metric.execution_time)
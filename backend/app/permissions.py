@@ -634,15 +634,10 @@ def get_accessible_organization_ids(user: TokenData, db: Session) -> List[uuid.U
         orgs = db.query(models.Organization.id).all()
         return [org.id for org in orgs]
     
-    # Regular users can access their own organization and its suppliers
-    accessible_orgs = db.query(models.Organization.id).filter(
-        or_(
-            models.Organization.id == user.organization_id,
-            models.Organization.parent_organization_id == user.organization_id
-        )
-    ).all()
-    
-    return [org.id for org in accessible_orgs]
+    # Regular users can access their own organization and its direct children
+    # Import here to avoid circular imports
+    from .crud import organization_hierarchy
+    return organization_hierarchy.get_organization_and_children_ids(db, user.organization_id)
 
 # --- Audit Logging ---
 
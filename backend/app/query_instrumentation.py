@@ -0,0 +1,239 @@
+# backend/app/query_instrumentation.py
+
+"""
+Per-request SQL instrumentation.
+
+Engine event hooks time every statement and add it to the QueryStats of the
+request being handled, found through a context variable set by
+QueryStatsMiddleware (FastAPI copies the context into the threadpool that runs
+sync endpoints, so the hooks see it there too). Statements are grouped by
+fingerprint, the SQL with literals and bind parameters stripped, so a query
+issued once per row shows up as one fingerprint with a high count.
+
+A request that runs the same fingerprint N_PLUS_ONE_THRESHOLD times or more is
+flagged as a likely N+1: it is logged, counted per route in query_stats (served
+by /performance/queries) and in the Prometheus metrics. In development the
+numbers are also returned as X-DB-* response headers.
+
+count_queries(engine) records everything one engine runs, independent of the
+request context; tests use it through the assert_max_queries fixture.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .metrics import DB_N_PLUS_ONE_REQUESTS, DB_STATEMENTS_PER_REQUEST, DB_TIME_PER_REQUEST, route_label
+
+logger = logging.getLogger(__name__)
+
+# Executions of one fingerprint within a request that flag it as a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+# Response headers with the request's numbers, on by default outside production
+QUERY_STATS_HEADERS = os.getenv(
+    "QUERY_STATS_HEADERS", str(os.getenv("ENVIRONMENT", "development") == "development")
+).lower() == "true"
+MAX_FINGERPRINT_LENGTH = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAMETER = re.compile(r"%\(\w+\)s|%s|\?|(?<!:):\w+|\$\d+")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement with literals, bind parameters and IN-lists replaced by placeholders."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()[:MAX_FINGERPRINT_LENGTH]
+
+
+class QueryStats:
+    """Statements executed within one request (or one count_queries block)."""
+
+    def __init__(self) -> None:
+        self.statement_count = 0
+        self.total_time = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statement_count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Dict[str, Any]]:
+        """Fingerprints executed at least threshold times, most frequent first."""
+        return [
+            {"fingerprint": statement, "count": count}
+            for statement, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+    @property
+    def is_likely_n_plus_one(self) -> bool:
+        return bool(self.fingerprints) and self.fingerprints.most_common(1)[0][1] >= N_PLUS_ONE_THRESHOLD
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements run by any engine in the current context."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None and context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start_time = getattr(context, "_query_start_time", None)
+    if stats is not None and start_time is not None:
+        stats.record(statement, time.perf_counter() - start_time)
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[QueryStats]:
+    """Collect every statement the given engine executes in the block, from any thread."""
+    stats = QueryStats()
+    lock = threading.Lock()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_count_queries_start", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        start_time = conn.info["_count_queries_start"].pop()
+        with lock:
+            stats.record(statement, time.perf_counter() - start_time)
+
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+        event.remove(engine, "after_cursor_execute", after)
+
+
+class QueryStatsAggregator:
+    """Per-route totals of the SQL run by requests in this process."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.routes: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, route: str, stats: QueryStats) -> None:
+        with self.lock:
+            entry = self.routes.setdefault(route, {
+                "requests": 0,
+                "total_statements": 0,
+                "max_statements": 0,
+                "total_db_time": 0.0,
+                "n_plus_one_requests": 0,
+                "last_repeated_statements": [],
+            })
+            entry["requests"] += 1
+            entry["total_statements"] += stats.statement_count
+            entry["max_statements"] = max(entry["max_statements"], stats.statement_count)
+            entry["total_db_time"] += stats.total_time
+            if stats.is_likely_n_plus_one:
+                entry["n_plus_one_requests"] += 1
+                entry["last_repeated_statements"] = stats.repeated_statements()[:5]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Routes with average statements and DB time per request, heaviest first."""
+        with self.lock:
+            routes = [(route, dict(entry)) for route, entry in self.routes.items()]
+
+        summary = []
+        for route, entry in routes:
+            summary.append({
+                "route": route,
+                "requests": entry["requests"],
+                "avg_statements": entry["total_statements"] / entry["requests"],
+                "max_statements": entry["max_statements"],
+                "avg_db_time_ms": entry["total_db_time"] / entry["requests"] * 1000,
+                "n_plus_one_requests": entry["n_plus_one_requests"],
+                "last_repeated_statements": entry["last_repeated_statements"],
+            })
+        return sorted(summary, key=lambda row: row["avg_statements"], reverse=True)
+
+    def n_plus_one_routes(self) -> List[Dict[str, Any]]:
+        """Routes with at least one request flagged as a likely N+1."""
+        return [row for row in self.summary() if row["n_plus_one_requests"] > 0]
+
+    def reset(self) -> None:
+        with self.lock:
+            self.routes.clear()
+
+
+# Global aggregator instance
+query_stats = QueryStatsAggregator()
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting the SQL run by each HTTP request."""
+
+    def __init__(self, app, add_headers: bool = QUERY_STATS_HEADERS):
+        self.app = app
+        self.add_headers = add_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if self.add_headers and message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-query-count", str(stats.statement_count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_time * 1000:.1f}".encode()),
+                    (b"x-db-repeated-statements", str(len(stats.repeated_statements())).encode()),
+                ]
+            await send(message)
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._record(scope, stats)
+
+    @staticmethod
+    def _record(scope, stats: QueryStats) -> None:
+        if stats.statement_count == 0:
+            return
+
+        route = route_label(scope)
+        query_stats.record(route, stats)
+        DB_STATEMENTS_PER_REQUEST.labels(route).observe(stats.statement_count)
+        DB_TIME_PER_REQUEST.labels(route).observe(stats.total_time)
+
+        if stats.is_likely_n_plus_one:
+            DB_N_PLUS_ONE_REQUESTS.labels(route).inc()
+            top = stats.repeated_statements()[0]
+            logger.warning(
+                f"Likely N+1 in {scope['method']} {route}: {stats.statement_count} statements, "
+                f"{top['count']}x {top['fingerprint'][:200]}"
+            )
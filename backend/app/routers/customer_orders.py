@@ -1,15 +1,17 @@
 # backend/app/routers/customer_orders.py
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import json
+import uuid
 
 from .. import models, schemas, crud
 from ..database import get_db
+from ..services.order_allocation import get_order_allocation
 from ..auth import get_current_user, TokenData
 from ..permissions import (
     ResourceType, PermissionType, require_permission, require_super_admin,
@@ -196,22 +198,30 @@ def read_customer_orders(
 
 @router.get("/stock-availability/check")
 def check_stock_availability(
+    supplier_order_id: Optional[List[uuid.UUID]] = Query(None),
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(require_permission(ResourceType.ORDER, PermissionType.READ))
 ):
     """
     Check stock availability for active customer orders against Oraseas warehouses.
 
+    Stock is allocated to active orders oldest first (by order_date), so an order is
+    only short when the orders placed before it leave too little stock.
+
     Returns two views:
     1. **parts_short** (global/dashboard view): For each part where total demand across
        ALL active orders exceeds stock, lists: part info, stock qty, total ordered qty,
-       and which orders contain that part.
-    2. **orders** (per-order view): For each order that has at least one item where the
-       order's own quantity exceeds stock, lists: part info, stock qty, qty in this order,
-       total qty of that part across all active orders.
+       qty short, and which orders contain that part with the qty allocated to each.
+    2. **orders** (per-order view): For each order with at least one item that could
+       not be fully allocated, lists: part info, stock qty, qty in this order, qty
+       allocated and short, total qty of that part across all active orders.
+
+    Pass supplier_order_id (repeatable) to project stock as if those supplier orders
+    had arrived.
 
     Active orders = status in ('Requested', 'Pending') — i.e. not yet shipped.
     Only available to Oraseas EE organization users and super admins.
+    Results are cached until orders, transactions or adjustments change.
     """
     # Permission check
     user_org = db.query(models.Organization).filter(
@@ -237,118 +247,18 @@ def check_stock_availability(
         ).first()
 
     if not oraseas_org:
-        return {"parts_short": [], "orders": []}
-
-    # Get all active (not shipped) customer orders for Oraseas
-    active_orders = db.query(models.CustomerOrder).options(
-        selectinload(models.CustomerOrder.items).selectinload(models.CustomerOrderItem.part),
-        selectinload(models.CustomerOrder.customer_organization)
-    ).filter(
-        models.CustomerOrder.oraseas_organization_id == oraseas_org.id,
-        models.CustomerOrder.status.in_(['Requested', 'Pending'])
-    ).order_by(models.CustomerOrder.order_date.asc()).all()
-
-    if not active_orders:
-        return {"parts_short": [], "orders": []}
-
-    # Get all Oraseas warehouse IDs
-    oraseas_warehouse_ids = [
-        w.id for w in db.query(models.Warehouse).filter(
-            models.Warehouse.organization_id == oraseas_org.id,
-            models.Warehouse.is_active == True
-        ).all()
-    ]
-
-    # Get total available stock per part in Oraseas warehouses
-    # Uses the same calculated stock as the warehouse inventory page (transactions + adjustments)
-    stock_by_part = {}
-    if oraseas_warehouse_ids:
-        from ..crud.inventory_calculator import calculate_current_stock
-
-        # Get all inventory records (part_ids) across Oraseas warehouses
-        inventory_records = db.query(
-            models.Inventory.part_id,
-            models.Inventory.warehouse_id
-        ).filter(
-            models.Inventory.warehouse_id.in_(oraseas_warehouse_ids)
-        ).all()
-
-        # Calculate actual stock for each part across all Oraseas warehouses
-        for record in inventory_records:
-            part_id_str = str(record.part_id)
-            calculated = float(calculate_current_stock(db, record.warehouse_id, record.part_id))
-            if calculated > 0:
-                stock_by_part[part_id_str] = stock_by_part.get(part_id_str, 0.0) + calculated
-
-    # --- Build aggregated demand per part across ALL active orders ---
-    # part_id -> { total_demand, part_name, part_number, orders: [{order_id, customer, order_date, qty}] }
-    demand_by_part = {}
-    for order in active_orders:
-        for item in order.items:
-            part_id_str = str(item.part_id)
-            if part_id_str not in demand_by_part:
-                demand_by_part[part_id_str] = {
-                    "part_id": part_id_str,
-                    "part_name": item.part.name if item.part else "Unknown",
-                    "part_number": item.part.part_number if item.part else "Unknown",
-                    "total_demand": 0.0,
-                    "orders": [],
-                }
-            demand_by_part[part_id_str]["total_demand"] += float(item.quantity)
-            demand_by_part[part_id_str]["orders"].append({
-                "order_id": str(order.id),
-                "customer_organization_name": order.customer_organization.name if order.customer_organization else "Unknown",
-                "order_date": order.order_date.isoformat() if order.order_date else None,
-                "quantity_in_order": float(item.quantity),
-            })
-
-    # --- DASHBOARD VIEW: parts where total demand > stock ---
-    parts_short = []
-    for part_id_str, info in demand_by_part.items():
-        stock = stock_by_part.get(part_id_str, 0.0)
-        if info["total_demand"] > stock:
-            parts_short.append({
-                "part_id": info["part_id"],
-                "part_name": info["part_name"],
-                "part_number": info["part_number"],
-                "quantity_in_stock": round(stock, 3),
-                "total_quantity_ordered": round(info["total_demand"], 3),
-                "orders": info["orders"],
-            })
-
-    # --- ORDERS VIEW: per order, items where THIS order's qty > stock ---
-    orders_with_issues = []
-    for order in active_orders:
-        order_missing = []
-        for item in order.items:
-            part_id_str = str(item.part_id)
-            stock = stock_by_part.get(part_id_str, 0.0)
-            qty_this_order = float(item.quantity)
-
-            if qty_this_order > stock:
-                total_demand = demand_by_part[part_id_str]["total_demand"]
-                order_missing.append({
-                    "part_id": part_id_str,
-                    "part_name": item.part.name if item.part else "Unknown",
-                    "part_number": item.part.part_number if item.part else "Unknown",
-                    "quantity_in_stock": round(stock, 3),
-                    "quantity_in_this_order": round(qty_this_order, 3),
-                    "total_quantity_all_active_orders": round(total_demand, 3),
-                })
-
-        if order_missing:
-            orders_with_issues.append({
-                "order_id": str(order.id),
-                "customer_organization_name": order.customer_organization.name if order.customer_organization else "Unknown",
-                "order_date": order.order_date.isoformat() if order.order_date else None,
-                "status": order.status,
-                "items_short": order_missing,
-            })
-
-    return {
-        "parts_short": parts_short,
-        "orders": orders_with_issues,
-    }
+        return {"parts_short": [], "orders": [], "projected_supplier_order_ids": []}
+
+    supplier_order_ids = set(supplier_order_id or [])
+    if supplier_order_ids:
+        found = db.query(func.count(models.SupplierOrder.id)).filter(
+            models.SupplierOrder.id.in_(supplier_order_ids),
+            models.SupplierOrder.ordering_organization_id == oraseas_org.id
+        ).scalar()
+        if found != len(supplier_order_ids):
+            raise HTTPException(status_code=404, detail="Supplier order not found")
+
+    return get_order_allocation(db, oraseas_org.id, supplier_order_ids)
 
 
 @router.put("/{order_id}", response_model=schemas.CustomerOrderResponse)
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 from typing import List
 from .. import schemas, crud
-from ..database import get_db
+from ..db_routing import get_read_db
 from ..auth import get_current_user, TokenData
 from ..permissions import (
     ResourceType, PermissionType, require_permission,
@@ -16,7 +16,7 @@ router = APIRouter()
 
 @router.get("/metrics", response_model=schemas.DashboardMetricsResponse, tags=["Dashboard"])
 def get_metrics(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(require_permission(ResourceType.DASHBOARD, PermissionType.READ))
 ):
     """
@@ -38,7 +38,7 @@ def get_metrics(
 
 @router.get("/low-stock-by-org", tags=["Dashboard"])
 def get_low_stock_chart_data(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(require_permission(ResourceType.DASHBOARD, PermissionType.READ))
 ):
     """
@@ -1,12 +1,15 @@
 # backend/app/routers/images.py
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Callable, Hashable, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..database import get_db
+from ..cache import etag_matches
+from ..image_utils import image_cache
 from ..auth import get_current_user, TokenData
 from ..permissions import (
     permission_checker,
@@ -18,24 +21,66 @@ from ..permissions import (
 
 router = APIRouter()
 
+# Used when the client asks for the current version explicitly (?v=<version>)
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _versioned_image_response(
+    request: Request,
+    cache_key: Hashable,
+    version: str,
+    requested_version: Optional[str],
+    load_image: Callable[[], Optional[bytes]],
+    filename: str,
+    not_found_detail: str
+) -> Response:
+    """
+    Serve image bytes identified by a content version.
+    Answers 304 when the client already holds this version, otherwise serves
+    from the in-process byte cache and only falls back to the database on a miss.
+    """
+    etag = f'"{version}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if requested_version == version else REVALIDATE_CACHE_CONTROL
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    content = image_cache.get(cache_key)
+    if content is None:
+        content = load_image()
+        if not content:
+            raise HTTPException(status_code=404, detail=not_found_detail)
+        image_cache.set(cache_key, content)
+
+    headers["Content-Disposition"] = f'inline; filename="{filename}"'
+    return Response(content=content, media_type="image/webp", headers=headers)
+
 
 @router.get("/images/users/{user_id}/profile", tags=["Images"])
 async def get_user_profile_photo(
     user_id: uuid.UUID,
+    request: Request,
+    v: Optional[str] = Query(None, description="Expected photo version (profile_photo_version)"),
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
     Serve user profile photo from database.
-    Returns WebP image or 404 if not found.
+    Returns WebP image, 304 if the client's ETag is current, or 404 if not found.
     Requires the requesting user to own the profile or have admin/super-admin rights.
     """
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.query(models.User.id, models.User.organization_id, models.User.profile_photo_version)\
+        .filter(models.User.id == user_id)\
+        .first()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    if not user.profile_photo_data:
+    if not user.profile_photo_version:
         raise HTTPException(status_code=404, detail="Profile photo not found")
 
     if user.id != current_user.user_id:
@@ -43,45 +88,51 @@ async def get_user_profile_photo(
         if not (permission_checker.is_super_admin(current_user) or (permission_checker.is_admin(current_user) and same_org)):
             raise HTTPException(status_code=403, detail="Not authorized to view this profile photo")
     
-    return Response(
-        content=user.profile_photo_data,
-        media_type="image/webp",
-        headers={
-            "Cache-Control": "public, max-age=31536000, immutable",  # Cache for 1 year (safe with cache-busting)
-            "Content-Disposition": f'inline; filename="profile_{user_id}.webp"'
-        }
+    return _versioned_image_response(
+        request,
+        cache_key=("profile", user_id, user.profile_photo_version),
+        version=user.profile_photo_version,
+        requested_version=v,
+        load_image=lambda: db.query(models.User.profile_photo_data).filter(models.User.id == user_id).scalar(),
+        filename=f"profile_{user_id}.webp",
+        not_found_detail="Profile photo not found"
     )
 
 
 @router.get("/images/organizations/{org_id}/logo", tags=["Images"])
 async def get_organization_logo(
     org_id: uuid.UUID,
+    request: Request,
+    v: Optional[str] = Query(None, description="Expected logo version (logo_version)"),
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
     Serve organization logo from database.
-    Returns WebP image or 404 if not found.
+    Returns WebP image, 304 if the client's ETag is current, or 404 if not found.
     Only accessible to users with organization access or super-admin privileges.
     """
-    org = db.query(models.Organization).filter(models.Organization.id == org_id).first()
+    org = db.query(models.Organization.logo_version)\
+        .filter(models.Organization.id == org_id)\
+        .first()
     
     if not org:
         raise HTTPException(status_code=404, detail="Organization not found")
     
-    if not org.logo_data:
+    if not org.logo_version:
         raise HTTPException(status_code=404, detail="Logo not found")
 
     if not (permission_checker.is_super_admin(current_user) or check_organization_access(current_user, org_id, db)):
         raise HTTPException(status_code=403, detail="Not authorized to view this organization logo")
     
-    return Response(
-        content=org.logo_data,
-        media_type="image/webp",
-        headers={
-            "Cache-Control": "public, max-age=31536000, immutable",  # Cache for 1 year (safe with cache-busting)
-            "Content-Disposition": f'inline; filename="logo_{org_id}.webp"'
-        }
+    return _versioned_image_response(
+        request,
+        cache_key=("logo", org_id, org.logo_version),
+        version=org.logo_version,
+        requested_version=v,
+        load_image=lambda: db.query(models.Organization.logo_data).filter(models.Organization.id == org_id).scalar(),
+        filename=f"logo_{org_id}.webp",
+        not_found_detail="Logo not found"
     )
 
 
@@ -14,6 +14,7 @@ from decimal import Decimal
 
 from .. import schemas, crud, models # Import schemas, CRUD functions, and models
 from ..database import get_db # Import DB session dependency
+from ..db_routing import get_read_db
 from ..auth import get_current_user, TokenData # Import authentication dependencies
 from ..permissions import (
     ResourceType, PermissionType, require_permission, require_admin,
@@ -65,7 +66,7 @@ async def get_inventory_reports_compatibility(
     end_date: Optional[date] = Query(None, description="End date"),
     stock_status: str = Query("all", description="Stock status filter"),
     part_type: str = Query("all", description="Part type filter"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -83,15 +84,19 @@ async def get_inventory_reports_compatibility(
                 raise HTTPException(status_code=403, detail=f"Not authorized to view warehouse {wh_id}")
         
         # Get valuation data directly from the database
-        # Get all inventory items in the specified warehouses
+        # Get all inventory items in the specified warehouses, with the latest
+        # supplier order price per part from the price index
         inventory_query = db.query(
             models.Inventory,
             models.Part,
-            models.Warehouse.name.label("warehouse_name")
+            models.Warehouse.name.label("warehouse_name"),
+            models.PartPriceIndex.latest_unit_price
         ).join(
             models.Part, models.Inventory.part_id == models.Part.id
         ).join(
             models.Warehouse, models.Inventory.warehouse_id == models.Warehouse.id
+        ).outerjoin(
+            models.PartPriceIndex, models.Inventory.part_id == models.PartPriceIndex.part_id
         ).filter(
             models.Inventory.warehouse_id.in_(warehouse_ids)
         )
@@ -99,23 +104,7 @@ async def get_inventory_reports_compatibility(
         inventory_results = inventory_query.all()
         valuation_data = []
         
-        for inventory, part, warehouse_name in inventory_results:
-            # Get the most recent supplier order item for this part to estimate value
-            supplier_order_item = db.query(
-                models.SupplierOrderItem
-            ).join(
-                models.SupplierOrder, models.SupplierOrderItem.supplier_order_id == models.SupplierOrder.id
-            ).filter(
-                models.SupplierOrderItem.part_id == part.id
-            ).order_by(
-                models.SupplierOrder.order_date.desc()
-            ).first()
-            
-            # Estimate unit value
-            unit_value = None
-            if supplier_order_item and supplier_order_item.unit_price:
-                unit_value = supplier_order_item.unit_price
-            
+        for inventory, part, warehouse_name, unit_value in inventory_results:
             # Calculate total value
             total_value = None
             if unit_value is not None:
@@ -237,44 +226,27 @@ async def get_inventory_transfers(
         if end_date:
             end_datetime = datetime.combine(end_date, datetime.max.time())
         
-        # Handle warehouse_id parameter - if provided, it means transfers involving this warehouse
-        # We'll filter this after getting the results since we need OR logic (from OR to)
-        actual_from_warehouse_id = from_warehouse_id
-        actual_to_warehouse_id = to_warehouse_id
-        
         # Create filter for transfer transactions
         filters = schemas.TransactionFilter(
             transaction_type=schemas.TransactionTypeEnum.TRANSFER,
             start_date=start_datetime,
             end_date=end_datetime,
-            from_warehouse_id=actual_from_warehouse_id,
-            to_warehouse_id=actual_to_warehouse_id,
+            from_warehouse_id=from_warehouse_id,
+            to_warehouse_id=to_warehouse_id,
+            warehouse_id=warehouse_id,
             part_id=part_id
         )
         
-        # Get transfer transactions
-        transfers = crud.transaction.search_transactions(db, filters, skip, limit)
-        
-        # If user is not a super_admin, filter transfers by organization
+        # If user is not a super_admin, only transfers involving the organization's warehouses
+        warehouse_ids = None
         if current_user.role != "super_admin":
-            # Get all warehouses for the user's organization
             warehouses = db.query(models.Warehouse).filter(
                 models.Warehouse.organization_id == current_user.organization_id
             ).all()
             warehouse_ids = [w.id for w in warehouses]
-            
-            # Filter transfers where from_warehouse_id or to_warehouse_id is in the organization's warehouses
-            transfers = [
-                t for t in transfers 
-                if (t.get("from_warehouse_id") in warehouse_ids or t.get("to_warehouse_id") in warehouse_ids)
-            ]
-        
-        # Apply warehouse_id filter if provided (transfers involving this specific warehouse)
-        if warehouse_id:
-            transfers = [
-                t for t in transfers
-                if (t.get("from_warehouse_id") == warehouse_id or t.get("to_warehouse_id") == warehouse_id)
-            ]
+        
+        # Get transfer transactions
+        transfers = crud.transaction.search_transactions(db, filters, skip, limit, warehouse_ids=warehouse_ids)
         
         return transfers
         
@@ -518,7 +490,7 @@ async def get_warehouse_analytics(
     start_date: Optional[date] = Query(None, description="Start date for analytics period (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date for analytics period (YYYY-MM-DD)"),
     days: int = Query(30, ge=1, le=365, description="Number of days to include in analytics (default: 30)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -631,7 +603,7 @@ async def get_warehouse_analytics_trends(
     warehouse_id: uuid.UUID,
     period: str = Query("daily", regex="^(daily|weekly|monthly)$", description="Aggregation period: daily, weekly, or monthly"),
     days: int = Query(30, ge=1, le=365, description="Number of days to include in trends (default: 30)"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
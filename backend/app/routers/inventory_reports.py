@@ -7,10 +7,10 @@ from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func
 
 from .. import schemas, crud, models
-from ..database import get_db
+from ..db_routing import get_read_db
 from ..auth import get_current_user, TokenData
 from ..permissions import (
     ResourceType, PermissionType, require_permission, require_super_admin,
@@ -26,7 +26,7 @@ async def get_inventory_movement_report(
     part_id: Optional[uuid.UUID] = Query(None, description="Filter by part ID"),
     start_date: Optional[datetime] = Query(None, description="Start date for report period"),
     end_date: Optional[datetime] = Query(None, description="End date for report period"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(require_permission(ResourceType.INVENTORY, PermissionType.READ))
 ):
     """Generate inventory movement report based on transactions."""
@@ -196,7 +196,7 @@ async def get_inventory_turnover_report(
     organization_id: Optional[uuid.UUID] = Query(None, description="Filter by organization ID"),
     warehouse_id: Optional[uuid.UUID] = Query(None, description="Filter by warehouse ID"),
     period_days: int = Query(90, ge=30, le=365, description="Number of days to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(require_permission(ResourceType.INVENTORY, PermissionType.READ))
 ):
     """Generate inventory turnover report based on transactions."""
@@ -311,7 +311,7 @@ async def get_inventory_turnover_report(
 async def get_inventory_valuation_report(
     organization_id: Optional[uuid.UUID] = Query(None, description="Filter by organization ID"),
     warehouse_id: Optional[uuid.UUID] = Query(None, description="Filter by warehouse ID"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(require_permission(ResourceType.INVENTORY, PermissionType.READ))
 ):
     """Generate inventory valuation report based on current inventory and transaction history."""
@@ -346,15 +346,19 @@ async def get_inventory_valuation_report(
     if not warehouse_ids:
         return []
     
-    # Get all inventory items in the specified warehouses
+    # Get all inventory items in the specified warehouses, valued at the latest
+    # supplier order price per part from the price index
     inventory_query = db.query(
         models.Inventory,
         models.Part,
-        models.Warehouse.name.label("warehouse_name")
+        models.Warehouse.name.label("warehouse_name"),
+        models.PartPriceIndex.latest_unit_price
     ).join(
         models.Part, models.Inventory.part_id == models.Part.id
     ).join(
         models.Warehouse, models.Inventory.warehouse_id == models.Warehouse.id
+    ).outerjoin(
+        models.PartPriceIndex, models.Inventory.part_id == models.PartPriceIndex.part_id
     ).filter(
         models.Inventory.warehouse_id.in_(warehouse_ids)
     )
@@ -364,23 +368,7 @@ async def get_inventory_valuation_report(
     # Prepare result
     result = []
     
-    for inventory, part, warehouse_name in inventory_results:
-        # Get the most recent supplier order item for this part to estimate value
-        supplier_order_item = db.query(
-            models.SupplierOrderItem
-        ).join(
-            models.SupplierOrder, models.SupplierOrderItem.supplier_order_id == models.SupplierOrder.id
-        ).filter(
-            models.SupplierOrderItem.part_id == part.id
-        ).order_by(
-            desc(models.SupplierOrder.order_date)
-        ).first()
-        
-        # Estimate unit value
-        unit_value = None
-        if supplier_order_item and supplier_order_item.unit_price:
-            unit_value = supplier_order_item.unit_price
-        
+    for inventory, part, warehouse_name, unit_value in inventory_results:
         # Calculate total value
         total_value = None
         if unit_value is not None:
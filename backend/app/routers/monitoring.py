@@ -3,13 +3,15 @@ Monitoring router for ABParts.
 Provides endpoints for health checks, metrics, and alerts.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from sqlalchemy.orm import Session
 from typing import Dict, List, Any, Optional
 
 from ..database import get_db
 from ..auth import get_current_user, has_role, has_roles
 from ..monitoring import get_monitoring_system
+from ..slow_queries import slow_query_log
+from ..db_routing import pool_status
 
 router = APIRouter()
 
@@ -132,6 +134,50 @@ async def resolve_alert(
     }
 
 
+@router.get("/slow-queries", response_model=Dict[str, Any])
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total_ms", pattern="^(total_ms|p95_ms|max_ms|calls)$"),
+    include_plans: bool = True,
+    current_user = Depends(has_role("super_admin"))
+):
+    """
+    Get the slowest SQL statements seen by this API process.
+    
+    Returns statements over the slow query threshold grouped by fingerprint,
+    with call counts, p95 and the sampled EXPLAIN plan, plus the latest slow
+    executions. Plans can contain filter values, so this requires super admin
+    privileges.
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "top": slow_query_log.top(limit, order_by, include_plans),
+        "recent": slow_query_log.recent_executions(limit)
+    }
+
+
+@router.delete("/slow-queries", response_model=Dict[str, Any])
+async def reset_slow_queries(current_user = Depends(has_role("super_admin"))):
+    """
+    Clear the recorded slow statements.
+    
+    Requires super admin privileges.
+    """
+    slow_query_log.reset()
+    return {"status": "success", "message": "Slow query log cleared"}
+
+
+@router.get("/database-pools", response_model=Dict[str, Any])
+async def get_database_pools(current_user = Depends(has_roles(["admin", "super_admin"]))):
+    """
+    Get connection pool usage of the primary database and the read replica.
+    
+    The replica entry is null when DATABASE_REPLICA_URL is not set.
+    Requires admin privileges.
+    """
+    return pool_status()
+
+
 @router.get("/system-info", response_model=Dict[str, Any])
 async def get_system_info(current_user = Depends(has_roles(["admin", "super_admin"]))):
     """
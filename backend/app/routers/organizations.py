@@ -17,6 +17,7 @@ from ..permissions import (
     ResourceType, PermissionType, require_permission, require_super_admin, require_admin,
     OrganizationScopedQueries, check_organization_access, permission_checker
 )
+from ..crud import organization_hierarchy
 
 router = APIRouter()
 
@@ -75,12 +76,10 @@ async def get_organizations(
         if not include_inactive:
             query = query.filter(models.Organization.is_active == True)
         
+        # Logo bytes are deferred; the list carries logo_version for clients
+        # to request /images/organizations/{id}/logo?v=<logo_version>
         organizations = query.all()
         
-        # Add logo URLs with cache-busting to all organizations
-        for org in organizations:
-            _add_logo_url_to_organization(org)
-        
         return organizations
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -127,21 +126,12 @@ async def get_organization_hierarchy_tree(
                 detail="Invalid value for include_inactive parameter. Must be true or false."
             )
         
-        # Build base query for organizations
-        query = db.query(models.Organization)
-        
-        # Apply organization-scoped filtering
-        query = OrganizationScopedQueries.filter_organizations(query, current_user)
-        
-        # Apply inactive filter
-        if not include_inactive:
-            query = query.filter(models.Organization.is_active == True)
-        
-        # Get all accessible organizations
-        accessible_orgs = query.all()
-        
-        # Extract IDs for the CRUD function
-        accessible_org_ids = {org.id for org in accessible_orgs}
+        # Non-super-admins see their own organization and its direct children
+        accessible_org_ids = None
+        if not permission_checker.is_super_admin(current_user):
+            accessible_org_ids = set(organization_hierarchy.get_organization_and_children_ids(
+                db, current_user.organization_id, include_inactive=include_inactive
+            ))
         
         # Get the hierarchy tree using the CRUD function
         hierarchy_tree = crud.organizations.get_organization_hierarchy_tree(
@@ -355,7 +345,7 @@ def _add_logo_url_to_organization(org):
     """Helper to add logo data URL to organization response."""
     from ..image_utils import image_to_data_url
     
-    if org.logo_data:
+    if org.logo_version:
         # Convert binary data to data URL for immediate display
         org.logo_data_url = image_to_data_url(org.logo_data)
     else:
@@ -142,6 +142,26 @@ async def search_parts(
     
     return result
 
+@router.get("/autocomplete", response_model=List[schemas.PartAutocompleteSuggestion])
+@monitor_api_performance("api.autocomplete_parts")
+async def autocomplete_parts(
+    q: str = Query(..., min_length=1, max_length=100, description="Start of a part number or of a word in any language variant of the name"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    response: Response = None,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(require_permission(ResourceType.PART, PermissionType.READ))
+):
+    """
+    Suggest parts while the user types in the search box.
+    All authenticated users can search parts.
+    """
+    suggestions = crud.parts.autocomplete_parts(db, prefix=q, limit=limit)
+    
+    # Suggestions change as parts are added; cache briefly
+    response.headers["Cache-Control"] = "public, max-age=60"
+    
+    return suggestions
+
 # --- Pydantic model for label generation request ---
 class PartLabelRequest(BaseModel):
     part_ids: Optional[List[uuid.UUID]] = None
@@ -249,12 +269,16 @@ async def get_parts_with_inventory(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     include_count: bool = Query(False, description="Include total count of matching records (may impact performance)"),
+    stock_status: Optional[str] = Query(None, pattern="^(in_stock|low|out)$", description="Filter by stock status: in_stock, low or out"),
+    sort_by: Optional[str] = Query(None, pattern="^(created_at|name|part_number|total_stock)$", description="Sort field: created_at, name, part_number or total_stock"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction for sort_by: asc or desc"),
     response: Response = None,
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(require_permission(ResourceType.PART, PermissionType.READ))
 ):
     """
     Get all parts with inventory information across all warehouses.
+    Stock status filtering and sorting by total stock are applied before pagination.
     If organization_id is provided, only inventory from that organization's warehouses is included.
     Otherwise, for regular users, only inventory from their organization's warehouses is shown.
     Super admins see all inventory across all organizations if no organization_id is specified.
@@ -269,7 +293,8 @@ async def get_parts_with_inventory(
         raise HTTPException(status_code=403, detail="Not authorized to access this organization's inventory")
     
     result = crud.parts.get_parts_with_inventory_with_count(
-        db, organization_id, part_type, is_proprietary, skip, limit, include_count
+        db, organization_id, part_type, is_proprietary, skip, limit, include_count,
+        stock_status, sort_by, sort_order
     )
     
     # Add caching headers for inventory data (shorter cache due to dynamic nature)
@@ -287,6 +312,9 @@ async def search_parts_with_inventory(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     include_count: bool = Query(False, description="Include total count of matching records (may impact performance)"),
+    stock_status: Optional[str] = Query(None, pattern="^(in_stock|low|out)$", description="Filter by stock status: in_stock, low or out"),
+    sort_by: Optional[str] = Query(None, pattern="^(created_at|name|part_number|total_stock)$", description="Sort field: created_at, name, part_number or total_stock"),
+    sort_order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction for sort_by: asc or desc"),
     response: Response = None,
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(require_permission(ResourceType.PART, PermissionType.READ))
@@ -307,7 +335,8 @@ async def search_parts_with_inventory(
         raise HTTPException(status_code=403, detail="Not authorized to access this organization's inventory")
     
     result = crud.parts.search_parts_with_inventory_with_count(
-        db, q, organization_id, part_type, is_proprietary, skip, limit, include_count
+        db, q, organization_id, part_type, is_proprietary, skip, limit, include_count,
+        stock_status, sort_by, sort_order
     )
     
     # Add caching headers for search with inventory results (shorter cache due to dynamic nature)
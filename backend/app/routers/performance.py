@@ -10,6 +10,7 @@ from ..database import get_db
 from ..auth import TokenData
 from ..permissions import require_super_admin
 from ..performance_monitoring import performance_monitor, PerformanceBenchmark
+from ..query_instrumentation import query_stats, N_PLUS_ONE_THRESHOLD
 
 router = APIRouter()
 
@@ -54,6 +55,31 @@ async def get_slow_operations(
     """
     return performance_monitor.get_slow_operations(threshold_ms, hours)
 
+@router.get("/queries", response_model=List[Dict[str, Any]])
+async def get_query_statistics(
+    current_user: TokenData = Depends(require_super_admin())
+):
+    """
+    Get SQL statements and database time per request for each route, heaviest first.
+    Counts cover the API worker that serves this request since it started.
+    Only super admins can access performance metrics.
+    """
+    return query_stats.summary()
+
+@router.get("/queries/n-plus-one", response_model=Dict[str, Any])
+async def get_n_plus_one_routes(
+    current_user: TokenData = Depends(require_super_admin())
+):
+    """
+    Get routes whose requests repeated one SQL statement past the N+1 threshold,
+    with the most recently repeated statements.
+    Only super admins can access performance metrics.
+    """
+    return {
+        "threshold": N_PLUS_ONE_THRESHOLD,
+        "routes": query_stats.n_plus_one_routes()
+    }
+
 @router.get("/benchmarks", response_model=Dict[str, Dict[str, float]])
 async def get_performance_benchmarks(
     db: Session = Depends(get_db),
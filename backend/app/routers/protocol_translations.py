@@ -2,13 +2,17 @@
 
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Header
+import json
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..auth import get_current_user
 from ..models import User
+from ..cache import etag_matches
 from ..services.translation_service import TranslationService
+from ..services import protocol_bundles
 from ..services.ai_translation_service import ai_translation_service
 from ..schemas_translations import (
     ProtocolTranslationCreate, ProtocolTranslationUpdate, ProtocolTranslationResponse,
@@ -211,9 +215,45 @@ async def delete_checklist_item_translation(
 
 # Language-aware Display Endpoints
 
+def _bundle_response(request: Request, bundle: protocol_bundles.ProtocolBundle, part: Optional[str] = None) -> Response:
+    """
+    Serve a bundle, or one part of it ("protocol" or "checklist_items"), with
+    the bundle's content hash as ETag; 304 when the client's copy is current.
+    """
+    headers = {"ETag": bundle.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), bundle.etag):
+        return Response(status_code=304, headers=headers)
+    content = bundle.body if part is None else json.dumps(json.loads(bundle.body)[part])
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@router.get("/protocols/{protocol_id}/bundle", response_model=dict)
+async def get_protocol_bundle(
+    protocol_id: UUID,
+    request: Request,
+    language: Optional[str] = None,
+    accept_language: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Protocol and all its checklist items in the user's preferred language, as
+    one precompiled bundle: {"protocol": {...}, "checklist_items": [...]}.
+    Send the ETag back in If-None-Match to get a 304 while it is unchanged.
+    """
+    preferred_language = language or get_user_language(accept_language)
+
+    bundle = protocol_bundles.get_bundle(db, protocol_id, preferred_language)
+    if not bundle:
+        raise HTTPException(status_code=404, detail="Protocol not found")
+
+    return _bundle_response(request, bundle)
+
+
 @router.get("/protocols/{protocol_id}/localized", response_model=dict)
 async def get_localized_protocol(
     protocol_id: UUID,
+    request: Request,
     language: Optional[str] = None,
     accept_language: Optional[str] = Header(None),
     db: Session = Depends(get_db),
@@ -224,19 +264,18 @@ async def get_localized_protocol(
     # Determine preferred language
     preferred_language = language or get_user_language(accept_language)
     
-    protocol = TranslationService.get_localized_protocol(
-        protocol_id, preferred_language, db
-    )
+    bundle = protocol_bundles.get_bundle(db, protocol_id, preferred_language)
     
-    if not protocol:
+    if not bundle:
         raise HTTPException(status_code=404, detail="Protocol not found")
     
-    return protocol
+    return _bundle_response(request, bundle, "protocol")
 
 
 @router.get("/protocols/{protocol_id}/checklist-items/localized", response_model=List[dict])
 async def get_localized_checklist_items(
     protocol_id: UUID,
+    request: Request,
     language: Optional[str] = None,
     accept_language: Optional[str] = Header(None),
     db: Session = Depends(get_db),
@@ -247,11 +286,12 @@ async def get_localized_checklist_items(
     # Determine preferred language
     preferred_language = language or get_user_language(accept_language)
     
-    items = TranslationService.get_localized_checklist_items(
-        protocol_id, preferred_language, db
-    )
+    bundle = protocol_bundles.get_bundle(db, protocol_id, preferred_language)
+    
+    if not bundle:
+        return []
     
-    return items
+    return _bundle_response(request, bundle, "checklist_items")
 
 
 # Bulk Translation Operations
@@ -332,7 +372,7 @@ async def auto_translate_protocol(
     check_translation_permissions(current_user)
     
     # Check if AI translation service is available
-    if not ai_translation_service.is_translation_available():
+    if not await ai_translation_service.is_translation_available():
         raise HTTPException(
             status_code=503, 
             detail="AI translation service is currently unavailable"
@@ -356,7 +396,8 @@ async def auto_translate_protocol(
         ai_translations = await ai_translation_service.translate_protocol(
             protocol_name=protocol.name,
             protocol_description=protocol.description,
-            target_languages=target_languages
+            target_languages=target_languages,
+            db=db
         )
         
         # Save translations to database
@@ -428,7 +469,7 @@ async def auto_translate_protocol_checklist(
     check_translation_permissions(current_user)
     
     # Check if AI translation service is available
-    if not ai_translation_service.is_translation_available():
+    if not await ai_translation_service.is_translation_available():
         raise HTTPException(
             status_code=503, 
             detail="AI translation service is currently unavailable"
@@ -466,7 +507,8 @@ async def auto_translate_protocol_checklist(
         # Generate AI translations for all items
         ai_translations = await ai_translation_service.translate_multiple_checklist_items(
             items=items_data,
-            target_languages=target_languages
+            target_languages=target_languages,
+            db=db
         )
         
         # Save translations to database
@@ -567,7 +609,7 @@ async def auto_translate_complete_protocol(
     check_translation_permissions(current_user)
     
     # Check if AI translation service is available
-    if not ai_translation_service.is_translation_available():
+    if not await ai_translation_service.is_translation_available():
         raise HTTPException(
             status_code=503, 
             detail="AI translation service is currently unavailable"
@@ -612,7 +654,7 @@ async def get_auto_translate_status(
 ):
     """Check if auto-translation service is available"""
     
-    is_available = ai_translation_service.is_translation_available()
+    is_available = await ai_translation_service.is_translation_available()
     supported_languages = ai_translation_service.get_supported_languages()
     
     return {
@@ -0,0 +1,79 @@
+# backend/app/routers/sync.py
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .. import schemas
+from ..database import get_db
+from ..auth import get_current_user, TokenData
+from ..permissions import permission_checker
+from ..crud import sync as crud_sync, sync_replay as crud_sync_replay
+
+router = APIRouter()
+
+
+@router.post("/changes", response_model=schemas.SyncResponse)
+async def get_sync_changes(
+    request: schemas.SyncRequest,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    Delta sync for offline clients.
+    Takes a cursor per resource and returns only the rows created, updated or
+    deleted since then, scoped to the user's organization. Resources:
+    maintenance_protocols, protocol_checklist_items, machines, farm_sites, nets.
+    """
+    unknown = sorted(set(request.cursors) - set(crud_sync.SYNC_RESOURCES))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown sync resources: {', '.join(unknown)}. "
+                   f"Supported: {', '.join(crud_sync.SYNC_RESOURCES)}"
+        )
+
+    is_super_admin = permission_checker.is_super_admin(current_user)
+    resources = {}
+    for resource, cursor in request.cursors.items():
+        unscoped = is_super_admin and crud_sync.SYNC_RESOURCES[resource].super_admin_unscoped
+        try:
+            resources[resource] = crud_sync.get_changes(
+                db,
+                resource,
+                since=cursor,
+                limit=request.limit,
+                organization_id=None if unscoped else current_user.organization_id
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"{e}; send \"0\" to download {resource} again")
+
+    return {"resources": resources}
+
+
+@router.post("/replay", response_model=schemas.SyncReplayResponse)
+async def replay_offline_work(
+    batch: schemas.SyncReplayRequest,
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    Apply work queued while offline in one transaction.
+    Every item carries an id generated on the device, so replaying the same
+    batch again is harmless: existing rows are updated, not duplicated.
+    Returns one result per item; rejected items do not stop the rest.
+    """
+    try:
+        results = crud_sync_replay.replay_offline_batch(
+            db,
+            batch,
+            user_id=current_user.user_id,
+            organization_id=current_user.organization_id,
+            is_super_admin=permission_checker.is_super_admin(current_user)
+        )
+    except IntegrityError:
+        # Another replay of the same items committed first; retrying updates them
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Batch conflicted with a concurrent replay, please retry")
+    rejected = sum(1 for result in results if result["status"] == "rejected")
+    return {"results": results, "applied": len(results) - rejected, "rejected": rejected}
@@ -39,18 +39,9 @@ async def get_transactions(
         warehouses = db.query(models.Warehouse).filter(models.Warehouse.organization_id == current_user.organization_id).all()
         warehouse_ids = [w.id for w in warehouses]
         
-        # Create a filter for transactions involving the organization's warehouses
+        # Only transactions involving the organization's warehouses
         filters = schemas.TransactionFilter()
-        # We'll handle the warehouse filtering in the search_transactions function
-        transactions = crud.transaction.search_transactions(db, filters, skip, limit)
-        
-        # Filter transactions where from_warehouse_id or to_warehouse_id is in the organization's warehouses
-        transactions = [
-            t for t in transactions 
-            if (t.get("from_warehouse_id") in warehouse_ids or t.get("to_warehouse_id") in warehouse_ids)
-        ]
-        
-        return transactions[:limit]  # Apply limit after filtering
+        return crud.transaction.search_transactions(db, filters, skip, limit, warehouse_ids=warehouse_ids)
     else:
         # Super admins see all transactions
         return crud.transaction.get_transactions(db, skip, limit)
@@ -107,20 +98,41 @@ async def search_transactions(
         warehouses = db.query(models.Warehouse).filter(models.Warehouse.organization_id == current_user.organization_id).all()
         warehouse_ids = [w.id for w in warehouses]
         
-        # Search transactions
-        transactions = crud.transaction.search_transactions(db, filters, skip, limit)
-        
-        # Filter transactions where from_warehouse_id or to_warehouse_id is in the organization's warehouses
-        transactions = [
-            t for t in transactions 
-            if (t.get("from_warehouse_id") in warehouse_ids or t.get("to_warehouse_id") in warehouse_ids)
-        ]
-        
-        return transactions[:limit]  # Apply limit after filtering
+        # Search transactions involving the organization's warehouses
+        return crud.transaction.search_transactions(db, filters, skip, limit, warehouse_ids=warehouse_ids)
     else:
         # Super admins see all transactions
         return crud.transaction.search_transactions(db, filters, skip, limit)
 
+@router.post("/search/page", response_model=schemas.TransactionSearchPage)
+async def search_transactions_page(
+    filters: schemas.TransactionFilter,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(require_permission(ResourceType.TRANSACTION, PermissionType.READ))
+):
+    """
+    Search transactions with filters using cursor-based pagination.
+    Pages stay fast however far back the history goes; pass next_cursor from
+    each response to fetch the following page.
+    Users can only view transactions involving their organization's warehouses.
+    """
+    warehouse_ids = None
+    if not permission_checker.is_super_admin(current_user):
+        warehouse_ids = [
+            w.id for w in db.query(models.Warehouse.id).filter(
+                models.Warehouse.organization_id == current_user.organization_id
+            ).all()
+        ]
+    
+    try:
+        return crud.transaction.search_transactions_page(
+            db, filters, limit=limit, cursor=cursor, warehouse_ids=warehouse_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/reverse", response_model=schemas.TransactionResponse)
 async def reverse_transaction(
     reversal: schemas.TransactionReversal,
@@ -21,6 +21,7 @@ from .dashboard import *
 from .inventory_workflow import *
 from .maintenance_protocol import *
 from .warehouse_location import *
+from .sync import *
 
 # Rebuild maintenance protocol schemas with forward references
 from .maintenance_protocol import (
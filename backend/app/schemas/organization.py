@@ -52,7 +52,8 @@ class OrganizationResponse(OrganizationBase):
     id: uuid.UUID
     created_at: datetime
     updated_at: datetime
-    logo_data_url: Optional[str] = None  # Data URL for logo display
+    logo_data_url: Optional[str] = None  # Data URL for logo display (single-organization responses only)
+    logo_version: Optional[str] = None  # Content hash for /images/organizations/{id}/logo?v=
 
     class Config:
         from_attributes = True
@@ -113,6 +114,7 @@ class OrganizationHierarchyNode(BaseModel):
     updated_at: datetime
     children: List['OrganizationHierarchyNode'] = []
     logo_data_url: Optional[str] = None  # Data URL for logo display
+    logo_version: Optional[str] = None  # Content hash for /images/organizations/{id}/logo?v=
     
     class Config:
         from_attributes = True
@@ -178,6 +178,13 @@ class PartReorderSuggestion(BaseModel):
     class Config:
         from_attributes = True
 
+class PartAutocompleteSuggestion(BaseModel):
+    """Parts search box suggestion"""
+    id: uuid.UUID
+    part_number: str
+    name: str
+    matched_name: str  # Language variant of the name that matched the prefix
+
 # --- Enhanced Parts List Response Schemas ---
 class PartsListResponse(BaseModel):
     """Response schema for parts list endpoints with optional count"""
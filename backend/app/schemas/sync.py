@@ -0,0 +1,90 @@
+# backend/app/schemas/sync.py
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Union
+from pydantic import BaseModel, Field
+
+from .maintenance_protocol import ChecklistItemStatusEnum, MaintenanceExecutionStatusEnum
+from .net_cleaning import NetCleaningRecordCreate
+
+
+class SyncRequest(BaseModel):
+    """Per-resource change cursors from an offline client ("0" for a full download)"""
+    cursors: Dict[str, Union[str, int]] = Field(..., description="Resource name -> last cursor received")
+    limit: int = Field(500, ge=1, le=2000, description="Maximum changes returned per resource")
+
+
+class SyncResourceChanges(BaseModel):
+    """Changes to one resource since the client's cursor"""
+    resource: str
+    upserts: List[Dict[str, Any]] = []  # Created or updated rows, same shape as the resource's list endpoint
+    deletes: List[uuid.UUID] = []  # Rows to remove from the local cache
+    cursor: str  # Opaque; send back on the next sync
+    has_more: bool = False
+
+
+class SyncResponse(BaseModel):
+    resources: Dict[str, SyncResourceChanges]
+
+
+# --- Offline replay ---
+# Every item carries an id generated on the device, used as the row's primary
+# key so that replaying the same batch twice updates rather than duplicates.
+
+MAX_REPLAY_ITEMS = 1000
+
+
+class ReplayExecution(BaseModel):
+    id: uuid.UUID
+    machine_id: uuid.UUID
+    protocol_id: Optional[uuid.UUID] = None
+    performed_date: Optional[datetime] = None
+    machine_hours_at_service: Optional[Decimal] = Field(None, decimal_places=2, ge=0)
+    next_service_due_hours: Optional[Decimal] = Field(None, decimal_places=2, ge=0)
+    status: MaintenanceExecutionStatusEnum = MaintenanceExecutionStatusEnum.IN_PROGRESS
+    notes: Optional[str] = None
+
+
+class ReplayChecklistCompletion(BaseModel):
+    id: uuid.UUID
+    execution_id: uuid.UUID  # An execution in this batch or one already on the server
+    checklist_item_id: uuid.UUID
+    status: ChecklistItemStatusEnum = ChecklistItemStatusEnum.COMPLETED
+    notes: Optional[str] = None
+    completed_at: Optional[datetime] = None  # When the item was ticked off on the device
+
+
+class ReplayMachineHours(BaseModel):
+    id: uuid.UUID
+    machine_id: uuid.UUID
+    hours_value: Decimal = Field(..., decimal_places=2, gt=0, le=99999)
+    recorded_date: datetime
+    notes: Optional[str] = None
+
+
+class ReplayNetCleaningRecord(NetCleaningRecordCreate):
+    id: uuid.UUID
+
+
+class SyncReplayRequest(BaseModel):
+    """Work recorded offline, applied in one transaction"""
+    executions: List[ReplayExecution] = Field([], max_length=MAX_REPLAY_ITEMS)
+    checklist_completions: List[ReplayChecklistCompletion] = Field([], max_length=MAX_REPLAY_ITEMS)
+    machine_hours: List[ReplayMachineHours] = Field([], max_length=MAX_REPLAY_ITEMS)
+    net_cleaning_records: List[ReplayNetCleaningRecord] = Field([], max_length=MAX_REPLAY_ITEMS)
+
+
+class ReplayItemResult(BaseModel):
+    kind: str  # execution, checklist_completion, machine_hours or net_cleaning_record
+    id: uuid.UUID  # Client id as sent
+    status: str  # created, updated or rejected
+    server_id: Optional[uuid.UUID] = None  # Differs from id when a completion merged into an existing one
+    detail: Optional[str] = None  # Reason for a rejection
+
+
+class SyncReplayResponse(BaseModel):
+    results: List[ReplayItemResult]
+    applied: int
+    rejected: int
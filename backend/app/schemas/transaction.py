@@ -62,12 +62,19 @@ class TransactionFilter(BaseModel):
     part_id: Optional[uuid.UUID] = None
     from_warehouse_id: Optional[uuid.UUID] = None
     to_warehouse_id: Optional[uuid.UUID] = None
+    warehouse_id: Optional[uuid.UUID] = None  # Either source or destination
     machine_id: Optional[uuid.UUID] = None
     performed_by_user_id: Optional[uuid.UUID] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     reference_number: Optional[str] = None
 
+class TransactionSearchPage(BaseModel):
+    """Keyset-paginated transaction search results"""
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to get the next page
+    has_more: bool = False
+
 class TransactionReversal(BaseModel):
     transaction_id: uuid.UUID
     reason: str
@@ -49,6 +49,7 @@ class UserResponse(UserBase):
     preferred_country: Optional[str] = None
     profile_photo_url: Optional[str] = None
     profile_photo_data_url: Optional[str] = None  # Data URL for photo display
+    profile_photo_version: Optional[str] = None  # Content hash for /images/users/{id}/profile?v=
     last_login: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
@@ -105,6 +106,7 @@ class UserProfileResponse(BaseModel):
     preferred_language: Optional[str] = None
     preferred_country: Optional[str] = None
     profile_photo_url: Optional[str] = None
+    profile_photo_version: Optional[str] = None
     last_login: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
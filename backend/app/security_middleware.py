@@ -25,7 +25,7 @@ class SecurityAuditMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
         self.excluded_paths = {
-            "/docs", "/redoc", "/openapi.json", "/health", "/token", "/static", "/images"
+            "/docs", "/redoc", "/openapi.json", "/health", "/metrics", "/token", "/static", "/images"
         }
         self.sensitive_endpoints = {
             "/organizations", "/users", "/machines", "/warehouses", 
@@ -1,19 +1,37 @@
 # backend/app/services/ai_translation_service.py
 
-import os
+import hashlib
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 from deep_translator import GoogleTranslator
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import TranslationMemory
 
 logger = logging.getLogger(__name__)
 
+# How long a successful availability probe is trusted
+AVAILABILITY_TTL = 300  # seconds
+
+
+def source_hash(text: str) -> str:
+    """Translation memory key for a source string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 class AITranslationService:
     """Service for AI-powered automatic translations using Google Translate"""
     
-    def __init__(self):
-        self.executor = ThreadPoolExecutor(max_workers=5)
+    def __init__(self, max_workers: int = 5):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Translators are reused per worker thread and language pair
+        self._translators = threading.local()
+        self._available_until = 0.0
         
         # Language mapping: our codes -> Google Translate codes
         self.language_mapping = {
@@ -52,7 +70,7 @@ class AITranslationService:
             dest_lang = self.language_mapping.get(target_language, target_language)
             
             # Run translation in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
                 self.executor,
                 self._translate_sync,
@@ -69,14 +87,98 @@ class AITranslationService:
     
     def _translate_sync(self, text: str, src_lang: str, dest_lang: str):
         """Synchronous translation method for thread pool execution"""
-        translator = GoogleTranslator(source=src_lang, target=dest_lang)
+        # GoogleTranslator keeps per-call state, so instances are not shared between threads
+        translators = getattr(self._translators, 'by_pair', None)
+        if translators is None:
+            translators = self._translators.by_pair = {}
+        translator = translators.get((src_lang, dest_lang))
+        if translator is None:
+            translator = translators[(src_lang, dest_lang)] = GoogleTranslator(source=src_lang, target=dest_lang)
         return translator.translate(text)
     
+    async def translate_batch(
+        self,
+        texts: Iterable[Optional[str]],
+        target_languages: Iterable[str],
+        source_language: str = 'en',
+        db: Optional[Session] = None
+    ) -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Translate every text to every target language.
+        
+        Identical strings are translated once, strings already in the
+        translation memory are not sent at all, and the rest are translated
+        concurrently on the executor. New translations are added to the memory
+        when a session is given.
+        
+        Returns:
+            {(text, language): translated text, or None if translation failed}
+        """
+        unique_texts = {text for text in texts if text and text.strip()}
+        languages = {lang for lang in target_languages if lang != source_language}
+        translations: Dict[Tuple[str, str], Optional[str]] = {}
+        if not unique_texts or not languages:
+            return translations
+            
+        hashes = {source_hash(text): text for text in unique_texts}
+        if db is not None:
+            remembered = db.query(TranslationMemory).filter(
+                TranslationMemory.source_hash.in_(list(hashes)),
+                TranslationMemory.source_language == source_language,
+                TranslationMemory.target_language.in_(languages)
+            ).all()
+            for entry in remembered:
+                # Guard against a hash collision before trusting the entry
+                if hashes[entry.source_hash] == entry.source_text:
+                    translations[(entry.source_text, entry.target_language)] = entry.translated_text
+                    
+        pending = [
+            (text, lang) for text in sorted(unique_texts) for lang in sorted(languages)
+            if (text, lang) not in translations
+        ]
+        if pending:
+            logger.info(
+                f"Translating {len(pending)} strings ({len(unique_texts) * len(languages) - len(pending)} "
+                f"from translation memory)"
+            )
+            results = await asyncio.gather(*(
+                self.translate_text(text, lang, source_language) for text, lang in pending
+            ))
+            translations.update(zip(pending, results))
+            
+            if db is not None:
+                self._remember(db, source_language, [
+                    (text, lang, translated) for (text, lang), translated in zip(pending, results) if translated
+                ])
+                
+        return translations
+    
+    def _remember(self, db: Session, source_language: str, entries: List[Tuple[str, str, str]]):
+        """Add new translations to the translation memory; committing is left to the caller."""
+        if not entries:
+            return
+        try:
+            with db.begin_nested():
+                db.add_all([
+                    TranslationMemory(
+                        source_hash=source_hash(text),
+                        source_language=source_language,
+                        target_language=lang,
+                        source_text=text,
+                        translated_text=translated
+                    )
+                    for text, lang, translated in entries
+                ])
+        except IntegrityError:
+            # A concurrent request stored the same strings first
+            logger.info("Translation memory entries already stored by another request")
+    
     async def translate_protocol(
-        self, 
-        protocol_name: str, 
+        self,
+        protocol_name: str,
         protocol_description: Optional[str] = None,
-        target_languages: Optional[List[str]] = None
+        target_languages: Optional[List[str]] = None,
+        db: Optional[Session] = None
     ) -> Dict[str, Dict[str, str]]:
         """
         Translate protocol name and description to multiple languages
@@ -85,6 +187,7 @@ class AITranslationService:
             protocol_name: Protocol name to translate
             protocol_description: Protocol description to translate (optional)
             target_languages: List of target language codes (default: all supported)
+            db: Session for the translation memory (optional)
             
         Returns:
             Dictionary with translations:
@@ -97,28 +200,17 @@ class AITranslationService:
         if target_languages is None:
             target_languages = self.target_languages
             
-        translations = {}
+        translated = await self.translate_batch([protocol_name, protocol_description], target_languages, db=db)
         
+        translations = {}
         for lang in target_languages:
-            try:
-                # Translate name (required)
-                translated_name = await self.translate_text(protocol_name, lang)
+            translated_name = translated.get((protocol_name, lang))
+            if translated_name:  # Only add if name translation succeeded
+                translations[lang] = {
+                    'name': translated_name,
+                    'description': translated.get((protocol_description, lang)) if protocol_description else None
+                }
                 
-                # Translate description (optional)
-                translated_description = None
-                if protocol_description:
-                    translated_description = await self.translate_text(protocol_description, lang)
-                
-                if translated_name:  # Only add if name translation succeeded
-                    translations[lang] = {
-                        'name': translated_name,
-                        'description': translated_description
-                    }
-                    
-            except Exception as e:
-                logger.error(f"Failed to translate protocol to {lang}: {str(e)}")
-                continue
-        
         return translations
     
     async def translate_checklist_item(
@@ -126,7 +218,8 @@ class AITranslationService:
         item_description: str,
         item_notes: Optional[str] = None,
         item_category: Optional[str] = None,
-        target_languages: Optional[List[str]] = None
+        target_languages: Optional[List[str]] = None,
+        db: Optional[Session] = None
     ) -> Dict[str, Dict[str, str]]:
         """
         Translate checklist item content to multiple languages
@@ -136,6 +229,7 @@ class AITranslationService:
             item_notes: Item notes to translate (optional)
             item_category: Item category to translate (optional)
             target_languages: List of target language codes (default: all supported)
+            db: Session for the translation memory (optional)
             
         Returns:
             Dictionary with translations:
@@ -145,50 +239,30 @@ class AITranslationService:
                 ...
             }
         """
-        if target_languages is None:
-            target_languages = self.target_languages
-            
-        translations = {}
-        
-        for lang in target_languages:
-            try:
-                # Translate description (required)
-                translated_description = await self.translate_text(item_description, lang)
-                
-                # Translate notes (optional)
-                translated_notes = None
-                if item_notes:
-                    translated_notes = await self.translate_text(item_notes, lang)
-                
-                # Translate category (optional)
-                translated_category = None
-                if item_category:
-                    translated_category = await self.translate_text(item_category, lang)
-                
-                if translated_description:  # Only add if description translation succeeded
-                    translations[lang] = {
-                        'item_description': translated_description,
-                        'notes': translated_notes,
-                        'item_category': translated_category
-                    }
-                    
-            except Exception as e:
-                logger.error(f"Failed to translate checklist item to {lang}: {str(e)}")
-                continue
-        
-        return translations
+        results = await self.translate_multiple_checklist_items(
+            [{'item_description': item_description, 'notes': item_notes, 'item_category': item_category}],
+            target_languages=target_languages,
+            db=db
+        )
+        return results[0]
     
     async def translate_multiple_checklist_items(
         self,
         items: List[Dict[str, str]],
-        target_languages: Optional[List[str]] = None
+        target_languages: Optional[List[str]] = None,
+        db: Optional[Session] = None
     ) -> Dict[int, Dict[str, Dict[str, str]]]:
         """
         Translate multiple checklist items efficiently
         
+        All fields of all items go through one translate_batch call, so repeated
+        strings (categories, common notes) are translated once and every
+        request runs concurrently.
+        
         Args:
             items: List of items with keys: 'item_description', 'notes', 'item_category'
             target_languages: List of target language codes
+            db: Session for the translation memory (optional)
             
         Returns:
             Dictionary indexed by item index:
@@ -201,43 +275,45 @@ class AITranslationService:
         if target_languages is None:
             target_languages = self.target_languages
             
-        results = {}
+        texts = [
+            item.get(field) for item in items for field in ('item_description', 'notes', 'item_category')
+        ]
+        translated = await self.translate_batch(texts, target_languages, db=db)
         
-        # Create translation tasks for all items
-        tasks = []
+        results = {}
         for i, item in enumerate(items):
-            task = self.translate_checklist_item(
-                item_description=item.get('item_description', ''),
-                item_notes=item.get('notes'),
-                item_category=item.get('item_category'),
-                target_languages=target_languages
-            )
-            tasks.append((i, task))
-        
-        # Execute all translations concurrently
-        for i, task in tasks:
-            try:
-                translations = await task
-                results[i] = translations
-            except Exception as e:
-                logger.error(f"Failed to translate checklist item {i}: {str(e)}")
-                results[i] = {}
-        
+            results[i] = {}
+            for lang in target_languages:
+                translated_description = translated.get((item.get('item_description', ''), lang))
+                if not translated_description:  # Only add if description translation succeeded
+                    continue
+                results[i][lang] = {
+                    'item_description': translated_description,
+                    'notes': translated.get((item.get('notes'), lang)) if item.get('notes') else None,
+                    'item_category': translated.get((item.get('item_category'), lang)) if item.get('item_category') else None
+                }
+                
         return results
     
     def get_supported_languages(self) -> List[str]:
         """Get list of supported target languages"""
         return self.target_languages.copy()
     
-    def is_translation_available(self) -> bool:
+    async def is_translation_available(self) -> bool:
         """Check if translation service is available"""
+        if time.monotonic() < self._available_until:
+            return True
         try:
-            # Test with a simple translation
-            result = self.translator.translate("test", src='en', dest='es')
-            return result is not None
+            # Test with a simple translation, off the event loop
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.executor, self._translate_sync, "test", 'en', 'es')
         except Exception as e:
             logger.error(f"Translation service not available: {str(e)}")
             return False
+        if result is None:
+            return False
+        self._available_until = time.monotonic() + AVAILABILITY_TTL
+        return True
 
 # Global instance
-ai_translation_service = AITranslationService()
\ No newline at end of file
+ai_translation_service = AITranslationService()
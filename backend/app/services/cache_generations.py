@@ -0,0 +1,72 @@
+# backend/app/services/cache_generations.py
+
+"""
+Generation-numbered Redis caches invalidated on commit.
+
+A cache keeps a generation number in Redis and puts it in every entry's key.
+Retiring entries is then a single INCR: readers move to fresh keys and the old
+entries age out through their own TTL. Generation keys never expire. An expired
+generation would read as "0" again, and later bumps would reuse numbers whose
+entries may still be cached, bringing stale data back.
+
+register_commit_invalidation wires a cache to the ORM session: after each
+flush a collect function reports what the flushed objects made stale, and once
+the transaction commits everything collected is passed to the invalidate
+function. A rollback discards it, since nothing changed.
+"""
+
+from typing import Callable, Hashable, Iterable, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..database import redis_client
+
+
+def current_generation(key: str) -> str:
+    """Generation stored under key, "0" before the first bump."""
+    return redis_client.get(key) or "0"
+
+
+def bump_generations(keys: Iterable[str]) -> None:
+    """Move every given generation on by one, retiring the entries built under it."""
+    keys = set(keys)
+    if not keys:
+        return
+    pipeline = redis_client.pipeline()
+    for key in keys:
+        pipeline.incr(key)
+    pipeline.execute()
+
+
+def mark_stale(session: Session, stale_key: str, items: Iterable[Hashable]) -> None:
+    """Record items to invalidate once the session's transaction commits."""
+    session.info.setdefault(stale_key, set()).update(items)
+
+
+def register_commit_invalidation(
+    stale_key: str,
+    collect: Callable[[Session], Set[Hashable]],
+    invalidate: Callable[[Set[Hashable]], None]
+) -> None:
+    """
+    Listen on every session: collect(session) after each flush, invalidate(items)
+    after a commit that collected anything. stale_key names the set kept in
+    session.info and must be unique per cache.
+    """
+    @event.listens_for(Session, "after_flush")
+    def _collect_stale(session, flush_context):
+        items = collect(session)
+        if items:
+            mark_stale(session, stale_key, items)
+
+    @event.listens_for(Session, "after_commit")
+    def _invalidate_after_commit(session):
+        items = session.info.pop(stale_key, None)
+        if items:
+            invalidate(items)
+
+    @event.listens_for(Session, "after_soft_rollback")
+    def _discard_after_rollback(session, previous_transaction):
+        if not session.in_transaction():
+            session.info.pop(stale_key, None)
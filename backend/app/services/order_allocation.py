@@ -0,0 +1,283 @@
+# backend/app/services/order_allocation.py
+
+"""
+FIFO stock allocation for active customer orders.
+
+Available stock per part is read with one grouped query over the stock rollup
+(warehouse_part_stock, see crud/stock_rollup.py) for the Oraseas organization's
+active warehouses. It is then allocated to active orders oldest first, so an
+order only gets what earlier orders left. The result lists shortfalls per
+order and per part, optionally projecting the arrival of supplier orders.
+
+Results are cached in Redis under a generation number. Any commit that touches
+orders, stock movements, or the parts, warehouses and organizations they refer
+to bumps the generation (see the session listeners below and
+cache_generations), so polling the dashboard widget costs one Redis read. Raw
+SQL is not seen; entries expire after ALLOCATION_TTL as a backstop.
+"""
+
+import json
+import logging
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+from sqlalchemy import and_, event, func
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..database import redis_client
+from .cache_generations import bump_generations, current_generation, mark_stale, register_commit_invalidation
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_ORDER_STATUSES = ('Requested', 'Pending')
+ALLOCATION_TTL = 10 * 60  # seconds
+ALLOCATION_PREFIX = "order_allocation:"
+GENERATION_KEY = f"{ALLOCATION_PREFIX}generation"
+
+
+def available_stock(db: Session, organization_id: uuid.UUID, part_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, Decimal]:
+    """
+    Stock per part across the organization's active warehouses.
+
+    Counts warehouses that hold an inventory record for the part and ignores
+    negative warehouse balances, like the warehouse inventory page does.
+    """
+    part_ids = list(part_ids)
+    if not part_ids:
+        return {}
+
+    rows = db.query(
+        models.Inventory.part_id,
+        func.sum(models.WarehousePartStock.stock)
+    ).join(
+        models.Warehouse, models.Inventory.warehouse_id == models.Warehouse.id
+    ).join(
+        models.WarehousePartStock,
+        and_(
+            models.WarehousePartStock.warehouse_id == models.Inventory.warehouse_id,
+            models.WarehousePartStock.part_id == models.Inventory.part_id,
+            models.WarehousePartStock.stock > 0
+        )
+    ).filter(
+        models.Warehouse.organization_id == organization_id,
+        models.Warehouse.is_active == True,
+        models.Inventory.part_id.in_(part_ids)
+    ).group_by(models.Inventory.part_id).all()
+
+    return {part_id: stock for part_id, stock in rows}
+
+
+def incoming_stock(db: Session, organization_id: uuid.UUID,
+                   supplier_order_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, Decimal]:
+    """Quantity per part on the given supplier orders of the organization."""
+    supplier_order_ids = list(supplier_order_ids)
+    if not supplier_order_ids:
+        return {}
+
+    rows = db.query(
+        models.SupplierOrderItem.part_id,
+        func.sum(models.SupplierOrderItem.quantity)
+    ).join(
+        models.SupplierOrder, models.SupplierOrderItem.supplier_order_id == models.SupplierOrder.id
+    ).filter(
+        models.SupplierOrder.ordering_organization_id == organization_id,
+        models.SupplierOrder.id.in_(supplier_order_ids)
+    ).group_by(models.SupplierOrderItem.part_id).all()
+
+    return {part_id: quantity for part_id, quantity in rows}
+
+
+def _quantity(value: Decimal) -> float:
+    return round(float(value), 3)
+
+
+def allocate_orders(db: Session, organization_id: uuid.UUID,
+                    supplier_order_ids: Iterable[uuid.UUID] = ()) -> dict:
+    """
+    Allocate available stock to active customer orders in order_date order.
+
+    Args:
+        db: Database session
+        organization_id: Oraseas organization receiving the orders
+        supplier_order_ids: Supplier orders to treat as already received (optional)
+
+    Returns:
+        {
+            'parts_short': parts whose total demand exceeds (projected) stock,
+            'orders': orders with at least one line that could not be fully allocated,
+            'projected_supplier_order_ids': supplier orders included in the projection
+        }
+    """
+    supplier_order_ids = sorted(set(supplier_order_ids), key=str)
+
+    lines = db.query(
+        models.CustomerOrder.id.label('order_id'),
+        models.CustomerOrder.order_date,
+        models.CustomerOrder.status,
+        models.Organization.name.label('customer_organization_name'),
+        models.CustomerOrderItem.part_id,
+        models.CustomerOrderItem.quantity,
+        models.Part.name.label('part_name'),
+        models.Part.part_number
+    ).join(
+        models.CustomerOrderItem, models.CustomerOrderItem.customer_order_id == models.CustomerOrder.id
+    ).join(
+        models.Part, models.CustomerOrderItem.part_id == models.Part.id
+    ).outerjoin(
+        models.Organization, models.CustomerOrder.customer_organization_id == models.Organization.id
+    ).filter(
+        models.CustomerOrder.oraseas_organization_id == organization_id,
+        models.CustomerOrder.status.in_(ACTIVE_ORDER_STATUSES)
+    ).order_by(
+        # Oldest order first; created_at and id break ties deterministically
+        models.CustomerOrder.order_date.asc(),
+        models.CustomerOrder.created_at.asc(),
+        models.CustomerOrder.id.asc(),
+        models.CustomerOrderItem.created_at.asc()
+    ).all()
+
+    part_ids = {line.part_id for line in lines}
+    stock = available_stock(db, organization_id, part_ids)
+    incoming = incoming_stock(db, organization_id, supplier_order_ids)
+
+    remaining = {
+        part_id: stock.get(part_id, Decimal(0)) + incoming.get(part_id, Decimal(0)) for part_id in part_ids
+    }
+    demand: Dict[uuid.UUID, Decimal] = defaultdict(Decimal)
+    for line in lines:
+        demand[line.part_id] += line.quantity
+    short_by_part: Dict[uuid.UUID, Decimal] = defaultdict(Decimal)
+
+    parts: Dict[uuid.UUID, dict] = {}
+    orders: Dict[uuid.UUID, dict] = {}
+    for line in lines:
+        allocated = min(line.quantity, max(remaining[line.part_id], Decimal(0)))
+        remaining[line.part_id] -= allocated
+        short = line.quantity - allocated
+        short_by_part[line.part_id] += short
+
+        order_date = line.order_date.isoformat() if line.order_date else None
+        customer_name = line.customer_organization_name or "Unknown"
+        part = parts.setdefault(line.part_id, {
+            "part_id": str(line.part_id),
+            "part_name": line.part_name,
+            "part_number": line.part_number,
+            "quantity_in_stock": _quantity(stock.get(line.part_id, 0)),
+            "quantity_incoming": _quantity(incoming.get(line.part_id, 0)),
+            "total_quantity_ordered": _quantity(demand[line.part_id]),
+            "orders": [],
+        })
+        part["orders"].append({
+            "order_id": str(line.order_id),
+            "customer_organization_name": customer_name,
+            "order_date": order_date,
+            "quantity_in_order": _quantity(line.quantity),
+            "quantity_allocated": _quantity(allocated),
+        })
+
+        if short > 0:
+            order = orders.setdefault(line.order_id, {
+                "order_id": str(line.order_id),
+                "customer_organization_name": customer_name,
+                "order_date": order_date,
+                "status": line.status,
+                "items_short": [],
+            })
+            order["items_short"].append({
+                "part_id": str(line.part_id),
+                "part_name": line.part_name,
+                "part_number": line.part_number,
+                "quantity_in_stock": _quantity(stock.get(line.part_id, 0)),
+                "quantity_in_this_order": _quantity(line.quantity),
+                "quantity_allocated": _quantity(allocated),
+                "quantity_short": _quantity(short),
+                "total_quantity_all_active_orders": _quantity(demand[line.part_id]),
+            })
+
+    parts_short = []
+    for part_id, part in parts.items():
+        if short_by_part[part_id] > 0:
+            part["quantity_short"] = _quantity(short_by_part[part_id])
+            parts_short.append(part)
+
+    return {
+        "parts_short": parts_short,
+        "orders": list(orders.values()),
+        "projected_supplier_order_ids": [str(order_id) for order_id in supplier_order_ids],
+    }
+
+
+def _cache_key(generation: str, organization_id: uuid.UUID, supplier_order_ids: List[uuid.UUID]) -> str:
+    projection = ",".join(sorted(str(order_id) for order_id in supplier_order_ids))
+    return f"{ALLOCATION_PREFIX}{generation}:{organization_id}:{projection}"
+
+
+def get_order_allocation(db: Session, organization_id: uuid.UUID,
+                         supplier_order_ids: Iterable[uuid.UUID] = ()) -> dict:
+    """Order allocation for an organization, from Redis when possible."""
+    supplier_order_ids = list(set(supplier_order_ids))
+    try:
+        generation = current_generation(GENERATION_KEY)
+        key = _cache_key(generation, organization_id, supplier_order_ids)
+        cached = redis_client.get(key)
+    except Exception as e:
+        logger.error(f"Error reading order allocation for {organization_id}: {e}")
+        return allocate_orders(db, organization_id, supplier_order_ids)
+
+    if cached:
+        return json.loads(cached)
+
+    allocation = allocate_orders(db, organization_id, supplier_order_ids)
+    try:
+        redis_client.setex(key, ALLOCATION_TTL, json.dumps(allocation))
+    except Exception as e:
+        logger.error(f"Error caching order allocation for {organization_id}: {e}")
+    return allocation
+
+
+def invalidate_order_allocations() -> None:
+    """Retire every cached allocation."""
+    try:
+        bump_generations([GENERATION_KEY])
+    except Exception as e:
+        logger.error(f"Error invalidating order allocations: {e}")
+
+
+# --- Invalidation on write ---
+
+_STALE_KEY = "stale_order_allocation"
+
+# Everything the allocation reads: orders, stock movements and the rollup they
+# feed, and the records whose names or flags appear in or filter the result
+_WATCHED_MODELS = (
+    models.CustomerOrder, models.CustomerOrderItem,
+    models.SupplierOrder, models.SupplierOrderItem,
+    models.Transaction, models.StockAdjustment, models.StockAdjustmentItem,
+    models.Inventory, models.Warehouse, models.Part, models.Organization,
+)
+_WATCHED_TABLES = frozenset(model.__tablename__ for model in _WATCHED_MODELS)
+
+
+def _collect_stale_allocation(session):
+    if any(isinstance(obj, _WATCHED_MODELS) for obj in (*session.new, *session.dirty, *session.deleted)):
+        return {GENERATION_KEY}
+    return set()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_stale_allocation_bulk(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and table.name in _WATCHED_TABLES:
+        mark_stale(orm_execute_state.session, _STALE_KEY, {GENERATION_KEY})
+
+
+register_commit_invalidation(
+    _STALE_KEY,
+    collect=_collect_stale_allocation,
+    invalidate=lambda stale: invalidate_order_allocations()
+)
@@ -0,0 +1,161 @@
+# backend/app/services/protocol_bundles.py
+
+"""
+Precompiled per-language protocol bundles.
+
+Field users read a protocol and its checklist in their language far more often
+than anyone edits them, so the localized content for each (protocol, language)
+is compiled once into a JSON bundle and kept in Redis together with its content
+hash, which doubles as the ETag.
+
+Bundle keys carry a per-protocol generation number. Writes to a protocol, its
+checklist items, their translations or a referenced part's name bump the
+generation once the transaction commits (see the session listeners below), so
+readers move to a fresh key and a bundle compiled from data read before the
+commit can never be served afterwards (see cache_generations). Bulk
+query().update() calls and raw SQL are not seen; bundles expire after
+BUNDLE_TTL as a backstop.
+
+If Redis is unavailable bundles are compiled on every request.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Iterable, NamedTuple, Optional, Set
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+from ..database import redis_client
+from ..models import MaintenanceProtocol, Part, ProtocolChecklistItem, ProtocolTranslation, ChecklistItemTranslation
+from .cache_generations import bump_generations, current_generation, register_commit_invalidation
+from .translation_service import TranslationService, SUPPORTED_LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_TTL = 24 * 60 * 60  # seconds
+BUNDLE_PREFIX = "protocol_bundle:"
+VERSION_LENGTH = 16
+
+
+class ProtocolBundle(NamedTuple):
+    version: str  # Content hash of body
+    body: str  # {"protocol": {...}, "checklist_items": [...]} as JSON
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+def _generation_key(protocol_id: UUID) -> str:
+    return f"{BUNDLE_PREFIX}{protocol_id}:generation"
+
+
+def _bundle_key(protocol_id: UUID, language: str, generation: str) -> str:
+    return f"{BUNDLE_PREFIX}{protocol_id}:{generation}:{language}"
+
+
+def compile_bundle(db: Session, protocol_id: UUID, language: str) -> Optional[ProtocolBundle]:
+    """Build the localized bundle from the database; None if the protocol does not exist."""
+    protocol = TranslationService.get_localized_protocol(protocol_id, language, db)
+    if protocol is None:
+        return None
+    checklist_items = TranslationService.get_localized_checklist_items(protocol_id, language, db)
+
+    # Encoded the same way FastAPI encodes the localized endpoints' responses
+    body = json.dumps(
+        jsonable_encoder({"protocol": protocol, "checklist_items": checklist_items}),
+        separators=(",", ":")
+    )
+    return ProtocolBundle(version=hashlib.sha256(body.encode()).hexdigest()[:VERSION_LENGTH], body=body)
+
+
+def get_bundle(db: Session, protocol_id: UUID, language: str) -> Optional[ProtocolBundle]:
+    """Localized bundle for a protocol, from Redis when possible."""
+    if language not in SUPPORTED_LANGUAGES:
+        # Not worth a cache entry; falls back to the base language anyway
+        return compile_bundle(db, protocol_id, language)
+
+    try:
+        generation = current_generation(_generation_key(protocol_id))
+        key = _bundle_key(protocol_id, language, generation)
+        cached = redis_client.get(key)
+    except Exception as e:
+        logger.error(f"Error reading protocol bundle {protocol_id}/{language}: {e}")
+        return compile_bundle(db, protocol_id, language)
+
+    if cached:
+        # Stored as "<version> <body>"
+        return ProtocolBundle(version=cached[:VERSION_LENGTH], body=cached[VERSION_LENGTH + 1:])
+
+    bundle = compile_bundle(db, protocol_id, language)
+    if bundle is not None:
+        try:
+            redis_client.setex(key, BUNDLE_TTL, f"{bundle.version} {bundle.body}")
+        except Exception as e:
+            logger.error(f"Error caching protocol bundle {protocol_id}/{language}: {e}")
+    return bundle
+
+
+def invalidate_bundles(protocol_ids: Iterable[UUID]) -> None:
+    """Retire every language's bundle for these protocols."""
+    protocol_ids = set(protocol_ids)
+    if not protocol_ids:
+        return
+    try:
+        bump_generations(_generation_key(protocol_id) for protocol_id in protocol_ids)
+    except Exception as e:
+        logger.error(f"Error invalidating protocol bundles {protocol_ids}: {e}")
+
+
+# --- Invalidation on write ---
+
+_STALE_KEY = "stale_protocol_bundles"
+
+
+def _attribute_values(obj, attr: str) -> Set:
+    """Current and pre-flush values of an attribute."""
+    history = inspect(obj).attrs[attr].history
+    return {value for value in (*history.added, *history.unchanged, *history.deleted) if value is not None}
+
+
+def _touched_protocol_ids(session, connection) -> Set[UUID]:
+    protocol_ids: Set[UUID] = set()
+    item_ids: Set[UUID] = set()
+    part_ids: Set[UUID] = set()
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, MaintenanceProtocol):
+            protocol_ids.add(obj.id)
+        elif isinstance(obj, (ProtocolChecklistItem, ProtocolTranslation)):
+            # Includes the old protocol of an item that moved
+            protocol_ids |= _attribute_values(obj, "protocol_id")
+        elif isinstance(obj, ChecklistItemTranslation):
+            item_ids |= _attribute_values(obj, "checklist_item_id")
+        elif isinstance(obj, Part) and obj in session.dirty:
+            # Bundles embed the part's name and number
+            state = inspect(obj)
+            if state.attrs.name.history.has_changes() or state.attrs.part_number.history.has_changes():
+                part_ids.add(obj.id)
+
+    if item_ids or part_ids:
+        query = select(ProtocolChecklistItem.protocol_id).distinct()
+        if item_ids and part_ids:
+            query = query.where(ProtocolChecklistItem.id.in_(item_ids) | ProtocolChecklistItem.part_id.in_(part_ids))
+        elif item_ids:
+            query = query.where(ProtocolChecklistItem.id.in_(item_ids))
+        else:
+            query = query.where(ProtocolChecklistItem.part_id.in_(part_ids))
+        protocol_ids |= set(connection.execute(query).scalars())
+
+    return protocol_ids
+
+
+register_commit_invalidation(
+    _STALE_KEY,
+    collect=lambda session: _touched_protocol_ids(session, session.connection()),
+    invalidate=lambda protocol_ids: invalidate_bundles(protocol_ids)
+)
@@ -0,0 +1,233 @@
+# backend/app/slow_queries.py
+
+"""
+Slow SQL statement recorder.
+
+Every statement that takes longer than SLOW_QUERY_THRESHOLD_MS is recorded
+under its fingerprint (see query_instrumentation.fingerprint), with a call
+count and the durations of its last executions for the p95. The number of
+fingerprints and recent executions kept is bounded, so memory stays flat
+however long the process runs.
+
+For a sample of slow executions (the first one of each fingerprint, then at
+most one per SLOW_QUERY_EXPLAIN_INTERVAL seconds) the statement's plan is
+captured with EXPLAIN (FORMAT JSON) on the same connection and parameters.
+Plain EXPLAIN only plans the statement, it does not run it again. Relations
+read with a sequential scan are listed next to the plan, which is usually
+where a missing index shows up.
+
+The recorder hooks every engine on import and is served by
+/monitoring/slow-queries.
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .query_instrumentation import fingerprint
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "600"))
+# Fingerprints kept; the one with the least total time is dropped when full
+MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "200"))
+# Durations kept per fingerprint for the p95
+DURATION_WINDOW = 200
+RECENT_BUFFER_SIZE = 500
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def sequential_scans(plan: Any) -> List[str]:
+    """Relations read with a sequential scan anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    relations = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, list):
+            nodes.extend(node)
+        elif isinstance(node, dict):
+            if node.get("Node Type") == "Seq Scan" and node.get("Relation Name"):
+                relations.append(node["Relation Name"])
+            nodes.extend(value for value in node.values() if isinstance(value, (list, dict)))
+    return sorted(set(relations))
+
+
+class SlowQueryLog:
+    """Bounded in-process record of slow statements, keyed by fingerprint."""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS,
+                 explain_interval: float = SLOW_QUERY_EXPLAIN_INTERVAL,
+                 max_fingerprints: int = MAX_FINGERPRINTS) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain_interval = explain_interval
+        self.max_fingerprints = max_fingerprints
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.recent: deque = deque(maxlen=RECENT_BUFFER_SIZE)
+
+    def record(self, statement: str, duration_ms: float) -> bool:
+        """
+        Record one slow execution.
+
+        Returns:
+            True when the caller should capture a plan for this execution
+        """
+        key = fingerprint(statement)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                if len(self.entries) >= self.max_fingerprints:
+                    evicted = min(self.entries, key=lambda k: self.entries[k]["total_ms"])
+                    del self.entries[evicted]
+                entry = self.entries[key] = {
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "durations": deque(maxlen=DURATION_WINDOW),
+                    "first_seen": datetime.utcnow(),
+                    "last_seen": None,
+                    "plan": None,
+                    "plan_captured_at": None,
+                    "explain_due_at": 0.0,
+                }
+            entry["calls"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["durations"].append(duration_ms)
+            entry["last_seen"] = datetime.utcnow()
+            self.recent.append({"fingerprint": key, "duration_ms": duration_ms, "timestamp": entry["last_seen"]})
+
+            if now < entry["explain_due_at"] or not _EXPLAINABLE.match(statement):
+                return False
+            # Claimed here so concurrent executions do not all run EXPLAIN
+            entry["explain_due_at"] = now + self.explain_interval
+            return True
+
+    def store_plan(self, statement: str, plan: Any) -> None:
+        key = fingerprint(statement)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry["plan"] = plan
+                entry["plan_captured_at"] = datetime.utcnow()
+
+    def top(self, limit: int = 20, order_by: str = "total_ms", include_plans: bool = True) -> List[Dict[str, Any]]:
+        """Slowest fingerprints, by total time (default), p95, max or call count."""
+        with self.lock:
+            entries = [(key, dict(entry, durations=list(entry["durations"]))) for key, entry in self.entries.items()]
+
+        offenders = []
+        for key, entry in entries:
+            offender = {
+                "fingerprint": key,
+                "calls": entry["calls"],
+                "total_ms": round(entry["total_ms"], 2),
+                "mean_ms": round(entry["total_ms"] / entry["calls"], 2),
+                "p95_ms": round(percentile(entry["durations"], 0.95), 2),
+                "max_ms": round(entry["max_ms"], 2),
+                "first_seen": entry["first_seen"].isoformat(),
+                "last_seen": entry["last_seen"].isoformat(),
+                "sequential_scans": sequential_scans(entry["plan"]) if entry["plan"] is not None else None,
+                "plan_captured_at": entry["plan_captured_at"].isoformat() if entry["plan_captured_at"] else None,
+            }
+            if include_plans:
+                offender["plan"] = entry["plan"]
+            offenders.append(offender)
+
+        offenders.sort(key=lambda row: row[order_by], reverse=True)
+        return offenders[:limit]
+
+    def recent_executions(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent slow executions, newest first."""
+        with self.lock:
+            recent = list(self.recent)[-limit:]
+        return [
+            {**row, "duration_ms": round(row["duration_ms"], 2), "timestamp": row["timestamp"].isoformat()}
+            for row in reversed(recent)
+        ]
+
+    def reset(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.recent.clear()
+
+
+# Global recorder instance
+slow_query_log = SlowQueryLog()
+
+
+def explain(conn, statement: str, parameters) -> Optional[Any]:
+    """
+    EXPLAIN (FORMAT JSON) of a statement on the connection that just ran it.
+
+    Runs on the raw DBAPI connection inside a savepoint, so a statement that
+    cannot be explained neither reaches the engine events nor aborts the
+    caller's transaction.
+    """
+    dbapi_connection = conn.connection.dbapi_connection
+    in_transaction = not getattr(dbapi_connection, "autocommit", False)
+    cursor = dbapi_connection.cursor()
+    try:
+        if in_transaction:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters or None)
+            result = cursor.fetchone()[0]
+        except Exception as e:
+            if in_transaction:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            logger.debug(f"Could not explain slow statement: {e}")
+            return None
+        if in_transaction:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return result[0] if isinstance(result, list) else result
+    finally:
+        cursor.close()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_slow_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_slow_query(conn, cursor, statement, parameters, context, executemany):
+    start_time = getattr(context, "_slow_query_start", None)
+    if start_time is None:
+        return
+
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    if duration_ms < slow_query_log.threshold_ms:
+        return
+
+    wants_plan = slow_query_log.record(statement, duration_ms)
+    logger.warning(f"Slow SQL statement ({duration_ms:.1f}ms): {fingerprint(statement)[:200]}")
+
+    if wants_plan and not executemany and conn.dialect.name == "postgresql":
+        try:
+            plan = explain(conn, statement, parameters)
+        except Exception as e:
+            logger.debug(f"Slow statement plan capture failed: {e}")
+            return
+        if plan is not None:
+            slow_query_log.store_plan(statement, plan)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Rebuild the part price index (latest and average unit cost per part) from
+supplier order items.
+
+The index is maintained automatically on every write made through the
+application. Run this after restoring a backup, importing supplier orders with
+raw SQL, or whenever inventory valuation disagrees with supplier order prices.
+
+Usage:
+  docker-compose exec api python scripts/rebuild_part_price_index.py
+  DATABASE_URL=postgresql://... python backend/scripts/rebuild_part_price_index.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the part price index.")
+    parser.add_argument("--database-url", help="Database URL (overrides DATABASE_URL env)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    if not os.getenv("DATABASE_URL"):
+        print("❌ DATABASE_URL is not set. Provide --database-url or set DATABASE_URL.")
+        return 1
+
+    # Imported late so --database-url is picked up by app.database
+    from app.database import SessionLocal
+    from app.crud.part_price_index import rebuild_part_price_index
+
+    db = SessionLocal()
+    try:
+        refreshed = rebuild_part_price_index(db)
+        print(f"✅ Rebuilt part price index: {refreshed} parts")
+        return 0
+    except Exception as exc:
+        db.rollback()
+        print(f"❌ Failed to rebuild part price index: {exc}")
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
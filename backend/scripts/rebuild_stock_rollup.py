@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Rebuild the organization stock rollup (warehouse_part_stock and
+organization_part_stock) from transactions and stock adjustments.
+
+The rollup is maintained automatically on every write made through the
+application. Run this after restoring a backup, importing data with raw SQL,
+or whenever the aggregated inventory view disagrees with per-warehouse stock.
+
+Usage:
+  docker-compose exec api python scripts/rebuild_stock_rollup.py
+  docker-compose exec api python scripts/rebuild_stock_rollup.py --organization-id <uuid>
+  DATABASE_URL=postgresql://... python backend/scripts/rebuild_stock_rollup.py
+"""
+
+import argparse
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the organization stock rollup.")
+    parser.add_argument("--organization-id", type=uuid.UUID, help="Only rebuild this organization")
+    parser.add_argument("--database-url", help="Database URL (overrides DATABASE_URL env)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    if not os.getenv("DATABASE_URL"):
+        print("❌ DATABASE_URL is not set. Provide --database-url or set DATABASE_URL.")
+        return 1
+
+    # Imported late so --database-url is picked up by app.database
+    from app.database import SessionLocal
+    from app.crud.stock_rollup import rebuild_stock_rollup
+
+    db = SessionLocal()
+    try:
+        refreshed = rebuild_stock_rollup(db, args.organization_id)
+        scope = f"organization {args.organization_id}" if args.organization_id else "all organizations"
+        print(f"✅ Rebuilt stock rollup for {scope}: {refreshed} warehouse/part pairs")
+        return 0
+    except Exception as exc:
+        db.rollback()
+        print(f"❌ Failed to rebuild stock rollup: {exc}")
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
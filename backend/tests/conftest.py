@@ -5,6 +5,7 @@ Pytest configuration and fixtures for ABParts integration testing.
 import pytest
 import asyncio
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Generator, Dict, Any
@@ -20,6 +21,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.main import app as fastapi_app
 from app.database import get_db, Base
+from app.db_routing import get_read_db
 from app.models import (
     Organization, User, Part, Warehouse, Inventory, Machine, Transaction,
     OrganizationType, UserRole, UserStatus, PartType, TransactionType, MachineStatus, MachineModelType
@@ -28,6 +30,7 @@ from app.models import (
 import app.models
 from app.auth import get_password_hash
 from app.session_manager import session_manager
+from app.query_instrumentation import count_queries
 
 
 # Test database configuration
@@ -85,6 +88,7 @@ def client(db_session: Session) -> TestClient:
             pass
     
     fastapi_app.dependency_overrides[get_db] = override_get_db
+    fastapi_app.dependency_overrides[get_read_db] = override_get_db
     
     with TestClient(fastapi_app) as test_client:
         yield test_client
@@ -92,6 +96,27 @@ def client(db_session: Session) -> TestClient:
     fastapi_app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def assert_max_queries(db_engine):
+    """
+    Fail the test when a block runs more SQL statements than allowed.
+
+    Usage:
+        with assert_max_queries(5):
+            client.get("/parts/with-inventory", headers=headers)
+    """
+    @contextmanager
+    def _assert_max_queries(max_queries: int):
+        with count_queries(db_engine) as stats:
+            yield stats
+        assert stats.statement_count <= max_queries, (
+            f"Expected at most {max_queries} SQL statements, got {stats.statement_count}. Most repeated:\n"
+            + "\n".join(f"  {count}x {statement}" for statement, count in stats.fingerprints.most_common(5))
+        )
+
+    return _assert_max_queries
+
+
 @pytest.fixture(scope="function")
 def test_organizations(db_session: Session) -> Dict[str, Organization]:
     """Create test organizations representing the business model."""
@@ -364,7 +389,7 @@ def test_machines(db_session: Session, test_organizations: Dict[str, Organizatio
     # Customer 1 machines
     machine1 = Machine(
         name="AutoBoss Unit 1",
-        model_type=MachineModelType.V4_0,
+        model_type=MachineModelType.V4_0.value,
         serial_number="AB-V4-001",
         customer_organization_id=test_organizations["customer1"].id,
         purchase_date=datetime.utcnow() - timedelta(days=365),
@@ -378,7 +403,7 @@ def test_machines(db_session: Session, test_organizations: Dict[str, Organizatio
     
     machine2 = Machine(
         name="AutoBoss Unit 2",
-        model_type=MachineModelType.V3_1B,
+        model_type=MachineModelType.V3_1B.value,
         serial_number="AB-V31B-001",
         customer_organization_id=test_organizations["customer1"].id,
         purchase_date=datetime.utcnow() - timedelta(days=730),
@@ -393,7 +418,7 @@ def test_machines(db_session: Session, test_organizations: Dict[str, Organizatio
     # Customer 2 machine
     machine3 = Machine(
         name="AutoBoss Service Unit",
-        model_type=MachineModelType.V4_0,
+        model_type=MachineModelType.V4_0.value,
         serial_number="AB-V4-002",
         customer_organization_id=test_organizations["customer2"].id,
         purchase_date=datetime.utcnow() - timedelta(days=180),
@@ -0,0 +1,101 @@
+"""
+Tests for generation-numbered caches invalidated on commit.
+Uses an in-memory stand-in for Redis and a SQLite session.
+"""
+
+import pytest
+from sqlalchemy import Column, Integer, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.services import cache_generations
+
+Base = declarative_base()
+
+
+class Widget(Base):
+    __tablename__ = "widgets"
+    id = Column(Integer, primary_key=True)
+
+
+_STALE_KEY = "stale_cache_generations_test"
+_invalidated = []
+
+# Listeners stay registered for the whole run; they only react to test sessions
+cache_generations.register_commit_invalidation(
+    _STALE_KEY,
+    collect=lambda session: set(session.info.get("touched", ())),
+    invalidate=_invalidated.append
+)
+
+
+class MemoryRedis:
+    """The slice of the Redis client the generation helpers use."""
+
+    def __init__(self):
+        self.values = {}
+        self.expiring = set()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def pipeline(self):
+        return self
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+
+    def expire(self, key, seconds):
+        self.expiring.add(key)
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = MemoryRedis()
+    monkeypatch.setattr(cache_generations, "redis_client", redis)
+    return redis
+
+
+@pytest.fixture
+def session():
+    _invalidated.clear()
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+class TestCacheGenerations:
+    """Generation numbers and commit-time invalidation"""
+
+    def test_generations_count_up_and_never_expire(self, redis):
+        assert cache_generations.current_generation("thing:generation") == "0"
+
+        cache_generations.bump_generations(["thing:generation", "other:generation"])
+        cache_generations.bump_generations(["thing:generation"])
+
+        assert cache_generations.current_generation("thing:generation") == "2"
+        assert cache_generations.current_generation("other:generation") == "1"
+        assert redis.expiring == set()
+
+    def test_invalidates_once_after_commit(self, session):
+        session.info["touched"] = {"a"}
+        session.add(Widget())
+        session.flush()
+        cache_generations.mark_stale(session, _STALE_KEY, {"b"})
+        assert _invalidated == []
+
+        session.commit()
+
+        assert _invalidated == [{"a", "b"}]
+
+    def test_rollback_discards_stale_items(self, session):
+        session.info["touched"] = {"a"}
+        session.add(Widget())
+        session.flush()
+        session.rollback()
+        session.commit()
+
+        assert _invalidated == []
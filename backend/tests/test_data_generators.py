@@ -8,21 +8,50 @@ import uuid
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Any, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models import (
-    Organization, User, Part, Warehouse, Inventory, Machine, Transaction,
+    Organization, User, Part, Warehouse, Inventory, Machine, MachineHours, Transaction,
     OrganizationType, UserRole, UserStatus, PartType, TransactionType, 
     MachineStatus, MachineModelType
 )
 from app.auth import get_password_hash
 
 
+# Part name variations for realistic data
+PART_CATEGORIES = [
+    "Filter", "Pump", "Belt", "Valve", "Sensor", "Motor", "Gasket",
+    "Bearing", "Seal", "Hose", "Connector", "Switch", "Relay", "Fuse",
+    "Oil", "Fluid", "Cleaner", "Lubricant", "Additive", "Chemical"
+]
+
+PART_TYPE_MODIFIERS = ["Oil", "Air", "Fuel", "Water", "Hydraulic", "Pneumatic",
+                       "Electric", "Mechanical", "Electronic", "Thermal"]
+
+MANUFACTURERS = ["BossAqua", "AutoParts Inc", "CleanTech", "Industrial Solutions",
+                 "Premium Parts", "Quality Components", "Reliable Systems"]
+
+# Benchmark dataset at scale 1; parts, customers and transactions grow with the scale
+BENCHMARK_BASE_SIZES = {
+    "parts": 500,
+    "customer_organizations": 5,
+    "transactions": 5000,
+}
+BENCHMARK_WAREHOUSES_PER_ORGANIZATION = 2
+BENCHMARK_PARTS_PER_WAREHOUSE = 50
+BENCHMARK_MACHINES_PER_ORGANIZATION = 4
+BENCHMARK_HOURS_RECORDS_PER_MACHINE = 12
+BENCHMARK_INSERT_BATCH_SIZE = 5000
+
+
 class LargeDatasetGenerator:
     """Generator for large test datasets with configurable sizes."""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, seed: Optional[int] = None):
         self.db_session = db_session
+        # Seeded generators produce the same dataset on every run
+        self.random = random.Random(seed)
         self.data = {
             "organizations": [],
             "users": [],
@@ -152,29 +181,16 @@ class LargeDatasetGenerator:
         import time
         timestamp = int(time.time() * 1000) % 1000000  # Last 6 digits of timestamp
         
-        # Part name variations for realistic data
-        part_categories = [
-            "Filter", "Pump", "Belt", "Valve", "Sensor", "Motor", "Gasket",
-            "Bearing", "Seal", "Hose", "Connector", "Switch", "Relay", "Fuse",
-            "Oil", "Fluid", "Cleaner", "Lubricant", "Additive", "Chemical"
-        ]
-        
-        part_types_list = ["Oil", "Air", "Fuel", "Water", "Hydraulic", "Pneumatic",
-                          "Electric", "Mechanical", "Electronic", "Thermal"]
-        
-        manufacturers = ["BossAqua", "AutoParts Inc", "CleanTech", "Industrial Solutions",
-                        "Premium Parts", "Quality Components", "Reliable Systems"]
-        
         for i in range(1, parts_count + 1):
             # Determine part characteristics
             part_type = PartType.CONSUMABLE if i % 3 != 0 else PartType.BULK_MATERIAL
             is_proprietary = i % 7 == 0  # ~14% proprietary parts
-            unit = "pieces" if part_type == PartType.CONSUMABLE else random.choice(["liters", "kg", "meters"])
+            unit = "pieces" if part_type == PartType.CONSUMABLE else self.random.choice(["liters", "kg", "meters"])
             
             # Generate realistic part names
-            category = random.choice(part_categories)
-            type_modifier = random.choice(part_types_list)
-            manufacturer = random.choice(manufacturers)
+            category = self.random.choice(PART_CATEGORIES)
+            type_modifier = self.random.choice(PART_TYPE_MODIFIERS)
+            manufacturer = self.random.choice(MANUFACTURERS)
             
             if part_type == PartType.BULK_MATERIAL:
                 name = f"{type_modifier} {category}"
@@ -215,11 +231,11 @@ class LargeDatasetGenerator:
         for i, part in enumerate(self.data["parts"]):
             # Generate realistic stock levels
             if part.part_type == PartType.BULK_MATERIAL:
-                current_stock = Decimal(str(random.randint(100, 2000)))
-                min_stock = Decimal(str(random.randint(20, 200)))
+                current_stock = Decimal(str(self.random.randint(100, 2000)))
+                min_stock = Decimal(str(self.random.randint(20, 200)))
             else:
-                current_stock = Decimal(str(random.randint(10, 500)))
-                min_stock = Decimal(str(random.randint(5, 50)))
+                current_stock = Decimal(str(self.random.randint(10, 500)))
+                min_stock = Decimal(str(self.random.randint(5, 50)))
             
             inventory = Inventory(
                 warehouse_id=warehouse.id,
@@ -250,14 +266,14 @@ class LargeDatasetGenerator:
         transaction_count = min(1000, len(self.data["parts"]) * 2)  # 2 transactions per part max
         
         for i in range(transaction_count):
-            part = random.choice(self.data["parts"])
+            part = self.random.choice(self.data["parts"])
             
             # Create mostly CREATION transactions for initial stock
-            transaction_type = TransactionType.CREATION if i < transaction_count * 0.7 else random.choice([
+            transaction_type = TransactionType.CREATION if i < transaction_count * 0.7 else self.random.choice([
                 TransactionType.ADJUSTMENT, TransactionType.TRANSFER
             ])
             
-            quantity = Decimal(str(random.randint(1, 100)))
+            quantity = Decimal(str(self.random.randint(1, 100)))
             
             transaction = Transaction(
                 transaction_type=transaction_type.value,  # Use enum value (string)
@@ -267,7 +283,7 @@ class LargeDatasetGenerator:
                 quantity=quantity,
                 unit_of_measure=part.unit_of_measure,
                 performed_by_user_id=user.id,
-                transaction_date=datetime.utcnow() - timedelta(days=random.randint(0, 365)),
+                transaction_date=datetime.utcnow() - timedelta(days=self.random.randint(0, 365)),
                 notes=f"Test transaction for {part.name}"
             )
             self.db_session.add(transaction)
@@ -281,6 +297,175 @@ class LargeDatasetGenerator:
         self.db_session.flush()
         print(f"Completed generating {transaction_count} transactions")
 
+    
+    def generate_benchmark_dataset(self, scale: int = 1, parts: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Generate the performance benchmark dataset at the given scale.
+        
+        Ids, names, quantities and date offsets all come from the seeded
+        generator, so a seed and scale always produce the same data. Rows are
+        bulk inserted, which skips the stock rollup flush listeners, so the
+        rollup is rebuilt at the end.
+        
+        Args:
+            scale: Multiplier for parts, customer organizations and transactions
+            parts: Part count overriding the scale's, for parts search benchmarks
+            
+        Returns:
+            Row counts and the ids the benchmark scenarios query by
+        """
+        from app.crud.stock_rollup import rebuild_stock_rollup
+        
+        sizes = {name: count * scale for name, count in BENCHMARK_BASE_SIZES.items()}
+        if parts is not None:
+            sizes["parts"] = parts
+        now = datetime.utcnow()
+        
+        self._create_base_organizations()
+        oraseas, user, main_warehouse = self.data["organizations"][0], self.data["users"][0], self.data["warehouses"][0]
+        
+        parts = []
+        for i in range(1, sizes["parts"] + 1):
+            part_type = PartType.CONSUMABLE if i % 3 != 0 else PartType.BULK_MATERIAL
+            name = f"{self.random.choice(MANUFACTURERS)} {self.random.choice(PART_TYPE_MODIFIERS)} {self.random.choice(PART_CATEGORIES)}"
+            parts.append({
+                "id": self._uuid(),
+                "part_number": f"BENCH-{i:07d}",
+                "name": name,
+                "description": f"High-quality {name.lower()} for AutoBoss machines. Part #{i}",
+                "part_type": part_type,
+                "is_proprietary": i % 7 == 0,
+                "unit_of_measure": "pieces" if part_type == PartType.CONSUMABLE else self.random.choice(["liters", "kg", "meters"]),
+            })
+        self._bulk_insert(Part, parts)
+        
+        organizations, warehouses, machines, hours_records = [], [], [], []
+        warehouse_ids = [main_warehouse.id]
+        organization_warehouses, organization_machines = [], []
+        for i in range(1, sizes["customer_organizations"] + 1):
+            organization_id = self._uuid()
+            organizations.append({
+                "id": organization_id,
+                "name": f"Benchmark Customer {i:05d}",
+                "organization_type": OrganizationType.customer,
+                "parent_organization_id": oraseas.id,
+            })
+            own_warehouses = []
+            for j in range(1, BENCHMARK_WAREHOUSES_PER_ORGANIZATION + 1):
+                warehouse_id = self._uuid()
+                warehouses.append({"id": warehouse_id, "organization_id": organization_id, "name": f"Warehouse {j}"})
+                own_warehouses.append(warehouse_id)
+            own_machines = []
+            for j in range(1, BENCHMARK_MACHINES_PER_ORGANIZATION + 1):
+                machine_id = self._uuid()
+                machines.append({
+                    "id": machine_id,
+                    "customer_organization_id": organization_id,
+                    "model_type": self.random.choice([m.value for m in MachineModelType]),
+                    "name": f"AutoBoss {i:05d}-{j}",
+                    "serial_number": f"BENCH-SN-{i:05d}-{j}",
+                    "status": MachineStatus.active,
+                })
+                hours = 0
+                for month in range(BENCHMARK_HOURS_RECORDS_PER_MACHINE, 0, -1):
+                    hours += self.random.randint(20, 200)
+                    hours_records.append({
+                        "id": self._uuid(),
+                        "machine_id": machine_id,
+                        "recorded_by_user_id": user.id,
+                        "hours_value": Decimal(hours),
+                        "recorded_date": now - timedelta(days=30 * month),
+                    })
+                own_machines.append(machine_id)
+            warehouse_ids.extend(own_warehouses)
+            organization_warehouses.append(own_warehouses)
+            organization_machines.append(own_machines)
+        
+        self._bulk_insert(Organization, organizations)
+        self._bulk_insert(Warehouse, warehouses)
+        self._bulk_insert(Machine, machines)
+        self._bulk_insert(MachineHours, hours_records)
+        
+        inventory = []
+        for warehouse_id in warehouse_ids:
+            for part in self.random.sample(parts, min(BENCHMARK_PARTS_PER_WAREHOUSE, len(parts))):
+                inventory.append({
+                    "id": self._uuid(),
+                    "warehouse_id": warehouse_id,
+                    "part_id": part["id"],
+                    "current_stock": Decimal(self.random.randint(0, 500)),
+                    "minimum_stock_recommendation": Decimal(self.random.randint(5, 50)),
+                    "unit_of_measure": part["unit_of_measure"],
+                })
+        self._bulk_insert(Inventory, inventory)
+        
+        batch = []
+        for i in range(sizes["transactions"]):
+            part = self.random.choice(parts)
+            customer = self.random.randrange(len(organization_warehouses))
+            customer_warehouse = self.random.choice(organization_warehouses[customer])
+            roll = self.random.random()
+            row = {
+                "id": self._uuid(),
+                "part_id": part["id"],
+                "from_warehouse_id": None,
+                "to_warehouse_id": None,
+                "machine_id": None,
+                "quantity": Decimal(self.random.randint(1, 50)),
+                "unit_of_measure": part["unit_of_measure"],
+                "performed_by_user_id": user.id,
+                "transaction_date": now - timedelta(minutes=self.random.randint(0, 365 * 24 * 60)),
+                "reference_number": f"BENCH-TX-{i:08d}",
+            }
+            if roll < 0.3:
+                row.update(transaction_type=TransactionType.CREATION.value, to_warehouse_id=main_warehouse.id)
+            elif roll < 0.7:
+                row.update(transaction_type=TransactionType.TRANSFER.value,
+                           from_warehouse_id=main_warehouse.id, to_warehouse_id=customer_warehouse)
+            elif roll < 0.95:
+                row.update(transaction_type=TransactionType.CONSUMPTION.value, from_warehouse_id=customer_warehouse,
+                           machine_id=self.random.choice(organization_machines[customer]))
+            else:
+                row.update(transaction_type=TransactionType.ADJUSTMENT.value, to_warehouse_id=customer_warehouse)
+            batch.append(row)
+            if len(batch) == BENCHMARK_INSERT_BATCH_SIZE:
+                self._bulk_insert(Transaction, batch)
+                batch = []
+        self._bulk_insert(Transaction, batch)
+        
+        self.db_session.commit()
+        rebuild_stock_rollup(self.db_session)
+        
+        return {
+            "scale": scale,
+            "counts": {
+                "parts": len(parts),
+                "organizations": len(organizations),
+                "warehouses": len(warehouse_ids),
+                "machines": len(machines),
+                "machine_hours": len(hours_records),
+                "inventory": len(inventory),
+                "transactions": sizes["transactions"],
+            },
+            "super_admin_id": user.id,
+            "main_warehouse_id": main_warehouse.id,
+            "oraseas_organization_id": oraseas.id,
+            "customer_organization_id": organizations[0]["id"],
+            "customer_warehouse_id": organization_warehouses[0][0],
+            "machine_id": organization_machines[0][0],
+            "part_id": parts[0]["id"],
+        }
+    
+    def _uuid(self) -> uuid.UUID:
+        """Random UUID drawn from the seeded generator."""
+        return uuid.UUID(int=self.random.getrandbits(128), version=4)
+    
+    def _bulk_insert(self, model, rows: List[Dict[str, Any]]):
+        """Insert rows in batches without building ORM objects."""
+        for start in range(0, len(rows), BENCHMARK_INSERT_BATCH_SIZE):
+            self.db_session.execute(insert(model), rows[start:start + BENCHMARK_INSERT_BATCH_SIZE])
+        if rows:
+            print(f"Inserted {len(rows)} {model.__tablename__} rows")
 
 def generate_large_parts_dataset(
     db_session: Session,
@@ -308,6 +493,23 @@ def generate_large_parts_dataset(
     )
 
 
+def generate_benchmark_dataset(db_session: Session, scale: int = 1, seed: int = 42,
+                               parts: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Convenience function to generate the seeded performance benchmark dataset.
+    
+    Args:
+        db_session: Database session
+        scale: Dataset scale (1, 10, 100, ...)
+        seed: Random seed; the same seed and scale give the same data
+        parts: Part count overriding the scale's
+        
+    Returns:
+        Row counts and ids used by the benchmark scenarios
+    """
+    return LargeDatasetGenerator(db_session, seed=seed).generate_benchmark_dataset(scale, parts=parts)
+
+
 def generate_performance_test_scenarios(db_session: Session) -> Dict[str, Dict[str, Any]]:
     """
     Generate multiple test scenarios with different dataset sizes.
@@ -0,0 +1,68 @@
+"""
+Tests for the database connection pool configuration and its metrics.
+"""
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, exc, text
+
+from app import database
+from app.database import engine_options, instrument_pool, instrumented_pool_class, pool_numbers
+
+
+def sample(name, target):
+    return REGISTRY.get_sample_value(name, {"target": target}) or 0
+
+
+@pytest.fixture
+def small_pool():
+    """A one-connection SQLite pool that gives up after 50ms."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        poolclass=instrumented_pool_class("test"),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_pool("test", engine)
+    yield engine
+    engine.dispose()
+
+
+class TestPoolMetrics:
+    """Checkout wait, timeouts and utilization"""
+
+    def test_checkout_wait_and_usage_recorded(self, small_pool):
+        waits = sample("abparts_db_pool_checkout_wait_seconds_count", "test")
+
+        with small_pool.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert REGISTRY.get_sample_value(
+                "abparts_db_pool_connections", {"target": "test", "state": "checked_out"}
+            ) == 1
+
+        assert sample("abparts_db_pool_checkout_wait_seconds_count", "test") == waits + 1
+        assert pool_numbers(small_pool)["checked_out"] == 0
+
+    def test_exhausted_pool_times_out(self, small_pool):
+        timeouts = sample("abparts_db_pool_timeouts_total", "test")
+
+        with small_pool.connect():
+            with pytest.raises(exc.TimeoutError):
+                small_pool.connect()
+
+        assert sample("abparts_db_pool_timeouts_total", "test") == timeouts + 1
+
+
+class TestEngineOptions:
+    """Settings passed to create_engine"""
+
+    def test_statement_timeout_as_startup_option(self, monkeypatch):
+        monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 15000)
+        monkeypatch.setattr(database, "DB_PGBOUNCER", False)
+        assert engine_options()["connect_args"] == {"options": "-c statement_timeout=15000"}
+
+    def test_pgbouncer_mode_sends_no_startup_options(self, monkeypatch):
+        monkeypatch.setattr(database, "DB_STATEMENT_TIMEOUT_MS", 15000)
+        monkeypatch.setattr(database, "DB_PGBOUNCER", True)
+        assert "connect_args" not in engine_options()
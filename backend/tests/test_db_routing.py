@@ -0,0 +1,101 @@
+"""
+Tests for read replica routing.
+Covers client identification, the read-your-writes window and the choice of
+database made by get_read_db, with SQLite engines standing in for the primary
+and the replica.
+"""
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import db_routing
+from app.db_routing import DatabaseRoutingMiddleware, client_key_from_scope, get_read_db
+
+
+class UnavailableRedis:
+    """Redis client whose server is down."""
+
+    def set(self, *args, **kwargs):
+        raise ConnectionError("redis unavailable")
+
+    def exists(self, *args, **kwargs):
+        raise ConnectionError("redis unavailable")
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    """Configure a replica, keeping recent writes in process."""
+    primary, replica = create_engine("sqlite://"), create_engine("sqlite://")
+    monkeypatch.setattr(db_routing, "SessionLocal", sessionmaker(bind=primary))
+    monkeypatch.setattr(db_routing, "replica_engine", replica)
+    monkeypatch.setattr(db_routing, "ReplicaSessionLocal", sessionmaker(bind=replica))
+    monkeypatch.setattr(db_routing, "redis_client", UnavailableRedis())
+    monkeypatch.setattr(db_routing, "_local_recent_writes", {})
+
+    app = FastAPI()
+
+    @app.get("/report")
+    def report(db=Depends(get_read_db)):
+        return {"target": "replica" if db.get_bind() is replica else "primary"}
+
+    @app.post("/orders")
+    def create_order():
+        return {"status": "created"}
+
+    @app.post("/orders/rejected")
+    def reject_order():
+        raise HTTPException(status_code=400, detail="Invalid order")
+
+    app.add_middleware(DatabaseRoutingMiddleware)
+    yield TestClient(app)
+    primary.dispose()
+    replica.dispose()
+
+
+def headers(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestClientKey:
+    """Identification of the client behind a request"""
+
+    def test_hashed_bearer_token(self):
+        scope = {"headers": [(b"authorization", b"Bearer secret-token")]}
+        key = client_key_from_scope(scope)
+        assert key and "secret-token" not in key
+        assert key == client_key_from_scope(scope)
+
+    def test_anonymous(self):
+        assert client_key_from_scope({"headers": []}) is None
+        assert client_key_from_scope({"headers": [(b"authorization", b"Basic abc")]}) is None
+
+
+class TestReadRouting:
+    """Choice between the primary and the replica"""
+
+    def test_reads_go_to_replica(self, routed):
+        assert routed.get("/report", headers=headers("user-a")).json() == {"target": "replica"}
+
+    def test_own_writes_read_from_primary(self, routed):
+        assert routed.post("/orders", headers=headers("user-a")).status_code == 200
+
+        assert routed.get("/report", headers=headers("user-a")).json() == {"target": "primary"}
+        # Other clients are not affected by the write
+        assert routed.get("/report", headers=headers("user-b")).json() == {"target": "replica"}
+
+    def test_failed_writes_not_marked(self, routed):
+        assert routed.post("/orders/rejected", headers=headers("user-a")).status_code == 400
+        assert routed.get("/report", headers=headers("user-a")).json() == {"target": "replica"}
+
+    def test_window_expires(self, routed, monkeypatch):
+        monkeypatch.setattr(db_routing, "READ_YOUR_WRITES_SECONDS", 0)
+        routed.post("/orders", headers=headers("user-a"))
+        assert routed.get("/report", headers=headers("user-a")).json() == {"target": "replica"}
+
+    def test_primary_without_replica(self, routed, monkeypatch):
+        monkeypatch.setattr(db_routing, "replica_engine", None)
+        assert routed.get("/report", headers=headers("user-a")).json() == {"target": "primary"}
+        assert db_routing.pool_status()["replica"] is None
@@ -0,0 +1,179 @@
+"""
+Tests for the delta-sync API used by offline clients.
+Changes are only served once their transaction has finished, so these tests
+commit through their own sessions instead of the per-test transaction.
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.crud.sync import get_changes, parse_cursor
+
+
+@pytest.fixture
+def sync_db(db_engine):
+    """
+    Committed organizations north and south, with a farm site and two nets
+    for north. Yields (session factory, ids) and removes everything afterwards.
+    """
+    SyncSession = sessionmaker(bind=db_engine)
+    suffix = uuid.uuid4().hex[:8]
+    with SyncSession() as db:
+        north = models.Organization(name=f"Sync North {suffix}", organization_type=models.OrganizationType.customer)
+        south = models.Organization(name=f"Sync South {suffix}", organization_type=models.OrganizationType.customer)
+        db.add_all([north, south])
+        db.flush()
+        site = models.FarmSite(organization_id=north.id, name="North Bay")
+        db.add(site)
+        db.flush()
+        nets = [models.Net(farm_site_id=site.id, name=f"Cage {i}") for i in (1, 2)]
+        db.add_all(nets)
+        db.commit()
+        ids = {"north": north.id, "south": south.id, "site": site.id, "nets": [net.id for net in nets]}
+
+    yield SyncSession, ids
+
+    organization_ids = [ids["north"], ids["south"]]
+    with SyncSession() as db:
+        site_ids = [site_id for site_id, in db.query(models.FarmSite.id)
+                    .filter(models.FarmSite.organization_id.in_(organization_ids))]
+        db.query(models.Net).filter(models.Net.farm_site_id.in_(site_ids)).delete(synchronize_session=False)
+        db.query(models.FarmSite).filter(models.FarmSite.organization_id.in_(organization_ids))\
+            .delete(synchronize_session=False)
+        db.query(models.Machine).filter(models.Machine.customer_organization_id.in_(organization_ids))\
+            .delete(synchronize_session=False)
+        db.query(models.SyncTombstone).filter(
+            models.SyncTombstone.resource_id.in_(ids["nets"]) |
+            models.SyncTombstone.organization_id.in_(organization_ids)
+        ).delete(synchronize_session=False)
+        db.query(models.Organization).filter(models.Organization.id.in_(organization_ids))\
+            .delete(synchronize_session=False)
+        db.commit()
+
+
+def upserted_ids(changes):
+    return {row["id"] for row in changes["upserts"]}
+
+
+class TestDeltaSync:
+    """Change cursors and tombstones"""
+
+    def test_only_changes_after_cursor_are_returned(self, sync_db):
+        SyncSession, ids = sync_db
+        with SyncSession() as db:
+            full = get_changes(db, "nets", since="0", organization_id=ids["north"])
+            assert upserted_ids(full) == {str(net_id) for net_id in ids["nets"]}
+
+            db.get(models.Net, ids["nets"][0]).notes = "Repaired"
+            db.commit()
+
+            delta = get_changes(db, "nets", since=full["cursor"], organization_id=ids["north"])
+            assert upserted_ids(delta) == {str(ids["nets"][0])}
+            assert parse_cursor(delta["cursor"]) > parse_cursor(full["cursor"])
+
+            empty = get_changes(db, "nets", since=delta["cursor"], organization_id=ids["north"])
+            assert empty["upserts"] == [] and empty["deletes"] == []
+
+    def test_deletes_leave_tombstones(self, sync_db):
+        SyncSession, ids = sync_db
+        with SyncSession() as db:
+            cursor = get_changes(db, "nets", organization_id=ids["north"])["cursor"]
+
+            db.delete(db.get(models.Net, ids["nets"][1]))
+            db.commit()
+
+            delta = get_changes(db, "nets", since=cursor, organization_id=ids["north"])
+            assert delta["deletes"] == [ids["nets"][1]]
+            assert delta["upserts"] == []
+
+    def test_scoped_to_organization(self, sync_db):
+        SyncSession, ids = sync_db
+        with SyncSession() as db:
+            assert get_changes(db, "farm_sites", organization_id=ids["south"])["upserts"] == []
+
+    def test_transferred_machine_is_removed_from_old_organization(self, sync_db):
+        SyncSession, ids = sync_db
+        with SyncSession() as db:
+            machine = models.Machine(
+                customer_organization_id=ids["north"], model_type="V4.0",
+                name="Sync Test", serial_number=f"SYNC-{uuid.uuid4().hex[:8]}"
+            )
+            db.add(machine)
+            db.commit()
+            cursor = get_changes(db, "machines", organization_id=ids["north"])["cursor"]
+
+            machine.customer_organization_id = ids["south"]
+            db.commit()
+
+            assert get_changes(db, "machines", since=cursor, organization_id=ids["north"])["deletes"] == [machine.id]
+            moved_in = get_changes(db, "machines", since=cursor, organization_id=ids["south"])
+            assert upserted_ids(moved_in) == {str(machine.id)}
+
+    def test_moved_farm_site_takes_its_nets(self, sync_db):
+        SyncSession, ids = sync_db
+        with SyncSession() as db:
+            cursors = {org: get_changes(db, "nets", organization_id=ids[org])["cursor"] for org in ("north", "south")}
+
+            db.get(models.FarmSite, ids["site"]).organization_id = ids["south"]
+            db.commit()
+
+            left = get_changes(db, "nets", since=cursors["north"], organization_id=ids["north"])
+            arrived = get_changes(db, "nets", since=cursors["south"], organization_id=ids["south"])
+        assert set(left["deletes"]) == set(ids["nets"])
+        assert upserted_ids(arrived) == {str(net_id) for net_id in ids["nets"]}
+
+    def test_paging_with_limit(self, sync_db):
+        SyncSession, ids = sync_db
+        with SyncSession() as db:
+            first = get_changes(db, "nets", limit=1, organization_id=ids["north"])
+            assert len(first["upserts"]) == 1 and first["has_more"] is True
+
+            second = get_changes(db, "nets", since=first["cursor"], limit=1, organization_id=ids["north"])
+            assert len(second["upserts"]) == 1 and second["has_more"] is False
+            assert second["upserts"][0]["id"] != first["upserts"][0]["id"]
+
+    def test_slow_transaction_is_not_skipped(self, sync_db):
+        """A change committed after a client synced past its version still reaches the client."""
+        SyncSession, ids = sync_db
+        slow, fast, reader = SyncSession(), SyncSession(), SyncSession()
+        try:
+            cursor = get_changes(reader, "nets", organization_id=ids["north"])["cursor"]
+
+            # The slow transaction takes the lower version but commits last
+            slow_net = models.Net(farm_site_id=ids["site"], name="Slow")
+            slow.add(slow_net)
+            slow.flush()
+            fast_net = models.Net(farm_site_id=ids["site"], name="Fast")
+            fast.add(fast_net)
+            fast.commit()
+            assert slow_net.sync_version < fast_net.sync_version
+
+            during = get_changes(reader, "nets", since=cursor, organization_id=ids["north"])
+            slow.commit()
+            after = get_changes(reader, "nets", since=during["cursor"], organization_id=ids["north"])
+
+            assert upserted_ids(during) == set()
+            assert upserted_ids(after) == {str(slow_net.id), str(fast_net.id)}
+        finally:
+            for session in (slow, fast, reader):
+                session.close()
+
+    def test_invalid_cursor_is_rejected(self, client: TestClient, auth_headers):
+        response = client.post(
+            "/sync/changes",
+            json={"cursors": {"nets": "not-a-cursor"}},
+            headers=auth_headers["customer_admin"]
+        )
+        assert response.status_code == 400
+
+    def test_unknown_resource_is_rejected(self, client: TestClient, auth_headers):
+        response = client.post(
+            "/sync/changes",
+            json={"cursors": {"nets": 0, "spaceships": 0}},
+            headers=auth_headers["customer_admin"]
+        )
+        assert response.status_code == 400
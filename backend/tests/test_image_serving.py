@@ -0,0 +1,76 @@
+"""
+Tests for deferred image columns and ETag-cached logo / profile photo serving.
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.image_utils import ImageByteCache, image_cache
+
+
+class TestImageServing:
+    """Versioned image endpoints and list payloads"""
+
+    def test_profile_photo_etag_and_304(self, client: TestClient, db_session: Session, test_users, auth_headers):
+        image_cache.clear()
+        user = test_users["super_admin"]
+        user.profile_photo_data = b"RIFF-profile-photo"
+        db_session.flush()
+        assert user.profile_photo_version == models.image_version(b"RIFF-profile-photo")
+
+        url = f"/images/users/{user.id}/profile"
+        response = client.get(url, headers=auth_headers["super_admin"])
+        assert response.status_code == 200
+        assert response.content == b"RIFF-profile-photo"
+        etag = response.headers["etag"]
+        assert etag == f'"{user.profile_photo_version}"'
+
+        cached = client.get(url, headers={**auth_headers["super_admin"], "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        user.profile_photo_data = b"RIFF-new-photo"
+        db_session.flush()
+        changed = client.get(url, headers={**auth_headers["super_admin"], "If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.content == b"RIFF-new-photo"
+        assert changed.headers["etag"] != etag
+
+    def test_versioned_url_is_immutable(self, client: TestClient, db_session: Session, test_organizations, auth_headers):
+        org = test_organizations["oraseas"]
+        org.logo_data = b"RIFF-logo"
+        db_session.flush()
+
+        response = client.get(
+            f"/images/organizations/{org.id}/logo?v={org.logo_version}",
+            headers=auth_headers["super_admin"]
+        )
+        assert response.status_code == 200
+        assert "immutable" in response.headers["cache-control"]
+
+    def test_organization_list_carries_version_only(self, client: TestClient, db_session: Session,
+                                                    test_organizations, auth_headers):
+        org = test_organizations["oraseas"]
+        org.logo_data = b"RIFF-logo"
+        db_session.flush()
+
+        response = client.get("/organizations/", headers=auth_headers["super_admin"])
+        assert response.status_code == 200
+        listed = next(item for item in response.json() if item["id"] == str(org.id))
+        assert listed["logo_version"] == org.logo_version
+        assert listed["logo_data_url"] is None
+
+    def test_byte_cache_evicts_least_recently_used(self):
+        cache = ImageByteCache(max_bytes=10)
+        cache.set("a", b"12345")
+        cache.set("b", b"12345")
+        cache.get("a")
+        cache.set("c", b"1")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"12345"
+        assert cache.size == 6
+
+        cache.set("huge", b"x" * 11)
+        assert cache.get("huge") is None
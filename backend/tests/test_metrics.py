@@ -0,0 +1,108 @@
+"""
+Tests for the Prometheus metrics middleware and /metrics endpoint.
+"""
+
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.metrics import PrometheusMiddleware
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/widgets/{widget_id}")
+    async def get_widget(widget_id: int):
+        return {"id": widget_id}
+
+    return app
+
+
+class TestPrometheusMiddleware:
+    """Request counts and latency histograms per route template"""
+
+    def test_requests_labelled_by_route_template(self):
+        client = TestClient(make_app())
+        labels = {"method": "GET", "route": "/widgets/{widget_id}"}
+        before = sample("abparts_http_requests_total", status="200", **labels)
+        observed_before = sample("abparts_http_request_duration_seconds_count", **labels)
+
+        for widget_id in (1, 2, 3):
+            assert client.get(f"/widgets/{widget_id}").status_code == 200
+
+        assert sample("abparts_http_requests_total", status="200", **labels) == before + 3
+        assert sample("abparts_http_request_duration_seconds_count", **labels) == observed_before + 3
+        assert sample("abparts_http_requests_in_progress", method="GET") == 0
+
+    def test_unmatched_paths_share_one_series(self):
+        client = TestClient(make_app())
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = sample("abparts_http_requests_total", **labels)
+
+        client.get("/wp-login.php")
+        client.get("/.env")
+
+        assert sample("abparts_http_requests_total", **labels) == before + 2
+
+    def test_metrics_endpoint(self, client: TestClient, monkeypatch):
+        client.get("/")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'abparts_http_requests_total{method="GET",route="/",status="200"}' in response.text
+
+        monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+    def test_metrics_hidden_in_production_without_token(self, client: TestClient, monkeypatch):
+        monkeypatch.delenv("METRICS_TOKEN", raising=False)
+        monkeypatch.setenv("ENVIRONMENT", "production")
+        assert client.get("/metrics").status_code == 404
+
+        monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+        assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+    def test_workers_aggregated_through_multiprocess_dir(self, tmp_path):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), PYTHONPATH=BACKEND_DIR)
+        worker = (
+            "from app.metrics import observe_operation\n"
+            "observe_operation('report', 0.2)\n"
+        )
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+
+        scrape = subprocess.run(
+            [sys.executable, "-c", "import sys; from app.metrics import render_metrics; sys.stdout.write(render_metrics().decode())"],
+            env=env, check=True, capture_output=True, text=True
+        )
+        assert 'abparts_operation_duration_seconds_count{operation="report",success="true"} 2.0' in scrape.stdout
+
+    def test_exited_worker_leaves_live_gauges(self, tmp_path):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), PYTHONPATH=BACKEND_DIR)
+        worker = (
+            "from app.metrics import HTTP_REQUESTS_IN_PROGRESS, mark_process_dead\n"
+            "HTTP_REQUESTS_IN_PROGRESS.labels('GET').inc()\n"
+            "{exit}"
+        )
+        subprocess.run([sys.executable, "-c", worker.format(exit="")], env=env, check=True)
+        subprocess.run([sys.executable, "-c", worker.format(exit="mark_process_dead()\n")], env=env, check=True)
+
+        scrape = subprocess.run(
+            [sys.executable, "-c", "import sys; from app.metrics import render_metrics; sys.stdout.write(render_metrics().decode())"],
+            env=env, check=True, capture_output=True, text=True
+        )
+        # Only the worker that exited without marking itself dead is still counted
+        assert 'abparts_http_requests_in_progress{method="GET"} 1.0' in scrape.stdout
@@ -0,0 +1,134 @@
+"""
+Tests for the bulk offline replay endpoint.
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+@pytest.fixture
+def protocol(db_session: Session):
+    """A daily protocol with one checklist item."""
+    protocol = models.MaintenanceProtocol(name="Replay Daily", protocol_type=models.ProtocolType.DAILY)
+    db_session.add(protocol)
+    db_session.flush()
+    item = models.ProtocolChecklistItem(
+        protocol_id=protocol.id, item_order=1, item_description="Check oil",
+        item_type=models.ChecklistItemType.CHECK
+    )
+    db_session.add(item)
+    db_session.flush()
+    return protocol, item
+
+
+def _batch(machine, protocol, item):
+    execution_id = str(uuid.uuid4())
+    return {
+        "executions": [{
+            "id": execution_id,
+            "machine_id": str(machine.id),
+            "protocol_id": str(protocol.id),
+            "status": "completed",
+            "machine_hours_at_service": "1250.00",
+            "performed_date": "2026-10-01T08:00:00Z",
+        }],
+        "checklist_completions": [{
+            "id": str(uuid.uuid4()),
+            "execution_id": execution_id,
+            "checklist_item_id": str(item.id),
+            "status": "completed",
+            "completed_at": "2026-10-01T08:05:00Z",
+        }],
+        "machine_hours": [{
+            "id": str(uuid.uuid4()),
+            "machine_id": str(machine.id),
+            "hours_value": "1260.00",
+            "recorded_date": "2026-10-01T17:00:00Z",
+        }],
+    }
+
+
+class TestOfflineReplay:
+    """Idempotent bulk apply of queued offline work"""
+
+    def test_replaying_a_batch_twice_does_not_duplicate(self, client: TestClient, db_session: Session,
+                                                         test_machines, protocol, auth_headers):
+        machine = test_machines["customer1_machine1"]
+        batch = _batch(machine, *protocol)
+
+        first = client.post("/sync/replay", json=batch, headers=auth_headers["customer_admin"])
+        assert first.status_code == 200
+        assert first.json()["applied"] == 3
+        assert [result["status"] for result in first.json()["results"]] == ["created"] * 3
+
+        second = client.post("/sync/replay", json=batch, headers=auth_headers["customer_admin"])
+        assert second.status_code == 200
+        assert [result["status"] for result in second.json()["results"]] == ["updated"] * 3
+
+        execution_id = uuid.UUID(batch["executions"][0]["id"])
+        assert db_session.query(models.MaintenanceExecution).filter_by(id=execution_id).count() == 1
+        assert db_session.query(models.MaintenanceChecklistCompletion).filter_by(execution_id=execution_id).count() == 1
+        # The replayed reading plus the one recorded from the execution
+        assert db_session.query(models.MachineHours).filter_by(machine_id=machine.id).count() == 2
+
+    def test_completion_merges_into_existing_item_completion(self, client: TestClient, db_session: Session,
+                                                            test_machines, test_users, protocol, auth_headers):
+        protocol, item = protocol
+        execution = models.MaintenanceExecution(
+            machine_id=test_machines["customer1_machine1"].id, protocol_id=protocol.id,
+            performed_by_user_id=test_users["customer_admin"].id
+        )
+        db_session.add(execution)
+        db_session.flush()
+        existing = models.MaintenanceChecklistCompletion(
+            execution_id=execution.id, checklist_item_id=item.id, is_completed=False
+        )
+        db_session.add(existing)
+        db_session.flush()
+
+        response = client.post("/sync/replay", json={"checklist_completions": [{
+            "id": str(uuid.uuid4()), "execution_id": str(execution.id), "checklist_item_id": str(item.id)
+        }]}, headers=auth_headers["customer_admin"])
+
+        result = response.json()["results"][0]
+        assert result["status"] == "updated"
+        assert result["server_id"] == str(existing.id)
+        db_session.refresh(existing)
+        assert existing.is_completed is True
+
+    def test_other_organizations_items_are_rejected_individually(self, client: TestClient, db_session: Session,
+                                                                 test_machines, protocol, auth_headers):
+        batch = _batch(test_machines["customer2_machine1"], *protocol)
+        own_hours = {
+            "id": str(uuid.uuid4()),
+            "machine_id": str(test_machines["customer1_machine2"].id),
+            "hours_value": "10.00",
+            "recorded_date": "2026-10-01T17:00:00Z",
+        }
+        batch["machine_hours"].append(own_hours)
+
+        response = client.post("/sync/replay", json=batch, headers=auth_headers["customer_admin"])
+        assert response.status_code == 200
+        body = response.json()
+        assert [result["status"] for result in body["results"]] == ["rejected"] * 3 + ["created"]
+        assert body["results"][1]["detail"] == "Execution not found"
+        assert body["applied"] == 1 and body["rejected"] == 3
+
+    def test_repeated_id_in_one_batch_updates_the_first(self, client: TestClient, db_session: Session,
+                                                        test_machines, protocol, auth_headers):
+        machine = test_machines["customer1_machine1"]
+        batch = _batch(machine, *protocol)
+        hours = batch["machine_hours"][0]
+        batch["machine_hours"].append({**hours, "hours_value": "1270.00"})
+
+        response = client.post("/sync/replay", json=batch, headers=auth_headers["customer_admin"])
+        assert response.status_code == 200
+        assert [result["status"] for result in response.json()["results"]] == ["created"] * 3 + ["updated"]
+
+        record = db_session.query(models.MachineHours).filter_by(id=uuid.UUID(hours["id"])).one()
+        assert float(record.hours_value) == 1270.0
@@ -0,0 +1,100 @@
+"""
+Tests for FIFO stock allocation of active customer orders.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import order_allocation
+from app.services.order_allocation import allocate_orders
+
+
+@pytest.fixture
+def oil_filter_orders(db_session: Session, test_organizations, test_warehouses, test_parts, test_inventory, test_users):
+    """10 oil filters in stock, an older order for 8 and a newer order for 5."""
+    oraseas = test_organizations["oraseas"]
+    oil_filter = test_parts["oil_filter"]
+
+    db_session.add(models.Transaction(
+        transaction_type="creation", part_id=oil_filter.id, to_warehouse_id=test_warehouses["oraseas_main"].id,
+        quantity=Decimal("10"), unit_of_measure=oil_filter.unit_of_measure,
+        performed_by_user_id=test_users["oraseas_admin"].id, transaction_date=datetime.utcnow()
+    ))
+
+    orders = {}
+    now = datetime.utcnow()
+    for name, customer, days_ago, quantity in (
+        ("older", "customer1", 2, "8"),
+        ("newer", "customer2", 1, "5"),
+    ):
+        order = models.CustomerOrder(
+            customer_organization_id=test_organizations[customer].id,
+            oraseas_organization_id=oraseas.id,
+            order_date=now - timedelta(days=days_ago),
+            status="Pending"
+        )
+        order.items.append(models.CustomerOrderItem(part_id=oil_filter.id, quantity=Decimal(quantity)))
+        db_session.add(order)
+        orders[name] = order
+    db_session.flush()
+    return orders
+
+
+class TestOrderAllocation:
+    """FIFO allocation, supplier order projection and cache invalidation"""
+
+    def test_older_orders_allocated_first(self, db_session: Session, test_organizations, oil_filter_orders):
+        allocation = allocate_orders(db_session, test_organizations["oraseas"].id)
+
+        assert [order["order_id"] for order in allocation["orders"]] == [str(oil_filter_orders["newer"].id)]
+        item = allocation["orders"][0]["items_short"][0]
+        assert item["quantity_in_stock"] == 10.0
+        assert item["quantity_allocated"] == 2.0
+        assert item["quantity_short"] == 3.0
+
+        part = allocation["parts_short"][0]
+        assert part["total_quantity_ordered"] == 13.0
+        assert part["quantity_short"] == 3.0
+        assert [order["quantity_allocated"] for order in part["orders"]] == [8.0, 2.0]
+
+    def test_supplier_order_projection(self, db_session: Session, test_organizations, test_parts, oil_filter_orders):
+        supplier_order = models.SupplierOrder(
+            ordering_organization_id=test_organizations["oraseas"].id, supplier_name="Filters Inc",
+            order_date=datetime.utcnow(), status="Pending"
+        )
+        supplier_order.items.append(models.SupplierOrderItem(part_id=test_parts["oil_filter"].id, quantity=Decimal("3")))
+        db_session.add(supplier_order)
+        db_session.flush()
+
+        allocation = allocate_orders(db_session, test_organizations["oraseas"].id, [supplier_order.id])
+        assert allocation["parts_short"] == []
+        assert allocation["orders"] == []
+        assert allocation["projected_supplier_order_ids"] == [str(supplier_order.id)]
+
+    def test_endpoint(self, client: TestClient, auth_headers, oil_filter_orders):
+        response = client.get("/customer_orders/stock-availability/check", headers=auth_headers["oraseas_admin"])
+        assert response.status_code == 200
+        assert response.json()["parts_short"][0]["quantity_short"] == 3.0
+
+        unknown = client.get(
+            "/customer_orders/stock-availability/check?supplier_order_id=00000000-0000-0000-0000-000000000000",
+            headers=auth_headers["oraseas_admin"]
+        )
+        assert unknown.status_code == 404
+
+    def test_writes_invalidate_after_commit(self, db_session: Session, oil_filter_orders, monkeypatch):
+        invalidations = []
+        monkeypatch.setattr(order_allocation, "invalidate_order_allocations", lambda: invalidations.append(True))
+        db_session.commit()
+        invalidations.clear()
+
+        oil_filter_orders["newer"].status = "Shipped"
+        db_session.flush()
+        assert invalidations == []
+
+        db_session.commit()
+        assert invalidations == [True]
@@ -0,0 +1,117 @@
+"""
+Tests for the recursive-CTE organization hierarchy queries.
+"""
+
+import pytest
+import uuid
+from sqlalchemy.orm import Session
+
+from app import models
+from app.auth import TokenData
+from app.models import OrganizationType
+from app.crud import organization_hierarchy
+from app.crud.organizations import get_organization_hierarchy
+from app.permissions import OrganizationScopedQueries
+
+
+@pytest.fixture
+def hierarchy(db_session: Session):
+    """Oraseas EE -> customer -> (active supplier, inactive supplier, sub-customer -> supplier)."""
+    def org(name, organization_type, parent=None, is_active=True):
+        organization = models.Organization(
+            id=uuid.uuid4(),
+            name=name,
+            organization_type=organization_type,
+            parent_organization_id=parent.id if parent else None,
+            is_active=is_active
+        )
+        db_session.add(organization)
+        return organization
+
+    orgs = {}
+    orgs["root"] = org("Hierarchy Root", OrganizationType.oraseas_ee)
+    orgs["customer"] = org("Hierarchy Customer", OrganizationType.customer, orgs["root"])
+    orgs["supplier"] = org("Hierarchy Supplier", OrganizationType.supplier, orgs["customer"])
+    orgs["inactive_supplier"] = org("Hierarchy Old Supplier", OrganizationType.supplier, orgs["customer"], is_active=False)
+    orgs["sub_customer"] = org("Hierarchy Sub Customer", OrganizationType.customer, orgs["customer"])
+    orgs["sub_supplier"] = org("Hierarchy Sub Supplier", OrganizationType.supplier, orgs["sub_customer"])
+    db_session.flush()
+    return orgs
+
+
+class TestOrganizationHierarchy:
+    """Subtree, ancestor-path, cycle and accessible-set queries"""
+
+    def test_subtree_depths(self, db_session: Session, hierarchy):
+        depths = {org.id: depth for org, depth in organization_hierarchy.get_subtree(db_session, hierarchy["customer"].id)}
+
+        assert depths == {
+            hierarchy["customer"].id: 0,
+            hierarchy["supplier"].id: 1,
+            hierarchy["inactive_supplier"].id: 1,
+            hierarchy["sub_customer"].id: 1,
+            hierarchy["sub_supplier"].id: 2,
+        }
+
+        active = organization_hierarchy.get_subtree_ids(db_session, hierarchy["customer"].id, include_inactive=False)
+        assert hierarchy["inactive_supplier"].id not in active
+        assert len(active) == 4
+
+    def test_ancestor_path(self, db_session: Session, hierarchy):
+        path = organization_hierarchy.get_ancestor_path(db_session, hierarchy["sub_supplier"].id)
+
+        assert path == [
+            hierarchy["root"].id, hierarchy["customer"].id,
+            hierarchy["sub_customer"].id, hierarchy["sub_supplier"].id
+        ]
+
+    def test_cycle_check(self, db_session: Session, hierarchy):
+        assert organization_hierarchy.would_create_cycle(db_session, hierarchy["customer"].id, hierarchy["sub_supplier"].id)
+        assert organization_hierarchy.would_create_cycle(db_session, hierarchy["customer"].id, hierarchy["customer"].id)
+        assert not organization_hierarchy.would_create_cycle(db_session, hierarchy["sub_customer"].id, hierarchy["root"].id)
+
+    def test_accessible_set_is_own_org_and_active_direct_suppliers(self, db_session: Session, hierarchy,
+                                                                   test_organizations):
+        accessible = set(organization_hierarchy.get_accessible_organization_ids(db_session, hierarchy["customer"].id))
+        assert accessible == {hierarchy["customer"].id, hierarchy["supplier"].id}
+
+        # A supplier's own suppliers are not reachable from the customer
+        nested = models.Organization(
+            name="Hierarchy Nested Supplier", organization_type=OrganizationType.supplier,
+            parent_organization_id=hierarchy["supplier"].id
+        )
+        db_session.add(nested)
+        db_session.flush()
+        assert nested.id not in organization_hierarchy.get_accessible_organization_ids(db_session, hierarchy["customer"].id)
+
+        bossaqua = test_organizations["bossaqua"]
+        assert organization_hierarchy.get_accessible_organization_ids(db_session, bossaqua.id) == []
+
+    def test_organization_hierarchy_tree(self, db_session: Session, hierarchy):
+        tree = get_organization_hierarchy(db_session, hierarchy["root"].id)
+
+        assert tree["organization"].id == hierarchy["root"].id
+        customer = tree["children"][0]
+        assert customer["depth"] == 1
+        assert [child["organization"].name for child in customer["children"]] == [
+            "Hierarchy Sub Customer", "Hierarchy Supplier"
+        ]
+        assert customer["children"][0]["children"][0]["depth"] == 3
+
+    @pytest.mark.parametrize("include_inactive", [False, True])
+    @pytest.mark.parametrize("member_of", ["root", "customer", "sub_customer", "supplier"])
+    def test_tree_scope_matches_organization_scoped_filter(self, db_session: Session, hierarchy,
+                                                          member_of, include_inactive):
+        """The hierarchy tree keeps the own-organization-plus-children scope of filter_organizations."""
+        user = TokenData(username="scope", organization_id=hierarchy[member_of].id, role="admin")
+        query = OrganizationScopedQueries.filter_organizations(db_session.query(models.Organization), user)
+        if not include_inactive:
+            query = query.filter(models.Organization.is_active == True)
+        before = {org.id for org in query}
+
+        after = organization_hierarchy.get_organization_and_children_ids(
+            db_session, hierarchy[member_of].id, include_inactive=include_inactive
+        )
+
+        assert set(after) == before
+        assert len(after) == len(before)
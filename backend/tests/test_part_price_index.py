@@ -0,0 +1,95 @@
+"""
+Tests for the part price index used by inventory valuation.
+Checks that latest and average unit cost follow supplier order writes and that
+valuation reads prices from the index.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app import models
+from app.crud.inventory import get_warehouse_analytics
+from app.crud.part_price_index import rebuild_part_price_index
+
+
+def add_supplier_order(db_session, organization, part, quantity, unit_price, days_ago, status="Pending"):
+    order = models.SupplierOrder(
+        ordering_organization_id=organization.id, supplier_name="Filters Inc",
+        order_date=datetime.utcnow() - timedelta(days=days_ago), status=status
+    )
+    order.items.append(models.SupplierOrderItem(
+        part_id=part.id, quantity=Decimal(quantity),
+        unit_price=Decimal(unit_price) if unit_price is not None else None
+    ))
+    db_session.add(order)
+    db_session.flush()
+    return order
+
+
+class TestPartPriceIndex:
+    """Incremental maintenance of the part price index"""
+
+    def test_latest_and_average_cost(self, db_session: Session, test_organizations, test_parts):
+        oraseas = test_organizations["oraseas"]
+        oil_filter = test_parts["oil_filter"]
+
+        add_supplier_order(db_session, oraseas, oil_filter, "10", "4.00", days_ago=20, status="Delivered")
+        add_supplier_order(db_session, oraseas, oil_filter, "30", "6.00", days_ago=10, status="Received")
+        latest = add_supplier_order(db_session, oraseas, oil_filter, "5", "7.50", days_ago=1)
+        add_supplier_order(db_session, oraseas, oil_filter, "5", None, days_ago=0)
+
+        price = db_session.get(models.PartPriceIndex, oil_filter.id)
+        db_session.refresh(price)
+        assert price.latest_unit_price == Decimal("7.50")
+        assert price.received_quantity == Decimal("40")
+        assert price.average_unit_cost == Decimal("5.5000")
+
+        latest.status = "Delivered"
+        db_session.flush()
+        db_session.refresh(price)
+        assert price.received_quantity == Decimal("45")
+
+        db_session.delete(latest)
+        db_session.flush()
+        db_session.refresh(price)
+        assert price.latest_unit_price == Decimal("6.00")
+        assert price.average_unit_cost == Decimal("5.5000")
+
+    def test_unpriced_part_leaves_index(self, db_session: Session, test_organizations, test_parts):
+        cleaning_oil = test_parts["cleaning_oil"]
+        order = add_supplier_order(db_session, test_organizations["oraseas"], cleaning_oil, "2", "12.00", days_ago=1)
+        assert db_session.get(models.PartPriceIndex, cleaning_oil.id) is not None
+
+        order.items[0].unit_price = None
+        db_session.flush()
+        db_session.expire_all()
+        assert db_session.get(models.PartPriceIndex, cleaning_oil.id) is None
+
+    def test_rebuild_matches_incremental(self, db_session: Session, test_organizations, test_parts):
+        oil_filter = test_parts["oil_filter"]
+        add_supplier_order(db_session, test_organizations["oraseas"], oil_filter, "10", "4.00", days_ago=2, status="Delivered")
+        before = db_session.get(models.PartPriceIndex, oil_filter.id)
+        expected = (before.latest_unit_price, before.average_unit_cost, before.received_quantity)
+
+        assert rebuild_part_price_index(db_session) >= 1
+        after = db_session.get(models.PartPriceIndex, oil_filter.id)
+        assert (after.latest_unit_price, after.average_unit_cost, after.received_quantity) == expected
+
+    def test_warehouse_value_uses_latest_price(self, db_session: Session, test_organizations, test_warehouses,
+                                               test_parts, test_inventory):
+        oraseas = test_organizations["oraseas"]
+        oil_filter = test_parts["oil_filter"]
+        add_supplier_order(db_session, oraseas, oil_filter, "10", "4.00", days_ago=20)
+        add_supplier_order(db_session, oraseas, oil_filter, "10", "5.00", days_ago=2)
+
+        warehouse = test_warehouses["oraseas_main"]
+        stock = db_session.query(models.Inventory.current_stock).filter(
+            models.Inventory.warehouse_id == warehouse.id,
+            models.Inventory.part_id == oil_filter.id
+        ).scalar()
+
+        result = get_warehouse_analytics(db_session, warehouse.id)
+        # Counted once at the latest price, however many orders the part has
+        assert result["inventory_summary"]["total_value"] == pytest.approx(float(stock * Decimal("5.00")))
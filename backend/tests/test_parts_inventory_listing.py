@@ -0,0 +1,129 @@
+"""
+Tests for the inventory-joined parts listing.
+A page of parts with stock comes from one query and must match what
+get_part_with_inventory returns part by part; stock status filters and
+sorting by total stock are applied before pagination.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.crud.parts import (
+    get_part_with_inventory, get_parts_with_inventory_with_count, search_parts_with_inventory_with_count
+)
+from app.models import Inventory
+
+
+@pytest.fixture
+def stock_levels(db_session: Session, test_warehouses, test_parts, test_inventory):
+    """Adds a pump below its minimum and a belt without stock to the test inventory."""
+    db_session.add_all([
+        Inventory(
+            warehouse_id=test_warehouses["oraseas_secondary"].id,
+            part_id=test_parts["bossaqua_pump"].id,
+            current_stock=Decimal("1.000"),
+            minimum_stock_recommendation=Decimal("2.000"),
+            unit_of_measure="pieces"
+        ),
+        Inventory(
+            warehouse_id=test_warehouses["oraseas_main"].id,
+            part_id=test_parts["drive_belt"].id,
+            current_stock=Decimal("0.000"),
+            minimum_stock_recommendation=Decimal("0.000"),
+            unit_of_measure="pieces"
+        ),
+    ])
+    db_session.commit()
+    return test_parts
+
+
+def part_numbers(result):
+    return [part["part_number"] for part in result["items"]]
+
+
+def stock_view(part):
+    """The inventory fields of a listing item, with warehouses in a stable order."""
+    return (
+        part["total_stock"],
+        part["is_low_stock"],
+        sorted((row["warehouse_id"], row["current_stock"], row["minimum_stock_recommendation"],
+                row["is_low_stock"], row["unit_of_measure"]) for row in part["warehouse_inventory"])
+    )
+
+
+class TestPartsWithInventoryListing:
+    """Parts page with stock from a single query"""
+
+    @pytest.mark.parametrize("organization", [None, "oraseas", "customer1"])
+    def test_matches_per_part_inventory(self, db_session: Session, test_organizations, stock_levels, organization):
+        organization_id = test_organizations[organization].id if organization else None
+
+        result = get_parts_with_inventory_with_count(db_session, organization_id, limit=100)
+
+        assert result["items"]
+        for part in result["items"]:
+            expected = get_part_with_inventory(db_session, part["id"], organization_id)
+            assert stock_view(part) == stock_view(expected)
+            assert part["image_urls"] == expected["image_urls"]
+
+    def test_statement_count_independent_of_page_size(self, db_session: Session, stock_levels, assert_max_queries):
+        with assert_max_queries(2):
+            result = get_parts_with_inventory_with_count(db_session, limit=100, include_count=True)
+
+        assert len(result["items"]) == result["total_count"] == len(stock_levels)
+
+    def test_stock_status_filters(self, db_session: Session, stock_levels):
+        low = get_parts_with_inventory_with_count(db_session, stock_status="low", include_count=True)
+        out = get_parts_with_inventory_with_count(db_session, stock_status="out", include_count=True)
+        in_stock = get_parts_with_inventory_with_count(db_session, stock_status="in_stock")
+
+        assert part_numbers(low) == [stock_levels["bossaqua_pump"].part_number]
+        assert low["total_count"] == 1
+        assert part_numbers(out) == [stock_levels["drive_belt"].part_number]
+        assert set(part_numbers(in_stock)) == {
+            stock_levels["oil_filter"].part_number, stock_levels["cleaning_oil"].part_number
+        }
+
+    def test_organization_scopes_stock_status(self, db_session: Session, test_organizations, stock_levels):
+        # Only Oraseas holds the pump, so for the customer it is out of stock rather than low
+        customer1 = test_organizations["customer1"].id
+
+        result = get_parts_with_inventory_with_count(db_session, customer1, stock_status="out")
+
+        assert set(part_numbers(result)) == {
+            stock_levels["bossaqua_pump"].part_number, stock_levels["drive_belt"].part_number
+        }
+
+    def test_sort_by_total_stock_pages(self, db_session: Session, stock_levels):
+        first = get_parts_with_inventory_with_count(db_session, sort_by="total_stock", sort_order="desc", limit=2)
+        rest = get_parts_with_inventory_with_count(db_session, sort_by="total_stock", sort_order="desc", skip=2, limit=2)
+
+        totals = [part["total_stock"] for part in first["items"] + rest["items"]]
+        assert totals == sorted(totals, reverse=True)
+        assert first["has_more"] and not rest["has_more"]
+
+    def test_search_with_stock_status(self, db_session: Session, stock_levels):
+        result = search_parts_with_inventory_with_count(db_session, "oil", stock_status="in_stock", include_count=True)
+
+        assert result["total_count"] == len(result["items"]) > 0
+        assert all(part["total_stock"] > 0 and not part["is_low_stock"] for part in result["items"])
+
+
+class TestPartsWithInventoryEndpoint:
+    """Stock status and sort parameters on /parts/with-inventory"""
+
+    def test_low_stock_filter(self, client, auth_headers, stock_levels):
+        response = client.get("/parts/with-inventory?stock_status=low&include_count=true",
+                              headers=auth_headers["super_admin"])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] == 1
+        assert data["items"][0]["is_low_stock"] is True
+
+    def test_invalid_parameters_rejected(self, client, auth_headers):
+        headers = auth_headers["super_admin"]
+        assert client.get("/parts/with-inventory?stock_status=plenty", headers=headers).status_code == 422
+        assert client.get("/parts/with-inventory?sort_by=price", headers=headers).status_code == 422
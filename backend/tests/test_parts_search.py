@@ -0,0 +1,105 @@
+"""
+Tests for parts search and autocomplete.
+Substring search must keep returning exactly the parts ILIKE '%term%' matched,
+now ordered by relevance; autocomplete matches prefixes in every language
+variant of a part name.
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.crud.parts import (
+    _matching_name_variant, _prefix_tsquery, autocomplete_parts, search_parts_multilingual_with_count
+)
+from app.models import Part, PartType
+
+
+@pytest.fixture
+def multilingual_parts(db_session: Session):
+    """Parts with pipe-separated English, Greek and Spanish names."""
+    rows = [
+        ("FLT-100", "Oil Filter|Φίλτρο λαδιού|Filtro de aceite", "Spin-on filter for the main pump"),
+        ("FLT-1000", "Air Filter|Φίλτρο αέρα|Filtro de aire", None),
+        ("PMP-200", "Pump Seal|Τσιμούχα αντλίας|Sello de bomba", "Fits FLT-100 housings"),
+        ("BRS-300", "Brush Head|Κεφαλή βούρτσας|Cabezal de cepillo", "Replacement brush, unfiltered water only"),
+    ]
+    parts = []
+    for part_number, name, description in rows:
+        part = Part(part_number=part_number, name=name, description=description, part_type=PartType.CONSUMABLE)
+        db_session.add(part)
+        parts.append(part)
+    db_session.flush()
+    return parts
+
+
+def substring_matches(db_session: Session, term: str):
+    """Part numbers today's ILIKE '%term%' search returns."""
+    lowered = term.lower()
+    return {
+        part.part_number for part in db_session.query(models.Part).all()
+        if any(lowered in (value or "").lower() for value in (part.name, part.part_number, part.description))
+    }
+
+
+class TestSearchHelpers:
+    """Pure helpers behind ranking and autocomplete"""
+
+    def test_prefix_tsquery(self):
+        assert _prefix_tsquery("Oil fil") == "oil:* & fil:*"
+        assert _prefix_tsquery("FLT-100") == "flt:* & 100:*"
+        assert _prefix_tsquery("%&|!") is None
+
+    def test_matching_name_variant(self):
+        name = "Oil Filter|Φίλτρο λαδιού|Filtro de aceite"
+        assert _matching_name_variant(name, "φίλ") == "Φίλτρο λαδιού"
+        assert _matching_name_variant(name, "filtro ac") == "Filtro de aceite"
+        assert _matching_name_variant(name, "FLT-1") == "Oil Filter"
+
+
+class TestPartsSearch:
+    """Ranked substring search"""
+
+    @pytest.mark.parametrize("term", ["filt", "FLT-100", "φίλτρο", "ump", "aceite", "x-no-match"])
+    def test_same_results_as_substring_search(self, db_session: Session, multilingual_parts, test_parts, term):
+        result = search_parts_multilingual_with_count(db_session, term, limit=100, include_count=True)
+
+        found = {part["part_number"] for part in result["items"]}
+        assert found == substring_matches(db_session, term)
+        assert result["total_count"] == len(found)
+
+    def test_part_number_matches_ranked_first(self, db_session: Session, multilingual_parts):
+        result = search_parts_multilingual_with_count(db_session, "FLT-100", limit=10)
+
+        # Exact part number, then prefix, then a mention in another part's description
+        assert [part["part_number"] for part in result["items"]] == ["FLT-100", "FLT-1000", "PMP-200"]
+
+    def test_word_start_ranked_before_inner_substring(self, db_session: Session, multilingual_parts):
+        result = search_parts_multilingual_with_count(db_session, "filter", limit=10)
+
+        numbers = [part["part_number"] for part in result["items"]]
+        assert numbers[-1] == "BRS-300"  # Only "unfiltered" in the description
+        assert set(numbers[:2]) == {"FLT-100", "FLT-1000"}
+
+
+class TestPartsAutocomplete:
+    """Prefix suggestions across language variants"""
+
+    def test_prefix_in_any_language(self, db_session: Session, multilingual_parts):
+        suggestions = autocomplete_parts(db_session, "Φίλτ")
+
+        assert [s["part_number"] for s in suggestions] == ["FLT-100", "FLT-1000"]
+        assert suggestions[0]["matched_name"] == "Φίλτρο λαδιού"
+
+    def test_part_number_prefix(self, db_session: Session, multilingual_parts):
+        suggestions = autocomplete_parts(db_session, "pmp", limit=5)
+        assert [s["part_number"] for s in suggestions] == ["PMP-200"]
+
+    def test_inner_substring_not_suggested(self, db_session: Session, multilingual_parts):
+        assert autocomplete_parts(db_session, "ilter") == []
+
+    def test_endpoint(self, client, auth_headers, multilingual_parts):
+        response = client.get("/parts/autocomplete?q=sello", headers=auth_headers["customer_user"])
+
+        assert response.status_code == 200
+        assert response.json()[0]["matched_name"] == "Sello de bomba"
@@ -0,0 +1,77 @@
+"""
+Tests for precompiled localized protocol bundles.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import protocol_bundles
+
+
+@pytest.fixture
+def protocol(db_session: Session):
+    """An English protocol with one checklist item."""
+    protocol = models.MaintenanceProtocol(name="Bundle Daily", protocol_type=models.ProtocolType.DAILY)
+    db_session.add(protocol)
+    db_session.flush()
+    db_session.add(models.ProtocolChecklistItem(
+        protocol_id=protocol.id, item_order=1, item_description="Check oil",
+        item_type=models.ChecklistItemType.CHECK
+    ))
+    db_session.flush()
+    return protocol
+
+
+class TestProtocolBundles:
+    """Bundle contents, ETag revalidation and invalidation"""
+
+    def test_bundle_contains_localized_protocol_and_items(self, client: TestClient, protocol, auth_headers):
+        response = client.get(
+            f"/translations/protocols/{protocol.id}/bundle?language=el", headers=auth_headers["customer_user"]
+        )
+        assert response.status_code == 200
+        bundle = response.json()
+        assert bundle["protocol"]["name"] == "Bundle Daily"
+        assert bundle["protocol"]["display_language"] == "en"
+        assert [item["item_description"] for item in bundle["checklist_items"]] == ["Check oil"]
+
+    def test_etag_revalidation(self, client: TestClient, db_session: Session, protocol, auth_headers):
+        url = f"/translations/protocols/{protocol.id}/localized?language=el"
+        first = client.get(url, headers=auth_headers["customer_user"])
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        cached = client.get(url, headers={**auth_headers["customer_user"], "If-None-Match": etag})
+        assert cached.status_code == 304
+
+        db_session.add(models.ProtocolTranslation(protocol_id=protocol.id, language_code="el", name="Ημερήσια"))
+        db_session.commit()
+
+        changed = client.get(url, headers={**auth_headers["customer_user"], "If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["name"] == "Ημερήσια"
+        assert changed.headers["etag"] != etag
+
+    def test_writes_invalidate_after_commit(self, db_session: Session, protocol, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(protocol_bundles, "invalidate_bundles", lambda ids: invalidated.extend(ids))
+        db_session.commit()
+        invalidated.clear()
+
+        item = protocol.checklist_items[0]
+        db_session.add(models.ChecklistItemTranslation(
+            checklist_item_id=item.id, language_code="es", item_description="Revisar aceite"
+        ))
+        db_session.flush()
+        assert invalidated == []
+
+        db_session.commit()
+        assert invalidated == [protocol.id]
+
+    def test_unknown_protocol(self, client: TestClient, auth_headers):
+        response = client.get(
+            "/translations/protocols/00000000-0000-0000-0000-000000000000/bundle", headers=auth_headers["customer_user"]
+        )
+        assert response.status_code == 404
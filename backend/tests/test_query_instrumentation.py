@@ -0,0 +1,107 @@
+"""
+Tests for per-request SQL instrumentation and N+1 detection.
+The middleware tests run a small app against an in-memory SQLite engine, so
+they do not depend on the application database.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.query_instrumentation import (
+    N_PLUS_ONE_THRESHOLD, QueryStatsMiddleware, count_queries, fingerprint, query_stats
+)
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE widgets (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO widgets (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    yield engine
+    engine.dispose()
+
+
+def make_app(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, add_headers=True)
+
+    @app.get("/widgets")
+    def list_widgets():
+        with engine.connect() as conn:
+            ids = conn.execute(text("SELECT id FROM widgets")).scalars().all()
+            return [conn.execute(text("SELECT name FROM widgets WHERE id = :id"), {"id": i}).scalar() for i in ids]
+
+    @app.get("/widgets/n-plus-one")
+    def list_widgets_one_by_one():
+        with engine.connect() as conn:
+            return [
+                conn.execute(text("SELECT name FROM widgets WHERE id = :id"), {"id": i % 3 + 1}).scalar()
+                for i in range(N_PLUS_ONE_THRESHOLD)
+            ]
+
+    return app
+
+
+class TestFingerprint:
+    """Statements differing only in values share a fingerprint"""
+
+    def test_literals_and_parameters_stripped(self):
+        assert fingerprint("SELECT * FROM parts WHERE id = 42 AND name = 'O''Ring'") == \
+            "SELECT * FROM parts WHERE id = ? AND name = ?"
+        assert fingerprint("SELECT * FROM parts WHERE id = %(id_1)s") == fingerprint("SELECT * FROM parts WHERE id = :id")
+
+    def test_in_lists_collapsed(self):
+        assert fingerprint("SELECT * FROM parts WHERE id IN (1, 2, 3)") == \
+            fingerprint("SELECT * FROM parts WHERE id IN (%(id_1)s)")
+
+
+class TestQueryStatsMiddleware:
+    """Statement counts per request and N+1 flagging"""
+
+    def test_headers_report_statement_count(self, sqlite_engine):
+        client = TestClient(make_app(sqlite_engine))
+        response = client.get("/widgets")
+
+        assert response.json() == ["a", "b", "c"]
+        assert response.headers["x-db-query-count"] == "4"
+        assert response.headers["x-db-repeated-statements"] == "0"
+
+    def test_repeated_statement_flagged(self, sqlite_engine):
+        query_stats.reset()
+        client = TestClient(make_app(sqlite_engine))
+        client.get("/widgets")
+        response = client.get("/widgets/n-plus-one")
+
+        assert response.headers["x-db-repeated-statements"] == "1"
+        [route] = query_stats.n_plus_one_routes()
+        assert route["route"] == "/widgets/n-plus-one"
+        assert route["max_statements"] == N_PLUS_ONE_THRESHOLD
+        assert route["last_repeated_statements"][0]["fingerprint"] == "SELECT name FROM widgets WHERE id = ?"
+
+    def test_count_queries_without_request(self, sqlite_engine):
+        with count_queries(sqlite_engine) as stats:
+            with sqlite_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+        assert stats.statement_count == 2
+        assert stats.fingerprints == {"SELECT ?": 2}
+
+
+class TestAssertMaxQueries:
+    """assert_max_queries fixture against the application database"""
+
+    def test_parts_list_query_budget(self, client, auth_headers, test_parts, assert_max_queries):
+        with assert_max_queries(10) as stats:
+            response = client.get("/parts/", headers=auth_headers["super_admin"])
+        assert response.status_code == 200
+        assert stats.statement_count > 0
+
+    def test_budget_exceeded(self, db_session, assert_max_queries):
+        with pytest.raises(AssertionError, match="at most 1 SQL statements"):
+            with assert_max_queries(1):
+                for _ in range(3):
+                    db_session.execute(text("SELECT 1"))
@@ -0,0 +1,78 @@
+"""
+Tests for the benchmark suite's result summaries and baseline comparison.
+"""
+
+import json
+
+from .run_benchmarks import compare_results, main, summarize
+
+
+def make_run(scenarios, scale="1x"):
+    return {"scales": {scale: {"counts": {}, "scenarios": scenarios}}}
+
+
+def scenario(median_ms, statements=3):
+    return {"median_ms": median_ms, "p95_ms": median_ms, "min_ms": median_ms, "max_ms": median_ms,
+            "runs": 5, "statements": statements}
+
+
+class TestSummarize:
+    """Timing summaries of repeated runs"""
+
+    def test_median_and_p95(self):
+        summary = summarize([float(ms) for ms in range(20, 0, -1)])
+        assert summary["median_ms"] == 10.5
+        assert summary["p95_ms"] == 19.0
+        assert (summary["min_ms"], summary["max_ms"]) == (1.0, 20.0)
+
+
+class TestCompareResults:
+    """Regression detection against a stored baseline"""
+
+    def test_statuses(self):
+        baseline = make_run({
+            "parts.search": scenario(100.0),
+            "dashboard.metrics": scenario(100.0),
+            "machines.list": scenario(100.0),
+            "reports.valuation": scenario(100.0),
+            "stock.warehouse_balance": scenario(2.0),
+        })
+        current = make_run({
+            "parts.search": scenario(110.0),
+            "dashboard.metrics": scenario(140.0),
+            "machines.list": scenario(50.0),
+            "stock.warehouse_balance": scenario(4.0),
+            "transactions.search_by_part": scenario(5.0),
+        })
+
+        statuses = {row["scenario"]: row["status"] for row in compare_results(baseline, current, tolerance=0.25)}
+        assert statuses == {
+            "parts.search": "ok",
+            "dashboard.metrics": "regressed",
+            "machines.list": "improved",
+            "reports.valuation": "missing",
+            # Twice as slow, but within the noise floor
+            "stock.warehouse_balance": "ok",
+            "transactions.search_by_part": "new",
+        }
+
+    def test_extra_statements_regress(self):
+        rows = compare_results(make_run({"machines.list": scenario(100.0, statements=3)}),
+                               make_run({"machines.list": scenario(90.0, statements=103)}))
+        assert rows[0]["status"] == "regressed"
+
+    def test_scales_missing_from_run_skipped(self):
+        baseline = {"scales": {**make_run({"parts.search": scenario(10.0)})["scales"],
+                               **make_run({"parts.search": scenario(100.0)}, scale="100x")["scales"]}}
+        rows = compare_results(baseline, make_run({"parts.search": scenario(10.0)}))
+        assert [row["scale"] for row in rows] == ["1x"]
+
+    def test_compare_command_exit_code(self, tmp_path):
+        baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+        baseline.write_text(json.dumps(make_run({"parts.search": scenario(100.0)})))
+
+        current.write_text(json.dumps(make_run({"parts.search": scenario(105.0)})))
+        assert main(["compare", str(baseline), str(current)]) == 0
+
+        current.write_text(json.dumps(make_run({"parts.search": scenario(200.0)})))
+        assert main(["compare", str(baseline), str(current)]) == 1
@@ -0,0 +1,97 @@
+"""
+Tests for the slow SQL statement recorder.
+Covers aggregation by fingerprint, the bounded buffers, plan sampling and the
+EXPLAIN capture against the application database.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.slow_queries import SlowQueryLog, percentile, sequential_scans, slow_query_log
+
+
+@pytest.fixture
+def record_everything(monkeypatch):
+    """Treat every statement as slow for the duration of the test."""
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0.0)
+    slow_query_log.reset()
+    yield slow_query_log
+    slow_query_log.reset()
+
+
+class TestSlowQueryLog:
+    """Aggregation of slow executions"""
+
+    def test_grouped_by_fingerprint_with_p95(self):
+        log = SlowQueryLog(threshold_ms=0)
+        for duration in range(1, 21):
+            log.record(f"SELECT * FROM transactions WHERE part_id = {duration}", float(duration))
+
+        [offender] = log.top()
+        assert offender["fingerprint"] == "SELECT * FROM transactions WHERE part_id = ?"
+        assert offender["calls"] == 20
+        assert offender["p95_ms"] == 19.0
+        assert offender["max_ms"] == 20.0
+        assert log.recent_executions(limit=1)[0]["duration_ms"] == 20.0
+
+    def test_fingerprints_bounded(self):
+        log = SlowQueryLog(threshold_ms=0, max_fingerprints=2)
+        log.record("SELECT * FROM inventory", 500.0)
+        log.record("SELECT * FROM machine_hours", 10.0)
+        log.record("SELECT * FROM transactions", 300.0)
+
+        assert [row["fingerprint"] for row in log.top()] == [
+            "SELECT * FROM inventory", "SELECT * FROM transactions"
+        ]
+
+    def test_plans_sampled(self):
+        log = SlowQueryLog(threshold_ms=0, explain_interval=60)
+        assert log.record("SELECT * FROM inventory WHERE id = 1", 300.0) is True
+        assert log.record("SELECT * FROM inventory WHERE id = 2", 300.0) is False
+        assert log.record("COMMIT", 300.0) is False
+
+    def test_sequential_scans_found_in_plan(self):
+        plan = {"Plan": {"Node Type": "Hash Join", "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "machine_hours"},
+            {"Node Type": "Index Scan", "Relation Name": "machines"},
+        ]}}
+        assert sequential_scans(plan) == ["machine_hours"]
+        assert percentile([3.0], 0.95) == 3.0
+
+
+class TestSlowQueryCapture:
+    """Engine hooks and EXPLAIN capture"""
+
+    def test_statements_over_threshold_recorded(self, record_everything):
+        engine = create_engine("sqlite://")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        engine.dispose()
+
+        assert record_everything.top()[0]["fingerprint"] == "SELECT ?"
+        # Plans are only captured on PostgreSQL
+        assert record_everything.top()[0]["plan"] is None
+
+    def test_plan_captured_without_breaking_transaction(self, db_session, record_everything):
+        db_session.execute(text("SELECT * FROM transactions WHERE quantity > :quantity"), {"quantity": 5})
+        assert db_session.execute(text("SELECT 1")).scalar() == 1
+
+        offender = next(
+            row for row in record_everything.top(limit=200)
+            if row["fingerprint"] == "SELECT * FROM transactions WHERE quantity > ?"
+        )
+        assert offender["plan"]["Plan"]["Node Type"]
+        assert offender["plan_captured_at"] is not None
+
+    def test_monitoring_endpoint(self, client, auth_headers, record_everything):
+        client.get("/parts/", headers=auth_headers["super_admin"])
+
+        response = client.get("/monitoring/slow-queries?limit=5&include_plans=false",
+                              headers=auth_headers["super_admin"])
+        assert response.status_code == 200
+        body = response.json()
+        assert body["threshold_ms"] == 0.0
+        assert 0 < len(body["top"]) <= 5
+        assert "plan" not in body["top"][0]
+
+        assert client.get("/monitoring/slow-queries", headers=auth_headers["customer_user"]).status_code == 403
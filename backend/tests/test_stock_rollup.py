@@ -0,0 +1,149 @@
+"""
+Tests for the organization-wide stock rollup.
+Checks that warehouse_part_stock and organization_part_stock follow transactions
+and stock adjustments incrementally and agree with calculate_current_stock.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models import AdjustmentType
+from app.crud.inventory import get_inventory_aggregation_by_organization
+from app.crud.inventory_calculator import calculate_current_stock
+from app.crud.stock_rollup import rebuild_stock_rollup
+
+
+def add_transaction(db_session, part, quantity, user, to_warehouse=None, from_warehouse=None, when=None):
+    transaction = models.Transaction(
+        transaction_type="transfer" if to_warehouse and from_warehouse else ("creation" if to_warehouse else "consumption"),
+        part_id=part.id,
+        to_warehouse_id=to_warehouse.id if to_warehouse else None,
+        from_warehouse_id=from_warehouse.id if from_warehouse else None,
+        quantity=Decimal(quantity),
+        unit_of_measure=part.unit_of_measure,
+        performed_by_user_id=user.id,
+        transaction_date=when or datetime.utcnow()
+    )
+    db_session.add(transaction)
+    db_session.flush()
+    return transaction
+
+
+def rollup_for(db_session, organization, part):
+    rows = get_inventory_aggregation_by_organization(db_session, organization.id)
+    return next((row for row in rows if row['part_id'] == str(part.id)), None)
+
+
+class TestStockRollup:
+    """Incremental maintenance of the organization stock rollup"""
+
+    def test_transactions_update_rollup(self, db_session: Session, test_inventory, test_warehouses,
+                                        test_parts, test_users, test_organizations):
+        oraseas = test_organizations["oraseas"]
+        main, secondary = test_warehouses["oraseas_main"], test_warehouses["oraseas_secondary"]
+        oil_filter = test_parts["oil_filter"]
+        user = test_users["oraseas_admin"]
+
+        add_transaction(db_session, oil_filter, "30", user, to_warehouse=main)
+        row = rollup_for(db_session, oraseas, oil_filter)
+        assert row['total_stock'] == 30.0
+        assert row['warehouse_count'] == 1
+        assert row['total_minimum_stock'] == 20.0
+        assert row['is_low_stock'] is False
+
+        add_transaction(db_session, oil_filter, "25", user, from_warehouse=main, to_warehouse=secondary)
+        row = rollup_for(db_session, oraseas, oil_filter)
+        assert row['total_stock'] == 30.0
+        assert row['warehouse_count'] == 2
+
+        consumption = add_transaction(db_session, oil_filter, "20", user, from_warehouse=secondary)
+        row = rollup_for(db_session, oraseas, oil_filter)
+        assert row['total_stock'] == 10.0
+        assert row['is_low_stock'] is True
+
+        db_session.delete(consumption)
+        db_session.flush()
+        assert rollup_for(db_session, oraseas, oil_filter)['total_stock'] == 30.0
+
+        for warehouse in (main, secondary):
+            stock = db_session.get(models.WarehousePartStock, (warehouse.id, oil_filter.id)).stock
+            assert stock == calculate_current_stock(db_session, warehouse.id, oil_filter.id)
+
+    def test_adjustment_resets_baseline(self, db_session: Session, test_inventory, test_warehouses,
+                                        test_parts, test_users, test_organizations):
+        customer = test_organizations["customer1"]
+        warehouse = test_warehouses["customer1_main"]
+        oil_filter = test_parts["oil_filter"]
+        user = test_users["oraseas_admin"]
+
+        add_transaction(db_session, oil_filter, "40", user, to_warehouse=warehouse,
+                        when=datetime.utcnow() - timedelta(days=2))
+
+        adjustment = models.StockAdjustment(
+            warehouse_id=warehouse.id,
+            adjustment_type=AdjustmentType.stock_take,
+            user_id=user.id,
+            adjustment_date=datetime.utcnow() - timedelta(days=1),
+            total_items_adjusted=1
+        )
+        db_session.add(adjustment)
+        db_session.flush()
+        db_session.add(models.StockAdjustmentItem(
+            stock_adjustment_id=adjustment.id,
+            part_id=oil_filter.id,
+            quantity_before=Decimal("40"),
+            quantity_after=Decimal("12"),
+            quantity_change=Decimal("-28")
+        ))
+        db_session.flush()
+
+        assert rollup_for(db_session, customer, oil_filter)['total_stock'] == 12.0
+
+        db_session.delete(adjustment)
+        db_session.flush()
+        assert rollup_for(db_session, customer, oil_filter)['total_stock'] == 40.0
+
+    def test_future_dated_transaction_counts_right_away(self, db_session: Session, test_inventory,
+                                                        test_warehouses, test_parts, test_users,
+                                                        test_organizations):
+        oraseas = test_organizations["oraseas"]
+        oil_filter = test_parts["oil_filter"]
+        user = test_users["oraseas_admin"]
+
+        add_transaction(db_session, oil_filter, "30", user, to_warehouse=test_warehouses["oraseas_main"],
+                        when=datetime.utcnow() + timedelta(hours=2))
+
+        # Nothing else touches the key afterwards, so the rollup must already include it
+        assert rollup_for(db_session, oraseas, oil_filter)['total_stock'] == 30.0
+
+    def test_minimum_stock_change_updates_low_stock_flag(self, db_session: Session, test_inventory,
+                                                         test_parts, test_organizations):
+        customer = test_organizations["customer1"]
+        cleaning_oil = test_parts["cleaning_oil"]
+
+        assert rollup_for(db_session, customer, cleaning_oil)['is_low_stock'] is True
+
+        inventory = test_inventory["customer1_cleaning_oil"]
+        inventory.minimum_stock_recommendation = Decimal("0")
+        db_session.flush()
+
+        row = rollup_for(db_session, customer, cleaning_oil)
+        assert row['total_minimum_stock'] == 0.0
+        assert row['is_low_stock'] is True  # no stock history yet: 0 <= 0
+
+    def test_rebuild_matches_incremental(self, db_session: Session, test_inventory, test_warehouses,
+                                         test_parts, test_users, test_organizations):
+        oraseas = test_organizations["oraseas"]
+        user = test_users["oraseas_admin"]
+        add_transaction(db_session, test_parts["oil_filter"], "15", user, to_warehouse=test_warehouses["oraseas_main"])
+        add_transaction(db_session, test_parts["cleaning_oil"], "250", user, to_warehouse=test_warehouses["oraseas_main"])
+
+        incremental = get_inventory_aggregation_by_organization(db_session, oraseas.id)
+        rebuild_stock_rollup(db_session, oraseas.id)
+        rebuilt = get_inventory_aggregation_by_organization(db_session, oraseas.id)
+
+        assert rebuilt == incremental
+        assert [row['part_number'] for row in rebuilt] == sorted(row['part_number'] for row in rebuilt)
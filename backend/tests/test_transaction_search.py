@@ -0,0 +1,85 @@
+"""
+Tests for transaction search: joined warehouse/machine names and keyset pagination.
+"""
+
+import pytest
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.crud.transaction import (
+    search_transactions, search_transactions_page,
+    encode_transaction_cursor, decode_transaction_cursor
+)
+
+
+@pytest.fixture
+def transaction_history(db_session: Session, test_warehouses, test_parts, test_users):
+    """Twelve transfers one hour apart, two of them sharing a timestamp."""
+    base = datetime.utcnow() - timedelta(days=1)
+    transactions = []
+    for i in range(12):
+        transaction = models.Transaction(
+            transaction_type="transfer",
+            part_id=test_parts["oil_filter"].id,
+            from_warehouse_id=test_warehouses["oraseas_main"].id,
+            to_warehouse_id=test_warehouses["oraseas_secondary"].id,
+            quantity=Decimal("1"),
+            unit_of_measure="pieces",
+            performed_by_user_id=test_users["oraseas_admin"].id,
+            transaction_date=base + timedelta(hours=min(i, 10))
+        )
+        db_session.add(transaction)
+        transactions.append(transaction)
+    db_session.flush()
+    return transactions
+
+
+class TestTransactionSearch:
+    """Single-query transaction search"""
+
+    def test_results_include_joined_names(self, db_session: Session, transaction_history, test_warehouses):
+        results = search_transactions(db_session, schemas.TransactionFilter(), limit=5)
+
+        assert len(results) == 5
+        assert results[0]["from_warehouse_name"] == test_warehouses["oraseas_main"].name
+        assert results[0]["to_warehouse_name"] == test_warehouses["oraseas_secondary"].name
+        assert results[0]["machine_serial"] is None
+        assert results[0]["part_number"]
+
+    def test_keyset_pages_cover_history_without_overlap(self, db_session: Session, transaction_history):
+        seen = []
+        cursor = None
+        while True:
+            page = search_transactions_page(db_session, schemas.TransactionFilter(), limit=5, cursor=cursor)
+            seen.extend(item["id"] for item in page["items"])
+            if not page["has_more"]:
+                assert page["next_cursor"] is None
+                break
+            cursor = page["next_cursor"]
+
+        assert len(seen) == len(set(seen)) == 12
+        offset_order = [r["id"] for r in search_transactions(db_session, schemas.TransactionFilter(), limit=100)]
+        assert seen == offset_order
+
+    def test_organization_scope_is_applied_in_query(self, db_session: Session, transaction_history, test_warehouses):
+        other_org_only = [test_warehouses["customer1_main"].id]
+
+        page = search_transactions_page(db_session, schemas.TransactionFilter(), limit=5, warehouse_ids=other_org_only)
+
+        assert page["items"] == []
+        assert page["has_more"] is False
+
+    def test_either_side_warehouse_filter(self, db_session: Session, transaction_history, test_warehouses):
+        filters = schemas.TransactionFilter(warehouse_id=test_warehouses["oraseas_secondary"].id)
+
+        assert len(search_transactions(db_session, filters, limit=100)) == 12
+
+    def test_cursor_round_trip_and_invalid_cursor(self):
+        position = (datetime(2025, 3, 1, 12, 30), uuid.uuid4())
+
+        assert decode_transaction_cursor(encode_transaction_cursor(*position)) == position
+        with pytest.raises(ValueError):
+            decode_transaction_cursor("not-a-cursor")
@@ -0,0 +1,96 @@
+"""
+Tests for batched machine translation and the translation memory.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services.ai_translation_service import AITranslationService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """A translation service whose backend records every string it is sent."""
+    service = AITranslationService()
+    service.sent = []
+
+    def fake_translate(text, src_lang, dest_lang):
+        service.sent.append((text, dest_lang))
+        return f"{dest_lang}:{text}"
+
+    monkeypatch.setattr(service, "_translate_sync", fake_translate)
+    return service
+
+
+ITEMS = [
+    {'item_description': 'Check oil', 'notes': 'Use gloves', 'item_category': 'Engine'},
+    {'item_description': 'Check belts', 'notes': 'Use gloves', 'item_category': 'Engine'},
+]
+
+
+class TestTranslationMemory:
+    """Deduplication, memory reuse and incremental re-translation"""
+
+    def test_identical_strings_translated_once(self, service):
+        results = asyncio.run(service.translate_multiple_checklist_items(ITEMS, target_languages=['el', 'es']))
+
+        # 4 distinct strings x 2 languages, although the items hold 6 strings
+        assert len(service.sent) == 8
+        assert results[1]['el'] == {
+            'item_description': 'el:Check belts', 'notes': 'el:Use gloves', 'item_category': 'el:Engine'
+        }
+
+    def test_memory_reused_across_runs(self, service, db_session: Session):
+        asyncio.run(service.translate_multiple_checklist_items(ITEMS, target_languages=['el'], db=db_session))
+        assert db_session.query(models.TranslationMemory).count() == 4
+
+        service.sent.clear()
+        results = asyncio.run(service.translate_multiple_checklist_items(ITEMS, target_languages=['el'], db=db_session))
+        assert service.sent == []
+        assert results[0]['el']['item_description'] == 'el:Check oil'
+
+    def test_edited_item_only_sends_changed_string(self, service, db_session: Session):
+        asyncio.run(service.translate_multiple_checklist_items(ITEMS, target_languages=['el', 'es'], db=db_session))
+
+        service.sent.clear()
+        edited = [dict(ITEMS[0], item_description='Check oil level'), ITEMS[1]]
+        asyncio.run(service.translate_multiple_checklist_items(edited, target_languages=['el', 'es'], db=db_session))
+        assert sorted(service.sent) == [('Check oil level', 'el'), ('Check oil level', 'es')]
+
+    def test_failed_translations_not_remembered(self, service, db_session: Session, monkeypatch):
+        monkeypatch.setattr(service, "_translate_sync", lambda text, src, dest: None)
+        translations = asyncio.run(service.translate_protocol("Daily check", target_languages=['el'], db=db_session))
+        assert translations == {}
+        assert db_session.query(models.TranslationMemory).count() == 0
+
+    def test_memory_left_for_the_caller_to_commit(self, service, db_session: Session, monkeypatch):
+        monkeypatch.setattr(db_session, "commit", lambda: pytest.fail("translation memory committed the session"))
+
+        asyncio.run(service.translate_protocol("Daily check", target_languages=['el'], db=db_session))
+
+        assert db_session.query(models.TranslationMemory).count() == 1
+
+
+class TestTranslationAvailability:
+    """Availability probe"""
+
+    def test_probe_runs_off_the_event_loop_and_is_cached(self, service):
+        translate = service._translate_sync
+        probe_threads = []
+
+        def probe(text, src_lang, dest_lang):
+            probe_threads.append(threading.get_ident())
+            return translate(text, src_lang, dest_lang)
+
+        service._translate_sync = probe
+
+        async def check_twice():
+            return await service.is_translation_available(), await service.is_translation_available()
+
+        assert asyncio.run(check_twice()) == (True, True)
+        assert len(probe_threads) == 1
+        assert probe_threads[0] != threading.get_ident()
@@ -0,0 +1,69 @@
+// frontend/src/components/VersionedImage.js
+
+import React, { useEffect, useState } from 'react';
+import { API_BASE_URL } from '../services/api';
+
+// Object URLs keyed by versioned path, shared across components so a logo
+// shown in several places is fetched once per version
+const objectUrls = new Map();
+
+const fetchObjectUrl = (path) => {
+  if (!objectUrls.has(path)) {
+    const token = localStorage.getItem('authToken');
+    const promise = fetch(`${API_BASE_URL}${path}`, {
+      headers: token ? { 'Authorization': `Bearer ${token}` } : {}
+    })
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Image request failed with status ${response.status}`);
+        }
+        return response.blob();
+      })
+      .then((blob) => URL.createObjectURL(blob))
+      .catch((error) => {
+        objectUrls.delete(path);
+        throw error;
+      });
+    objectUrls.set(path, promise);
+  }
+  return objectUrls.get(path);
+};
+
+/**
+ * Displays an authenticated image endpoint (organization logo, profile photo)
+ * identified by its content version, e.g.
+ * <VersionedImage path={`/images/organizations/${org.id}/logo`} version={org.logo_version} />
+ * The version makes the URL immutable, so the browser and this component can cache it.
+ */
+const VersionedImage = ({ path, version, alt, className, fallback = null }) => {
+  const [src, setSrc] = useState(null);
+  const [failed, setFailed] = useState(false);
+
+  useEffect(() => {
+    if (!version) {
+      setSrc(null);
+      return undefined;
+    }
+
+    let cancelled = false;
+    setFailed(false);
+    fetchObjectUrl(`${path}?v=${encodeURIComponent(version)}`)
+      .then((url) => {
+        if (!cancelled) setSrc(url);
+      })
+      .catch(() => {
+        if (!cancelled) setFailed(true);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [path, version]);
+
+  if (!version || failed) return fallback;
+  if (!src) return fallback;
+
+  return <img src={src} alt={alt} className={className} />;
+};
+
+export default VersionedImage;
@@ -598,6 +598,48 @@ export async function markExecutionAsSynced(tempId, serverId) {
   }
 }
 
+/**
+ * Random UUID v4 (crypto.randomUUID is only available in secure contexts)
+ */
+function generateClientId() {
+  if (crypto.randomUUID) {
+    return crypto.randomUUID();
+  }
+  const bytes = crypto.getRandomValues(new Uint8Array(16));
+  bytes[6] = (bytes[6] & 0x0f) | 0x40;
+  bytes[8] = (bytes[8] & 0x3f) | 0x80;
+  const hex = Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
+
+/**
+ * Give offline items (and their checklist completions) a stable clientId.
+ * The server uses it as the row id during bulk replay, so a retried sync
+ * updates the same rows instead of creating duplicates.
+ */
+export async function assignClientIds(storeName, items) {
+  const db = await getDB();
+
+  for (const item of items) {
+    let changed = false;
+    if (!item.clientId) {
+      item.clientId = generateClientId();
+      changed = true;
+    }
+    for (const completion of item.checklist_completions || []) {
+      if (!completion.clientId) {
+        completion.clientId = generateClientId();
+        changed = true;
+      }
+    }
+    if (changed) {
+      await db.put(storeName, item);
+    }
+  }
+
+  return items;
+}
+
 // ============================================================================
 // SYNC QUEUE OPERATIONS
 // ============================================================================
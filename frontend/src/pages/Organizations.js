@@ -5,6 +5,7 @@ import { organizationsService, OrganizationType } from '../services/organization
 import { useAuth } from '../AuthContext';
 import Modal from '../components/Modal';
 import OrganizationForm from '../components/OrganizationForm';
+import VersionedImage from '../components/VersionedImage';
 import PermissionGuard from '../components/PermissionGuard';
 import { PERMISSIONS } from '../utils/permissions';
 import { useTranslation } from '../hooks/useTranslation';
@@ -121,9 +122,18 @@ const Organizations = () => {
     }
   };
 
-  const openModal = (org = null) => {
+  const openModal = async (org = null) => {
     setEditingOrganization(org);
     setShowModal(true);
+    if (org?.logo_version) {
+      // List payloads carry only logo_version; the detail response includes the logo for the form preview
+      try {
+        const detail = await organizationsService.getOrganization(org.id);
+        setEditingOrganization(current => (current && current.id === org.id ? detail : current));
+      } catch (err) {
+        // Keep the list data; the form still works without a logo preview
+      }
+    }
   };
 
   const closeModal = () => {
@@ -321,20 +331,17 @@ const Organizations = () => {
                   <div className="flex items-start justify-between mb-3">
                     <div className="flex items-center space-x-3 flex-1">
                       {/* Organization Logo */}
-                      {org.logo_data_url ? (
-                        <img
-                          src={org.logo_data_url}
-                          alt={`${org.name} logo`}
-                          className="w-12 h-12 rounded-lg object-contain border border-gray-200 bg-white flex-shrink-0"
-                          onError={(e) => {
-                            e.target.style.display = 'none';
-                          }}
-                        />
-                      ) : (
-                        <div className="w-12 h-12 rounded-lg bg-gray-100 flex items-center justify-center flex-shrink-0 border border-gray-200">
-                          <span className="text-gray-400 text-xs">{t('organizations.noLogo')}</span>
-                        </div>
-                      )}
+                      <VersionedImage
+                        path={`/images/organizations/${org.id}/logo`}
+                        version={org.logo_version}
+                        alt={`${org.name} logo`}
+                        className="w-12 h-12 rounded-lg object-contain border border-gray-200 bg-white flex-shrink-0"
+                        fallback={
+                          <div className="w-12 h-12 rounded-lg bg-gray-100 flex items-center justify-center flex-shrink-0 border border-gray-200">
+                            <span className="text-gray-400 text-xs">{t('organizations.noLogo')}</span>
+                          </div>
+                        }
+                      />
                       <h3 className="text-xl font-semibold text-gray-900">{org.name}</h3>
                     </div>
                     <span className="text-2xl">{config.icon}</span>
@@ -102,11 +102,16 @@ const confirmCustomerOrderReceipt = (orderId, receiptData) => {
 
 /**
  * Checks stock availability for pending/requested customer orders.
- * Returns orders that cannot be fully fulfilled due to insufficient stock.
+ * Stock is allocated to orders oldest first; returns orders that cannot be fully
+ * fulfilled due to insufficient stock.
  * Only available to Oraseas EE organization users and super admins.
+ * @param {string[]} [supplierOrderIds] Supplier orders to project as already received.
  */
-const checkStockAvailability = () => {
-  return api.get('/customer_orders/stock-availability/check');
+const checkStockAvailability = (supplierOrderIds = []) => {
+  const params = new URLSearchParams();
+  supplierOrderIds.forEach(id => params.append('supplier_order_id', id));
+  const query = params.toString();
+  return api.get(`/customer_orders/stock-availability/check${query ? `?${query}` : ''}`);
 };
 
 /**
@@ -16,11 +16,14 @@ import {
   markPhotoAsSynced,
   getUnsyncedMaintenanceExecutions,
   markExecutionAsSynced,
+  assignClientIds,
+  STORES,
 } from '../db/indexedDB';
 
 const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000';
 const MAX_RETRIES = 3;
 const RETRY_DELAY = 2000; // 2 seconds between retries
+const MAX_REPLAY_ITEMS = 1000; // Per list in one /sync/replay request (MAX_REPLAY_ITEMS in backend/app/schemas/sync.py)
 
 /**
  * Main sync function - processes all pending operations
@@ -46,19 +49,12 @@ export async function processSync() {
       return results;
     }
     
-    // Process net cleaning records first (they're the priority)
-    const netCleaningResults = await syncNetCleaningRecords(token);
-    results.total += netCleaningResults.total;
-    results.succeeded += netCleaningResults.succeeded;
-    results.failed += netCleaningResults.failed;
-    results.errors.push(...netCleaningResults.errors);
-    
-    // Process maintenance executions
-    const maintenanceResults = await syncMaintenanceExecutions(token);
-    results.total += maintenanceResults.total;
-    results.succeeded += maintenanceResults.succeeded;
-    results.failed += maintenanceResults.failed;
-    results.errors.push(...maintenanceResults.errors);
+    // Replay offline net cleaning records and maintenance executions in one request
+    const replayResults = await replayOfflineWork(token);
+    results.total += replayResults.total;
+    results.succeeded += replayResults.succeeded;
+    results.failed += replayResults.failed;
+    results.errors.push(...replayResults.errors);
     
     // Process sync queue operations
     const queueResults = await processSyncQueue(token);
@@ -78,12 +74,51 @@ export async function processSync() {
 }
 
 /**
- * Sync net cleaning records from IndexedDB
+ * Build the replay requests for the queued work. The server accepts at most
+ * MAX_REPLAY_ITEMS items per list, so larger queues are split over several
+ * batches; an execution always travels in the same batch as its completions.
+ * 
+ * @param {Array} records - Unsynced net cleaning records with clientIds
+ * @param {Array} executions - Unsynced maintenance executions with clientIds
+ * @returns {Array<Object>} Batches of { records, executions }
+ */
+function buildReplayBatches(records, executions) {
+  const batches = [];
+  let current = null;
+  
+  for (const execution of executions) {
+    const completions = (execution.checklist_completions || []).length;
+    if (!current || current.executions.length >= MAX_REPLAY_ITEMS ||
+        (current.executions.length > 0 && current.completionCount + completions > MAX_REPLAY_ITEMS)) {
+      current = { records: [], executions: [], completionCount: 0 };
+      batches.push(current);
+    }
+    current.executions.push(execution);
+    current.completionCount += completions;
+  }
+  
+  for (let start = 0; start < records.length; start += MAX_REPLAY_ITEMS) {
+    const index = start / MAX_REPLAY_ITEMS;
+    if (!batches[index]) {
+      batches.push({ records: [], executions: [], completionCount: 0 });
+    }
+    batches[index].records = records.slice(start, start + MAX_REPLAY_ITEMS);
+  }
+  
+  return batches;
+}
+
+/**
+ * Replay offline net cleaning records and maintenance executions (with their
+ * checklist completions), in as few requests as the server's batch limit
+ * allows. Every item is sent with a stable clientId, so if a response is lost
+ * the next sync simply updates the same server rows. Items are marked synced
+ * batch by batch, so one failing batch does not hold back the others.
  * 
  * @param {string} token - Auth token
  * @returns {Promise<Object>} Sync results
  */
-async function syncNetCleaningRecords(token) {
+async function replayOfflineWork(token) {
   const results = {
     total: 0,
     succeeded: 0,
@@ -92,40 +127,23 @@ async function syncNetCleaningRecords(token) {
   };
   
   try {
-    // Get all unsynced records
-    const records = await getUnsyncedNetCleaningRecords();
-    results.total = records.length;
+    const records = await assignClientIds(STORES.NET_CLEANING_RECORDS, await getUnsyncedNetCleaningRecords());
+    const executions = await assignClientIds(STORES.MAINTENANCE_EXECUTIONS, await getUnsyncedMaintenanceExecutions());
+    results.total = records.length + executions.length;
     
-    // console.log(`[SyncProcessor] Syncing ${records.length} net cleaning records...`);
-    
-    for (const record of records) {
+    for (const batch of buildReplayBatches(records, executions)) {
       try {
-        // Sync the main record
-        const serverId = await syncSingleNetCleaningRecord(record, token);
-        
-        if (serverId) {
-          // Mark record as synced
-          await markRecordAsSynced(record.tempId, serverId);
-          
-          // Sync photos for this record
-          await syncPhotosForRecord(record.tempId, serverId, token);
-          
-          results.succeeded++;
-          // console.log(`[SyncProcessor] Synced record ${record.tempId} -> ${serverId}`);
-        } else {
-          results.failed++;
-          results.errors.push(`Failed to sync record ${record.tempId}`);
-        }
-        
+        await replayBatch(batch, token, results);
       } catch (error) {
-        console.error(`[SyncProcessor] Failed to sync record ${record.tempId}:`, error);
-        results.failed++;
-        results.errors.push(`Record ${record.tempId}: ${error.message}`);
+        console.error('[SyncProcessor] Failed to replay offline work:', error);
+        results.failed += batch.records.length + batch.executions.length;
+        results.errors.push(error.message);
       }
     }
     
   } catch (error) {
-    console.error('[SyncProcessor] Failed to sync net cleaning records:', error);
+    console.error('[SyncProcessor] Failed to replay offline work:', error);
+    results.failed = results.total - results.succeeded;
     results.errors.push(error.message);
   }
   
@@ -133,37 +151,81 @@ async function syncNetCleaningRecords(token) {
 }
 
 /**
- * Sync a single net cleaning record
+ * Send one replay batch and mark the items the server accepted as synced
  * 
- * @param {Object} record - Record data
+ * @param {Object} batch - { records, executions } from buildReplayBatches
  * @param {string} token - Auth token
- * @returns {Promise<string|null>} Server ID or null if failed
+ * @param {Object} results - Sync results to update
+ * @returns {Promise<void>}
  */
-async function syncSingleNetCleaningRecord(record, token) {
-  try {
-    // Prepare data for API (remove temp fields)
-    const { tempId, synced, timestamp, ...apiData } = record;
-    
-    const response = await fetch(`${API_BASE_URL}/net-cleaning-records/`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${token}`,
-      },
-      body: JSON.stringify(apiData),
-    });
-    
-    if (!response.ok) {
-      const error = await response.json();
-      throw new Error(error.detail || 'Failed to create record');
+async function replayBatch({ records, executions }, token, results) {
+  const body = {
+    executions: executions.map(({ clientId, tempId, synced, timestamp, protocol, machine, checklist_completions, organization_id, created_at, completed_at, ...apiData }) => ({
+      ...apiData,
+      id: clientId,
+    })),
+    checklist_completions: executions.flatMap((execution) =>
+      (execution.checklist_completions || []).map((completion) => ({
+        id: completion.clientId,
+        execution_id: execution.clientId,
+        checklist_item_id: completion.checklist_item_id,
+        status: completion.status,
+        notes: completion.notes,
+        completed_at: completion.completed_at,
+      }))
+    ),
+    net_cleaning_records: records.map(({ clientId, tempId, synced, timestamp, ...apiData }) => ({
+      ...apiData,
+      id: clientId,
+    })),
+  };
+  
+  const response = await fetch(`${API_BASE_URL}/sync/replay`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Authorization': `Bearer ${token}`,
+    },
+    body: JSON.stringify(body),
+  });
+  
+  if (!response.ok) {
+    const error = await response.json().catch(() => ({}));
+    throw new Error(error.detail || 'Failed to replay offline work');
+  }
+  
+  const data = await response.json();
+  const resultsById = new Map(data.results.map((result) => [result.id, result]));
+  
+  for (const record of records) {
+    const result = resultsById.get(record.clientId);
+    if (result && result.status !== 'rejected') {
+      await markRecordAsSynced(record.tempId, result.server_id);
+      await syncPhotosForRecord(record.tempId, result.server_id, token);
+      results.succeeded++;
+    } else {
+      results.failed++;
+      results.errors.push(`Record ${record.tempId}: ${result ? result.detail : 'No result returned'}`);
+    }
+  }
+  
+  for (const execution of executions) {
+    const result = resultsById.get(execution.clientId);
+    if (result && result.status !== 'rejected') {
+      await markExecutionAsSynced(execution.tempId, result.server_id);
+      results.succeeded++;
+    } else {
+      results.failed++;
+      results.errors.push(`Execution ${execution.tempId}: ${result ? result.detail : 'No result returned'}`);
     }
     
-    const data = await response.json();
-    return data.id;
-    
-  } catch (error) {
-    console.error('[SyncProcessor] Failed to sync record:', error);
-    throw error;
+    // A rejected completion does not hold back its execution
+    for (const completion of execution.checklist_completions || []) {
+      const completionResult = resultsById.get(completion.clientId);
+      if (completionResult && completionResult.status === 'rejected') {
+        console.error(`[SyncProcessor] Checklist completion rejected: ${completionResult.detail}`);
+      }
+    }
   }
 }
 
@@ -197,160 +259,6 @@ async function syncPhotosForRecord(recordTempId, serverId, token) {
   }
 }
 
-/**
- * Sync maintenance executions from IndexedDB
- * 
- * @param {string} token - Auth token
- * @returns {Promise<Object>} Sync results
- */
-async function syncMaintenanceExecutions(token) {
-  const results = {
-    total: 0,
-    succeeded: 0,
-    failed: 0,
-    errors: [],
-  };
-  
-  try {
-    // Get all unsynced executions
-    const executions = await getUnsyncedMaintenanceExecutions();
-    results.total = executions.length;
-    
-    // console.log(`[SyncProcessor] Syncing ${executions.length} maintenance executions...`);
-    
-    for (const execution of executions) {
-      try {
-        // Sync the execution
-        const serverId = await syncSingleMaintenanceExecution(execution, token);
-        
-        if (serverId) {
-          // Mark execution as synced
-          await markExecutionAsSynced(execution.tempId, serverId);
-          
-          results.succeeded++;
-          // console.log(`[SyncProcessor] Synced execution ${execution.tempId} -> ${serverId}`);
-        } else {
-          results.failed++;
-          results.errors.push(`Failed to sync execution ${execution.tempId}`);
-        }
-        
-      } catch (error) {
-        console.error(`[SyncProcessor] Failed to sync execution ${execution.tempId}:`, error);
-        results.failed++;
-        results.errors.push(`Execution ${execution.tempId}: ${error.message}`);
-      }
-    }
-    
-  } catch (error) {
-    console.error('[SyncProcessor] Failed to sync maintenance executions:', error);
-    results.errors.push(error.message);
-  }
-  
-  return results;
-}
-
-/**
- * Sync a single maintenance execution
- * 
- * @param {Object} execution - Execution data
- * @param {string} token - Auth token
- * @returns {Promise<string|null>} Server ID or null if failed
- */
-async function syncSingleMaintenanceExecution(execution, token) {
-  try {
-    // Prepare data for API (remove temp fields, nested objects, and checklist_completions)
-    // Keep status, protocol_id, machine_id, machine_hours_at_service, etc.
-    const { tempId, synced, timestamp, protocol, machine, checklist_completions, organization_id, created_at, completed_at, ...apiData } = execution;
-    
-    // console.log('[SyncProcessor] Syncing execution with data:', apiData);
-    
-    // Create execution with the correct status
-    const response = await fetch(`${API_BASE_URL}/maintenance-protocols/executions`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'Authorization': `Bearer ${token}`,
-      },
-      body: JSON.stringify(apiData),
-    });
-    
-    if (!response.ok) {
-      const errorText = await response.text();
-      console.error('[SyncProcessor] Server error response:', errorText);
-      let errorDetail;
-      try {
-        const errorJson = JSON.parse(errorText);
-        errorDetail = errorJson.detail || errorText;
-      } catch {
-        errorDetail = errorText;
-      }
-      throw new Error(errorDetail || 'Failed to create execution');
-    }
-    
-    const data = await response.json();
-    const executionId = data.id;
-    
-    // console.log(`[SyncProcessor] Created execution ${executionId} with status: ${apiData.status}`);
-    
-    // Sync checklist completions if any
-    if (checklist_completions && checklist_completions.length > 0) {
-      // console.log(`[SyncProcessor] Syncing ${checklist_completions.length} checklist completions...`);
-      for (const completion of checklist_completions) {
-        try {
-          await syncChecklistCompletion(executionId, completion, token);
-          // console.log(`[SyncProcessor] Synced checklist item ${completion.checklist_item_id}`);
-        } catch (error) {
-          console.error(`[SyncProcessor] Failed to sync checklist completion:`, error);
-          // Continue with other completions
-        }
-      }
-    }
-    
-    return executionId;
-    
-  } catch (error) {
-    console.error('[SyncProcessor] Failed to sync execution:', error);
-    throw error;
-  }
-}
-
-/**
- * Sync a single checklist completion
- * 
- * @param {string} executionId - Server execution ID
- * @param {Object} completion - Completion data
- * @param {string} token - Auth token
- * @returns {Promise<void>}
- */
-async function syncChecklistCompletion(executionId, completion, token) {
-  try {
-    const response = await fetch(
-      `${API_BASE_URL}/maintenance-protocols/executions/${executionId}/checklist/${completion.checklist_item_id}/complete`,
-      {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': `Bearer ${token}`,
-        },
-        body: JSON.stringify({
-          status: completion.status,
-          notes: completion.notes,
-          actual_quantity_used: completion.actual_quantity_used,
-        }),
-      }
-    );
-    
-    if (!response.ok) {
-      const error = await response.json();
-      throw new Error(error.detail || 'Failed to sync checklist completion');
-    }
-    
-  } catch (error) {
-    console.error('[SyncProcessor] Failed to sync checklist completion:', error);
-    throw error;
-  }
-}
-
 /**
  * Sync a single photo
  * 
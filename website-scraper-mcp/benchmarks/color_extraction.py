@@ -0,0 +1,109 @@
+"""Benchmark dominant color extraction on large full-page screenshots.
+
+Compares the in-memory NumPy engine with the previous ColorThief path (write
+the screenshot to a temporary file, then ColorThief.get_palette with
+quality=10) on synthetic screenshots of increasing height.
+
+Usage:
+    python benchmarks/color_extraction.py [--repeat 3] [--colors 15]
+
+ColorThief is optional; without it only the engine is timed.
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+from PIL import Image, ImageDraw
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from website_scraper_mcp.color_engine import dominant_colors
+
+try:
+    import colorthief
+except ImportError:
+    colorthief = None
+
+SIZES = [(1280, 2000), (1280, 8000), (1920, 16000)]
+PALETTE = [
+    (248, 249, 250), (33, 37, 41), (13, 110, 253), (25, 135, 84),
+    (220, 53, 69), (255, 193, 7), (108, 117, 125), (111, 66, 193),
+]
+
+
+def make_screenshot(width: int, height: int, seed: int = 0) -> bytes:
+    """A page-like PNG: header, content blocks, text-like stripes and a footer."""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), PALETTE[0])
+    draw = ImageDraw.Draw(img)
+
+    draw.rectangle((0, 0, width, 90), fill=PALETTE[1])
+    y = 120
+    while y < height - 200:
+        block = rng.randint(150, 500)
+        draw.rectangle((40, y, width - 40, y + block), fill=rng.choice(PALETTE[2:]))
+        for line in range(y + 20, y + block - 20, 24):
+            draw.rectangle((60, line, rng.randint(200, width - 60), line + 10), fill=PALETTE[1])
+        y += block + rng.randint(20, 80)
+    draw.rectangle((0, height - 160, width, height), fill=PALETTE[6])
+
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def colorthief_path(image_data: bytes, num_colors: int) -> List[str]:
+    """The extraction path ImageProcessor used before the color engine."""
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
+        temp_path = temp_file.name
+        temp_file.write(image_data)
+    try:
+        palette = colorthief.ColorThief(temp_path).get_palette(color_count=num_colors, quality=10)
+    finally:
+        os.unlink(temp_path)
+    return ["#{:02x}{:02x}{:02x}".format(*rgb) for rgb in palette]
+
+
+def time_it(func: Callable[[], List[str]], repeat: int) -> float:
+    """Median wall time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dominant color extraction")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--colors", type=int, default=15, help="Palette size")
+    args = parser.parse_args(argv)
+
+    if colorthief is None:
+        print("colorthief is not installed; timing the engine only")
+
+    print(f"{'size':>12} {'png MB':>7} {'engine ms':>10} {'colorthief ms':>14} {'speedup':>8}")
+    for width, height in SIZES:
+        image = make_screenshot(width, height)
+        engine_ms = time_it(lambda: dominant_colors(image, args.colors), args.repeat)
+
+        if colorthief is not None:
+            colorthief_ms = time_it(lambda: colorthief_path(image, args.colors), args.repeat)
+            comparison = f"{colorthief_ms:>14.1f} {colorthief_ms / engine_ms:>7.1f}x"
+        else:
+            comparison = f"{'-':>14} {'-':>8}"
+
+        print(f"{width:>5}x{height:<6} {len(image) / 1e6:>7.2f} {engine_ms:>10.1f} {comparison}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Tests for the dominant color engine."""
+
+import io
+import os
+import sys
+import unittest
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from website_scraper_mcp.color_engine import (
+    ColorExtractionEngine,
+    dominant_colors,
+    load_pixels,
+    median_cut,
+)
+
+
+def make_png(width, height, bands, mode="RGB"):
+    """Encode an image made of horizontal bands of (color, share of height)."""
+    img = Image.new(mode, (width, height))
+    top = 0
+    for color, share in bands:
+        bottom = top + round(height * share)
+        img.paste(color, (0, top, width, bottom))
+        top = bottom
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestColorEngine(unittest.TestCase):
+    """Test the in-memory color quantization."""
+
+    def test_dominant_colors_ordered_by_frequency(self):
+        """Test that band colors come back most frequent first."""
+        image = make_png(200, 400, [((200, 16, 16), 0.5), ((16, 200, 16), 0.3), ((16, 16, 200), 0.2)])
+
+        colors = dominant_colors(image, num_colors=3)
+
+        self.assertEqual(colors, ["#cc1414", "#14cc14", "#1414cc"])
+
+    def test_large_images_are_downsampled(self):
+        """Test that a full-page sized image is reduced before quantization."""
+        image = make_png(1280, 8000, [((40, 40, 40), 0.7), ((230, 120, 20), 0.3)])
+
+        pixels = load_pixels(image, max_pixels=50_000)
+
+        self.assertLessEqual(len(pixels), 50_000)
+        self.assertEqual(dominant_colors(image, num_colors=2), ["#2c2c2c", "#e47c14"])
+
+    def test_transparent_and_white_pixels_ignored(self):
+        """Test that transparent and near-white pixels do not count."""
+        image = make_png(
+            100, 100,
+            [((255, 255, 255, 255), 0.6), ((0, 0, 0, 0), 0.3), ((10, 90, 170, 255), 0.1)],
+            mode="RGBA",
+        )
+
+        self.assertEqual(dominant_colors(image, num_colors=4), ["#0c5cac"])
+
+    def test_median_cut_edge_cases(self):
+        """Test empty input and single-color input."""
+        self.assertEqual(median_cut(np.empty((0, 3), dtype=np.uint8), 5), [])
+
+        palette = median_cut(np.full((10, 3), 100, dtype=np.uint8), 5)
+        self.assertEqual(len(palette), 1)
+        self.assertEqual(palette[0][1], 10)
+
+
+class TestColorExtractionEngine(unittest.IsolatedAsyncioTestCase):
+    """Test running extraction in the process pool."""
+
+    async def test_extract_in_process_pool(self):
+        """Test that extraction runs in a worker process and returns colors."""
+        engine = ColorExtractionEngine(max_workers=1)
+        try:
+            image = make_png(50, 50, [((200, 16, 16), 1.0)])
+            self.assertEqual(await engine.extract(image, num_colors=2), ["#cc1414"])
+        finally:
+            engine.shutdown()
+
+
+if __name__ == "__main__":
+    # Run tests
+    unittest.main()
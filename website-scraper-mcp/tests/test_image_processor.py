@@ -110,46 +110,20 @@ class TestImageProcessor(unittest.TestCase):
         self.assertIsNotNone(result["error"])
         self.assertIn("Error processing data URL", result["error"])
 
-    @patch("colorthief.ColorThief")
-    @patch("tempfile.NamedTemporaryFile")
-    async def test_extract_dominant_colors(self, mock_temp_file, mock_color_thief):
+    async def test_extract_dominant_colors(self):
         """Test extracting dominant colors from an image."""
-        # Mock temporary file
-        mock_temp = MagicMock()
-        mock_temp.name = "/tmp/test.png"
-        mock_temp_file.return_value.__enter__.return_value = mock_temp
+        # Mock the color engine
+        self.processor.color_engine = MagicMock()
+        self.processor.color_engine.extract = AsyncMock(return_value=["#ff0000", "#00ff00", "#0000ff"])
         
-        # Mock ColorThief
-        mock_ct_instance = MagicMock()
-        mock_ct_instance.get_palette.return_value = [
-            (255, 0, 0),
-            (0, 255, 0),
-            (0, 0, 255),
-        ]
-        mock_color_thief.return_value = mock_ct_instance
+        # Call extract_dominant_colors
+        colors = await self.processor.extract_dominant_colors(b"image_data", num_colors=3)
         
-        # Mock os.unlink
-        with patch("os.unlink") as mock_unlink:
-            # Call extract_dominant_colors
-            colors = await self.processor.extract_dominant_colors(b"image_data", num_colors=3)
-        
-        # Verify temporary file was written
-        mock_temp.write.assert_called_once_with(b"image_data")
-        
-        # Verify ColorThief was created with correct path
-        mock_color_thief.assert_called_once_with("/tmp/test.png")
-        
-        # Verify get_palette was called with correct parameters
-        mock_ct_instance.get_palette.assert_called_once_with(color_count=3, quality=10)
-        
-        # Verify temporary file was deleted
-        mock_unlink.assert_called_once_with("/tmp/test.png")
+        # Verify the engine was called with the image bytes
+        self.processor.color_engine.extract.assert_called_once_with(b"image_data", num_colors=3)
         
         # Verify result
-        self.assertEqual(len(colors), 3)
-        self.assertEqual(colors[0], "#ff0000")
-        self.assertEqual(colors[1], "#00ff00")
-        self.assertEqual(colors[2], "#0000ff")
+        self.assertEqual(colors, ["#ff0000", "#00ff00", "#0000ff"])
 
     async def test_close(self):
         """Test closing the HTTP session."""
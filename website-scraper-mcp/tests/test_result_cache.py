@@ -0,0 +1,72 @@
+"""Tests for the scraping result cache."""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from website_scraper_mcp.cache import ResultCache
+from website_scraper_mcp.models import ScrapingResult
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the ResultCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is evicted over the size cap."""
+        cache = ResultCache(max_entries=2)
+        cache.set("a", ScrapingResult(url="https://a.example"))
+        cache.set("b", ScrapingResult(url="https://b.example"))
+
+        # Touch "a" so "b" becomes least recently used
+        self.assertIsNotNone(cache.get("a"))
+        cache.set("c", ScrapingResult(url="https://c.example"))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are not returned."""
+        cache = ResultCache()
+        cache.set("a", ScrapingResult(url="https://a.example"))
+        self.assertIsNotNone(cache.get("a", ttl=60))
+
+        timestamp, result = cache._entries["a"]
+        cache._entries["a"] = (timestamp - timedelta(seconds=120), result)
+        self.assertIsNone(cache.get("a", ttl=60))
+
+    def test_persists_across_instances(self):
+        """Test that results written to disk are loaded by a new cache."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ResultCache(max_entries=2, cache_dir=cache_dir)
+            cache.set("a", ScrapingResult(url="https://a.example", metadata={"title": "A"}))
+            cache.set("b", ScrapingResult(url="https://b.example"))
+            cache.set("c", ScrapingResult(url="https://c.example"))
+
+            # The evicted entry is removed from disk as well
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+            reloaded = ResultCache(max_entries=2, cache_dir=cache_dir)
+            self.assertNotIn("a", reloaded)
+            self.assertEqual(reloaded.get("c").url, "https://c.example")
+
+    def test_discards_unreadable_files(self):
+        """Test that corrupt cache files are ignored and removed."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with open(os.path.join(cache_dir, "broken.json"), "w") as f:
+                f.write("{not json")
+
+            cache = ResultCache(cache_dir=cache_dir)
+            self.assertEqual(len(cache), 0)
+            self.assertEqual(os.listdir(cache_dir), [])
+
+
+if __name__ == "__main__":
+    # Run tests
+    unittest.main()
@@ -44,7 +44,7 @@ class TestScrapingOrchestrator(unittest.TestCase):
         
         # Add to cache
         cache_key = self.orchestrator._get_cache_key(request)
-        self.orchestrator._cache[cache_key] = (datetime.now(), cached_result)
+        self.orchestrator._cache.set(cache_key, cached_result)
         
         # Call scrape
         result = await self.orchestrator.scrape(request)
@@ -65,8 +65,7 @@ class TestScrapingOrchestrator(unittest.TestCase):
         
         # Mock _setup_browser_and_navigate
         browser_data = {
-            "browser": MagicMock(),
-            "context": MagicMock(),
+            "context": AsyncMock(),
             "page": MagicMock(),
             "soup": MagicMock(),
             "metadata": {"title": "Example"},
@@ -102,8 +101,8 @@ class TestScrapingOrchestrator(unittest.TestCase):
         self.orchestrator.color_extractor.extract.assert_called_once()
         self.orchestrator.ui_style_extractor.extract.assert_called_once()
         
-        # Verify browser was closed
-        browser_data["browser"].close.assert_called_once()
+        # Verify the context was closed
+        browser_data["context"].close.assert_called_once()
         
         # Verify result
         self.assertEqual(result.url, "https://example.com")
@@ -116,9 +115,7 @@ class TestScrapingOrchestrator(unittest.TestCase):
         
         # Verify result was cached
         cache_key = self.orchestrator._get_cache_key(request)
-        self.assertIn(cache_key, self.orchestrator._cache)
-        cached_timestamp, cached_result = self.orchestrator._cache[cache_key]
-        self.assertEqual(cached_result, result)
+        self.assertEqual(self.orchestrator._cache.get(cache_key), result)
 
     async def test_scrape_with_url_validation_error(self):
         """Test scraping with a URL validation error."""
@@ -186,8 +183,7 @@ class TestScrapingOrchestrator(unittest.TestCase):
         
         # Mock _setup_browser_and_navigate
         browser_data = {
-            "browser": MagicMock(),
-            "context": MagicMock(),
+            "context": AsyncMock(),
             "page": MagicMock(),
             "soup": MagicMock(),
         }
@@ -268,6 +264,38 @@ class TestScrapingOrchestrator(unittest.TestCase):
         self.assertNotEqual(key1, key5)  # Different options should have different keys
 
 
+class TestComparisonConcurrency(unittest.IsolatedAsyncioTestCase):
+    """Test concurrent processing of comparison URLs."""
+
+    async def test_comparison_urls_respect_concurrency_limit(self):
+        """Comparison URLs run concurrently, never more than max_concurrency at once."""
+        orchestrator = ScrapingOrchestrator(max_concurrency=2)
+        running = 0
+        peak = 0
+        requests = []
+
+        async def fake_scrape(request):
+            nonlocal running, peak
+            requests.append(request)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return ScrapingResult(url=request.url)
+
+        orchestrator.scrape = fake_scrape
+        urls = [f"https://example{i}.com" for i in range(5)]
+        results = await orchestrator._process_comparison_urls(
+            urls, ["logos"], {"comparison_urls": urls}
+        )
+
+        self.assertEqual(list(results), urls)
+        self.assertEqual(peak, 2)
+        # Comparison pages must not fan out into further comparisons
+        for request in requests:
+            self.assertNotIn("comparison_urls", request.options)
+
+
 if __name__ == "__main__":
     # Run tests
     unittest.main()
\ No newline at end of file
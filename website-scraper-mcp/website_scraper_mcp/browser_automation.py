@@ -12,6 +12,79 @@ from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 logger = logging.getLogger(__name__)
 
 
+SUPPORTED_BROWSERS = ("chromium", "firefox", "webkit")
+
+
+class BrowserPool:
+    """Keeps launched browsers warm and hands out isolated contexts.
+
+    A browser is launched on first use for each (browser type, headless, proxy)
+    combination and shared by every later scrape. Each caller gets its own
+    BrowserContext, so cookies, storage and cache are never shared between
+    scrapes; callers close their context when done.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty pool; nothing is launched until first use."""
+        self._playwright = None
+        self._browsers: Dict[Tuple[str, bool, Optional[str]], Browser] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get_browser(
+        self, browser_type: str = "chromium", headless: bool = True, proxy: Optional[str] = None
+    ) -> Browser:
+        """Return a running browser for these launch options, launching it if needed."""
+        key = (browser_type, headless, proxy)
+        browser = self._browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+
+        # Created lazily so the lock belongs to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            # Another task may have launched it while we waited
+            browser = self._browsers.get(key)
+            if browser is None or not browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+
+                launch_options = {"headless": headless}
+                if proxy:
+                    launch_options["proxy"] = {"server": proxy}
+
+                logger.info(f"Launching pooled {browser_type} browser (headless: {headless})")
+                browser = await getattr(self._playwright, browser_type).launch(**launch_options)
+                self._browsers[key] = browser
+
+        return browser
+
+    async def new_context(
+        self,
+        browser_type: str = "chromium",
+        headless: bool = True,
+        proxy: Optional[str] = None,
+        **context_options: Any,
+    ) -> BrowserContext:
+        """Open a fresh context on a pooled browser."""
+        browser = await self.get_browser(browser_type, headless, proxy)
+        return await browser.new_context(**context_options)
+
+    async def close(self) -> None:
+        """Close every pooled browser and stop Playwright."""
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled browser: {e}")
+        self._browsers.clear()
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
 class BrowserAutomationEngine:
     """Browser automation engine for scraping websites."""
 
@@ -25,6 +98,7 @@ class BrowserAutomationEngine:
             "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 "
             "Website-Scraper-MCP/0.1.0"
         )
+        self.pool = BrowserPool()
 
     async def setup_browser(
         self,
@@ -78,6 +152,34 @@ class BrowserAutomationEngine:
 
             return browser, context
 
+    async def new_context(
+        self,
+        browser_type: str = None,
+        headless: bool = True,
+        proxy: Optional[str] = None,
+        viewport_size: Optional[Dict[str, int]] = None,
+        user_agent: Optional[str] = None,
+    ) -> BrowserContext:
+        """Open an isolated context on a pooled, already running browser."""
+        browser_type = browser_type or self.browser_type
+        if browser_type not in SUPPORTED_BROWSERS:
+            logger.warning(f"Unknown browser type: {browser_type}, using chromium")
+            browser_type = "chromium"
+
+        return await self.pool.new_context(
+            browser_type,
+            headless,
+            proxy,
+            viewport=viewport_size or self.viewport_size,
+            user_agent=user_agent or self.user_agent,
+            bypass_csp=True,  # Bypass Content Security Policy
+            ignore_https_errors=True,  # Ignore HTTPS errors
+        )
+
+    async def close(self) -> None:
+        """Close the pooled browsers."""
+        await self.pool.close()
+
     async def navigate_to_url(
         self,
         context: BrowserContext,
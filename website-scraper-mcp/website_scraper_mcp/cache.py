@@ -0,0 +1,122 @@
+"""Result cache for the Website Scraper MCP Server."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from website_scraper_mcp.models import ScrapingResult
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """LRU cache of scraping results with optional on-disk persistence.
+
+    At most ``max_entries`` results are kept; the least recently used one is
+    evicted first. When ``cache_dir`` is given, every result is also written
+    there as a JSON file so the cache survives restarts, and the directory is
+    trimmed to the same size.
+    """
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None) -> None:
+        """Initialize the cache, loading persisted results if any."""
+        self.max_entries = max(1, max_entries)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: "OrderedDict[str, Tuple[datetime, ScrapingResult]]" = OrderedDict()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[ScrapingResult]:
+        """Return the cached result for key, or None if missing or older than ttl seconds."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        timestamp, result = entry
+        if ttl is not None and (datetime.now() - timestamp).total_seconds() >= ttl:
+            return None
+
+        self._entries.move_to_end(key)
+        return result
+
+    def set(self, key: str, result: ScrapingResult) -> None:
+        """Cache a result, evicting the least recently used entries over the cap."""
+        timestamp = datetime.now()
+        self._entries[key] = (timestamp, result)
+        self._entries.move_to_end(key)
+        self._write(key, timestamp, result)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._remove(evicted)
+
+    def clear(self) -> None:
+        """Drop every cached result, including persisted ones."""
+        for key in list(self._entries):
+            self._remove(key)
+        self._entries.clear()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def _write(self, key: str, timestamp: datetime, result: ScrapingResult) -> None:
+        """Persist an entry; failures only cost persistence, not the in-memory entry."""
+        if not self.cache_dir:
+            return
+
+        payload = json.dumps({
+            "key": key,
+            "timestamp": timestamp.isoformat(),
+            "result": json.loads(result.json()),
+        })
+        try:
+            # Write to a temporary file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Error persisting cached result for {key}: {e}")
+
+    def _remove(self, key: str) -> None:
+        if not self.cache_dir:
+            return
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Error removing cached result for {key}: {e}")
+
+    def _load(self) -> None:
+        """Load persisted entries, most recently written last, and trim the rest."""
+        files = sorted(self.cache_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for stale in files[:-self.max_entries]:
+            stale.unlink(missing_ok=True)
+
+        for path in files[-self.max_entries:]:
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                self._entries[data["key"]] = (
+                    datetime.fromisoformat(data["timestamp"]),
+                    ScrapingResult.parse_obj(data["result"]),
+                )
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Discarding unreadable cache file {path}: {e}")
+                path.unlink(missing_ok=True)
+
+        logger.info(f"Loaded {len(self._entries)} cached results from {self.cache_dir}")
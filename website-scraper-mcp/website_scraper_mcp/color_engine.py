@@ -0,0 +1,143 @@
+"""Dominant color extraction for the Website Scraper MCP Server.
+
+Colors are extracted from decoded pixels in memory: the image is reduced to
+roughly ``max_pixels`` pixels, quantized to 5 bits per channel and run through
+a weighted median cut over the resulting color histogram, the same approach
+ColorThief's MMCQ takes but vectorized with NumPy. Extraction is CPU bound, so
+ColorExtractionEngine runs it in a process pool to keep the event loop free.
+"""
+
+import asyncio
+import io
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SIGBITS = 5  # Bits kept per channel when building the histogram
+RSHIFT = 8 - SIGBITS
+MAX_PIXELS = 100_000  # Pixels sampled from an image
+ALPHA_THRESHOLD = 125  # Pixels more transparent than this are ignored
+WHITE_THRESHOLD = 250  # Near-white pixels are ignored, as ColorThief does
+
+
+def load_pixels(image_data: bytes, max_pixels: int = MAX_PIXELS) -> np.ndarray:
+    """Decode an image and return its visible pixels as an (n, 3) uint8 array.
+
+    The image is downsampled by an integer factor so that at most about
+    max_pixels remain; dominant colors survive box reduction unchanged.
+    """
+    with Image.open(io.BytesIO(image_data)) as img:
+        factor = math.ceil(math.sqrt(img.width * img.height / max_pixels))
+        if img.format == "JPEG" and factor > 1:
+            # Let the decoder skip the detail we are about to throw away
+            img.draft("RGB", (img.width // factor, img.height // factor))
+            factor = math.ceil(math.sqrt(img.width * img.height / max_pixels))
+
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        if factor > 1:
+            # Reduce before any other conversion so it runs on few pixels
+            img = img.reduce(factor)
+        rgba = np.asarray(img.convert("RGBA")).reshape(-1, 4)
+
+    visible = rgba[:, 3] >= ALPHA_THRESHOLD
+    not_white = (rgba[:, :3] <= WHITE_THRESHOLD).any(axis=1)
+    return rgba[visible & not_white, :3]
+
+
+def median_cut(pixels: np.ndarray, num_colors: int) -> List[Tuple[Tuple[int, int, int], int]]:
+    """Quantize pixels into at most num_colors colors.
+
+    Returns (rgb, pixel count) pairs, most frequent first.
+    """
+    if len(pixels) == 0 or num_colors < 1:
+        return []
+
+    # Histogram of 5-bit colors: (m, 3) distinct colors and their pixel counts
+    quantized = (pixels >> RSHIFT).astype(np.int32)
+    index = (quantized[:, 0] << (2 * SIGBITS)) | (quantized[:, 1] << SIGBITS) | quantized[:, 2]
+    counts = np.bincount(index, minlength=1 << (3 * SIGBITS))
+    present = np.nonzero(counts)[0]
+    colors = np.stack(
+        [present >> (2 * SIGBITS), (present >> SIGBITS) & 0x1F, present & 0x1F], axis=1
+    )
+    weights = counts[present]
+
+    boxes = [(colors, weights)]
+    while len(boxes) < num_colors:
+        # Split the box with the largest population times channel range
+        scores = [
+            int(box_weights.sum()) * int(np.ptp(box_colors, axis=0).max())
+            for box_colors, box_weights in boxes
+        ]
+        target = int(np.argmax(scores))
+        if scores[target] == 0:
+            break  # Every box is a single color
+
+        box_colors, box_weights = boxes.pop(target)
+        channel = int(np.argmax(np.ptp(box_colors, axis=0)))
+        order = np.argsort(box_colors[:, channel], kind="stable")
+        box_colors, box_weights = box_colors[order], box_weights[order]
+
+        # Split at the weighted median, keeping both halves non-empty
+        cumulative = np.cumsum(box_weights)
+        split = int(np.searchsorted(cumulative, cumulative[-1] / 2))
+        split = min(max(split, 0), len(box_colors) - 2) + 1
+        boxes.append((box_colors[:split], box_weights[:split]))
+        boxes.append((box_colors[split:], box_weights[split:]))
+
+    palette = []
+    for box_colors, box_weights in boxes:
+        population = int(box_weights.sum())
+        # Weighted mean of the bucket centres, back on the 8-bit scale
+        mean = (box_colors * box_weights[:, None]).sum(axis=0) / population
+        rgb = tuple(int(min(255, round(value * (1 << RSHIFT) + (1 << RSHIFT) / 2))) for value in mean)
+        palette.append((rgb, population))
+
+    palette.sort(key=lambda entry: entry[1], reverse=True)
+    return palette
+
+
+def dominant_colors(image_data: bytes, num_colors: int = 10, max_pixels: int = MAX_PIXELS) -> List[str]:
+    """Dominant colors of an encoded image as hex strings, most frequent first."""
+    palette = median_cut(load_pixels(image_data, max_pixels), num_colors)
+
+    hex_colors = []
+    for rgb, _ in palette:
+        hex_color = "#{:02x}{:02x}{:02x}".format(*rgb)
+        if hex_color not in hex_colors:
+            hex_colors.append(hex_color)
+    return hex_colors
+
+
+class ColorExtractionEngine:
+    """Runs dominant color extraction off the event loop in a process pool."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """Initialize the engine; the pool is started on first use."""
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def extract(self, image_data: bytes, num_colors: int = 10) -> List[str]:
+        """Extract dominant colors from encoded image bytes."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, dominant_colors, image_data, num_colors)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Shared by every ImageProcessor so the server runs a single pool
+default_engine = ColorExtractionEngine()
@@ -7,7 +7,6 @@ import logging
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
-import colorthief
 from bs4 import BeautifulSoup, Tag
 from PIL import Image
 from playwright.async_api import Page
@@ -701,12 +700,12 @@ class ColorExtractor:
                 elements_to_check = await page.query_selector_all("p, h1, h2, h3, h4, h5, h6, span, a, label, li")
             else:
                 # Check a representative sample of elements
-                elements_to_check = await page.query_selector_all(`
+                elements_to_check = await page.query_selector_all("""
                     body, html, header, footer, main, nav, section, article,
                     h1, h2, h3, p, a, button, .btn, input[type=button], input[type=submit],
                     .container, .bg, [class*=color], [class*=background], [class*=text],
                     .primary, .secondary, .accent, .highlight, .dark, .light
-                `)
+                """)
 
             # Process each element
             for element in elements_to_check:
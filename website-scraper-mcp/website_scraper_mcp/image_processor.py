@@ -5,22 +5,53 @@ import base64
 import io
 import logging
 import re
-import tempfile
 from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
-import colorthief
 from PIL import Image
 
+from website_scraper_mcp.color_engine import ColorExtractionEngine, default_engine
+
 logger = logging.getLogger(__name__)
 
 
+def _encode_image(image_data: bytes, content_type: str, image_format: str) -> Dict[str, Any]:
+    """Decode image data and re-encode it as a data URL (CPU bound, runs off the event loop)."""
+    result = {"format": image_format}
+
+    # Get image dimensions
+    with Image.open(io.BytesIO(image_data)) as img:
+        result["width"] = img.width
+        result["height"] = img.height
+
+        # Convert to data URL
+        img_byte_arr = io.BytesIO()
+        
+        # Preserve SVG format
+        if image_format.lower() == "svg+xml":
+            result["data"] = f"data:{content_type};base64,{base64.b64encode(image_data).decode('utf-8')}"
+        else:
+            # For other formats, use PIL to save as PNG
+            if img.mode == "RGBA":
+                img.save(img_byte_arr, format="PNG")
+                result["format"] = "png"
+            else:
+                img.save(img_byte_arr, format="JPEG", quality=85)
+                result["format"] = "jpeg"
+            
+            img_byte_arr = img_byte_arr.getvalue()
+            result["data"] = f"data:image/{result['format']};base64,{base64.b64encode(img_byte_arr).decode('utf-8')}"
+
+    return result
+
+
 class ImageProcessor:
     """Processes images for extraction of visual elements."""
 
-    def __init__(self) -> None:
+    def __init__(self, color_engine: Optional[ColorExtractionEngine] = None) -> None:
         """Initialize the image processor."""
         self.session = None
+        self.color_engine = color_engine or default_engine
         self.user_agent = (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 "
@@ -137,28 +168,11 @@ class ImageProcessor:
             else:
                 result["format"] = "unknown"
 
-            # Get image dimensions
-            with Image.open(io.BytesIO(image_data)) as img:
-                result["width"] = img.width
-                result["height"] = img.height
-
-                # Convert to data URL
-                img_byte_arr = io.BytesIO()
-                
-                # Preserve SVG format
-                if result["format"].lower() == "svg+xml":
-                    result["data"] = f"data:{content_type};base64,{base64.b64encode(image_data).decode('utf-8')}"
-                else:
-                    # For other formats, use PIL to save as PNG
-                    if img.mode == "RGBA":
-                        img.save(img_byte_arr, format="PNG")
-                        result["format"] = "png"
-                    else:
-                        img.save(img_byte_arr, format="JPEG", quality=85)
-                        result["format"] = "jpeg"
-                    
-                    img_byte_arr = img_byte_arr.getvalue()
-                    result["data"] = f"data:image/{result['format']};base64,{base64.b64encode(img_byte_arr).decode('utf-8')}"
+            # Decode and re-encode in a worker thread; Pillow releases the GIL meanwhile
+            loop = asyncio.get_running_loop()
+            result.update(await loop.run_in_executor(
+                None, _encode_image, image_data, content_type, result["format"]
+            ))
 
             # Cache result
             self._image_cache[f"data:image/{result['format']};base64,..."] = result
@@ -174,25 +188,8 @@ class ImageProcessor:
     ) -> List[str]:
         """Extract dominant colors from an image."""
         try:
-            # Create a temporary file for ColorThief
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_file:
-                temp_path = temp_file.name
-                temp_file.write(image_data)
-
-            # Use ColorThief to extract dominant colors
-            ct = colorthief.ColorThief(temp_path)
-            palette = ct.get_palette(color_count=num_colors, quality=10)
-
-            # Convert to hex colors
-            hex_colors = [
-                "#{:02x}{:02x}{:02x}".format(rgb[0], rgb[1], rgb[2]) for rgb in palette
-            ]
-
-            # Clean up temporary file
-            import os
-            os.unlink(temp_path)
-
-            return hex_colors
+            # Quantized in memory by the color engine's process pool
+            return await self.color_engine.extract(image_data, num_colors=num_colors)
 
         except Exception as e:
             logger.exception(f"Error extracting dominant colors: {e}")
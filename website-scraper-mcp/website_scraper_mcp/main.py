@@ -20,6 +20,7 @@ from website_scraper_mcp.extractors import (
 from website_scraper_mcp.exporters import ResultExporter
 from website_scraper_mcp.image_processor import ImageProcessor
 from website_scraper_mcp.browser_automation import BrowserAutomationEngine
+from website_scraper_mcp.color_engine import default_engine
 from website_scraper_mcp.models import (
     Color,
     ComponentStyle,
@@ -42,7 +43,12 @@ logger = logging.getLogger("website_scraper_mcp")
 class WebScraperMCPServer:
     """MCP server for website scraping."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache_size: int = 128,
+        cache_dir: Optional[str] = None,
+        max_concurrency: int = 4,
+    ) -> None:
         """Initialize the MCP server."""
         self.app = FastAPI(title="Website Scraper MCP Server")
         self.image_processor = ImageProcessor()
@@ -50,7 +56,11 @@ class WebScraperMCPServer:
         self.logo_extractor = LogoExtractor()
         self.color_extractor = ColorExtractor()
         self.ui_style_extractor = UIStyleExtractor()
-        self.orchestrator = ScrapingOrchestrator()
+        self.orchestrator = ScrapingOrchestrator(
+            cache_size=cache_size,
+            cache_dir=cache_dir,
+            max_concurrency=max_concurrency,
+        )
 
     def register_tools(self) -> List[Dict[str, Any]]:
         """Register the MCP tools with Kiro."""
@@ -132,6 +142,10 @@ class WebScraperMCPServer:
                                     "items": {"type": "string"},
                                     "description": "URLs to compare with the main URL",
                                 },
+                                "max_concurrency": {
+                                    "type": "integer",
+                                    "description": "Maximum number of comparison URLs scraped at once",
+                                },
                                 "excluded_elements": {
                                     "type": "array",
                                     "items": {"type": "string"},
@@ -437,6 +451,9 @@ class WebScraperMCPServer:
         logger.info("Cleaning up resources...")
         if hasattr(self, "image_processor") and self.image_processor:
             await self.image_processor.close()
+        if hasattr(self, "orchestrator") and self.orchestrator:
+            await self.orchestrator.close()
+        default_engine.shutdown()
 
 
 def main() -> None:
@@ -445,6 +462,11 @@ def main() -> None:
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--log-level", default="info", help="Logging level")
+    parser.add_argument("--cache-size", type=int, default=128, help="Maximum number of cached results")
+    parser.add_argument("--cache-dir", default=None, help="Directory to persist cached results in")
+    parser.add_argument(
+        "--max-concurrency", type=int, default=4, help="Maximum number of comparison URLs scraped at once"
+    )
     
     args = parser.parse_args()
     
@@ -453,7 +475,11 @@ def main() -> None:
     logging.getLogger().setLevel(log_level)
     
     # Create MCP server
-    server = WebScraperMCPServer()
+    server = WebScraperMCPServer(
+        cache_size=args.cache_size,
+        cache_dir=args.cache_dir,
+        max_concurrency=args.max_concurrency,
+    )
     
     # Register with FastMCP
     fastmcp.register_mcp_server(server.app, server)
@@ -142,6 +142,7 @@ class ScrapingOptions(BaseModel):
     max_depth: int = 1  # For multi-page scraping
     excluded_elements: List[str] = []
     comparison_urls: List[str] = []  # For side-by-side analysis
+    max_concurrency: int = 4  # Comparison URLs scraped at once
     element_focus: Optional[str] = None  # For color extraction
     component_types: List[str] = []  # For UI style extraction
     export_format: str = "json"  # json, csv, html, pdf
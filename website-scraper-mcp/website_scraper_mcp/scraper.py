@@ -13,6 +13,7 @@ import aiohttp
 from bs4 import BeautifulSoup
 
 from website_scraper_mcp.browser_automation import BrowserAutomationEngine
+from website_scraper_mcp.cache import ResultCache
 from website_scraper_mcp.extractors import (
     ColorExtractor,
     LogoExtractor,
@@ -26,14 +27,20 @@ logger = logging.getLogger(__name__)
 class ScrapingOrchestrator:
     """Orchestrates the website scraping process."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        cache_size: int = 128,
+        cache_dir: Optional[str] = None,
+        max_concurrency: int = 4,
+    ) -> None:
         """Initialize the scraping orchestrator."""
         self.logo_extractor = LogoExtractor()
         self.color_extractor = ColorExtractor()
         self.ui_style_extractor = UIStyleExtractor()
         self.browser_engine = BrowserAutomationEngine()
-        self._cache: Dict[str, Tuple[datetime, ScrapingResult]] = {}
+        self._cache = ResultCache(max_entries=cache_size, cache_dir=cache_dir)
         self._cache_ttl = 3600  # 1 hour
+        self.max_concurrency = max_concurrency  # Comparison URLs scraped at once
 
     async def scrape(self, request: ScrapingRequest) -> ScrapingResult:
         """Orchestrate the scraping process for the given URL."""
@@ -43,11 +50,10 @@ class ScrapingOrchestrator:
         
         # Check cache
         cache_key = self._get_cache_key(request)
-        if cache_key in self._cache:
-            timestamp, result = self._cache[cache_key]
-            if (datetime.now() - timestamp).total_seconds() < cache_ttl:
-                logger.info(f"Using cached result for {request.url}")
-                return result
+        cached_result = self._cache.get(cache_key, ttl=cache_ttl)
+        if cached_result is not None:
+            logger.info(f"Using cached result for {request.url}")
+            return cached_result
 
         # Validate URL
         try:
@@ -73,7 +79,7 @@ class ScrapingOrchestrator:
                 "timeout": options.get("timeout", 30000),
             }
             
-            # Launch browser and navigate to page
+            # Open a context on a pooled browser and navigate to page
             browser_data = await self._setup_browser_and_navigate(
                 request.url,
                 browser_options=browser_options,
@@ -84,42 +90,45 @@ class ScrapingOrchestrator:
                 return ScrapingResult(url=request.url, error=browser_data["error"])
             
             page = browser_data["page"]
-            browser = browser_data["browser"]
             context = browser_data["context"]
             soup = browser_data["soup"]
             
-            # Add metadata to result
-            if browser_data.get("metadata"):
-                result.metadata = browser_data["metadata"]
+            try:
+                # Add metadata to result
+                if browser_data.get("metadata"):
+                    result.metadata = browser_data["metadata"]
             
-            # Take screenshots
-            screenshots = await self._capture_screenshots(page)
-            result.screenshots = screenshots
+                # Take screenshots
+                screenshots = await self._capture_screenshots(page)
+                result.screenshots = screenshots
             
-            # Extract requested elements
-            if "logos" in request.elements:
-                logger.info("Extracting logos")
-                logo_selector = request.selectors.get("logo") if request.selectors else None
-                result.logos = await self.logo_extractor.extract(page, soup, logo_selector)
+                # Extract requested elements
+                if "logos" in request.elements:
+                    logger.info("Extracting logos")
+                    logo_selector = request.selectors.get("logo") if request.selectors else None
+                    result.logos = await self.logo_extractor.extract(page, soup, logo_selector)
 
-            if "colors" in request.elements:
-                logger.info("Extracting colors")
-                color_options = {
-                    "element_focus": options.get("element_focus"),
-                    "include_images": options.get("include_images", True),
-                }
-                colors_result = await self.color_extractor.extract(
-                    page, soup, base64.b64decode(screenshots["full"]), color_options
-                )
-                result.colors = colors_result.get("colors")
-                result.color_palette = colors_result.get("palette")
+                if "colors" in request.elements:
+                    logger.info("Extracting colors")
+                    color_options = {
+                        "element_focus": options.get("element_focus"),
+                        "include_images": options.get("include_images", True),
+                    }
+                    colors_result = await self.color_extractor.extract(
+                        page, soup, base64.b64decode(screenshots["full"]), color_options
+                    )
+                    result.colors = colors_result.get("colors")
+                    result.color_palette = colors_result.get("palette")
 
-            if "styles" in request.elements:
-                logger.info("Extracting UI styles")
-                style_options = {
-                    "component_types": options.get("component_types", []),
-                }
-                result.ui_style = await self.ui_style_extractor.extract(page, soup, style_options)
+                if "styles" in request.elements:
+                    logger.info("Extracting UI styles")
+                    style_options = {
+                        "component_types": options.get("component_types", []),
+                    }
+                    result.ui_style = await self.ui_style_extractor.extract(page, soup, style_options)
+            finally:
+                # Only the context is closed; the pooled browser stays warm
+                await context.close()
 
             # Handle comparison URLs if provided
             comparison_urls = options.get("comparison_urls", [])
@@ -129,11 +138,8 @@ class ScrapingOrchestrator:
                     comparison_urls, request.elements, options
                 )
 
-            # Close browser
-            await browser.close()
-
             # Cache result
-            self._cache[cache_key] = (datetime.now(), result)
+            self._cache.set(cache_key, result)
             return result
 
         except Exception as e:
@@ -143,19 +149,18 @@ class ScrapingOrchestrator:
     async def _setup_browser_and_navigate(
         self, url: str, browser_options: Dict[str, Any] = None, wait_until: str = "networkidle"
     ) -> Dict[str, Any]:
-        """Set up browser and navigate to URL."""
+        """Open a browser context and navigate to URL."""
         logger.info(f"Setting up browser and navigating to {url}")
         browser_options = browser_options or {}
         
         try:
-            # Set up browser and context
-            browser, context = await self.browser_engine.setup_browser(
+            # Isolated context on a pooled browser
+            context = await self.browser_engine.new_context(
                 browser_type=browser_options.get("browser_type"),
                 headless=browser_options.get("headless", True),
                 proxy=browser_options.get("proxy"),
                 viewport_size=browser_options.get("viewport_size"),
                 user_agent=browser_options.get("user_agent"),
-                timeout=browser_options.get("timeout"),
             )
             
             # Set up extra HTTP headers if provided
@@ -171,7 +176,7 @@ class ScrapingOrchestrator:
             )
             
             if error:
-                await browser.close()
+                await context.close()
                 return {"error": error}
             
             # Get page metadata
@@ -179,7 +184,6 @@ class ScrapingOrchestrator:
             logger.info(f"Page title: {metadata.get('title', 'Unknown')}")
             
             return {
-                "browser": browser,
                 "context": context,
                 "page": page,
                 "soup": soup,
@@ -228,36 +232,44 @@ class ScrapingOrchestrator:
     async def _process_comparison_urls(
         self, urls: List[str], elements: List[str], options: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Process comparison URLs."""
-        results = {}
-        
-        for url in urls:
-            try:
-                # Create a new request for the comparison URL
-                comparison_request = ScrapingRequest(
-                    url=url,
-                    elements=elements,
-                    options=options,
-                )
-                
-                # Scrape the comparison URL
-                logger.info(f"Scraping comparison URL: {url}")
-                comparison_result = await self.scrape(comparison_request)
-                
-                # Add to results
-                results[url] = {
-                    "logos": comparison_result.logos,
-                    "colors": comparison_result.colors,
-                    "color_palette": comparison_result.color_palette,
-                    "ui_style": comparison_result.ui_style,
-                    "metadata": comparison_result.metadata,
-                }
-                
-            except Exception as e:
-                logger.warning(f"Error processing comparison URL {url}: {e}")
-                results[url] = {"error": str(e)}
+        """Process comparison URLs concurrently, at most max_concurrency at a time."""
+        semaphore = asyncio.Semaphore(max(1, options.get("max_concurrency", self.max_concurrency)))
+
+        # Comparison pages are not compared against further URLs themselves
+        comparison_options = {k: v for k, v in options.items() if k != "comparison_urls"}
+
+        async def process(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    # Create a new request for the comparison URL
+                    comparison_request = ScrapingRequest(
+                        url=url,
+                        elements=elements,
+                        options=comparison_options,
+                    )
+                    
+                    # Scrape the comparison URL
+                    logger.info(f"Scraping comparison URL: {url}")
+                    comparison_result = await self.scrape(comparison_request)
+                    
+                    return {
+                        "logos": comparison_result.logos,
+                        "colors": comparison_result.colors,
+                        "color_palette": comparison_result.color_palette,
+                        "ui_style": comparison_result.ui_style,
+                        "metadata": comparison_result.metadata,
+                    }
+                    
+                except Exception as e:
+                    logger.warning(f"Error processing comparison URL {url}: {e}")
+                    return {"error": str(e)}
         
-        return results
+        results = await asyncio.gather(*(process(url) for url in urls))
+        return dict(zip(urls, results))
+
+    async def close(self) -> None:
+        """Release the pooled browsers."""
+        await self.browser_engine.close()
 
     async def validate_url(self, url: str) -> None:
         """Validate URL and check robots.txt compliance."""